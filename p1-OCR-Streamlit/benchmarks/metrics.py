@@ -0,0 +1,233 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun
+#   - Importe: numpy, difflib, re
+#   - Utilisé par: benchmarks/run_benchmarks.py, tests/test_benchmarks.py
+
+"""
+ShelfReader - Benchmark Metrics
+Latences, précision (rappel des titres, regroupement par dos, lignes de tranches)
+et détection de régressions entre deux exécutions.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# Seuils par défaut
+TITLE_MATCH_THRESHOLD = 0.6  # Similarité minimale OCR / titre attendu
+BOUNDARY_TOLERANCE = 0.35  # Fraction de la largeur moyenne d'un dos
+PERCENTILES = (50, 90, 95, 99)
+
+# Sens d'amélioration des métriques comparées: +1 = plus haut est meilleur
+METRIC_DIRECTIONS = {
+    'latency_ms.p50': -1,
+    'latency_ms.p95': -1,
+    'throughput_ips': +1,
+    'peak_rss_mb': -1,
+    'accuracy.title_recall': +1,
+    'accuracy.grouping': +1,
+    'accuracy.boundary_f1': +1,
+    'accuracy.row_f1': +1,
+}
+ACCURACY_PREFIX = 'accuracy.'
+
+
+def normalize_text(text):
+    """Majuscules, alphanumérique seulement, espaces simples."""
+    return ' '.join(re.sub(r'[^0-9A-Z]+', ' ', str(text).upper()).split())
+
+
+def text_similarity(title, text):
+    """Similarité titre attendu / texte OCR (1.0 si le titre est contenu dans le texte)."""
+    title, text = normalize_text(title), normalize_text(text)
+    if not title or not text:
+        return 0.0
+    if title in text:
+        return 1.0
+    return SequenceMatcher(None, title, text).ratio()
+
+
+def latency_summary(latencies):
+    """Percentiles de latence en millisecondes."""
+    if not latencies:
+        return {}
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    summary = {f"p{p}": round(float(np.percentile(values, p)), 2) for p in PERCENTILES}
+    summary['mean'] = round(float(values.mean()), 2)
+    summary['max'] = round(float(values.max()), 2)
+    return summary
+
+
+def title_recall(boxes, titles, threshold=TITLE_MATCH_THRESHOLD):
+    """Fraction des titres attendus retrouvés dans au moins une boîte OCR."""
+    if not titles:
+        return None
+    texts = [b.get('text', '') for b in boxes]
+    found = sum(1 for title in titles
+                if any(text_similarity(title, text) >= threshold for text in texts))
+    return found / len(titles)
+
+
+def _horizontal_overlap(box, x_range):
+    left = max(box['x'], x_range[0])
+    right = min(box['x'] + box['width'], x_range[1])
+    return max(0.0, right - left)
+
+
+def grouping_accuracy(boxes, spines, threshold=TITLE_MATCH_THRESHOLD):
+    """
+    Fraction des dos correctement regroupés: exactement une boîte leur est
+    attribuée (pas de dos coupé en deux ni de dos fusionnés) et son texte
+    correspond au titre.
+
+    Chaque boîte est attribuée au dos de même rangée qui la recouvre le plus.
+    """
+    if not spines:
+        return None
+    assigned = {i: [] for i in range(len(spines))}
+    for box in boxes:
+        if not box.get('text'):
+            continue
+        center_y = box['y'] + box['height'] / 2
+        best, best_overlap = None, 0.0
+        for i, spine in enumerate(spines):
+            ys = [p[1] for p in spine['polygon']]
+            if not min(ys) <= center_y <= max(ys):
+                continue
+            overlap = _horizontal_overlap(box, spine['x_range'])
+            if overlap > best_overlap:
+                best, best_overlap = i, overlap
+        if best is not None:
+            assigned[best].append(box)
+
+    correct = 0
+    for i, spine in enumerate(spines):
+        group = assigned[i]
+        if len(group) == 1 and text_similarity(spine['title'], group[0]['text']) >= threshold:
+            correct += 1
+    return correct / len(spines)
+
+
+def _match_positions(predicted, expected, tolerance):
+    """Appariement glouton 1-1 de positions 1D; retourne (précision, rappel, F1)."""
+    if not expected:
+        return None
+    remaining = sorted(predicted)
+    matched = 0
+    for target in sorted(expected):
+        if not remaining:
+            break
+        distances = [abs(p - target) for p in remaining]
+        best = int(np.argmin(distances))
+        if distances[best] <= tolerance:
+            matched += 1
+            remaining.pop(best)
+    precision = matched / len(predicted) if predicted else 0.0
+    recall = matched / len(expected)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4)}
+
+
+def _line_x(line, y):
+    if hasattr(line, 'x'):
+        return line.x(y)
+    return line['x']
+
+
+def boundary_scores(lines, ground_truth, boundaries, tolerance=BOUNDARY_TOLERANCE):
+    """
+    Compare les lignes de tranches détectées aux séparations réelles entre dos.
+
+    Args:
+        lines: Lignes détectées (objets Line)
+        ground_truth: Vérité terrain de l'étagère synthétique
+        boundaries: [(rangée, y, x)] issus de synthetic_shelf.spine_boundaries
+        tolerance: Tolérance en fraction de la largeur moyenne d'un dos
+    """
+    spines = ground_truth['spines']
+    mean_width = np.mean([s['x_range'][1] - s['x_range'][0] for s in spines])
+    tol = tolerance * mean_width
+    scores = []
+    for row, (y0, y1) in enumerate(ground_truth['rows']):
+        expected = [x for r, _, x in boundaries if r == row]
+        y = next((by for r, by, _ in boundaries if r == row), (y0 + y1) / 2)
+        predicted = []
+        for line in lines:
+            # Ligne présente dans la rangée à cette hauteur
+            if getattr(line, 'min_y', y0) <= y <= getattr(line, 'max_y', y1):
+                x = _line_x(line, y)
+                if np.isfinite(x):
+                    predicted.append(float(x))
+        # Les bords extérieurs de la rangée ne sont pas des séparations
+        row_spines = [s for s in spines if s['row'] == row]
+        left = min(s['x_range'][0] for s in row_spines) + tol
+        right = max(s['x_range'][1] for s in row_spines) - tol
+        predicted = [x for x in predicted if left <= x <= right]
+        score = _match_positions(predicted, expected, tol)
+        if score:
+            scores.append(score)
+    if not scores:
+        return None
+    return {k: round(float(np.mean([s[k] for s in scores])), 4) for k in ('precision', 'recall', 'f1')}
+
+
+def row_scores(lines, ground_truth, tolerance=0.1):
+    """Compare les lignes horizontales détectées aux limites des rangées (planches)."""
+    rows = ground_truth['rows']
+    expected = sorted({y for row in rows for y in row})
+    row_height = np.mean([y1 - y0 for y0, y1 in rows])
+    predicted = []
+    for line in lines:
+        y = line.center[1] if hasattr(line, 'center') else line['y']
+        predicted.append(float(y))
+    return _match_positions(predicted, expected, tolerance * row_height)
+
+
+def flatten(record, prefix=''):
+    """Aplati un dictionnaire imbriqué: {'a': {'b': 1}} -> {'a.b': 1}."""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_runs(base, head, perf_threshold=0.10, accuracy_threshold=0.02):
+    """
+    Compare deux exécutions cas par cas.
+
+    Args:
+        base: Exécution de référence (entrée de l'historique)
+        head: Exécution candidate
+        perf_threshold: Dégradation relative tolérée pour latence, débit et mémoire
+        accuracy_threshold: Baisse absolue tolérée pour les métriques de précision
+
+    Returns:
+        list: Lignes {'case', 'metric', 'base', 'head', 'change', 'regression'}
+    """
+    rows = []
+    for case, head_case in head['cases'].items():
+        base_case = base['cases'].get(case)
+        if not base_case or base_case.get('status') != 'ok' or head_case.get('status') != 'ok':
+            continue
+        base_flat, head_flat = flatten(base_case), flatten(head_case)
+        for metric, direction in METRIC_DIRECTIONS.items():
+            if metric not in base_flat or metric not in head_flat:
+                continue
+            before, after = base_flat[metric], head_flat[metric]
+            if metric.startswith(ACCURACY_PREFIX):
+                change = after - before
+                regression = direction * change < -accuracy_threshold
+            else:
+                change = (after - before) / before if before else 0.0
+                regression = direction * change < -perf_threshold
+            rows.append({
+                'case': case, 'metric': metric,
+                'base': before, 'head': after,
+                'change': round(change, 4), 'regression': regression
+            })
+    return rows
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# DÉPENDANCES:
+#   - Utilise: benchmarks/synthetic_shelf.py, benchmarks/metrics.py,
+#              engines/easyocr/detection/spine_detection.py, engines/*/logic/orchestrator.py,
+#              core/spine/service.py
+#   - Importe: argparse, concurrent.futures, multiprocessing, resource, json, cv2, numpy, PIL
+#   - Utilisé par: Aucun (point d'entrée)
+
+"""
+ShelfReader - Benchmarks
+Suite reproductible (CPU uniquement) sur les images de test et des étagères synthétiques.
+
+Chaque cas (détection de tranches seule, ou moteur OCR complet) s'exécute dans
+un processus neuf pour isoler le pic mémoire et le chargement des modèles.
+Les résultats sont ajoutés à un historique JSON; le mode compare signale les
+régressions entre deux exécutions.
+
+Usage:
+    python benchmarks/run_benchmarks.py run --synthetic 5 --repeat 3 --label "avant tiling"
+    python benchmarks/run_benchmarks.py list
+    python benchmarks/run_benchmarks.py compare            # deux dernières exécutions
+    python benchmarks/run_benchmarks.py compare -2 -1 --threshold 0.05
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_PATH = os.path.join(BENCH_DIR, '..', 'src')
+for path in (BENCH_DIR, SRC_PATH):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import numpy as np
+
+from metrics import (latency_summary, title_recall, grouping_accuracy, boundary_scores,
+                     row_scores, compare_runs)
+from synthetic_shelf import generate_dataset, spine_boundaries
+
+DEFAULT_IMAGES_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', '..', 'shared', 'data', 'test_images'))
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, 'results', 'history.json')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+ENGINES = ('EasyOCR', 'Tesseract', 'TrOCR')
+SPINE_METHODS = ('vertical_lines', 'horizontal_shelves')
+DEFAULT_CONFIDENCE = 0.3
+
+
+# ---------------------------------------------------------------------------
+# Jeux de données
+# ---------------------------------------------------------------------------
+
+def load_real_images(images_dir):
+    """
+    Charge les images réelles. Un fichier <image>.json optionnel peut fournir
+    la vérité terrain: {"titles": ["...", ...]}.
+    """
+    import cv2
+
+    dataset = []
+    if not images_dir or not os.path.isdir(images_dir):
+        return dataset
+    for path in sorted(glob.glob(os.path.join(images_dir, '*'))):
+        if not path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        truth = None
+        sidecar = os.path.splitext(path)[0] + '.json'
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding='utf-8') as f:
+                truth = json.load(f)
+        dataset.append((os.path.basename(path), image, truth))
+    return dataset
+
+
+def load_dataset(config):
+    dataset = load_real_images(config['images_dir'])
+    if config['synthetic']:
+        dataset += generate_dataset(config['synthetic'], seed=config['seed'],
+                                    num_spines=config['spines'], rows=config['rows'])
+    return dataset
+
+
+# ---------------------------------------------------------------------------
+# Cas de benchmark
+# ---------------------------------------------------------------------------
+
+def build_cases(engines, spine_methods):
+    """Liste des cas: détection de tranches seule, puis moteurs OCR complets."""
+    cases = [(f"spine:{method}", 'spine', None, method) for method in spine_methods]
+    for engine in engines:
+        if engine == 'EasyOCR':
+            cases += [(f"EasyOCR:{method}", 'engine', engine, method) for method in spine_methods]
+        else:
+            cases.append((engine, 'engine', engine, None))
+    return cases
+
+
+def _trocr_to_boxes(results, confidence):
+    boxes = []
+    for result in results:
+        if result.get('confidence', 0.0) >= confidence and len(result.get('bbox', [])) >= 4:
+            x, y, w, h = result['bbox']
+            boxes.append({'x': x, 'y': y, 'width': w, 'height': h,
+                          'text': result.get('text', ''), 'confidence': result['confidence']})
+    return boxes
+
+
+def _uncached(runner):
+    """
+    Vide le cache de tranches du processus avant chaque appel: sans cela, la
+    chauffe et les répétitions sur la même image réutiliseraient les tranches
+    déjà calculées et la détection ne serait mesurée qu'une fois.
+    """
+    from core.spine import spine_service
+
+    def run(image):
+        spine_service.clear()
+        return runner(image)
+    return run
+
+
+def build_runner(kind, engine, method, confidence=DEFAULT_CONFIDENCE):
+    """Construit la fonction mesurée: image BGR -> lignes (spine) ou boîtes (engine)."""
+    if kind == 'spine':
+        from engines.easyocr.detection.spine_detection import EasyOCRSpineDetection
+        return lambda image: EasyOCRSpineDetection.detect_spine_lines(image, method=method)
+    return _uncached(_build_engine_runner(engine, method, confidence))
+
+
+def _build_engine_runner(engine, method, confidence):
+    from PIL import Image
+
+    if engine == 'EasyOCR':
+        from engines.easyocr.logic.orchestrator import EasyOCRProcessor
+        processor = EasyOCRProcessor(['en'], confidence, use_gpu=False)
+        return lambda image: processor.get_boxes(
+            Image.fromarray(image[:, :, ::-1]), preprocess=False,
+            use_spine_detection=True, spine_method=method)
+
+    if engine == 'Tesseract':
+        from engines.tesseract.logic.orchestrator import TesseractOCRProcessor
+        processor = TesseractOCRProcessor('eng', confidence * 100, False)
+        return lambda image: processor.get_boxes(Image.fromarray(image[:, :, ::-1]))
+
+    if engine == 'TrOCR':
+        from engines.trocr.logic.orchestrator import ShelfReaderTrOCRProcessor
+        processor = ShelfReaderTrOCRProcessor('cpu')
+        return lambda image: _trocr_to_boxes(
+            processor.process_image(np.ascontiguousarray(image[:, :, ::-1])), confidence)
+
+    raise ValueError(f"Moteur inconnu : {engine}")
+
+
+def evaluate(kind, method, output, truth):
+    """Métriques de précision d'une sortie selon la vérité terrain disponible."""
+    if not truth:
+        return {}
+    if kind == 'spine':
+        if 'spines' not in truth:
+            return {}
+        if method == 'vertical_lines':
+            scores = boundary_scores(output, truth, spine_boundaries(truth))
+            prefix = 'boundary'
+        else:
+            scores = row_scores(output, truth)
+            prefix = 'row'
+        if not scores:
+            return {}
+        return {f"{prefix}_{k}": v for k, v in scores.items()}
+
+    titles = truth.get('titles') or [s['title'] for s in truth.get('spines', [])]
+    accuracy = {'title_recall': title_recall(output, titles)}
+    if truth.get('spines'):
+        accuracy['grouping'] = grouping_accuracy(output, truth['spines'])
+    return {k: v for k, v in accuracy.items() if v is not None}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: kilo-octets, macOS: octets
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def run_case(case, config):
+    """Exécute un cas complet (appelé dans un processus dédié)."""
+    os.environ['CUDA_VISIBLE_DEVICES'] = ''  # CPU uniquement
+    name, kind, engine, method = case
+    result = {'kind': kind, 'engine': engine, 'method': method}
+
+    dataset = load_dataset(config)
+    if not dataset:
+        return dict(result, status='skipped', reason="aucune image")
+
+    try:
+        start = time.perf_counter()
+        runner = build_runner(kind, engine, method, config['confidence'])
+        result['init_s'] = round(time.perf_counter() - start, 3)
+    except ImportError as e:
+        return dict(result, status='skipped', reason=f"dépendance manquante: {e}")
+    except Exception as e:
+        return dict(result, status='error', reason=f"{type(e).__name__}: {e}")
+
+    try:
+        for _ in range(config['warmup']):
+            runner(dataset[0][1])
+
+        latencies = []
+        per_image = {}
+        accuracy_values = {}
+        wall_start = time.perf_counter()
+        for image_name, image, truth in dataset:
+            image_latencies = []
+            output = None
+            for _ in range(config['repeat']):
+                start = time.perf_counter()
+                output = runner(image)
+                image_latencies.append(time.perf_counter() - start)
+            latencies += image_latencies
+
+            accuracy = evaluate(kind, method, output, truth)
+            for metric, value in accuracy.items():
+                accuracy_values.setdefault(metric, []).append(value)
+            per_image[image_name] = {
+                'latency_ms': latency_summary(image_latencies),
+                'outputs': len(output) if output is not None else 0,
+                'accuracy': accuracy
+            }
+        wall = time.perf_counter() - wall_start
+    except Exception as e:
+        return dict(result, status='error', reason=f"{type(e).__name__}: {e}")
+
+    result.update({
+        'status': 'ok',
+        'images': len(dataset),
+        'calls': len(latencies),
+        'latency_ms': latency_summary(latencies),
+        'throughput_ips': round(len(latencies) / wall, 3) if wall > 0 else None,
+        'peak_rss_mb': _peak_rss_mb(),
+        'accuracy': {k: round(float(np.mean(v)), 4) for k, v in accuracy_values.items()},
+        'per_image': per_image
+    })
+    return result
+
+
+def run_isolated(case, config):
+    """Lance un cas dans un processus neuf (spawn) pour des mesures indépendantes."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, case, config).result()
+
+
+# ---------------------------------------------------------------------------
+# Historique
+# ---------------------------------------------------------------------------
+
+def _package_version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def environment_info():
+    """Contexte d'exécution enregistré avec chaque run (reproductibilité)."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    packages = ('numpy', 'opencv-python', 'opencv-python-headless', 'scipy', 'Pillow',
+                'easyocr', 'pytesseract', 'torch', 'transformers')
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+        'threads': {k: os.environ[k] for k in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS') if k in os.environ},
+        'packages': {p: v for p in packages if (v := _package_version(p))}
+    }
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return {'runs': []}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_history(history, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def select_run(history, ref):
+    """Sélectionne un run par identifiant ou par index (-1 = dernier)."""
+    runs = history['runs']
+    for run in runs:
+        if run['run_id'] == ref:
+            return run
+    try:
+        return runs[int(ref)]
+    except (ValueError, IndexError):
+        raise SystemExit(f"❌ Run introuvable: {ref}")
+
+
+# ---------------------------------------------------------------------------
+# Affichage
+# ---------------------------------------------------------------------------
+
+def print_run(run):
+    print(f"\n📊 Run {run['run_id']}" + (f" ({run['label']})" if run.get('label') else ''))
+    print(f"{'Cas':<32} {'p50 ms':>9} {'p95 ms':>9} {'img/s':>8} {'RSS MB':>8}  Précision")
+    for name, case in run['cases'].items():
+        if case['status'] != 'ok':
+            print(f"{name:<32} {case['status']}: {case.get('reason', '')}")
+            continue
+        latency = case['latency_ms']
+        accuracy = ', '.join(f"{k}={v:.2f}" for k, v in case['accuracy'].items()) or '-'
+        rss = case['peak_rss_mb'] if case['peak_rss_mb'] is not None else '-'
+        print(f"{name:<32} {latency['p50']:>9.1f} {latency['p95']:>9.1f} "
+              f"{case['throughput_ips']:>8.2f} {rss:>8}  {accuracy}")
+
+
+def print_comparison(base, head, rows):
+    print(f"\n🔍 Comparaison {base['run_id']} → {head['run_id']}")
+    if not rows:
+        print("Aucun cas commun à comparer.")
+        return
+    print(f"{'Cas':<32} {'Métrique':<24} {'Avant':>10} {'Après':>10} {'Écart':>9}")
+    for row in rows:
+        is_accuracy = row['metric'].startswith('accuracy.')
+        change = f"{row['change']:+.3f}" if is_accuracy else f"{row['change'] * 100:+.1f}%"
+        flag = '  ⚠️ RÉGRESSION' if row['regression'] else ''
+        print(f"{row['case']:<32} {row['metric']:<24} {row['base']:>10.3f} {row['head']:>10.3f} "
+              f"{change:>9}{flag}")
+
+
+# ---------------------------------------------------------------------------
+# Commandes
+# ---------------------------------------------------------------------------
+
+def command_run(args):
+    config = {
+        'images_dir': None if args.no_real else args.images_dir,
+        'synthetic': args.synthetic,
+        'spines': args.spines,
+        'rows': args.rows,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'warmup': args.warmup,
+        'confidence': args.confidence
+    }
+    cases = build_cases(args.engines, args.spine_methods)
+    run = {
+        'run_id': datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ'),
+        'label': args.label,
+        'config': config,
+        'environment': environment_info(),
+        'cases': {}
+    }
+
+    for case in cases:
+        print(f"⏱️ {case[0]}...", flush=True)
+        if args.in_process:
+            run['cases'][case[0]] = run_case(case, config)
+        else:
+            run['cases'][case[0]] = run_isolated(case, config)
+
+    history = load_history(args.history)
+    history['runs'].append(run)
+    save_history(history, args.history)
+    print_run(run)
+    print(f"\n✅ Résultats ajoutés à {args.history}")
+    return 0
+
+
+def command_list(args):
+    history = load_history(args.history)
+    for index, run in enumerate(history['runs']):
+        ok = sum(1 for c in run['cases'].values() if c['status'] == 'ok')
+        print(f"[{index}] {run['run_id']}  {run.get('label') or ''}  "
+              f"({ok}/{len(run['cases'])} cas, commit {run['environment'].get('git_commit')})")
+    return 0
+
+
+def command_compare(args):
+    history = load_history(args.history)
+    if len(history['runs']) < 2 and (args.base is None or args.head is None):
+        raise SystemExit("❌ Il faut au moins deux runs dans l'historique")
+    base = select_run(history, args.base if args.base is not None else -2)
+    head = select_run(history, args.head if args.head is not None else -1)
+    rows = compare_runs(base, head, perf_threshold=args.threshold,
+                        accuracy_threshold=args.accuracy_threshold)
+    print_comparison(base, head, rows)
+    regressions = [r for r in rows if r['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) détectée(s)")
+        return 1
+    print("\n✅ Aucune régression")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks ShelfReader P1 (CPU uniquement)")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="Fichier d'historique JSON")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Exécute la suite et l'ajoute à l'historique")
+    run_parser.add_argument('--engines', nargs='*', default=list(ENGINES), choices=ENGINES)
+    run_parser.add_argument('--spine-methods', nargs='*', default=list(SPINE_METHODS), choices=SPINE_METHODS)
+    run_parser.add_argument('--images-dir', default=DEFAULT_IMAGES_DIR)
+    run_parser.add_argument('--no-real', action='store_true', help="Ignorer les images réelles")
+    run_parser.add_argument('--synthetic', type=int, default=5, help="Nombre d'étagères synthétiques")
+    run_parser.add_argument('--spines', type=int, default=12, help="Dos par rangée synthétique")
+    run_parser.add_argument('--rows', type=int, default=1, help="Rangées par étagère synthétique")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeat', type=int, default=3, help="Mesures par image")
+    run_parser.add_argument('--warmup', type=int, default=1, help="Appels de chauffe non mesurés")
+    run_parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE)
+    run_parser.add_argument('--label', default=None, help="Libellé libre du run")
+    run_parser.add_argument('--in-process', action='store_true',
+                            help="Ne pas isoler les cas dans des processus séparés (debug)")
+    run_parser.set_defaults(func=command_run)
+
+    list_parser = subparsers.add_parser('list', help="Liste les runs de l'historique")
+    list_parser.set_defaults(func=command_list)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare deux runs et signale les régressions")
+    compare_parser.add_argument('base', nargs='?', default=None, help="Run de référence (id ou index, défaut -2)")
+    compare_parser.add_argument('head', nargs='?', default=None, help="Run candidat (id ou index, défaut -1)")
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Dégradation relative tolérée (latence, débit, mémoire)")
+    compare_parser.add_argument('--accuracy-threshold', type=float, default=0.02,
+                                help="Baisse absolue tolérée des métriques de précision")
+    compare_parser.set_defaults(func=command_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
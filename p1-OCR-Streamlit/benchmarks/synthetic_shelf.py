@@ -0,0 +1,234 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun
+#   - Importe: PIL, numpy, random, math
+#   - Utilisé par: benchmarks/run_benchmarks.py, tests/test_benchmarks.py
+
+"""
+ShelfReader - Synthetic Shelf
+Génère des étagères synthétiques avec vérité terrain (titres, orientations, inclinaisons).
+
+Chaque dos est un polygone coloré portant son titre écrit verticalement
+(de bas en haut ou de haut en bas), éventuellement incliné de quelques degrés.
+La génération est déterministe pour une graine donnée.
+"""
+
+import math
+import random
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Titres du domaine public utilisés pour les dos synthétiques
+TITLES = [
+    "MOBY DICK", "PRIDE AND PREJUDICE", "DRACULA", "FRANKENSTEIN", "EMMA",
+    "ULYSSES", "WALDEN", "THE ODYSSEY", "JANE EYRE", "MIDDLEMARCH",
+    "LES MISERABLES", "CANDIDE", "THE IDIOT", "PERSUASION", "BEOWULF",
+    "THE TIME MACHINE", "GREAT EXPECTATIONS", "WAR AND PEACE", "DON QUIXOTE",
+    "THE JUNGLE BOOK", "LITTLE WOMEN", "HEART OF DARKNESS", "THE ILIAD",
+    "TREASURE ISLAND", "KIDNAPPED", "NORTH AND SOUTH", "CRIME AND PUNISHMENT",
+    "ANNA KARENINA", "MADAME BOVARY", "THE RAVEN"
+]
+
+ORIENTATIONS = ('bottom_to_top', 'top_to_bottom')
+
+# Paramètres par défaut
+DEFAULT_WIDTH = 1600
+DEFAULT_ROW_HEIGHT = 700
+DEFAULT_NUM_SPINES = 12
+DEFAULT_MAX_SLANT = 4.0  # degrés
+FONT_NAMES = ('DejaVuSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf')
+
+
+def _load_font(size):
+    for name in FONT_NAMES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size)
+
+
+def _rotate_point(x, y, cx, cy, angle_deg):
+    """Rotation d'un point autour de (cx, cy), angle en degrés (sens horaire à l'écran)."""
+    a = math.radians(angle_deg)
+    dx, dy = x - cx, y - cy
+    return (cx + dx * math.cos(a) - dy * math.sin(a),
+            cy + dx * math.sin(a) + dy * math.cos(a))
+
+
+def _contrasting_color(rng, background):
+    luminance = 0.299 * background[0] + 0.587 * background[1] + 0.114 * background[2]
+    if luminance > 128:
+        return tuple(rng.randint(0, 50) for _ in range(3))
+    return tuple(rng.randint(215, 255) for _ in range(3))
+
+
+def _render_title(title, spine_width, spine_height, orientation, text_color):
+    """Rend le titre horizontalement puis le tourne pour l'écrire le long du dos."""
+    font_size = max(10, int(spine_width * 0.55))
+    font = _load_font(font_size)
+    left, top, right, bottom = font.getbbox(title)
+    text_w, text_h = right - left, bottom - top
+
+    # Réduire la police si le titre dépasse la hauteur du dos
+    max_len = spine_height * 0.85
+    if text_w > max_len:
+        font_size = max(8, int(font_size * max_len / text_w))
+        font = _load_font(font_size)
+        left, top, right, bottom = font.getbbox(title)
+        text_w, text_h = right - left, bottom - top
+
+    patch = Image.new('L', (text_w + 4, text_h + 4), 0)
+    ImageDraw.Draw(patch).text((2 - left, 2 - top), title, font=font, fill=255)
+    angle = 90 if orientation == 'bottom_to_top' else -90
+    mask = patch.rotate(angle, expand=True)
+    color = Image.new('RGB', mask.size, text_color)
+    return color, mask
+
+
+def generate_shelf(num_spines=DEFAULT_NUM_SPINES, seed=0, width=DEFAULT_WIDTH,
+                   row_height=DEFAULT_ROW_HEIGHT, rows=1, max_slant=DEFAULT_MAX_SLANT,
+                   slant_probability=0.3):
+    """
+    Génère une étagère synthétique.
+
+    Args:
+        num_spines: Nombre de dos par rangée
+        seed: Graine du générateur (même graine = même image)
+        width: Largeur de l'image en pixels
+        row_height: Hauteur d'une rangée en pixels
+        rows: Nombre de rangées (séparées par une planche)
+        max_slant: Inclinaison maximale des dos en degrés
+        slant_probability: Proportion de dos inclinés
+
+    Returns:
+        tuple: (image BGR numpy, vérité terrain)
+            vérité terrain = {'spines': [...], 'rows': [[y0, y1], ...], 'seed': seed}
+            chaque dos = {'title', 'orientation', 'slant', 'row', 'polygon', 'x_range'}
+    """
+    rng = random.Random(seed)
+    board = max(12, row_height // 25)
+    height = rows * row_height + (rows + 1) * board
+    image = Image.new('RGB', (width, height), (rng.randint(60, 90),) * 3)
+    draw = ImageDraw.Draw(image)
+
+    titles = list(TITLES)
+    rng.shuffle(titles)
+    spines = []
+    row_ranges = []
+
+    for row in range(rows):
+        y0 = board + row * (row_height + board)
+        y1 = y0 + row_height
+        row_ranges.append([y0, y1])
+
+        # Fond de rangée et planche
+        draw.rectangle([0, y0, width, y1], fill=tuple(rng.randint(25, 45) for _ in range(3)))
+        draw.rectangle([0, y1, width, y1 + board], fill=(120, 85, 50))
+
+        # Largeurs des dos réparties sur la rangée, avec de petits espaces
+        margin = width * 0.03
+        usable = width - 2 * margin
+        weights = [rng.uniform(0.7, 1.3) for _ in range(num_spines)]
+        gap = max(2, int(usable * 0.004))
+        unit = (usable - gap * (num_spines - 1)) / sum(weights)
+        x = margin
+
+        for i in range(num_spines):
+            spine_w = weights[i] * unit
+            spine_h = row_height * rng.uniform(0.72, 0.95)
+            slant = rng.uniform(-max_slant, max_slant) if rng.random() < slant_probability else 0.0
+            orientation = rng.choice(ORIENTATIONS)
+            title = titles[(row * num_spines + i) % len(titles)]
+            background = tuple(rng.randint(30, 230) for _ in range(3))
+
+            # Rectangle droit, pivoté autour du bas du dos
+            pivot = (x + spine_w / 2, y1)
+            corners = [(x, y1 - spine_h), (x + spine_w, y1 - spine_h), (x + spine_w, y1), (x, y1)]
+            polygon = [_rotate_point(px, py, pivot[0], pivot[1], slant) for px, py in corners]
+            draw.polygon(polygon, fill=background)
+
+            # Titre centré sur le dos, incliné comme lui
+            color, mask = _render_title(title, spine_w, spine_h, orientation,
+                                        _contrasting_color(rng, background))
+            if slant:
+                color = color.rotate(-slant, expand=True)
+                mask = mask.rotate(-slant, expand=True)
+            cx, cy = _rotate_point(x + spine_w / 2, y1 - spine_h / 2, pivot[0], pivot[1], slant)
+            image.paste(color, (int(cx - mask.width / 2), int(cy - mask.height / 2)), mask)
+
+            xs = [p[0] for p in polygon]
+            spines.append({
+                'title': title,
+                'orientation': orientation,
+                'slant': slant,
+                'row': row,
+                'polygon': [[round(px, 1), round(py, 1)] for px, py in polygon],
+                'x_range': [min(xs), max(xs)]
+            })
+            x += spine_w + gap
+
+    bgr = np.ascontiguousarray(np.array(image)[:, :, ::-1])
+    return bgr, {'spines': spines, 'rows': row_ranges, 'seed': seed}
+
+
+def _edge_x(top, bottom, y):
+    """Abscisse d'une arête de polygone (top -> bottom) à l'ordonnée y."""
+    if bottom[1] == top[1]:
+        return top[0]
+    t = (y - top[1]) / (bottom[1] - top[1])
+    return top[0] + t * (bottom[0] - top[0])
+
+
+def spine_boundaries(ground_truth):
+    """
+    Abscisses des séparations entre dos voisins, mesurées dans chaque rangée
+    à une hauteur traversée par tous les dos (35% de la rangée depuis le bas).
+
+    Returns:
+        list: [(rangée, y, x)] pour chaque paire de dos adjacents
+    """
+    boundaries = []
+    for row, (y0, y1) in enumerate(ground_truth['rows']):
+        y = y1 - 0.35 * (y1 - y0)
+        row_spines = [s for s in ground_truth['spines'] if s['row'] == row]
+        row_spines.sort(key=lambda s: s['x_range'][0])
+        for left, right in zip(row_spines, row_spines[1:]):
+            # Polygone: [haut-gauche, haut-droit, bas-droit, bas-gauche]
+            left_edge = _edge_x(left['polygon'][1], left['polygon'][2], y)
+            right_edge = _edge_x(right['polygon'][0], right['polygon'][3], y)
+            boundaries.append((row, y, (left_edge + right_edge) / 2))
+    return boundaries
+
+
+def generate_dataset(count, seed=0, **kwargs):
+    """Génère `count` étagères déterministes: [(nom, image, vérité terrain)]."""
+    dataset = []
+    for i in range(count):
+        image, truth = generate_shelf(seed=seed + i, **kwargs)
+        dataset.append((f"synthetic_{seed + i:03d}", image, truth))
+    return dataset
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    import os
+
+    import cv2
+
+    parser = argparse.ArgumentParser(description="Génère des étagères synthétiques avec vérité terrain")
+    parser.add_argument('output_dir', help="Dossier de sortie (PNG + JSON)")
+    parser.add_argument('--count', type=int, default=5)
+    parser.add_argument('--spines', type=int, default=DEFAULT_NUM_SPINES)
+    parser.add_argument('--rows', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name, image, truth in generate_dataset(args.count, seed=args.seed,
+                                               num_spines=args.spines, rows=args.rows):
+        cv2.imwrite(os.path.join(args.output_dir, f"{name}.png"), image)
+        with open(os.path.join(args.output_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(truth, f, indent=2)
+        print(f"✅ {name}: {len(truth['spines'])} dos")
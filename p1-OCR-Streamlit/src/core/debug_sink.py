@@ -0,0 +1,269 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun
+#   - Importe: abc, cv2, numpy, threading, concurrent.futures, json, time
+#   - Utilisé par: engines/easyocr/detection/spine_detection.py, engines/easyocr/main.py
+
+"""
+ShelfReader - Debug Sink
+Collecte des images intermédiaires et des temps par étape, sans affichage bloquant.
+
+Remplace les appels cv2.imshow/cv2.waitKey(0) en mode debug : les images sont
+encodées en PNG compressé dans un thread de fond puis écrites sur disque
+(DiskDebugSink) ou gardées en mémoire (MemoryDebugSink). L'échantillonnage
+(1 image sur N) borne le surcoût sur les workers de production.
+"""
+
+import abc
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# Paramètres par défaut
+DEFAULT_SAMPLE_EVERY = 1
+DEFAULT_PNG_COMPRESSION = 3  # 0-9, 3 = bon compromis vitesse/taille
+DEFAULT_MEMORY_CAPACITY = 32  # Nombre de sessions gardées par MemoryDebugSink
+
+
+def to_displayable(img):
+    """Convertit une image intermédiaire (float, labels...) en uint8 affichable."""
+    if img is None:
+        return None
+    img = np.asarray(img)
+    if img.dtype == np.uint8:
+        return img
+    if img.dtype == bool:
+        return img.astype(np.uint8) * 255
+    img = img.astype(np.float32)
+    min_val, max_val = float(img.min()), float(img.max())
+    if max_val - min_val <= 0:
+        return np.zeros(img.shape, dtype=np.uint8)
+    return ((img - min_val) / (max_val - min_val) * 255).astype(np.uint8)
+
+
+class DebugSession:
+    """Enregistrement des étapes d'une image (images + temps)."""
+
+    def __init__(self, sink, image_id):
+        self.sink = sink
+        self.image_id = image_id
+        self.stages = []  # [(index, nom, durée en secondes)]
+        self._last = time.perf_counter()
+        self._start = self._last
+
+    def stage(self, name, image=None, elapsed=None):
+        """
+        Enregistre une étape.
+
+        Args:
+            name: Nom de l'étape (ex: 'downsampled', 'sobel')
+            image: Image intermédiaire (copiée avant l'encodage asynchrone)
+            elapsed: Durée de l'étape en secondes (défaut: temps depuis l'étape précédente)
+        """
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._last
+
+        index = len(self.stages)
+        self.stages.append((index, name, elapsed))
+        if image is not None:
+            self.sink._submit_image(self.image_id, index, name, np.array(image, copy=True))
+        # La copie de l'image n'est pas comptée dans l'étape suivante
+        self._last = time.perf_counter()
+
+    def timings(self):
+        """Retourne les temps par étape sous forme de dictionnaire."""
+        return {
+            'image_id': self.image_id,
+            'total': time.perf_counter() - self._start,
+            'stages': [{'name': name, 'seconds': seconds} for _, name, seconds in self.stages]
+        }
+
+    def close(self):
+        """Termine la session et transmet les temps au sink."""
+        self.sink._submit_timings(self.image_id, self.timings())
+
+
+class DebugSink(abc.ABC):
+    """
+    Interface de base des sinks de debug.
+
+    Le thread d'encodage n'est créé qu'à la première image soumise.
+
+    Args:
+        sample_every: N pour échantillonner 1 image sur N (1 = toutes)
+        compression: Niveau de compression PNG (0-9)
+    """
+
+    def __init__(self, sample_every=DEFAULT_SAMPLE_EVERY, compression=DEFAULT_PNG_COMPRESSION):
+        self.sample_every = max(1, int(sample_every))
+        self.compression = compression
+        self._counter = itertools.count()
+        self._executor = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def start(self, image_id=None):
+        """
+        Démarre une session pour une image si elle est échantillonnée.
+
+        Returns:
+            DebugSession ou None si l'image n'est pas retenue
+        """
+        index = next(self._counter)
+        if index % self.sample_every != 0:
+            return None
+        if image_id is None:
+            image_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{index:06d}"
+        return DebugSession(self, image_id)
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='debug-sink')
+            future = self._executor.submit(fn, *args)
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+
+    def _submit_image(self, image_id, index, name, image):
+        self._submit(self._encode_and_write, image_id, index, name, image)
+
+    def _submit_timings(self, image_id, timings):
+        self._submit(self.write_timings, image_id, timings)
+
+    def _encode_and_write(self, image_id, index, name, image):
+        ok, buffer = cv2.imencode('.png', to_displayable(image),
+                                  [cv2.IMWRITE_PNG_COMPRESSION, self.compression])
+        if ok:
+            self.write_image(image_id, index, name, buffer.tobytes())
+
+    @abc.abstractmethod
+    def write_image(self, image_id, index, name, png_bytes):
+        """Stocke une image PNG encodée."""
+
+    @abc.abstractmethod
+    def write_timings(self, image_id, timings):
+        """Stocke les temps d'une session."""
+
+    def flush(self):
+        """Attend la fin des écritures en cours."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self):
+        """Vide la file d'écriture et arrête le thread de fond."""
+        self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class DiskDebugSink(DebugSink):
+    """Écrit les étapes dans <output_dir>/<image_id>/NN_<étape>.png + timings.json."""
+
+    def __init__(self, output_dir, sample_every=DEFAULT_SAMPLE_EVERY, compression=DEFAULT_PNG_COMPRESSION):
+        super().__init__(sample_every=sample_every, compression=compression)
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _session_dir(self, image_id):
+        path = os.path.join(self.output_dir, str(image_id))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def write_image(self, image_id, index, name, png_bytes):
+        path = os.path.join(self._session_dir(image_id), f"{index:02d}_{name}.png")
+        with open(path, 'wb') as f:
+            f.write(png_bytes)
+
+    def write_timings(self, image_id, timings):
+        path = os.path.join(self._session_dir(image_id), 'timings.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(timings, f, indent=2)
+
+
+class MemoryDebugSink(DebugSink):
+    """
+    Garde les dernières sessions en mémoire (PNG encodés + temps).
+
+    Les sessions sont écrites par le thread d'encodage: les lire avec session(),
+    qui en renvoie une copie.
+    """
+
+    def __init__(self, sample_every=DEFAULT_SAMPLE_EVERY, compression=DEFAULT_PNG_COMPRESSION,
+                 capacity=DEFAULT_MEMORY_CAPACITY):
+        super().__init__(sample_every=sample_every, compression=compression)
+        self.sessions = {}
+        self._order = deque()
+        self._sessions_lock = threading.Lock()
+        self.capacity = capacity
+
+    def session(self, image_id):
+        """Copie d'une session ({'images': {...}, 'timings': ...}), ou None si inconnue ou évincée."""
+        with self._sessions_lock:
+            session = self.sessions.get(image_id)
+            if session is None:
+                return None
+            return {'images': dict(session['images']), 'timings': session['timings']}
+
+    def _session(self, image_id):
+        if image_id not in self.sessions:
+            self.sessions[image_id] = {'images': {}, 'timings': None}
+            self._order.append(image_id)
+            while len(self._order) > self.capacity:
+                self.sessions.pop(self._order.popleft(), None)
+        return self.sessions[image_id]
+
+    def write_image(self, image_id, index, name, png_bytes):
+        with self._sessions_lock:
+            self._session(image_id)['images'][f"{index:02d}_{name}"] = png_bytes
+
+    def write_timings(self, image_id, timings):
+        with self._sessions_lock:
+            self._session(image_id)['timings'] = timings
+
+
+class InteractiveDebugSink(DebugSink):
+    """Affichage interactif historique (cv2.imshow + waitKey), réservé au poste local."""
+
+    def start(self, image_id=None):
+        return InteractiveDebugSession(self, image_id or 'interactive')
+
+    def write_image(self, image_id, index, name, png_bytes):
+        """Rien à stocker: les étapes sont affichées directement, jamais encodées."""
+
+    def write_timings(self, image_id, timings):
+        for stage in timings['stages']:
+            print(f"⏱️ {stage['name']}: {stage['seconds'] * 1000:.1f} ms")
+
+
+class InteractiveDebugSession(DebugSession):
+    """Session affichant chaque étape dans une fenêtre OpenCV."""
+
+    def stage(self, name, image=None, elapsed=None):
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._last
+        self.stages.append((len(self.stages), name, elapsed))
+        if image is not None:
+            cv2.imshow(name, to_displayable(image))
+            cv2.waitKey(0)
+        # Le temps passé devant la fenêtre ne compte pas dans l'étape suivante
+        self._last = time.perf_counter()
+
+    def close(self):
+        self.sink.write_timings(self.image_id, self.timings())
+
+
+def has_display():
+    """Indique si une fenêtre OpenCV peut être ouverte (poste avec écran)."""
+    if os.name == 'nt':
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
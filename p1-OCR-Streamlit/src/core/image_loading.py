@@ -0,0 +1,164 @@
+# DÉPENDANCES:
+#   - Utilise: core/resolution.py
+#   - Importe: PIL, numpy, cv2, io
+#   - Utilisé par: frontend/utils/ocr_processing.py, frontend/components/visualization.py,
+#                  frontend/app_pages/analysis_page.py, engines/*/logic/orchestrator.py
+
+"""
+ShelfReader - Image Loading
+Décodage unique des images: réduction JPEG dans le domaine DCT, orientation EXIF,
+tableau BGR/gris contigu partagé entre les moteurs OCR et la visualisation.
+
+Pour un JPEG, PIL `draft()` demande au décodeur une réduction 1/2, 1/4 ou 1/8
+pendant la décompression: une photo de 48 MP destinée à une détection à 2048 px
+n'est jamais décodée en pleine résolution.
+"""
+
+import io
+import math
+
+import cv2
+import numpy as np
+from PIL import Image, ImageOps
+
+from core.resolution import ScaledImage, capped_scale
+
+# Formats pour lesquels PIL sait réduire pendant le décodage
+DRAFT_FORMATS = ('JPEG', 'MPO')
+
+
+class LoadedImage:
+    """
+    Image décodée une seule fois, partagée par l'OCR et la visualisation.
+
+    Attributs:
+        bgr: Tableau BGR uint8 contigu (ou gris si chargé en mode 'gray')
+        scale: Taille décodée / taille d'origine (après orientation EXIF), <= 1
+        original_size: (largeur, hauteur) de l'image d'origine orientée
+        source: Chemin ou description de la source
+    """
+
+    def __init__(self, array, scale, original_size, source=None):
+        self.bgr = array
+        self.scale = scale
+        self.original_size = original_size
+        self.source = source
+        self._gray = array if array.ndim == 2 else None
+
+    @property
+    def shape(self):
+        return self.bgr.shape
+
+    @property
+    def gray(self):
+        """Version niveaux de gris (calculée une fois)."""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def rgb(self):
+        """Copie RGB (affichage Streamlit / PIL)."""
+        if self.bgr.ndim == 2:
+            return cv2.cvtColor(self.bgr, cv2.COLOR_GRAY2RGB)
+        return cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB)
+
+    def to_pil(self):
+        return Image.fromarray(self.rgb())
+
+    def frame(self):
+        """Repère du buffer décodé, pour ramener boîtes et lignes à l'image d'origine."""
+        original_shape = (self.original_size[1], self.original_size[0]) + self.bgr.shape[2:]
+        return ScaledImage(self.bgr, self.scale, original_shape)
+
+    def boxes_to_original(self, boxes):
+        """Boîtes exprimées dans le buffer décodé -> repère de l'image d'origine."""
+        frame = self.frame()
+        return [frame.box_to_original(box) for box in boxes]
+
+    def boxes_from_original(self, boxes):
+        """Boîtes de l'image d'origine -> repère du buffer décodé (dessin)."""
+        if self.scale == 1.0:
+            return boxes
+        scaled = []
+        for box in boxes:
+            box = dict(box)
+            for key in ('x', 'y', 'width', 'height', 'font_size'):
+                if key in box:
+                    box[key] = box[key] * self.scale
+            scaled.append(box)
+        return scaled
+
+
+def _open(source):
+    if isinstance(source, Image.Image):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Image.open(io.BytesIO(source))
+    return Image.open(source)
+
+
+def _flatten_alpha(pil_image):
+    """Compose les images transparentes sur fond blanc (comme l'upload Streamlit)."""
+    if pil_image.mode == 'P' and 'transparency' in pil_image.info:
+        pil_image = pil_image.convert('RGBA')
+    if pil_image.mode in ('RGBA', 'LA'):
+        background = Image.new('RGB', pil_image.size, (255, 255, 255))
+        background.paste(pil_image.convert('RGBA'), mask=pil_image.getchannel('A'))
+        return background
+    return pil_image
+
+
+def load_image(source, max_edge=None, mode='bgr'):
+    """
+    Décode une image une seule fois.
+
+    Args:
+        source: Chemin, fichier ouvert, bytes ou PIL.Image
+        max_edge: Limite nécessaire en aval (ResolutionPolicy.decode_edge(), voir capped_scale);
+            autorise la réduction JPEG pendant le décodage. None = pleine résolution.
+        mode: 'bgr' (défaut) ou 'gray'
+
+    Returns:
+        LoadedImage
+    """
+    pil_image = _open(source)
+    stored_size = pil_image.size
+    transposed = pil_image.getexif().get(0x0112, 1) in (5, 6, 7, 8)
+    original_size = (stored_size[1], stored_size[0]) if transposed else stored_size
+
+    # Réduction DCT: le décodeur choisit la plus petite échelle >= taille demandée
+    # (même limite que la politique de résolution, panoramas compris)
+    ratio = capped_scale(stored_size, max_edge)
+    if pil_image.format in DRAFT_FORMATS and ratio < 1.0:
+        requested = (max(1, math.ceil(stored_size[0] * ratio)), max(1, math.ceil(stored_size[1] * ratio)))
+        pil_image.draft('L' if mode == 'gray' else 'RGB', requested)
+
+    # Orientation EXIF appliquée une seule fois (le tag est retiré ensuite)
+    pil_image = ImageOps.exif_transpose(pil_image)
+    pil_image = _flatten_alpha(pil_image)
+
+    if mode == 'gray':
+        array = np.asarray(pil_image.convert('L'))
+    else:
+        rgb = np.asarray(pil_image.convert('RGB'))
+        # cvtColor produit directement un tableau contigu
+        array = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+    scale = array.shape[1] / float(original_size[0])
+    return LoadedImage(np.ascontiguousarray(array), scale, original_size,
+                       source=source if isinstance(source, str) else None)
+
+
+def to_bgr(image):
+    """
+    Normalise l'entrée d'un moteur en tableau BGR uint8.
+
+    Accepte un tableau numpy (supposé BGR, ou gris), une LoadedImage ou une PIL.Image.
+    """
+    if isinstance(image, LoadedImage):
+        image = image.bgr
+    if isinstance(image, np.ndarray):
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+    return cv2.cvtColor(np.asarray(_flatten_alpha(image).convert('RGB')), cv2.COLOR_RGB2BGR)
@@ -0,0 +1,291 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun
+#   - Importe: contextvars, threading, time, json, os
+#   - Utilisé par: engines/*/logic/orchestrator.py, engines/easyocr/detection/spine_detection.py,
+#                  services/openlibrary_client.py, services/async_openlibrary_client.py, services/cover_cache.py,
+#                  frontend/utils/ocr_processing.py
+
+"""
+ShelfReader - Instrumentation
+Spans imbriqués et compteurs par requête, exportables en JSON, Chrome trace et Prometheus.
+
+Usage:
+    with tracer.request('EasyOCR') as trace:
+        with span('easyocr.detection'):
+            ...
+        count('openlibrary.http_requests')
+    trace.to_chrome_trace()
+
+Hors d'une requête active (ou si le tracer est désactivé), span() renvoie un
+context manager vide partagé et count() ne fait rien : le coût est négligeable.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_current_trace = contextvars.ContextVar('shelfreader_trace', default=None)
+_current_span = contextvars.ContextVar('shelfreader_span', default=None)
+
+
+class _NullSpan:
+    """Span vide utilisé quand l'instrumentation est inactive."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Intervalle de temps nommé, rattaché à un span parent."""
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attrs', 'start', 'end', 'thread_id', '_token')
+
+    def __init__(self, trace, name, parent_id, attrs):
+        self.trace = trace
+        self.span_id = trace._next_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.end = None
+        self.thread_id = threading.get_ident()
+        self._token = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.trace._add(self)
+        return False
+
+    def set(self, **attrs):
+        """Ajoute des attributs au span (ex: nombre de boîtes)."""
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+
+class Trace:
+    """Ensemble des spans et compteurs d'une requête."""
+
+    def __init__(self, name, attrs=None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.spans = []
+        self.counters = defaultdict(float)
+        self.origin = time.perf_counter()
+        self.wall_start = time.time()
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def _next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def _add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def stage_totals(self):
+        """Temps cumulé et nombre d'appels par nom de span."""
+        totals = defaultdict(lambda: [0.0, 0])
+        for s in self.spans:
+            totals[s.name][0] += s.duration
+            totals[s.name][1] += 1
+        return {name: {'seconds': seconds, 'count': calls} for name, (seconds, calls) in totals.items()}
+
+    def to_dict(self):
+        """Export JSON-compatible (temps relatifs au début de la requête, en secondes)."""
+        spans = sorted(self.spans, key=lambda s: s.start)
+        return {
+            'name': self.name,
+            'attrs': self.attrs,
+            'started_at': self.wall_start,
+            'spans': [
+                {
+                    'id': s.span_id,
+                    'parent': s.parent_id,
+                    'name': s.name,
+                    'start': s.start - self.origin,
+                    'duration': s.duration,
+                    'thread': s.thread_id,
+                    'attrs': s.attrs
+                }
+                for s in spans
+            ],
+            'counters': dict(self.counters)
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), default=str, **kwargs)
+
+    def to_chrome_trace(self):
+        """Export au format Chrome trace-event (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = []
+        for s in sorted(self.spans, key=lambda s: s.start):
+            events.append({
+                'name': s.name,
+                'cat': s.name.split('.')[0],
+                'ph': 'X',
+                'ts': (s.start - self.origin) * 1e6,
+                'dur': s.duration * 1e6,
+                'pid': pid,
+                'tid': s.thread_id,
+                'args': {k: str(v) for k, v in s.attrs.items()}
+            })
+        end_ts = max((e['ts'] + e['dur'] for e in events), default=0.0)
+        for name, value in self.counters.items():
+            events.append({'name': name, 'ph': 'C', 'ts': end_ts, 'pid': pid, 'args': {'value': value}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'request': self.name}}
+
+    def to_prometheus(self, prefix='shelfreader'):
+        """Export au format texte Prometheus pour cette requête."""
+        return format_prometheus(self.stage_totals(), dict(self.counters), prefix)
+
+
+def _metric_name(name):
+    return ''.join(c if c.isalnum() else '_' for c in name)
+
+
+def format_prometheus(stage_totals, counters, prefix='shelfreader'):
+    """Formate des totaux par étape et des compteurs en texte Prometheus."""
+    lines = [
+        f'# HELP {prefix}_stage_seconds Temps passé par étape du pipeline OCR.',
+        f'# TYPE {prefix}_stage_seconds summary'
+    ]
+    for stage, total in sorted(stage_totals.items()):
+        lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {total["seconds"]:.6f}')
+        lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {total["count"]}')
+    for name, value in sorted(counters.items()):
+        metric = f'{prefix}_{_metric_name(name)}_total'
+        lines.append(f'# TYPE {metric} counter')
+        lines.append(f'{metric} {value:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class Tracer:
+    """
+    Point d'entrée de l'instrumentation.
+
+    Activé par la variable d'environnement SHELFREADER_TRACE=1, par enable(),
+    ou ponctuellement via tracer.request(..., enabled=True).
+    """
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get('SHELFREADER_TRACE', '') not in ('', '0', 'false')
+        self.enabled = enabled
+        self._totals = defaultdict(lambda: {'seconds': 0.0, 'count': 0})
+        self._counters = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    @contextmanager
+    def request(self, name, enabled=None, **attrs):
+        """
+        Ouvre une trace pour une requête (ou un span si une trace est déjà active).
+
+        Yields:
+            Trace active, ou None si l'instrumentation est désactivée
+        """
+        current = _current_trace.get()
+        if current is not None:
+            with self.span(name, **attrs):
+                yield current
+            return
+
+        if not (self.enabled if enabled is None else enabled):
+            yield None
+            return
+
+        trace = Trace(name, attrs)
+        token = _current_trace.set(trace)
+        try:
+            with self.span(name, **attrs):
+                yield trace
+        finally:
+            _current_trace.reset(token)
+            self._accumulate(trace)
+
+    def span(self, name, **attrs):
+        """Context manager mesurant une étape de la requête courante."""
+        trace = _current_trace.get()
+        if trace is None:
+            return NULL_SPAN
+        parent = _current_span.get()
+        return Span(trace, name, parent.span_id if parent else None, attrs)
+
+    def count(self, name, value=1):
+        """Incrémente un compteur de la requête courante."""
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.count(name, value)
+
+    def current_trace(self):
+        return _current_trace.get()
+
+    def wrap(self, fn):
+        """
+        Rattache fn au contexte courant (trace + span parent) pour l'exécuter
+        dans un autre thread (ThreadPoolExecutor ne propage pas les contextvars).
+        """
+        if _current_trace.get() is None:
+            return fn
+        context = contextvars.copy_context()
+
+        def wrapped(*args, **kwargs):
+            return context.copy().run(fn, *args, **kwargs)
+        return wrapped
+
+    def _accumulate(self, trace):
+        with self._lock:
+            for stage, total in trace.stage_totals().items():
+                self._totals[stage]['seconds'] += total['seconds']
+                self._totals[stage]['count'] += total['count']
+            for name, value in trace.counters.items():
+                self._counters[name] += value
+
+    def prometheus_text(self, prefix='shelfreader'):
+        """Totaux cumulés depuis le démarrage du processus, au format Prometheus."""
+        with self._lock:
+            return format_prometheus(dict(self._totals), dict(self._counters), prefix)
+
+
+# Instance globale partagée par tous les moteurs
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
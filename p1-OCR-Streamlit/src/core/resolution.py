@@ -0,0 +1,217 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun
+#   - Importe: cv2, numpy, copy
+#   - Utilisé par: engines/*/logic/orchestrator.py, engines/*/main.py, frontend/utils/ocr_processing.py,
+#                  core/image_loading.py
+
+"""
+ShelfReader - Resolution Policy
+Réduction de l'image avant détection et remappage des coordonnées vers l'image d'origine.
+
+Les photos de téléphone (12-48 MP) sont ramenées à un grand côté maximal pour la
+détection (latence et mémoire prévisibles). Les panoramas (rapport des côtés
+supérieur à PANORAMA_ASPECT) sont limités sur leur petit côté: réduits au grand
+côté, les titres deviendraient illisibles; leur longueur est laissée au
+découpage en tuiles (core/tiling.py). La reconnaissance peut utiliser une
+résolution plus élevée, limitée aux zones détectées. Toutes les boîtes et lignes
+retournées par les moteurs sont exprimées dans le repère de l'image d'origine.
+"""
+
+import copy
+
+import cv2
+import numpy as np
+
+# Paramètres par défaut
+DEFAULT_MAX_DETECT_EDGE = 2048  # Grand côté maximal pour la détection (pixels)
+DEFAULT_MAX_RECOGNITION_EDGE = None  # None = même image que la détection, 0 = pleine résolution
+PANORAMA_ASPECT = 2.0  # Au-delà (grand côté / petit côté), la limite porte sur le petit côté
+
+
+def capped_scale(shape, max_edge):
+    """
+    Facteur de réduction (<= 1) pour une limite max_edge.
+
+    Le grand côté tient dans max_edge; pour un panorama, le petit côté tient dans
+    max_edge / PANORAMA_ASPECT (même résolution verticale qu'une image au rapport
+    limite) et le grand côté peut dépasser max_edge.
+    """
+    if not max_edge:
+        return 1.0
+    long_edge, short_edge = max(shape[0], shape[1]), min(shape[0], shape[1])
+    if long_edge > PANORAMA_ASPECT * short_edge:
+        return min(1.0, max_edge / (PANORAMA_ASPECT * short_edge))
+    return min(1.0, max_edge / float(long_edge))
+
+
+class ScaledImage:
+    """
+    Image redimensionnée et facteur d'échelle par rapport à l'original.
+
+    Attributs:
+        image: Image redimensionnée (numpy array)
+        scale: Facteur appliqué (taille redimensionnée = taille originale * scale)
+        original_shape: Forme de l'image d'origine
+    """
+
+    def __init__(self, image, scale, original_shape):
+        self.image = image
+        self.scale = scale
+        self.original_shape = original_shape
+
+    @property
+    def is_scaled(self):
+        return self.scale != 1.0
+
+    def point_to_original(self, x, y):
+        return x / self.scale, y / self.scale
+
+    def polygon_to_original(self, points):
+        """Points [[x, y], ...] (bbox EasyOCR/Tesseract) vers le repère d'origine."""
+        if not self.is_scaled:
+            return points
+        return [[float(x) / self.scale, float(y) / self.scale] for x, y in points]
+
+    def rect_to_original(self, rect):
+        """Rectangle (x, y, w, h) vers le repère d'origine (entiers)."""
+        if not self.is_scaled:
+            return tuple(rect)
+        x, y, w, h = rect
+        return (int(round(x / self.scale)), int(round(y / self.scale)),
+                int(round(w / self.scale)), int(round(h / self.scale)))
+
+    def box_to_original(self, box):
+        """Boîte ShelfReader {'x', 'y', 'width', 'height', 'font_size', ...} vers l'origine."""
+        if not self.is_scaled:
+            return box
+        box = dict(box)
+        for key in ('x', 'y', 'width', 'height', 'font_size'):
+            if key in box:
+                box[key] = box[key] / self.scale
+        return box
+
+    def line_to_original(self, line):
+        """
+        Ligne de tranche (y = m*x + b) vers l'origine: la pente est inchangée,
+        l'ordonnée à l'origine, le centre et les bornes sont mis à l'échelle.
+        """
+        if not self.is_scaled:
+            return line
+        factor = 1.0 / self.scale
+        line = copy.copy(line)
+        line.b = line.b * factor
+        line.center = tuple(c * factor for c in line.center)
+        line.min_x, line.max_x = line.min_x * factor, line.max_x * factor
+        line.min_y, line.max_y = line.min_y * factor, line.max_y * factor
+        return line
+
+    def lines_to_original(self, lines):
+        return [self.line_to_original(line) for line in lines] if lines else lines
+
+    def rect_from(self, other, rect):
+        """Convertit un rectangle exprimé dans le repère d'une autre ScaledImage."""
+        ratio = self.scale / other.scale
+        x, y, w, h = rect
+        return (int(round(x * ratio)), int(round(y * ratio)),
+                int(round(w * ratio)), int(round(h * ratio)))
+
+
+class ResolutionPolicy:
+    """
+    Politique de résolution des moteurs OCR.
+
+    Args:
+        max_detect_edge: Grand côté maximal pour la détection (None ou 0 = pas de réduction)
+        max_recognition_edge: Grand côté maximal pour la reconnaissance des zones
+            (None = réutiliser l'image de détection, 0 = pleine résolution)
+    """
+
+    def __init__(self, max_detect_edge=DEFAULT_MAX_DETECT_EDGE,
+                 max_recognition_edge=DEFAULT_MAX_RECOGNITION_EDGE):
+        self.max_detect_edge = max_detect_edge
+        self.max_recognition_edge = max_recognition_edge
+
+    @classmethod
+    def from_params(cls, params):
+        """Construit la politique depuis les paramètres avancés (UI / CLI)."""
+        params = params or {}
+        return cls(
+            max_detect_edge=params.get('max_detect_edge', DEFAULT_MAX_DETECT_EDGE),
+            max_recognition_edge=params.get('max_recognition_edge', DEFAULT_MAX_RECOGNITION_EDGE)
+        )
+
+    @staticmethod
+    def scale_for(shape, max_edge):
+        """Facteur de réduction (<= 1) pour la limite max_edge (voir capped_scale)."""
+        return capped_scale(shape, max_edge)
+
+    @staticmethod
+    def resize(image, scale):
+        """Redimensionne une image (INTER_AREA en réduction, sans copie si scale == 1)."""
+        if scale == 1.0:
+            return ScaledImage(image, 1.0, image.shape)
+        height, width = image.shape[:2]
+        size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        resized = cv2.resize(image, size, interpolation=interpolation)
+        # Échelle effective après arrondi (évite une dérive des coordonnées)
+        effective = size[0] / float(width)
+        return ScaledImage(resized, effective, image.shape)
+
+    def for_detection(self, image):
+        """Image de détection (réduite selon max_detect_edge, petit côté limité pour un panorama)."""
+        return self.resize(image, self.scale_for(image.shape, self.max_detect_edge))
+
+    def uses_separate_recognition(self, image):
+        """Vrai si la reconnaissance doit se faire à une résolution différente de la détection."""
+        if self.max_recognition_edge is None:
+            return False
+        return (self.scale_for(image.shape, self.max_recognition_edge)
+                != self.scale_for(image.shape, self.max_detect_edge))
+
+    def for_recognition(self, image, detection=None):
+        """Image de reconnaissance (réutilise l'image de détection si la politique le permet)."""
+        if detection is not None and not self.uses_separate_recognition(image):
+            return detection
+        if self.max_recognition_edge is None:
+            return self.for_detection(image)
+        return self.resize(image, self.scale_for(image.shape, self.max_recognition_edge))
+
+    def decode_edge(self):
+        """
+        Limite à décoder pour satisfaire la politique, à appliquer avec capped_scale
+        (None = pleine résolution nécessaire).
+        """
+        if not self.max_detect_edge or self.max_recognition_edge == 0:
+            return None
+        return max(self.max_detect_edge, self.max_recognition_edge or 0)
+
+    @classmethod
+    def from_args(cls, args):
+        """Construit la politique depuis les options de add_resolution_arguments."""
+        return cls(max_detect_edge=args.max_detect_edge, max_recognition_edge=args.max_recognition_edge)
+
+    def describe(self):
+        return {'max_detect_edge': self.max_detect_edge, 'max_recognition_edge': self.max_recognition_edge}
+
+
+def add_resolution_arguments(parser):
+    """Ajoute --max-detect-edge / --max-recognition-edge à un parser argparse."""
+    parser.add_argument('--max-detect-edge', type=int, default=DEFAULT_MAX_DETECT_EDGE,
+                        help=f'Grand côté maximal pour la détection (petit côté limité pour un panorama), 0 = pleine résolution '
+                             f'(défaut: {DEFAULT_MAX_DETECT_EDGE})')
+    parser.add_argument('--max-recognition-edge', type=int, default=DEFAULT_MAX_RECOGNITION_EDGE,
+                        help='Grand côté maximal pour la reconnaissance des zones, 0 = pleine résolution '
+                             '(défaut: même image que la détection)')
+
+
+def scale_easyocr_lists(horizontal_list, free_list, factor):
+    """
+    Met à l'échelle les listes de détection EasyOCR (reader.detect) d'un repère
+    à l'autre: horizontal_list = [[x_min, x_max, y_min, y_max]], free_list = [[[x, y] * 4]].
+    """
+    if factor == 1.0:
+        return horizontal_list, free_list
+    horizontal = [[int(round(v * factor)) for v in box] for box in horizontal_list]
+    free = [np.asarray(poly, dtype=np.float64) * factor for poly in free_list]
+    return horizontal, [poly.astype(np.int32).tolist() for poly in free]
@@ -0,0 +1,398 @@
+# DÉPENDANCES:
+#   - Utilise: core/instrumentation.py
+#   - Importe: cv2, numpy, hashlib, json, os, threading, time
+#   - Utilisé par: frontend/utils/ocr_processing.py, frontend/app_pages/analysis_page.py, services/cover_cache.py
+
+"""
+ShelfReader - Result Cache
+Cache disque des résultats OCR (boîtes, texte, enrichissement) pour les rescans.
+
+Recherche exacte sur l'empreinte SHA-256 du fichier, puis, si activée, recherche
+de quasi-doublons (même étagère photographiée à nouveau) sur une empreinte
+perceptuelle dHash 64 bits, par distance de Hamming dans un BK-tree.
+Les résultats dépendent du moteur et de ses paramètres: chaque combinaison a
+son propre index. L'empreinte des paramètres inclut CACHE_VERSION, à incrémenter
+quand un changement des moteurs modifie les résultats (les anciennes entrées ne
+sont plus retrouvées puis sont évincées).
+
+Le cache est borné: les entrées plus anciennes que max_age sont supprimées, et
+au-delà de max_entries les plus anciennes le sont aussi (l'index est alors réécrit).
+
+Disposition sur disque:
+    <cache_dir>/index.jsonl            une ligne par entrée (ajout seulement)
+    <cache_dir>/entries/ab/<clé>.json  résultats d'une entrée
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from core.instrumentation import span, count
+
+# Paramètres par défaut
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SHELFREADER_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'shelfreader', 'results')
+)
+DEFAULT_NEAR_DISTANCE = 0  # Distance de Hamming max (dHash 64 bits), 0 = recherche exacte seulement
+HASH_SIZE = 8  # dHash HASH_SIZE x HASH_SIZE bits
+CACHE_VERSION = 1  # Version des résultats: incluse dans l'empreinte des paramètres
+DEFAULT_MAX_ENTRIES = 2000  # Entrées gardées (éviction des plus anciennes au-delà)
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # Secondes avant qu'une entrée soit supprimée (None = sans limite)
+EVICTION_SLACK = 0.1  # Fraction de max_entries libérée en plus à chaque éviction (réécritures d'index groupées)
+# Paramètres sans effet sur le résultat OCR (exclus de l'empreinte des paramètres)
+VOLATILE_PARAMS = ('trace', 'use_cache', 'cache_dir', 'near_duplicate_distance')
+
+
+def content_hash(data):
+    """Empreinte SHA-256 d'un fichier (chemin) ou de bytes."""
+    digest = hashlib.sha256()
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        digest.update(data)
+    else:
+        with open(data, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    """
+    Empreinte perceptuelle par différence (dHash): signe du gradient horizontal
+    d'une vignette (hash_size + 1) x hash_size en niveaux de gris.
+
+    Args:
+        image: Tableau BGR ou niveaux de gris
+
+    Returns:
+        int: Empreinte de hash_size² bits
+    """
+    # Réduire avant la conversion en gris: quelques pixels au lieu de l'image entière
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """
+    Arbre de Burkhard-Keller sur la distance de Hamming.
+
+    Une recherche à distance d n'explore que les sous-arbres dont l'arête est
+    dans [distance - d, distance + d] (inégalité triangulaire).
+    """
+
+    def __init__(self):
+        self._root = None  # [empreinte, [valeurs], {distance: noeud}]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value_hash, value):
+        self._size += 1
+        if self._root is None:
+            self._root = [value_hash, [value], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value_hash, node[0])
+            if distance == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value_hash, [value], {}]
+                return
+            node = child
+
+    def search(self, value_hash, max_distance):
+        """Valeurs à distance <= max_distance, triées par distance: [(distance, valeur)]."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(value_hash, node[0])
+            if distance <= max_distance:
+                found.extend((distance, value) for value in node[1])
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+def params_fingerprint(engine_name, confidence, advanced_params=None, mode='batch'):
+    """
+    Empreinte stable de la version, du moteur et des paramètres qui influencent le résultat.
+
+    mode: 'batch' (get_boxes) ou 'stream' (iter_books): les deux chemins des moteurs
+    ne regroupent pas les boîtes de la même façon, leurs résultats sont séparés.
+    """
+    params = {k: v for k, v in (advanced_params or {}).items() if k not in VOLATILE_PARAMS}
+    payload = json.dumps({'version': CACHE_VERSION, 'engine': engine_name, 'confidence': confidence,
+                          'mode': mode, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _to_builtin(value):
+    """Sérialisation JSON des scalaires et tableaux numpy."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def scale_boxes(boxes, sx, sy):
+    """Met à l'échelle des boîtes {'x', 'y', 'width', 'height', ...} (quasi-doublon de taille différente)."""
+    if sx == 1.0 and sy == 1.0:
+        return boxes
+    scaled = []
+    for box in boxes:
+        box = dict(box)
+        for key in ('x', 'width'):
+            if key in box:
+                box[key] = box[key] * sx
+        for key in ('y', 'height', 'font_size'):
+            if key in box:
+                box[key] = box[key] * sy
+        scaled.append(box)
+    return scaled
+
+
+class CacheHit:
+    """
+    Résultat d'une recherche dans le cache.
+
+    Attributs:
+        key: Clé de l'entrée
+        match: 'exact' ou 'near'
+        distance: Distance de Hamming entre les dHash (0 pour une recherche exacte)
+        entry: Contenu de l'entrée ({'results', 'enriched_books', 'original_size', ...})
+    """
+
+    def __init__(self, key, match, distance, entry):
+        self.key = key
+        self.match = match
+        self.distance = distance
+        self.entry = entry
+
+
+class ResultCache:
+    """
+    Cache disque des résultats OCR.
+
+    Args:
+        cache_dir: Dossier du cache
+        near_duplicate_distance: Distance de Hamming maximale pour accepter un
+            quasi-doublon (0 = désactivé). 4-8 tolère recompression et léger recadrage.
+        max_entries: Nombre maximal d'entrées (les plus anciennes sont supprimées au-delà)
+        max_age: Durée de vie d'une entrée en secondes (None = sans limite)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, near_duplicate_distance=DEFAULT_NEAR_DISTANCE,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_age=DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.near_duplicate_distance = near_duplicate_distance
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = {}  # clé -> ligne d'index
+        self._exact = {}  # (sha256, paramètres) -> clé
+        self._trees = {}  # paramètres -> BKTree des dHash
+        os.makedirs(os.path.join(cache_dir, 'entries'), exist_ok=True)
+        self._load_index()
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.cache_dir, 'index.jsonl')
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, 'entries', key[:2], f"{key}.json")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Ligne tronquée (arrêt pendant une écriture)
+                if os.path.exists(self._entry_path(record['key'])):
+                    self._index(record)
+        with self._lock:
+            self._evict()
+
+    def _index(self, record):
+        key = record['key']
+        if key in self._entries:
+            return
+        self._entries[key] = record
+        self._exact[(record['sha256'], record['params'])] = key
+        self._trees.setdefault(record['params'], BKTree()).add(record['dhash'], key)
+
+    def _expired(self, record, now):
+        return bool(self.max_age) and now - record.get('created', 0) > self.max_age
+
+    def _evict(self):
+        """
+        Supprime les entrées expirées, puis les plus anciennes au-delà de max_entries
+        (jusqu'à EVICTION_SLACK sous la limite). Appelé avec self._lock.
+        """
+        now = time.time()
+        doomed = [key for key, record in self._entries.items() if self._expired(record, now)]
+        overflow = len(self._entries) - len(doomed) - self.max_entries
+        if self.max_entries and overflow > 0:
+            doomed_keys = set(doomed)
+            remaining = sorted((record.get('created', 0), key) for key, record in self._entries.items()
+                               if key not in doomed_keys)
+            slack = int(self.max_entries * EVICTION_SLACK)
+            doomed += [key for _, key in remaining[:overflow + slack]]
+        if not doomed:
+            return
+
+        for key in doomed:
+            del self._entries[key]
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+        count('cache.evictions', len(doomed))
+
+        # Index reconstruit (le BK-tree ne sait pas retirer une valeur) et réécrit atomiquement
+        records = list(self._entries.values())
+        self._entries, self._exact, self._trees = {}, {}, {}
+        for record in records:
+            self._index(record)
+        tmp_path = f"{self._index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+        os.replace(tmp_path, self._index_path)
+
+    @staticmethod
+    def make_key(sha256, params):
+        return hashlib.sha256(f"{sha256}:{params}".encode('utf-8')).hexdigest()[:32]
+
+    def lookup_exact(self, sha256, params):
+        """
+        Recherche exacte sur (sha256 du fichier, paramètres): aucun décodage nécessaire.
+
+        Returns:
+            CacheHit ou None
+        """
+        with self._lock:
+            key = self._exact.get((sha256, params))
+        return self._hit(key, 'exact', 0)
+
+    def lookup_near(self, image_hash, params, max_distance=None):
+        """
+        Recherche du quasi-doublon le plus proche (dHash) pour les mêmes paramètres.
+
+        Returns:
+            CacheHit ou None
+        """
+        max_distance = self.near_duplicate_distance if max_distance is None else max_distance
+        if not max_distance:
+            return None
+        with self._lock:
+            tree = self._trees.get(params)
+            candidates = tree.search(image_hash, max_distance) if tree else []
+        if not candidates:
+            return None
+        distance, key = candidates[0]
+        return self._hit(key, 'near', distance)
+
+    def _hit(self, key, match, distance):
+        if key is None:
+            return None
+        with self._lock:
+            record = self._entries.get(key)
+        if record is None or self._expired(record, time.time()):
+            return None
+        with span('cache.read', match=match):
+            entry = self._read_entry(key)
+        if entry is None:
+            return None
+        count(f'cache.{match}_hits')
+        return CacheHit(key, match, distance, entry)
+
+    def _read_entry(self, key):
+        try:
+            with open(self._entry_path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, key, entry):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Écriture atomique: jamais d'entrée à moitié écrite
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, default=_to_builtin)
+        os.replace(tmp_path, path)
+
+    def store(self, sha256, image_hash, params, results, original_size=None):
+        """
+        Enregistre les résultats OCR d'une image.
+
+        Returns:
+            str: Clé de l'entrée
+        """
+        key = self.make_key(sha256, params)
+        created = time.time()
+        record = {'key': key, 'sha256': sha256, 'dhash': image_hash, 'params': params, 'created': created}
+        entry = {
+            'results': {k: v for k, v in results.items() if k not in ('trace', 'cache')},
+            'enriched_books': None,
+            'original_size': list(original_size) if original_size else None,
+            'created': created
+        }
+        with span('cache.store'):
+            self._write_entry(key, entry)
+            with self._lock:
+                if key not in self._entries:
+                    with open(self._index_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(record) + '\n')
+                    self._index(record)
+                    self._evict()
+        return key
+
+    def store_enrichment(self, key, enriched_books):
+        """Ajoute l'enrichissement Open Library à une entrée existante."""
+        entry = self._read_entry(key)
+        if entry is None:
+            return False
+        entry['enriched_books'] = enriched_books
+        self._write_entry(key, entry)
+        return True
+
+    def clear(self):
+        """Vide le cache (index et entrées)."""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+            if os.path.exists(self._index_path):
+                os.remove(self._index_path)
+            self._entries, self._exact, self._trees = {}, {}, {}
@@ -0,0 +1,28 @@
+# DÉPENDANCES:
+#   - Utilise: core/spine/line.py, core/spine/detection.py, core/spine/regions.py, core/spine/service.py
+#   - Importe: Aucun (fichier d'exports)
+#   - Utilisé par: engines/*, frontend/utils/ocr_processing.py
+
+"""
+ShelfReader - Spine Detection Service
+Détection de tranches partagée par les moteurs EasyOCR, Tesseract et TrOCR.
+"""
+
+from core.spine.line import Line, LineSet
+from core.spine.detection import SpineDetector
+from core.spine.regions import spine_regions, upright_crops, bounding_rect
+from core.spine.service import SpineResult, SpineService, spine_service, detect_spines, image_fingerprint
+
+__all__ = [
+    'Line',
+    'LineSet',
+    'SpineDetector',
+    'SpineResult',
+    'SpineService',
+    'spine_service',
+    'detect_spines',
+    'image_fingerprint',
+    'spine_regions',
+    'upright_crops',
+    'bounding_rect'
+]
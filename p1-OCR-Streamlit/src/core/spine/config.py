@@ -0,0 +1,35 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun (fichier de constantes)
+#   - Importe: Aucun
+#   - Utilisé par: core/spine/detection.py, core/spine/regions.py, core/spine/service.py,
+#                  engines/easyocr/logic/config.py
+
+"""
+ShelfReader - Spine Detection Configuration
+Constantes de la détection de tranches partagée entre les moteurs.
+"""
+
+# Paramètres de détection de tranches (Shelfie)
+DOWNSAMPLE_FACTOR = 3
+GAUSSIAN_BLUR_SIGMA = 3
+BINARIZE_CUTOFF_FACTOR = 100.0
+VERTICAL_ERODE_LENGTH = 50
+VERTICAL_ERODE_ITERATIONS = 1
+VERTICAL_DILATE_LENGTH = 10
+VERTICAL_DILATE_ITERATIONS = 1
+SHORT_CLUSTER_THRESHOLD_FRACTION = 0.30
+
+# Paramètres ICCC 2013
+CANNY_MIN = 50
+CANNY_MAX = 150
+ICCC_PIXEL_THRESHOLD_RATIO = 0.5
+ICCC_DILATE_WIDTH = 1
+ICCC_DILATE_HEIGHT = 3
+ICCC_MIN_HEIGHT_RATIO = 0.05
+
+# Régions par livre
+MIN_SPINE_WIDTH = 8  # Largeur minimale d'une tranche (pixels)
+SPINE_PADDING = 10  # Marge ajoutée autour de chaque tranche redressée (pixels)
+
+# Cache des résultats par image
+SPINE_CACHE_SIZE = 8  # Nombre d'images gardées en mémoire
@@ -0,0 +1,164 @@
+# DÉPENDANCES:
+#   - Utilise: Aucun (structures de données)
+#   - Importe: numpy
+#   - Utilisé par: core/spine/detection.py, core/spine/regions.py, core/spine/__init__.py,
+#                  engines/easyocr/grouping/text_grouping.py
+
+"""
+ShelfReader - Spine Line Model
+Lignes détectées dans l'image: Line (une ligne) et LineSet (ensemble de lignes
+en tableaux numpy, évaluées toutes à la fois).
+"""
+
+import numpy as np
+
+VERTICAL_SLOPE = 1000  # Pente à partir de laquelle une ligne est considérée verticale
+
+
+class Line(object):
+    """Classe représentant une ligne détectée (bord de tranche de livre)."""
+
+    __slots__ = ('m', 'b', 'center', 'min_x', 'max_x', 'min_y', 'max_y', 'vertical')
+
+    # Seuil pour considérer une ligne comme verticale (compatibilité)
+    vertical_threshold = VERTICAL_SLOPE
+
+    def __init__(self, slope, intercept, center, min_x, max_x, min_y, max_y, vertical=None):
+        self.m = slope  # pente
+        self.b = intercept  # ordonnée à l'origine
+        self.center = center  # centre de la ligne
+        self.min_x = min_x
+        self.max_x = max_x
+        self.min_y = min_y
+        self.max_y = max_y
+        # Ligne verticale: x constant, repérée par son centre (la pente n'est pas utilisée)
+        self.vertical = abs(slope) >= VERTICAL_SLOPE if vertical is None else bool(vertical)
+
+    def x(self, y):
+        """Retourne la coordonnée x de la ligne à la position y."""
+        # Ligne verticale
+        if self.vertical:
+            return self.center[0]
+        # Ligne normale
+        else:
+            return (y - self.b) / self.m
+
+    def __repr__(self):
+        return (f"Line(m={self.m:.3g}, b={self.b:.3g}, center=({self.center[0]:.1f}, {self.center[1]:.1f}), "
+                f"vertical={self.vertical})")
+
+
+class LineSet:
+    """
+    Ensemble de lignes stocké en tableaux numpy (une entrée par ligne).
+
+    Attributs:
+        m, b: Pentes et ordonnées à l'origine (y = m*x + b)
+        cx, cy: Centres
+        min_x, max_x, min_y, max_y: Étendues
+        vertical: Lignes verticales (x constant = cx)
+
+    L'itération et l'indexation entière retournent des Line, pour le code qui
+    manipule les lignes une par une.
+    """
+
+    FIELDS = ('m', 'b', 'cx', 'cy', 'min_x', 'max_x', 'min_y', 'max_y')
+
+    def __init__(self, m, b, cx, cy, min_x, max_x, min_y, max_y, vertical):
+        self.m = np.asarray(m, dtype=np.float64)
+        self.b = np.asarray(b, dtype=np.float64)
+        self.cx = np.asarray(cx, dtype=np.float64)
+        self.cy = np.asarray(cy, dtype=np.float64)
+        self.min_x = np.asarray(min_x, dtype=np.float64)
+        self.max_x = np.asarray(max_x, dtype=np.float64)
+        self.min_y = np.asarray(min_y, dtype=np.float64)
+        self.max_y = np.asarray(max_y, dtype=np.float64)
+        self.vertical = np.asarray(vertical, dtype=bool)
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Construit l'ensemble depuis des Line (ou retourne le LineSet tel quel)."""
+        if isinstance(lines, LineSet):
+            return lines
+        lines = list(lines or [])
+        return cls(
+            [l.m for l in lines], [l.b for l in lines],
+            [l.center[0] for l in lines], [l.center[1] for l in lines],
+            [l.min_x for l in lines], [l.max_x for l in lines],
+            [l.min_y for l in lines], [l.max_y for l in lines],
+            [getattr(l, 'vertical', abs(l.m) >= VERTICAL_SLOPE) for l in lines]
+        )
+
+    def __len__(self):
+        return len(self.m)
+
+    def _take(self, index):
+        return LineSet(*(getattr(self, name)[index] for name in self.FIELDS), self.vertical[index])
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Line(float(self.m[index]), float(self.b[index]),
+                        (float(self.cx[index]), float(self.cy[index])),
+                        float(self.min_x[index]), float(self.max_x[index]),
+                        float(self.min_y[index]), float(self.max_y[index]),
+                        vertical=bool(self.vertical[index]))
+        return self._take(index)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def to_lines(self):
+        return list(self)
+
+    def sorted(self, by='x'):
+        """Copie triée par centre ('x' pour les tranches, 'y' pour les étagères)."""
+        return self._take(np.argsort(self.cx if by == 'x' else self.cy, kind='stable'))
+
+    def x_at(self, y):
+        """
+        Abscisses de toutes les lignes aux hauteurs y.
+
+        Args:
+            y: Scalaire ou tableau de forme (k,)
+
+        Returns:
+            np.ndarray: (n,) pour un scalaire, (n, k) pour un tableau; NaN pour
+            les lignes horizontales (pente nulle)
+        """
+        y = np.asarray(y, dtype=np.float64)
+        # Une colonne par hauteur demandée
+        lines = (slice(None), None) if y.ndim else slice(None)
+        m, b, cx, vertical = self.m[lines], self.b[lines], self.cx[lines], self.vertical[lines]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(vertical, cx, (y - b) / m)
+        return np.where((m == 0) & ~vertical, np.nan, x)
+
+    def columns(self, x, y):
+        """
+        Indice de colonne de chaque point: nombre de lignes passant à sa gauche
+        (à la hauteur du point). 0 = à gauche de toutes les lignes, len(self) = à droite.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if not len(self):
+            return np.zeros(x.shape, dtype=np.intp)
+        return np.sum(self.x_at(y) <= x, axis=0)
+
+    def rows(self, y):
+        """Indice de rangée de chaque ordonnée: nombre de lignes (par centre) au-dessus."""
+        y = np.asarray(y, dtype=np.float64)
+        return np.searchsorted(np.sort(self.cy), y, side='right')
+
+    def nearest(self, x, y):
+        """
+        Ligne la plus proche horizontalement de chaque point (x, y).
+
+        Returns:
+            tuple: (indices (k,), distances (k,)); indice -1 si aucune ligne
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        if not len(self):
+            return np.full(x.shape, -1, dtype=np.intp), np.full(x.shape, np.inf)
+        distances = np.abs(self.x_at(np.atleast_1d(y)) - x)
+        distances = np.where(np.isnan(distances), np.inf, distances)
+        index = np.argmin(distances, axis=0)
+        return index, distances[index, np.arange(x.shape[0])]
@@ -0,0 +1,70 @@
+# DÉPENDANCES:
+#   - Utilise: core/spine/config.py
+#   - Importe: cv2, numpy
+#   - Utilisé par: core/spine/service.py, engines/tesseract/detection/spine_detection.py,
+#                  engines/trocr/detection/text_detection.py
+
+"""
+ShelfReader - Spine Regions
+Polygones par livre entre lignes de tranches voisines et redressement d'une tranche.
+"""
+
+import cv2
+import numpy as np
+from core.spine.config import MIN_SPINE_WIDTH, SPINE_PADDING
+
+
+def spine_regions(lines, shape, min_width=MIN_SPINE_WIDTH):
+    """
+    Quadrilatères entre lignes de tranches voisines (bords de l'image inclus).
+
+    Returns:
+        list: Tableaux float32 (4, 2) [haut-gauche, haut-droit, bas-droit, bas-gauche]
+    """
+    height, width = shape[:2]
+    lines = sorted(lines, key=lambda line: line.center[0])
+    regions = []
+    for i in range(len(lines) + 1):
+        left = lines[i - 1] if i > 0 else None
+        right = lines[i] if i < len(lines) else None
+        if left is None and right is None:
+            continue
+        # Hauteur couverte par les lignes qui bordent la tranche
+        bounds = [line for line in (left, right) if line is not None]
+        y0 = max(0.0, float(min(line.min_y for line in bounds)))
+        y1 = min(float(height - 1), float(max(line.max_y for line in bounds)))
+        if y1 - y0 < min_width:
+            continue
+        xl0, xl1 = (float(left.x(y0)), float(left.x(y1))) if left else (0.0, 0.0)
+        xr0, xr1 = (float(right.x(y0)), float(right.x(y1))) if right else (width - 1.0, width - 1.0)
+        if min(xr0 - xl0, xr1 - xl1) < min_width:
+            continue
+        quad = np.array([[xl0, y0], [xr0, y0], [xr1, y1], [xl1, y1]], dtype=np.float32)
+        regions.append(np.clip(quad, 0, [width - 1, height - 1]).astype(np.float32))
+    return regions
+
+
+def bounding_rect(quad):
+    """Rectangle englobant (x, y, w, h) entier d'un quadrilatère."""
+    x0, y0 = np.floor(quad.min(axis=0)).astype(int)
+    x1, y1 = np.ceil(quad.max(axis=0)).astype(int)
+    return int(x0), int(y0), int(x1 - x0 + 1), int(y1 - y0 + 1)
+
+
+def upright_crops(image, quad, padding=SPINE_PADDING):
+    """
+    Redresse une tranche: rectification du quadrilatère puis rotation à 90°
+    dans les deux sens (titre écrit de bas en haut ou de haut en bas).
+
+    Returns:
+        tuple: (lecture bas->haut, lecture haut->bas)
+    """
+    width = int(round(max(quad[1][0] - quad[0][0], quad[2][0] - quad[3][0])))
+    height = int(round(max(quad[3][1] - quad[0][1], quad[2][1] - quad[1][1])))
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(quad, target)
+    spine = cv2.warpPerspective(image, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                                borderMode=cv2.BORDER_REPLICATE)
+    spine = cv2.copyMakeBorder(spine, padding, padding, padding, padding, cv2.BORDER_REPLICATE)
+    return (cv2.rotate(spine, cv2.ROTATE_90_CLOCKWISE),
+            cv2.rotate(spine, cv2.ROTATE_90_COUNTERCLOCKWISE))
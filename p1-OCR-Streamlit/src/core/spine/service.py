@@ -0,0 +1,177 @@
+# DÉPENDANCES:
+#   - Utilise: core/spine/detection.py, core/spine/regions.py, core/spine/config.py, core/instrumentation.py
+#   - Importe: hashlib, threading, time, collections, concurrent.futures
+#   - Utilisé par: engines/easyocr/logic/orchestrator.py, engines/tesseract/logic/orchestrator.py,
+#                  engines/trocr/logic/orchestrator.py, engines/all-in-one/easyocr_engine.py
+
+"""
+ShelfReader - Spine Service
+Point d'entrée unique de la détection de tranches: lignes, polygones par livre
+et durées, avec un cache des résultats par image.
+
+Une comparaison de moteurs ou un pipeline multi-moteurs passe la même image
+(même politique de résolution) à chaque moteur: les tranches sont calculées une
+seule fois, les appels suivants réutilisent le résultat. Deux appels simultanés
+sur la même image attendent le même calcul.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from core.instrumentation import span, count
+from core.spine.config import MIN_SPINE_WIDTH, SPINE_CACHE_SIZE
+from core.spine.detection import SpineDetector
+from core.spine.regions import spine_regions
+
+METHODS = ('vertical_lines', 'horizontal_shelves')
+DEFAULT_METHOD = 'vertical_lines'
+
+
+def image_fingerprint(image):
+    """Empreinte du contenu d'un tableau numpy (forme, type et pixels)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.shape}:{image.dtype}".encode('ascii'))
+    digest.update(memoryview(image if image.flags.c_contiguous else image.copy()).cast('B'))
+    return digest.hexdigest()
+
+
+class SpineResult:
+    """
+    Résultat de la détection de tranches d'une image.
+
+    Attributs:
+        lines: Lignes de séparation (Line), dans le repère de l'image analysée
+        polygons: Quadrilatères float32 (4, 2) par livre (méthode vertical_lines uniquement)
+        timings: Durées en secondes par étape ('fingerprint', 'detection', 'regions')
+        shape: Forme de l'image analysée
+        method: Méthode de détection
+        cached: Vrai si le résultat provient du cache
+
+    Chaque appelant reçoit ses propres listes; les lignes et polygones sont partagés
+    entre les moteurs: ne pas les modifier (ScaledImage.lines_to_original en fait des copies).
+    """
+
+    def __init__(self, lines, polygons, timings, shape, method, cached=False):
+        self.lines = lines
+        self.polygons = polygons
+        self.timings = timings
+        self.shape = shape
+        self.method = method
+        self.cached = cached
+
+    def view(self, cached):
+        """Vue du résultat remise à un appelant (listes copiées, lignes et polygones partagés)."""
+        return SpineResult(list(self.lines), list(self.polygons), dict(self.timings),
+                           self.shape, self.method, cached=cached)
+
+
+class SpineService:
+    """
+    Détection de tranches avec cache LRU des résultats par image.
+
+    Args:
+        cache_size: Nombre d'images gardées (0 = pas de cache)
+        min_width: Largeur minimale d'une tranche pour les polygones
+    """
+
+    def __init__(self, cache_size=SPINE_CACHE_SIZE, min_width=MIN_SPINE_WIDTH):
+        self.cache_size = cache_size
+        self.min_width = min_width
+        self._lock = threading.Lock()
+        self._results = OrderedDict()  # clé -> SpineResult
+        self._pending = {}  # clé -> Future du calcul en cours
+
+    def __len__(self):
+        return len(self._results)
+
+    def detect(self, image, method=DEFAULT_METHOD, tile_executor=None, debug=False,
+               debug_sink=None, image_id=None, image_key=None):
+        """
+        Détecte les tranches d'une image.
+
+        Args:
+            image: Tableau BGR ou niveaux de gris
+            method: 'vertical_lines' (séparations entre livres) ou 'horizontal_shelves'
+            tile_executor: TileExecutor optionnel pour les très grandes images
+            debug, debug_sink, image_id: Étapes intermédiaires; le cache est ignoré
+                pour que chaque appel produise ses images de debug
+            image_key: Empreinte déjà connue de l'image (évite le hachage des pixels)
+
+        Returns:
+            SpineResult
+        """
+        if method not in METHODS:
+            raise ValueError(f"Méthode de détection de tranches inconnue : {method} (choix : {', '.join(METHODS)})")
+        if debug or debug_sink is not None or not self.cache_size:
+            return self._compute(image, method, tile_executor, debug, debug_sink, image_id, {})
+
+        started = time.perf_counter()
+        image_key = image_key or image_fingerprint(image)
+        timings = {'fingerprint': time.perf_counter() - started}
+        tiling = (tile_executor.tile_size, tile_executor.overlap) if tile_executor is not None else None
+        key = (image_key, image.shape, method, tiling, self.min_width)
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            else:
+                future = self._pending.get(key)
+                owner = future is None
+                if owner:
+                    future = self._pending[key] = Future()
+        if result is not None:
+            count('spine.cache_hits')
+            return result.view(cached=True)
+        if not owner:
+            count('spine.cache_hits')
+            return future.result().view(cached=True)
+
+        count('spine.cache_misses')
+        try:
+            result = self._compute(image, method, tile_executor, False, None, image_id, timings)
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                del self._pending[key]
+            raise
+        with self._lock:
+            del self._pending[key]
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        future.set_result(result)
+        return result.view(cached=False)
+
+    def _compute(self, image, method, tile_executor, debug, debug_sink, image_id, timings):
+        started = time.perf_counter()
+        lines = SpineDetector.detect_spine_lines(image, debug=debug, method=method, debug_sink=debug_sink,
+                                                 image_id=image_id, tile_executor=tile_executor)
+        timings['detection'] = time.perf_counter() - started
+
+        polygons = []
+        if method == 'vertical_lines':
+            started = time.perf_counter()
+            with span('spine.regions'):
+                polygons = spine_regions(lines, image.shape, self.min_width)
+            timings['regions'] = time.perf_counter() - started
+        return SpineResult(lines, polygons, timings, image.shape, method)
+
+    def clear(self):
+        """Vide le cache (les calculs en cours ne sont pas interrompus)."""
+        with self._lock:
+            self._results.clear()
+
+
+# Service partagé par tous les moteurs du processus: son cache vit aussi longtemps
+# que le processus (SPINE_CACHE_SIZE images au plus). Les mesures de performance
+# répétées sur une même image doivent appeler spine_service.clear() entre deux appels.
+spine_service = SpineService()
+
+
+def detect_spines(image, method=DEFAULT_METHOD, **kwargs):
+    """Détection de tranches via le service partagé (voir SpineService.detect)."""
+    return spine_service.detect(image, method=method, **kwargs)
@@ -0,0 +1,322 @@
+# DÉPENDANCES:
+#   - Utilise: core/instrumentation.py
+#   - Importe: numpy, copy, os, concurrent.futures
+#   - Utilisé par: engines/easyocr/logic/orchestrator.py, engines/easyocr/detection/spine_detection.py,
+#                  engines/easyocr/main.py, frontend/utils/ocr_processing.py
+
+"""
+ShelfReader - Tiling
+Découpage des très grandes images (panoramas de rayonnages) en tuiles chevauchantes.
+
+Chaque tuile est une vue (sans copie) de l'image; la détection de texte et de
+tranches s'exécute tuile par tuile, éventuellement en parallèle. La mémoire de
+travail est ainsi bornée par la taille des tuiles et le nombre de workers, et
+non par la taille de l'image. Les boîtes et lignes en double dans les zones de
+recouvrement sont fusionnées et ramenées dans le repère de l'image entière.
+"""
+
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core.instrumentation import span, count, tracer
+
+# Paramètres par défaut
+DEFAULT_TILE_SIZE = 4096  # Grand côté maximal d'une tuile (pixels), 0 = pas de découpage
+DEFAULT_TILE_OVERLAP = 256  # Recouvrement entre tuiles voisines (pixels)
+SEAM_MARGIN = 2  # Distance (pixels) au bord intérieur d'une tuile pour considérer une boîte tronquée
+BOX_DUPLICATE_RATIO = 0.5  # Intersection / plus petite aire au-delà de laquelle deux boîtes sont en double
+
+
+class Tile:
+    """
+    Tuile rectangulaire d'une image.
+
+    Attributs:
+        index: Position de la tuile dans le plan de découpage
+        x, y: Origine de la tuile dans l'image entière
+        width, height: Dimensions de la tuile
+        seams: Bords intérieurs {'left', 'right', 'top', 'bottom'} (partagés avec une voisine)
+    """
+
+    def __init__(self, index, x, y, width, height, seams=()):
+        self.index = index
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.seams = frozenset(seams)
+
+    @property
+    def rect(self):
+        return (self.x, self.y, self.width, self.height)
+
+    def crop(self, image, scale=1.0):
+        """
+        Vue de la tuile dans `image` (aucune copie).
+
+        Args:
+            scale: Échelle de `image` par rapport à l'image découpée
+                (ex. image de reconnaissance plus grande que l'image de détection)
+        """
+        x0, y0 = int(round(self.x * scale)), int(round(self.y * scale))
+        x1 = int(round((self.x + self.width) * scale))
+        y1 = int(round((self.y + self.height) * scale))
+        return image[y0:y1, x0:x1]
+
+    def polygon_to_image(self, points, scale=1.0):
+        """Points exprimés dans la tuile -> repère de l'image entière."""
+        dx, dy = int(round(self.x * scale)), int(round(self.y * scale))
+        return [[float(px) + dx, float(py) + dy] for px, py in points]
+
+    def line_to_image(self, line):
+        """Ligne de tranche (y = m*x + b) exprimée dans la tuile -> repère de l'image entière."""
+        return translate_line(line, self.x, self.y)
+
+    def touches_seam(self, points, scale=1.0):
+        """Vrai si le polygone (repère de la tuile) touche un bord intérieur: objet tronqué."""
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        width, height = self.width * scale, self.height * scale
+        return (('left' in self.seams and min(xs) <= SEAM_MARGIN)
+                or ('top' in self.seams and min(ys) <= SEAM_MARGIN)
+                or ('right' in self.seams and max(xs) >= width - SEAM_MARGIN)
+                or ('bottom' in self.seams and max(ys) >= height - SEAM_MARGIN))
+
+
+def _axis_starts(length, tile_size, overlap):
+    """Origines des tuiles sur un axe; la dernière tuile est alignée sur le bord."""
+    if length <= tile_size:
+        return [0]
+    step = max(1, tile_size - overlap)
+    starts = list(range(0, length - tile_size, step))
+    starts.append(length - tile_size)
+    return starts
+
+
+def plan_tiles(shape, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP):
+    """
+    Découpe une image de forme `shape` en tuiles chevauchantes.
+
+    Seuls les axes plus longs que `tile_size` sont découpés: un panorama large
+    donne une rangée de tuiles pleine hauteur.
+    """
+    height, width = shape[:2]
+    if not tile_size:
+        return [Tile(0, 0, 0, width, height)]
+
+    xs = _axis_starts(width, tile_size, overlap)
+    ys = _axis_starts(height, tile_size, overlap)
+    tiles = []
+    for row, y in enumerate(ys):
+        for col, x in enumerate(xs):
+            seams = []
+            if col > 0:
+                seams.append('left')
+            if col < len(xs) - 1:
+                seams.append('right')
+            if row > 0:
+                seams.append('top')
+            if row < len(ys) - 1:
+                seams.append('bottom')
+            tiles.append(Tile(len(tiles), x, y, min(tile_size, width), min(tile_size, height), seams))
+    return tiles
+
+
+def translate_line(line, dx, dy):
+    """Translate une ligne y = m*x + b de (dx, dy): la pente est inchangée."""
+    if not dx and not dy:
+        return line
+    line = copy.copy(line)
+    line.b = line.b + dy - line.m * dx
+    line.center = (line.center[0] + dx, line.center[1] + dy)
+    line.min_x, line.max_x = line.min_x + dx, line.max_x + dx
+    line.min_y, line.max_y = line.min_y + dy, line.max_y + dy
+    return line
+
+
+class TileExecutor:
+    """
+    Exécute une fonction sur les tuiles d'une image, en parallèle si demandé.
+
+    Args:
+        tile_size: Grand côté maximal d'une tuile (None ou 0 = pas de découpage)
+        overlap: Recouvrement entre tuiles voisines; doit dépasser la plus grande
+            boîte de texte attendue pour qu'elle soit entière dans au moins une tuile
+        max_workers: Nombre de tuiles traitées simultanément (None = nombre de cœurs).
+            La mémoire de travail est bornée par max_workers tuiles.
+    """
+
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP, max_workers=None):
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_params(cls, params):
+        """Construit l'exécuteur depuis les paramètres avancés (UI / CLI)."""
+        params = params or {}
+        return cls(
+            tile_size=params.get('tile_size', DEFAULT_TILE_SIZE),
+            overlap=params.get('tile_overlap', DEFAULT_TILE_OVERLAP),
+            max_workers=params.get('tile_workers')
+        )
+
+    @classmethod
+    def from_args(cls, args):
+        """Construit l'exécuteur depuis les options de add_tiling_arguments."""
+        return cls(tile_size=args.tile_size, overlap=args.tile_overlap, max_workers=args.tile_workers)
+
+    def should_tile(self, shape):
+        """Vrai si l'image dépasse la taille d'une tuile."""
+        return bool(self.tile_size) and max(shape[0], shape[1]) > self.tile_size
+
+    def tiles(self, shape):
+        return plan_tiles(shape, self.tile_size, self.overlap)
+
+    def workers_for(self, num_tiles):
+        workers = self.max_workers or os.cpu_count() or 1
+        return max(1, min(workers, num_tiles))
+
+    def run(self, fn, tiles, name='tiling'):
+        """
+        Applique fn(tile) à chaque tuile.
+
+        Returns:
+            list: Résultats dans l'ordre des tuiles
+        """
+        workers = self.workers_for(len(tiles))
+        count(f'{name}.tiles', len(tiles))
+
+        def process(tile):
+            with span(f'{name}.tile', index=tile.index, x=tile.x, y=tile.y):
+                return fn(tile)
+
+        with span(name, tiles=len(tiles), workers=workers):
+            if workers == 1:
+                return [process(tile) for tile in tiles]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tile') as pool:
+                return list(pool.map(tracer.wrap(process), tiles))
+
+    def describe(self):
+        return {'tile_size': self.tile_size, 'tile_overlap': self.overlap, 'tile_workers': self.max_workers}
+
+
+def _bounds(points):
+    points = np.asarray(points, dtype=np.float64)
+    return points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()
+
+
+def merge_text_results(tile_results):
+    """
+    Fusionne les résultats OCR des tuiles (déjà dans le repère de l'image entière).
+
+    Deux boîtes sont en double si leur intersection couvre plus de la moitié de
+    la plus petite. On garde de préférence la boîte qui ne touche pas un bord de
+    tuile (non tronquée), puis la plus grande, puis la plus confiante.
+
+    Args:
+        tile_results: [(bbox, text, confidence, truncated)]
+
+    Returns:
+        list: [(bbox, text, confidence)]
+    """
+    if not tile_results:
+        return []
+    bounds = np.array([_bounds(r[0]) for r in tile_results])
+    areas = np.maximum(bounds[:, 2] - bounds[:, 0], 1) * np.maximum(bounds[:, 3] - bounds[:, 1], 1)
+    truncated = np.array([bool(r[3]) for r in tile_results])
+    confidences = np.array([float(r[2]) for r in tile_results])
+    # Ordre de préférence: non tronquée, grande, confiante
+    order = np.lexsort((-confidences, -areas, truncated))
+
+    kept = []
+    for i in order:
+        duplicate = False
+        for j in kept:
+            ix = min(bounds[i, 2], bounds[j, 2]) - max(bounds[i, 0], bounds[j, 0])
+            iy = min(bounds[i, 3], bounds[j, 3]) - max(bounds[i, 1], bounds[j, 1])
+            if ix > 0 and iy > 0 and ix * iy > BOX_DUPLICATE_RATIO * min(areas[i], areas[j]):
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append(i)
+
+    count('tiling.duplicate_boxes', len(tile_results) - len(kept))
+    # Ordre d'origine (lecture de gauche à droite par tuile)
+    return [tuple(tile_results[i][:3]) for i in sorted(kept)]
+
+
+def _is_horizontal(line):
+    return abs(line.m) < 1
+
+
+def _same_line(a, b, tolerance):
+    """Deux segments (repère image) appartiennent-ils à la même ligne de tranche / rangée?"""
+    if _is_horizontal(a) != _is_horizontal(b):
+        return False
+    if _is_horizontal(a):
+        # Lignes de rangée: même hauteur, étendues horizontales qui se touchent
+        gap = max(a.min_x, b.min_x) - min(a.max_x, b.max_x)
+        return gap <= tolerance and abs(a.center[1] - b.center[1]) <= tolerance
+    gap = max(a.min_y, b.min_y) - min(a.max_y, b.max_y)
+    if gap > tolerance:
+        return False
+    # Comparer les abscisses à une hauteur commune
+    y = (max(a.min_y, b.min_y) + min(a.max_y, b.max_y)) / 2
+    return abs(a.x(y) - b.x(y)) <= tolerance
+
+
+def _union(a, b):
+    """Segment couvrant a et b, avec la pente du plus long."""
+    length = (lambda l: l.max_x - l.min_x) if _is_horizontal(a) else (lambda l: l.max_y - l.min_y)
+    base = a if length(a) >= length(b) else b
+    merged = copy.copy(base)
+    merged.min_x, merged.max_x = min(a.min_x, b.min_x), max(a.max_x, b.max_x)
+    merged.min_y, merged.max_y = min(a.min_y, b.min_y), max(a.max_y, b.max_y)
+    if _is_horizontal(base):
+        merged.center = ((merged.min_x + merged.max_x) / 2, base.center[1])
+    else:
+        mid_y = (merged.min_y + merged.max_y) / 2
+        merged.center = (base.x(mid_y), mid_y)
+    return merged
+
+
+def merge_lines(lines, tolerance=None, overlap=DEFAULT_TILE_OVERLAP):
+    """
+    Fusionne les lignes de tranches détectées dans des tuiles voisines
+    (déjà dans le repère de l'image entière).
+
+    Une même tranche vue dans deux tuiles, ou coupée par une jointure, donne un
+    seul segment couvrant les deux morceaux.
+
+    Args:
+        lines: Lignes de toutes les tuiles
+        tolerance: Écart maximal (pixels) entre deux segments de la même ligne
+            (défaut: un huitième du recouvrement)
+    """
+    tolerance = tolerance if tolerance is not None else max(4, overlap / 8)
+    merged = []
+    for line in sorted(lines, key=lambda l: (l.center[0], l.center[1])):
+        for i, other in enumerate(merged):
+            if _same_line(line, other, tolerance):
+                merged[i] = _union(other, line)
+                break
+        else:
+            merged.append(line)
+    count('tiling.duplicate_lines', len(lines) - len(merged))
+    merged.sort(key=lambda line: line.center[0])
+    return merged
+
+
+def add_tiling_arguments(parser):
+    """Ajoute --tile-size / --tile-overlap / --tile-workers à un parser argparse."""
+    parser.add_argument('--tile-size', type=int, default=DEFAULT_TILE_SIZE,
+                        help=f'Découpe en tuiles les images plus grandes, 0 = jamais '
+                             f'(défaut: {DEFAULT_TILE_SIZE})')
+    parser.add_argument('--tile-overlap', type=int, default=DEFAULT_TILE_OVERLAP,
+                        help=f'Recouvrement entre tuiles en pixels (défaut: {DEFAULT_TILE_OVERLAP})')
+    parser.add_argument('--tile-workers', type=int, default=None,
+                        help='Tuiles traitées en parallèle (défaut: nombre de cœurs)')
@@ -22,32 +22,16 @@ OPTIONS DE VALIDATION SUPPRIMÉES:
 """
 
 # === IMPORTS ===
+import os
+import sys
+
 import cv2
 import numpy as np
-import scipy.ndimage
-import scipy.stats
-
-class Line(object):
-    """Classe représentant une ligne détectée (bord de tranche de livre)."""
-
-    def __init__(self, slope, intercept, center, min_x, max_x, min_y, max_y):
-        self.m = slope  # pente
-        self.b = intercept  # ordonnée à l'origine
-        self.center = center  # centre de la ligne
-        self.min_x = min_x
-        self.max_x = max_x
-        self.min_y = min_y
-        self.max_y = max_y
-        self.vertical_threshold = 1000  # seuil pour considérer une ligne comme verticale
-
-    def x(self, y):
-        """Retourne la coordonnée x de la ligne à la position y."""
-        # Ligne verticale
-        if self.m > self.vertical_threshold:
-            return self.center[0]
-        # Ligne normale
-        else:
-            return (y - self.b) / self.m
+
+# Service de détection de tranches partagé (src/core/spine)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from core.spine import spine_service  # noqa: E402
+
 
 class EasyOCRProcessor:
     """Processeur OCR spécialisé pour EasyOCR avec détection de tranches."""
@@ -133,447 +117,20 @@ class EasyOCRProcessor:
 
         return filtered_results
 
-    # === DÉTECTION DES TRANCHES (ALGORITHME SHELFIE) ===
-    def _gaussian_blur(self, img, sigma, debug=False):
-        """Applique un flou gaussien."""
-        proc_img = scipy.ndimage.gaussian_filter(img, sigma)
-        if debug:
-            print('Gaussian blur')
-            cv2.imshow('Gaussian Blur', proc_img.astype(np.uint8))
-            cv2.waitKey(0)
-        return proc_img
-
-    def _downsample(self, img, num_downsamples, debug=False):
-        """Réduit la résolution de l'image."""
-        proc_img = img.copy()
-        for i in range(num_downsamples):
-            height, width = proc_img.shape[:2]
-            if height < 4 or width < 4:
-                break  # Ne pas descendre en dessous d'une taille minimale
-            new_width = max(1, width // 2)
-            new_height = max(1, height // 2)
-            proc_img = cv2.resize(proc_img, (new_width, new_height))
-        if debug:
-            print(f'Downsampled {min(num_downsamples, i+1)} times (final size: {proc_img.shape})')
-            cv2.imshow('Downsampled', proc_img.astype(np.uint8))
-            cv2.waitKey(0)
-        return proc_img
-
-    def _sobel_x_squared(self, img, debug=False):
-        """Applique le filtre Sobel horizontal au carré."""
-        sobel_x = cv2.Sobel(img, cv2.CV_64F, 1, 0, ksize=3)
-        proc_img = sobel_x ** 2
-        if debug:
-            print('Sobel X squared')
-            cv2.imshow('Sobel X Squared', (proc_img / proc_img.max() * 255).astype(np.uint8))
-            cv2.waitKey(0)
-        return proc_img
-
-    def _standardize(self, img, debug=False):
-        """Standardise l'image (moyenne 0, écart-type 1)."""
-        if img.std() > 0:
-            proc_img = (img - img.mean()) / img.std()
-        else:
-            proc_img = img - img.mean()
-        if debug:
-            print('Standardized')
-            cv2.imshow('Standardized', ((proc_img - proc_img.min()) / (proc_img.max() - proc_img.min()) * 255).astype(np.uint8))
-            cv2.waitKey(0)
-        return proc_img
-
-    def _binarize(self, img, cutoff=None, debug=False):
-        """Binarise l'image."""
-        if cutoff is None:
-            cutoff = img.max() / 100.0
-        proc_img = (img > cutoff).astype(np.uint8) * 255
-        if debug:
-            print(f'Binarized with cutoff {cutoff}')
-            cv2.imshow('Binarized', proc_img)
-            cv2.waitKey(0)
-        return proc_img
-
-    def _vertical_erode(self, img, structure_length, iterations, debug=False):
-        """Applique une érosion verticale."""
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, structure_length))
-        proc_img = cv2.erode(img, kernel, iterations=iterations)
-        if debug:
-            print(f'Vertical erode: length={structure_length}, iterations={iterations}')
-            cv2.imshow('Vertical Erode', proc_img)
-            cv2.waitKey(0)
-        return proc_img
-
-    def _vertical_dilate(self, img, structure_length, iterations, debug=False):
-        """Applique une dilatation verticale."""
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, structure_length))
-        proc_img = cv2.dilate(img, kernel, iterations=iterations)
-        if debug:
-            print(f'Vertical dilate: length={structure_length}, iterations={iterations}')
-            cv2.imshow('Vertical Dilate', proc_img)
-            cv2.waitKey(0)
-        return proc_img
-
-    def _remove_short_vertical_clusters(self, img, levels, threshold_fraction=0.5, debug=False):
-        """Supprime les lignes verticales trop courtes (bruit).
-        
-        Inspiré de Shelfie: filtre les composants dont la hauteur est inférieure
-        à threshold_fraction de la hauteur maximale trouvée.
-        """
-        if not levels:
-            return img
-            
-        heights = []
-        for level in levels:
-            line_mask = (img == level)
-            ys, xs = np.where(line_mask)
-            if len(ys) > 0:
-                height = np.ptp(ys)  # peak-to-peak (max - min)
-                heights.append((level, height))
-        
-        if not heights:
-            return img
-            
-        # Calculer le seuil basé sur la hauteur maximale
-        max_height = max(h for _, h in heights)
-        threshold = max_height * threshold_fraction
-        
-        # Supprimer les composants trop courts
-        proc_img = img.copy()
-        removed_count = 0
-        for level, height in heights:
-            if height < threshold:
-                proc_img[proc_img == level] = 0
-                removed_count += 1
-        
-        if debug:
-            print(f'Removed {removed_count} short vertical clusters (threshold: {threshold:.0f}px, max: {max_height:.0f}px)')
-            cv2.imshow('After Removing Short Clusters', (proc_img > 0).astype(np.uint8) * 255)
-            cv2.waitKey(0)
-            
-        return proc_img
-
-    def _connected_components(self, img, debug=False):
-        """Trouve les composants connectés."""
-        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(img, connectivity=8)
-        if debug:
-            print(f'Connected components: {num_labels} found')
-            # Créer une image colorée pour visualiser les composants
-            colored = cv2.applyColorMap((labels * 255 / num_labels).astype(np.uint8), cv2.COLORMAP_JET)
-            cv2.imshow('Connected Components', colored)
-            cv2.waitKey(0)
-        return labels, list(range(1, num_labels))  # levels exclut le fond (0)
-
-    def _upsample(self, img, factor, debug=False):
-        """Remonte la résolution de l'image."""
-        height, width = img.shape[:2]
-        new_width = int(width * factor)
-        new_height = int(height * factor)
-
-        if debug:
-            print(f"Upsampling: {width}x{height} -> {new_width}x{new_height} (factor: {factor})")
-
-        # Vérifier que les dimensions sont valides
-        if new_width <= 0 or new_height <= 0:
-            print(f"❌ Dimensions invalides pour upsampling: {new_width}x{new_height}")
-            return img
-
-        try:
-            # Convertir en float32 pour le resize si nécessaire
-            if img.dtype != np.uint8 and img.dtype != np.float32:
-                img = img.astype(np.float32)
-            proc_img = cv2.resize(img, (new_width, new_height), interpolation=cv2.INTER_NEAREST)
-        except cv2.error as e:
-            print(f"❌ Erreur OpenCV lors de l'upsampling: {e}")
-            print(f"   Dimensions originales: {img.shape}, dtype: {img.dtype}")
-            print(f"   Dimensions cibles: {new_width}x{new_height}")
-            return img
-
-        if debug:
-            print(f'Upsampled by factor {factor}')
-            cv2.imshow('Upsampled', proc_img.astype(np.uint8))
-            cv2.waitKey(0)
-        return proc_img
-
-    def _get_lines_from_img(self, img, levels, debug=False):
-        """Extrait les lignes des composants connectés."""
-        lines = []
-        for level in levels:
-            line_mask = (img == level)
-            ys, xs = np.where(line_mask)
-
-            if len(xs) == 0 or len(ys) == 0:
-                continue
-
-            center = [np.mean(xs), np.mean(ys)]
-            min_x, max_x = np.min(xs), np.max(xs)
-            min_y, max_y = np.min(ys), np.max(ys)
-
-            # Calculer le spread pour déterminer si c'est une ligne verticale
-            spread = (max_y - min_y) / (max_x - min_x) if (max_x - min_x) > 0 else 1000
-
-            # Ligne verticale
-            if spread > 10:
-                line = Line(1000, 0, center, min_x, max_x, min_y, max_y)
-            else:
-                # Ligne normale - régression linéaire
-                slope, intercept, r, p, std = scipy.stats.linregress(xs, ys)
-                line = Line(slope, intercept, center, min_x, max_x, min_y, max_y)
-
-            lines.append(line)
-
-        # Trier par position x centrale
-        lines.sort(key=lambda line: line.center[0])
-
-        if debug:
-            print(f'Extracted {len(lines)} lines')
-            # Visualiser les lignes - convertir en uint8 pour OpenCV
-            if len(img.shape) == 2:
-                vis_img = cv2.cvtColor(img.astype(np.uint8), cv2.COLOR_GRAY2BGR)
-            else:
-                vis_img = img.astype(np.uint8).copy()
-            for line in lines:
-                y0, y1 = 0, img.shape[0]
-                x0 = int(line.x(y0))
-                x1 = int(line.x(y1))
-                cv2.line(vis_img, (x0, y0), (x1, y1), (0, 255, 0), 2)
-            cv2.imshow('Extracted Lines', vis_img)
-            cv2.waitKey(0)
-
-        return lines
-
-    def _detect_shelf_rows_iccc2013(self, image, debug=False):
-        """Détecte les rangées d'étagères selon l'approche ICCC 2013.
-
-        Basé sur le papier: "A Technique to Detect Books from Library Bookshelf Image"
-        par Mohammad Imrul Jubair et Prianka Banik (ICCC 2013)
-
-        Approche:
-        1. Canny edge detection
-        2. Ligne imaginaire horizontale balayant verticalement
-        3. Comptage pixels sous la ligne (seuil 70%)
-        4. Extension des lignes sélectionnées
-        5. Morphological dilation + CCA
-        """
-        try:
-            import cv2
-            import numpy as np
-
-            # 1. Convertir en niveaux de gris et appliquer Canny
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = image.copy()
-
-            # Canny edge detection
-            edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-
-            if debug:
-                cv2.imshow('Canny Edges', edges)
-                cv2.waitKey(0)
-
-            height, width = edges.shape
-            horizontal_lines = np.zeros_like(edges)
-
-            # 2. Balayage avec ligne imaginaire horizontale
-            for y in range(0, height, 2):  # Pas de 2 pixels pour optimisation
-                # Compter les pixels sous la ligne horizontale complète
-                line_pixels = edges[y, :]  # Toute la ligne horizontale
-                pixel_count = np.sum(line_pixels > 0)
-
-                # Seuil: 50% des pixels de la ligne doivent être des bords (réduit de 70%)
-                threshold = int(width * 0.5)
-
-                if pixel_count >= threshold:
-                    # Ligne sélectionnée - l'activer complètement
-                    horizontal_lines[y, :] = 255
-
-            if debug:
-                cv2.imshow('Selected Horizontal Lines', horizontal_lines)
-                cv2.waitKey(0)
-
-            # 3. Extension des lignes sélectionnées (morphological dilation)
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (width//10, 3))  # Large horizontal
-            extended_lines = cv2.dilate(horizontal_lines, kernel, iterations=1)
-
-            if debug:
-                cv2.imshow('Extended Lines', extended_lines)
-                cv2.waitKey(0)
-
-            # 4. Connected Component Analysis pour extraire les régions
-            num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(extended_lines, connectivity=8)
-
-            # Filtrer les régions (composants connectés) par hauteur
-            min_height_threshold = height * 0.05  # Au moins 5% de la hauteur de l'image
-            valid_regions = []
-
-            for i in range(1, num_labels):  # Skip background (label 0)
-                x, y, w, h, area = stats[i]
-
-                # Garder seulement les régions suffisamment hautes
-                if h >= min_height_threshold:
-                    valid_regions.append((x, y, w, h))
-
-            if debug:
-                # Visualiser les régions détectées
-                debug_img = image.copy()
-                for x, y, w, h in valid_regions:
-                    cv2.rectangle(debug_img, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                cv2.imshow('Detected Shelf Rows', debug_img)
-                cv2.waitKey(0)
-
-            # Convertir les régions en "lignes" pour compatibilité avec l'ancien code
-            # Retourner les lignes centrales de chaque région
-            spine_lines = []
-            for x, y, w, h in valid_regions:
-                center_y = y + h // 2
-                # Créer une ligne horizontale fictive (m=0, b=center_y)
-                line = Line(0, center_y, (width//2, center_y), 0, width, y, y+h)
-                spine_lines.append(line)
-
-            if debug:
-                print(f"🔍 Détection ICCC 2013: {len(spine_lines)} rangées d'étagères détectées")
-
-            return spine_lines
-
-        except Exception as e:
-            if debug:
-                print(f"❌ Erreur dans la détection ICCC 2013: {e}")
-                import traceback
-                traceback.print_exc()
-    def _detect_spine_lines_shelfie(self, image, debug=False):
-        """Détection de lignes de séparation entre livres - ALGORITHME SHELFIE AMÉLIORÉ.
-        
-        Basé sur l'implémentation originale de Shelfie (tphinkle/shelfie):
-        https://github.com/tphinkle/shelfie
-        
-        Pipeline complet:
-        1. Downsampling (3x) pour réduire le bruit et accélérer
-        2. Gaussian blur (sigma=3)
-        3. Sobel X au carré (détection des bords verticaux)
-        4. Standardization (normalisation)
-        5. Digitization (4 niveaux) + Binarization
-        6. Vertical erosion (structure=200, iter=3) - supprime les lignes horizontales
-        7. Vertical dilation (structure=50, iter=5) - connecte les lignes verticales
-        8. Connected components + suppression des clusters courts
-        9. Upsampling vers résolution originale
-        10. Extraction des lignes verticales
-        """
-        try:
-            import cv2
-            import numpy as np
-
-            # Convertir en niveaux de gris
-            if len(image.shape) == 3:
-                proc_img = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY).astype(np.float64)
-            else:
-                proc_img = image.astype(np.float64)
-            
-            if debug:
-                print(f"📸 Image originale: {image.shape}")
-
-            # 1. Downsampling (3x)
-            num_downsamples = 3
-            proc_img = self._downsample(proc_img, num_downsamples, debug=debug)
-            
-            # 2. Gaussian blur
-            proc_img = self._gaussian_blur(proc_img, sigma=3, debug=debug)
-            
-            # 3. Sobel X squared (détecte les bords verticaux)
-            proc_img = self._sobel_x_squared(proc_img, debug=debug)
-            
-            # 4. Standardization
-            proc_img = self._standardize(proc_img, debug=debug)
-            
-            # 5. Binarization (garder le cutoff standard)
-            cutoff = proc_img.max() / 100.0
-            proc_img = self._binarize(proc_img, cutoff=cutoff, debug=debug)
-            
-            # 6. Erode subtract (supprime les éléments horizontalement épais)
-            structure = np.array(([0,0,0],[1,1,1],[0,0,0]), dtype=np.uint8) * 5
-            eroded = cv2.erode(proc_img, structure, iterations=1)
-            proc_img = proc_img - eroded
-            proc_img[proc_img < 0] = 255  # Inverser les négatifs
-            
-            if debug:
-                print('Erode subtract')
-                cv2.imshow('Erode Subtract', proc_img)
-                cv2.waitKey(0)
-            
-            # 7. Vertical erode (supprime les lignes horizontales - très réduit)
-            proc_img = self._vertical_erode(proc_img, structure_length=50, iterations=1, debug=debug)
-            
-            # 8. Connected components AVANT dilation (pour détecter les lignes séparées)
-            proc_img_labels, levels = self._connected_components(proc_img, debug=debug)
-            
-            if debug:
-                print(f"🔍 Composants trouvés après erosion: {len(levels)}")
-            
-            # 9. Supprimer UNIQUEMENT les très courts clusters (bruit évident) - seuil très réduit
-            proc_img_labels = self._remove_short_vertical_clusters(proc_img_labels, levels, threshold_fraction=0.30, debug=debug)
-            
-            # 10. Re-binarize pour la suite
-            proc_img = (proc_img_labels > 0).astype(np.uint8) * 255
-            
-            # 11. Petite dilation verticale pour renforcer (optionnel, paramètres réduits)
-            proc_img = self._vertical_dilate(proc_img, structure_length=10, iterations=1, debug=debug)
-            
-            # Re-binarize
-            proc_img = (proc_img > 0).astype(np.uint8) * 255
-            
-            # 11. Upsampling vers résolution originale
-            upsample_factor = 2 ** num_downsamples
-            proc_img = self._upsample(proc_img, upsample_factor, debug=debug)
-            
-            # 12. Connected components final
-            proc_img, levels = self._connected_components(proc_img, debug=debug)
-            
-            # 13. Extraire les lignes
-            lines = self._get_lines_from_img(proc_img, levels, debug=debug)
-            
-            if debug:
-                print(f"✅ Méthode Shelfie améliorée: {len(lines)} lignes verticales détectées")
-                # Visualiser les lignes détectées sur l'image originale
-                vis_img = image.copy()
-                for line in lines:
-                    y0, y1 = 0, image.shape[0]
-                    x0 = int(line.x(y0))
-                    x1 = int(line.x(y1))
-                    cv2.line(vis_img, (x0, y0), (x1, y1), (0, 255, 0), 3)
-                cv2.imshow('Shelfie - Detected Spine Lines', vis_img)
-                cv2.waitKey(0)
-            
-            return lines
-
-        except Exception as e:
-            if debug:
-                print(f"❌ Erreur dans la méthode shelfie améliorée: {e}")
-                import traceback
-                traceback.print_exc()
-            return []
-        """Détecte les lignes de tranches selon différentes méthodes.
-
-        Args:
-            image: Image d'entrée
-            debug: Mode debug
-            method: Méthode ("iccc2013" ou "shelfie")
-        """
-        if method == "iccc2013":
-            return self._detect_shelf_rows_iccc2013(image, debug)
-        else:
-            print(f"⚠️ Méthode '{method}' non reconnue, utilisation de 'iccc2013'")
-            return self._detect_shelf_rows_iccc2013(image, debug)
+    # === DÉTECTION DES TRANCHES (service partagé core/spine) ===
+    # Noms historiques de ce script -> méthodes du service partagé
+    SPINE_METHODS = {"shelfie": "vertical_lines", "iccc2013": "horizontal_shelves"}
 
     def _detect_spine_lines(self, image, debug=False, method="iccc2013"):
-        """Détecte les lignes de tranches selon différentes méthodes.
+        """Détecte les lignes de tranches via le service partagé (core/spine, mis en cache par image).
 
         Args:
             image: Image d'entrée
             debug: Mode debug
             method: Méthode ("iccc2013" ou "shelfie")
         """
-        if method == "shelfie":
-            return self._detect_spine_lines_shelfie(image, debug)
-        else:  # iccc2013
-            return self._detect_shelf_rows_iccc2013(image, debug)
+        spine_method = self.SPINE_METHODS.get(method, "horizontal_shelves")
+        return spine_service.detect(image, method=spine_method, debug=debug).lines
 
     def _group_texts_by_spine_lines(self, boxes, image, debug=False, method="iccc2013"):
         """Regroupe les textes par lignes de tranches détectées ou par proximité intelligente."""
@@ -10,7 +10,7 @@ Moteur OCR spécialisé pour EasyOCR avec détection de tranches.
 
 from .logic.orchestrator import EasyOCRProcessor
 from .logic.config import *
-from .models.line import Line
+from .models.line import Line, LineSet
 from .preprocessing.image_preprocessing import EasyOCRPreprocessing
 from .detection.spine_detection import EasyOCRSpineDetection
 from .grouping.text_grouping import EasyOCRTextGrouping
@@ -20,5 +20,6 @@ __all__ = [
     'EasyOCRPreprocessing',
     'EasyOCRSpineDetection',
     'EasyOCRTextGrouping',
-    'Line'
+    'Line',
+    'LineSet'
 ]
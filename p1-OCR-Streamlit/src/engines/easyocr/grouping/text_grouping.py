@@ -1,5 +1,5 @@
 # DÉPENDANCES:
-#   - Utilise: detection/spine_detection.py, logic/config.py
+#   - Utilise: core/spine (service de détection de tranches), logic/config.py
 #   - Importe: numpy
 #   - Utilisé par: logic/orchestrator.py
 
@@ -9,7 +9,7 @@ Module de regroupement intelligent des textes détectés.
 """
 
 import numpy as np
-from ..detection.spine_detection import EasyOCRSpineDetection
+from core.spine import LineSet, spine_service
 from ..logic.config import (
     MIN_SPINE_LINES_THRESHOLD, HORIZONTAL_GROUP_THRESHOLD_BASE,
     ADAPTIVE_THRESHOLD_MIN, ADAPTIVE_THRESHOLD_MAX,
@@ -22,13 +22,20 @@ class EasyOCRTextGrouping:
     """Utilitaires de regroupement de textes pour EasyOCR."""
 
     @staticmethod
-    def group_texts_by_spine_lines(boxes, image, debug=False, method="horizontal_shelves"):
-        """Regroupe les textes par lignes de tranches détectées ou par proximité intelligente."""
+    def group_texts_by_spine_lines(boxes, image, debug=False, method="horizontal_shelves", debug_sink=None,
+                                   spine_lines=None):
+        """
+        Regroupe les textes par lignes de tranches détectées ou par proximité intelligente.
+
+        Args:
+            spine_lines: Lignes déjà détectées (repère de l'image); détectées ici si None
+        """
         if not boxes:
             return boxes
 
         # Détecter les lignes de séparation
-        spine_lines = EasyOCRSpineDetection.detect_spine_lines(image, debug=debug, method=method)
+        if spine_lines is None:
+            spine_lines = spine_service.detect(image, method=method, debug=debug, debug_sink=debug_sink).lines
 
         print(f"🔍 [{method}] Lignes de tranches détectées: {len(spine_lines) if spine_lines else 0}")
 
@@ -49,121 +56,28 @@ class EasyOCRTextGrouping:
                 print("📋 ICCC2013: Aucune étagère détectée, regroupement par proximité horizontale uniquement")
                 return EasyOCRTextGrouping.group_by_proximity(boxes)
 
-        # Pour vertical_lines: lignes verticales → trier par X et créer des blocs horizontaux
-        # Pour horizontal_shelves: lignes horizontales → trier par Y et créer des blocs verticaux
+        # Pour vertical_lines: bloc = nombre de lignes de tranche à gauche du centre de la boîte
+        # (évaluées à la hauteur de la boîte, lignes inclinées comprises)
+        # Pour horizontal_shelves: bloc = nombre de rangées au-dessus du centre de la boîte
+        lines = LineSet.from_lines(spine_lines)
+        centers_x = np.array([box['x'] + box['width'] / 2 for box in boxes], dtype=np.float64)
+        centers_y = np.array([box['y'] + box['height'] / 2 for box in boxes], dtype=np.float64)
         if method == "vertical_lines":
-            # Trier les lignes par position X (horizontale)
-            spine_lines.sort(key=lambda line: line.center[0])
-
             if debug:
-                print(f"🔍 [Vertical Lines] Lignes de tranches triées par X: {[f'{line.center[0]:.0f}' for line in spine_lines]}")
-
-            # Créer des blocs entre les lignes verticales
-            blocks = [[] for _ in range(len(spine_lines) + 1)]
-
-            for box in boxes:
-                box_center_x = box['x'] + box['width'] / 2
-
-                # Trouver dans quel bloc mettre cette boîte
-                assigned = False
-                for i in range(len(spine_lines) + 1):
-                    if i == 0:
-                        # Premier bloc : à gauche de la première ligne
-                        if box_center_x < spine_lines[0].center[0]:
-                            blocks[i].append(box)
-                            assigned = True
-                            break
-                    elif i == len(spine_lines):
-                        # Dernier bloc : à droite de la dernière ligne
-                        if box_center_x >= spine_lines[-1].center[0]:
-                            blocks[i].append(box)
-                            assigned = True
-                            break
-                    else:
-                        # Bloc entre deux lignes verticales
-                        if spine_lines[i-1].center[0] <= box_center_x < spine_lines[i].center[0]:
-                            blocks[i].append(box)
-                            assigned = True
-                            break
-
-                if not assigned:
-                    # Par défaut, mettre dans le dernier bloc
-                    blocks[-1].append(box)
-
+                print(f"🔍 [Vertical Lines] Lignes de tranches triées par X: {[f'{x:.0f}' for x in np.sort(lines.cx)]}")
+            block_index = lines.columns(centers_x, centers_y)
         else:  # horizontal_shelves
-            # Trier les lignes par position Y (verticale)
-            spine_lines.sort(key=lambda line: line.center[1])
-
             if debug:
-                print(f"🔍 [Horizontal Shelves] Lignes de tranches triées par Y: {[f'{line.center[1]:.0f}' for line in spine_lines]}")
-
-            # Créer des blocs entre les lignes horizontales
-            blocks = [[] for _ in range(len(spine_lines) + 1)]
-
-            for box in boxes:
-                box_center_y = box['y'] + box['height'] / 2
-
-                # Trouver dans quel bloc mettre cette boîte
-                assigned = False
-                for i in range(len(spine_lines) + 1):
-                    if i == 0:
-                        # Premier bloc : au-dessus de la première ligne
-                        if box_center_y < spine_lines[0].center[1]:
-                            blocks[i].append(box)
-                            assigned = True
-                            break
-                    elif i == len(spine_lines):
-                        # Dernier bloc : en-dessous de la dernière ligne
-                        if box_center_y >= spine_lines[-1].center[1]:
-                            blocks[i].append(box)
-                            assigned = True
-                            break
-                    else:
-                        # Bloc entre deux lignes horizontales
-                        if spine_lines[i-1].center[1] <= box_center_y < spine_lines[i].center[1]:
-                            blocks[i].append(box)
-                            assigned = True
-                            break
-
-                if not assigned:
-                    # Par défaut, mettre dans le dernier bloc
-                    blocks[-1].append(box)
-
-        # Combiner les textes dans chaque bloc
-        grouped_boxes = []
-        for block in blocks:
-            if not block:
-                continue
-
-            if len(block) == 1:
-                grouped_boxes.append(block[0])
-            else:
-                # Trier par position horizontale
-                block.sort(key=lambda b: b['x'])
-
-                # Combiner les textes
-                combined_text = ' '.join([b['text'] for b in block])
-
-                # Calculer la boîte englobante
-                min_x = min([b['x'] for b in block])
-                max_x = max([b['x'] + b['width'] for b in block])
-                min_y = min([b['y'] for b in block])
-                max_y = max([b['y'] + b['height'] for b in block])
+                print(f"🔍 [Horizontal Shelves] Lignes de tranches triées par Y: {[f'{y:.0f}' for y in np.sort(lines.cy)]}")
+            block_index = lines.rows(centers_y)
 
-                # Confiance moyenne
-                avg_confidence = sum([b['confidence'] for b in block]) / len(block)
-
-                combined_box = {
-                    "text": combined_text,
-                    "x": min_x, "y": min_y,
-                    "width": max_x - min_x,
-                    "height": max_y - min_y,
-                    "font_size": max([b['height'] for b in block]),
-                    "is_vertical": any([b['is_vertical'] for b in block]),
-                    "confidence": avg_confidence
-                }
+        # Créer des blocs entre les lignes (ordre des lignes)
+        blocks = [[] for _ in range(len(lines) + 1)]
+        for box, index in zip(boxes, block_index):
+            blocks[index].append(box)
 
-                grouped_boxes.append(combined_box)
+        # Combiner les textes dans chaque bloc
+        grouped_boxes = [EasyOCRTextGrouping.combine_block(block) for block in blocks if block]
 
         if debug:
             print(f"🔍 Regroupement par lignes: {len(spine_lines)} lignes détectées, {len(grouped_boxes)} groupes créés")
@@ -173,6 +87,32 @@ class EasyOCRTextGrouping:
 
         return grouped_boxes
 
+    @staticmethod
+    def combine_block(block):
+        """Boîte unique d'un livre à partir des boîtes de texte de sa tranche."""
+        if len(block) == 1:
+            return block[0]
+
+        # Trier par position horizontale
+        block = sorted(block, key=lambda b: b['x'])
+
+        # Calculer la boîte englobante
+        min_x = min([b['x'] for b in block])
+        max_x = max([b['x'] + b['width'] for b in block])
+        min_y = min([b['y'] for b in block])
+        max_y = max([b['y'] + b['height'] for b in block])
+
+        return {
+            "text": ' '.join([b['text'] for b in block]),
+            "x": min_x, "y": min_y,
+            "width": max_x - min_x,
+            "height": max_y - min_y,
+            "font_size": max([b['height'] for b in block]),
+            "is_vertical": any([b['is_vertical'] for b in block]),
+            # Confiance moyenne
+            "confidence": sum([b['confidence'] for b in block]) / len(block)
+        }
+
     @staticmethod
     def group_by_proximity(boxes):
         """Regroupement par proximité horizontale (méthode de secours)."""
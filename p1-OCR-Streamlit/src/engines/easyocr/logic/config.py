@@ -1,5 +1,5 @@
 # DÉPENDANCES:
-#   - Utilise: Aucun (fichier de constantes)
+#   - Utilise: core/spine/config.py (constantes de détection de tranches)
 #   - Importe: Aucun
 #   - Utilisé par: orchestrator.py, __init__.py
 
@@ -26,15 +26,15 @@ OCR_ADJUST_CONTRAST = 0.7
 OCR_TEXT_THRESHOLD = 0.5
 OCR_LINK_THRESHOLD = 0.3
 
-# Paramètres de détection de tranches
-DOWNSAMPLE_FACTOR = 3
-GAUSSIAN_BLUR_SIGMA = 3
-BINARIZE_CUTOFF_FACTOR = 100.0
-VERTICAL_ERODE_LENGTH = 50
-VERTICAL_ERODE_ITERATIONS = 1
-VERTICAL_DILATE_LENGTH = 10
-VERTICAL_DILATE_ITERATIONS = 1
-SHORT_CLUSTER_THRESHOLD_FRACTION = 0.30
+# Paramètres de détection de tranches (service partagé core/spine)
+from core.spine.config import (  # noqa: F401
+    DOWNSAMPLE_FACTOR, GAUSSIAN_BLUR_SIGMA, BINARIZE_CUTOFF_FACTOR,
+    VERTICAL_ERODE_LENGTH, VERTICAL_ERODE_ITERATIONS,
+    VERTICAL_DILATE_LENGTH, VERTICAL_DILATE_ITERATIONS,
+    SHORT_CLUSTER_THRESHOLD_FRACTION, CANNY_MIN, CANNY_MAX,
+    ICCC_PIXEL_THRESHOLD_RATIO, ICCC_DILATE_WIDTH, ICCC_DILATE_HEIGHT,
+    ICCC_MIN_HEIGHT_RATIO
+)
 
 # Paramètres de regroupement
 MIN_SPINE_LINES_THRESHOLD = 5
@@ -45,11 +45,3 @@ FONT_SIZE_RATIO_STRICT = 1.5
 FONT_SIZE_RATIO_TOLERANT = 0.7
 FONT_SIZE_STRICT_MULTIPLIER = 0.75
 FONT_SIZE_TOLERANT_MULTIPLIER = 1.25
-
-# Paramètres ICCC 2013
-CANNY_MIN = 50
-CANNY_MAX = 150
-ICCC_PIXEL_THRESHOLD_RATIO = 0.5
-ICCC_DILATE_WIDTH = 1
-ICCC_DILATE_HEIGHT = 3
-ICCC_MIN_HEIGHT_RATIO = 0.05
\ No newline at end of file
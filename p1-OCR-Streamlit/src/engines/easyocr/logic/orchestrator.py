@@ -1,5 +1,6 @@
 # DÉPENDANCES:
-#   - Utilise: preprocessing/image_preprocessing.py, detection/spine_detection.py, grouping/text_grouping.py, config.py
+#   - Utilise: preprocessing/image_preprocessing.py, grouping/text_grouping.py, config.py, core/spine (tranches),
+#              core/instrumentation.py, core/resolution.py, core/image_loading.py, core/tiling.py
 #   - Importe: numpy, cv2 (opencv), PIL (Pillow)
 #   - Utilisé par: __init__.py, main.py
 
@@ -11,59 +12,176 @@ Processeur OCR spécialisé pour EasyOCR avec détection de tranches.
 import numpy as np
 import cv2
 from PIL import Image
+from core.instrumentation import span
+from core.resolution import ResolutionPolicy, scale_easyocr_lists
+from core.image_loading import to_bgr
+from core.tiling import TileExecutor, merge_text_results
+from core.spine import LineSet, spine_service
 from ..preprocessing.image_preprocessing import EasyOCRPreprocessing
-from ..detection.spine_detection import EasyOCRSpineDetection
 from ..grouping.text_grouping import EasyOCRTextGrouping
 from .config import (
     OCR_WIDTH_THS, OCR_HEIGHT_THS, OCR_CONTRAST_THS,
-    OCR_ADJUST_CONTRAST, OCR_TEXT_THRESHOLD, OCR_LINK_THRESHOLD
+    OCR_ADJUST_CONTRAST, OCR_TEXT_THRESHOLD, OCR_LINK_THRESHOLD,
+    MIN_SPINE_LINES_THRESHOLD
 )
 
 
 class EasyOCRProcessor:
     """Processeur OCR spécialisé pour EasyOCR avec détection de tranches."""
 
-    def __init__(self, languages, confidence_threshold, use_gpu=False):
-        """Initialise EasyOCR."""
+    def __init__(self, languages, confidence_threshold, use_gpu=False, debug_sink=None, resolution_policy=None,
+                 tile_executor=None):
+        """
+        Initialise EasyOCR.
+
+        Args:
+            debug_sink: DebugSink optionnel recevant les étapes de la détection de tranches
+            resolution_policy: ResolutionPolicy (réduction avant détection, défaut: grand côté 2048 px,
+                petit côté 1024 px pour un panorama)
+            tile_executor: TileExecutor (découpage des images de détection plus grandes qu'une tuile)
+        """
         try:
             import easyocr
         except ImportError as e:
             raise ImportError(f"EasyOCR nécessite des dépendances manquantes: {e}")
 
         self.confidence_threshold = confidence_threshold
+        self.debug_sink = debug_sink
+        self.resolution_policy = resolution_policy or ResolutionPolicy()
+        self.tile_executor = tile_executor or TileExecutor()
         self.reader = easyocr.Reader(languages, gpu=use_gpu)
         device = "GPU" if use_gpu else "CPU"
         print(f"🔍 EasyOCR initialisé - Langues: {languages}, Seuil: {confidence_threshold}, Device: {device}")
 
     def detect_text(self, pil_image, preprocess=True):
-        """Détecte le texte avec EasyOCR."""
-        image_array = np.array(pil_image)
-        bgr_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
+        """
+        Détecte le texte avec EasyOCR.
 
-        # Prétraitement si demandé
-        if preprocess:
-            bgr_image = EasyOCRPreprocessing.preprocess_image(bgr_image)
+        La détection se fait sur l'image réduite par la politique de résolution;
+        si une résolution de reconnaissance distincte est configurée, seules les
+        zones détectées sont relues à cette résolution. Les boîtes retournées sont
+        dans le repère de l'image d'origine.
+
+        Args:
+            pil_image: PIL.Image, ou tableau BGR déjà décodé (core.image_loading)
+        """
+        bgr_image = to_bgr(pil_image)
+
+        # Réduction avant détection
+        with span('easyocr.resize'):
+            detection = self.resolution_policy.for_detection(bgr_image)
+            recognition = self.resolution_policy.for_recognition(bgr_image, detection)
 
         # Détection OCR avec paramètres optimisés pour texte vertical
-        results = self.reader.readtext(
-            bgr_image,
-            rotation_info=[0, 90, 180, 270],
-            width_ths=OCR_WIDTH_THS,
-            height_ths=OCR_HEIGHT_THS,
-            contrast_ths=OCR_CONTRAST_THS,
-            adjust_contrast=OCR_ADJUST_CONTRAST,
-            text_threshold=OCR_TEXT_THRESHOLD,
-            link_threshold=OCR_LINK_THRESHOLD
-        )
-
-        # Filtrage par confiance et longueur
+        rotation_info = [0, 90, 180, 270]
+        if self.tile_executor.should_tile(detection.image.shape):
+            results = self._read_tiles(detection, recognition, preprocess, rotation_info)
+        else:
+            results = self._read(detection.image, recognition.image, recognition is detection,
+                                 recognition.scale / detection.scale, preprocess, rotation_info)
+
+        # Filtrage par confiance et longueur, coordonnées ramenées à l'original
         filtered_results = [
-            r for r in results
-            if r[2] >= self.confidence_threshold and len(r[1].strip()) >= 2
+            (recognition.polygon_to_original(bbox), text, confidence)
+            for bbox, text, confidence in results
+            if confidence >= self.confidence_threshold and len(text.strip()) >= 2
         ]
 
         return filtered_results
 
+    def _read(self, detection_image, recognition_image, shared, factor, preprocess, rotation_info):
+        """
+        Prétraitement, détection et reconnaissance d'une image (ou d'une tuile).
+
+        Args:
+            shared: Vrai si la reconnaissance utilise l'image de détection
+            factor: Échelle de l'image de reconnaissance par rapport à celle de détection
+
+        Returns:
+            list: [(bbox, text, confidence)] dans le repère de l'image de reconnaissance
+        """
+        # Prétraitement si demandé
+        if preprocess:
+            with span('easyocr.preprocessing'):
+                detection_image = EasyOCRPreprocessing.preprocess_image(detection_image)
+                if shared:
+                    recognition_image = detection_image
+                else:
+                    recognition_image = EasyOCRPreprocessing.preprocess_image(recognition_image)
+
+        if shared:
+            with span('easyocr.detection_recognition') as s:
+                results = self.reader.readtext(
+                    detection_image,
+                    rotation_info=rotation_info,
+                    width_ths=OCR_WIDTH_THS,
+                    height_ths=OCR_HEIGHT_THS,
+                    contrast_ths=OCR_CONTRAST_THS,
+                    adjust_contrast=OCR_ADJUST_CONTRAST,
+                    text_threshold=OCR_TEXT_THRESHOLD,
+                    link_threshold=OCR_LINK_THRESHOLD
+                )
+                s.set(raw_results=len(results))
+            return results
+        return self._detect_then_recognize(detection_image, recognition_image, factor, rotation_info)
+
+    def _read_tiles(self, detection, recognition, preprocess, rotation_info):
+        """
+        Lecture tuile par tuile d'une très grande image: chaque tuile est une vue
+        de l'image de détection (et de la zone correspondante de l'image de
+        reconnaissance). Les boîtes en double dans les recouvrements sont fusionnées.
+        """
+        shared = recognition is detection
+        factor = recognition.scale / detection.scale
+
+        def read_tile(tile):
+            detection_tile = tile.crop(detection.image)
+            recognition_tile = detection_tile if shared else tile.crop(recognition.image, factor)
+            results = self._read(detection_tile, recognition_tile, shared, factor, preprocess, rotation_info)
+            return [(tile.polygon_to_image(bbox, factor), text, confidence, tile.touches_seam(bbox, factor))
+                    for bbox, text, confidence in results]
+
+        tiles = self.tile_executor.tiles(detection.image.shape)
+        per_tile = self.tile_executor.run(read_tile, tiles, name='easyocr.tiling')
+        return merge_text_results([result for results in per_tile for result in results])
+
+    def _detect_then_recognize(self, detection_image, recognition_image, factor, rotation_info):
+        """Détection sur l'image réduite, reconnaissance des zones à la résolution de reconnaissance."""
+        horizontal_list, free_list = self._detect_regions(detection_image)
+        horizontal_list, free_list = scale_easyocr_lists(horizontal_list, free_list, factor)
+        return self._recognize_regions(recognition_image, horizontal_list, free_list, rotation_info)
+
+    def _detect_regions(self, detection_image):
+        """Zones de texte (reader.detect): (horizontal_list, free_list) dans le repère de l'image."""
+        with span('easyocr.detection') as s:
+            horizontal_list, free_list = self.reader.detect(
+                detection_image,
+                width_ths=OCR_WIDTH_THS,
+                height_ths=OCR_HEIGHT_THS,
+                text_threshold=OCR_TEXT_THRESHOLD,
+                link_threshold=OCR_LINK_THRESHOLD
+            )
+            # reader.detect traite un lot d'images: une seule ici
+            horizontal_list, free_list = horizontal_list[0], free_list[0]
+            s.set(regions=len(horizontal_list) + len(free_list))
+        return horizontal_list, free_list
+
+    def _recognize_regions(self, recognition_image, horizontal_list, free_list, rotation_info, **span_attrs):
+        """Reconnaissance des zones données (reader.recognize)."""
+        if recognition_image.ndim == 3:
+            recognition_image = cv2.cvtColor(recognition_image, cv2.COLOR_BGR2GRAY)
+        with span('easyocr.recognition', **span_attrs) as s:
+            results = self.reader.recognize(
+                recognition_image,
+                horizontal_list=horizontal_list,
+                free_list=free_list,
+                rotation_info=rotation_info,
+                contrast_ths=OCR_CONTRAST_THS,
+                adjust_contrast=OCR_ADJUST_CONTRAST
+            )
+            s.set(raw_results=len(results))
+        return results
+
     def get_text_and_confidence(self, pil_image, preprocess=True, use_spine_detection=True, reference_titles=None, spine_method="vertical_lines"):
         """Extrait le texte et la confiance moyenne."""
         boxes = self.get_boxes(pil_image, preprocess=preprocess, use_spine_detection=use_spine_detection, reference_titles=reference_titles, spine_method=spine_method)
@@ -76,44 +194,108 @@ class EasyOCRProcessor:
 
         return full_text, avg_confidence
 
-    def get_boxes(self, pil_image, preprocess=True, vertical_only=False, use_spine_detection=True, debug=False, reference_titles=None, spine_method="vertical_lines"):
+    def get_boxes(self, pil_image, preprocess=True, vertical_only=False, use_spine_detection=True, debug=False, reference_titles=None, spine_method="vertical_lines", debug_sink=None):
         """Extrait les boîtes de texte avec coordonnées, groupées par livre."""
-        results = self.detect_text(pil_image, preprocess=preprocess)
+        # Conversion unique, partagée par l'OCR et la détection de tranches
+        bgr_image = to_bgr(pil_image)
+        results = self.detect_text(bgr_image, preprocess=preprocess)
 
-        boxes = []
-        for bbox, text, confidence in results:
-            # Calcul des dimensions
-            x = min([p[0] for p in bbox])
-            y = min([p[1] for p in bbox])
-            width = max([p[0] for p in bbox]) - x
-            height = max([p[1] for p in bbox]) - y
-            font_size = height
+        boxes = [self._to_box(bbox, text, confidence) for bbox, text, confidence in results]
+        if vertical_only:
+            boxes = [box for box in boxes if box['is_vertical']]
 
-            # Détection verticale
-            is_vertical = height > width * 1.5
+        # Regrouper les boîtes par livre
+        with span('easyocr.grouping', boxes=len(boxes)):
+            if boxes and use_spine_detection:
+                # Lignes détectées sur l'image réduite (service partagé, résultat réutilisé
+                # par les autres moteurs sur la même image) puis ramenées à l'original
+                detection = self.resolution_policy.for_detection(bgr_image)
+                spines = spine_service.detect(
+                    detection.image, method=spine_method, tile_executor=self.tile_executor,
+                    debug=debug, debug_sink=debug_sink or self.debug_sink
+                )
+                spine_lines = detection.lines_to_original(spines.lines)
+
+                # Utiliser le regroupement par lignes de tranches
+                boxes = EasyOCRTextGrouping.group_texts_by_spine_lines(
+                    boxes, bgr_image, debug=debug, method=spine_method,
+                    spine_lines=spine_lines
+                )
+            elif boxes:
+                # Méthode de secours par proximité
+                boxes = EasyOCRTextGrouping.group_by_proximity(boxes)
+
+        return boxes
+
+    def iter_books(self, pil_image, preprocess=True, spine_method="vertical_lines", debug=False):
+        """
+        Générateur des boîtes par livre, produites au fur et à mesure.
 
-            if vertical_only and not is_vertical:
+        Avec les tranches verticales, la détection de texte (rapide) couvre toute
+        l'image, les zones sont réparties par tranche, puis la reconnaissance
+        (l'étape coûteuse) est lancée tranche par tranche de gauche à droite:
+        chaque livre est produit dès que sa tranche est reconnue. Sinon (rangées
+        horizontales, image découpée en tuiles, trop peu de tranches), les groupes
+        de get_boxes sont produits à la fin de l'analyse.
+        """
+        bgr_image = to_bgr(pil_image)
+        with span('easyocr.resize'):
+            detection = self.resolution_policy.for_detection(bgr_image)
+            recognition = self.resolution_policy.for_recognition(bgr_image, detection)
+
+        lines = None
+        if spine_method == "vertical_lines" and not self.tile_executor.should_tile(detection.image.shape):
+            spines = spine_service.detect(detection.image, method=spine_method, debug=debug,
+                                          debug_sink=self.debug_sink)
+            lines = LineSet.from_lines(spines.lines)
+        if lines is None or len(lines) < MIN_SPINE_LINES_THRESHOLD:
+            yield from self.get_boxes(bgr_image, preprocess=preprocess, debug=debug, spine_method=spine_method)
+            return
+
+        detection_image, recognition_image = detection.image, recognition.image
+        if preprocess:
+            with span('easyocr.preprocessing'):
+                detection_image = EasyOCRPreprocessing.preprocess_image(detection_image)
+                recognition_image = (detection_image if recognition is detection
+                                     else EasyOCRPreprocessing.preprocess_image(recognition_image))
+
+        # Zones de texte réparties par tranche (centres dans le repère de détection)
+        horizontal_list, free_list = self._detect_regions(detection_image)
+        horizontal_columns = lines.columns(
+            [(box[0] + box[1]) / 2 for box in horizontal_list], [(box[2] + box[3]) / 2 for box in horizontal_list])
+        free_columns = lines.columns(
+            [np.mean([p[0] for p in poly]) for poly in free_list], [np.mean([p[1] for p in poly]) for poly in free_list])
+        horizontal_list, free_list = scale_easyocr_lists(horizontal_list, free_list,
+                                                         recognition.scale / detection.scale)
+
+        rotation_info = [0, 90, 180, 270]
+        for column in range(len(lines) + 1):
+            horizontal = [box for box, c in zip(horizontal_list, horizontal_columns) if c == column]
+            free = [poly for poly, c in zip(free_list, free_columns) if c == column]
+            if not horizontal and not free:
                 continue
+            results = self._recognize_regions(recognition_image, horizontal, free, rotation_info, column=column)
+            boxes = [self._to_box(recognition.polygon_to_original(bbox), text, confidence)
+                     for bbox, text, confidence in results
+                     if confidence >= self.confidence_threshold and len(text.strip()) >= 2]
+            if boxes:
+                yield EasyOCRTextGrouping.combine_block(boxes)
 
-            boxes.append({
-                "text": text,
-                "x": x, "y": y,
-                "width": width, "height": height,
-                "font_size": font_size,
-                "is_vertical": is_vertical,
-                "confidence": confidence
-            })
+    @staticmethod
+    def _to_box(bbox, text, confidence):
+        """Boîte ShelfReader depuis un résultat EasyOCR (bbox, texte, confiance)."""
+        # Calcul des dimensions
+        x = min([p[0] for p in bbox])
+        y = min([p[1] for p in bbox])
+        width = max([p[0] for p in bbox]) - x
+        height = max([p[1] for p in bbox]) - y
 
-        # Regrouper les boîtes par livre
-        if boxes and use_spine_detection:
-            # Convertir l'image PIL en numpy array pour la détection de lignes
-            image_array = np.array(pil_image)
-            bgr_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
-
-            # Utiliser le regroupement par lignes de tranches
-            boxes = EasyOCRTextGrouping.group_texts_by_spine_lines(boxes, bgr_image, debug=debug, method=spine_method)
-        elif boxes:
-            # Méthode de secours par proximité
-            boxes = EasyOCRTextGrouping.group_by_proximity(boxes)
-
-        return boxes
\ No newline at end of file
+        return {
+            "text": text,
+            "x": x, "y": y,
+            "width": width, "height": height,
+            "font_size": height,
+            # Détection verticale
+            "is_vertical": height > width * 1.5,
+            "confidence": confidence
+        }
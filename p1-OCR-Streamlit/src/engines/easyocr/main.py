@@ -23,6 +23,12 @@ src_dir = current_dir.parent.parent  # Remonter à src/
 sys.path.insert(0, str(src_dir))
 
 from engines.easyocr import EasyOCRProcessor
+from core.debug_sink import DiskDebugSink
+from core.resolution import ResolutionPolicy, add_resolution_arguments
+from services.catalog_store import add_catalog_arguments, record_scan
+from services.parquet_export import add_parquet_arguments, export_results
+from core.instrumentation import tracer
+from core.tiling import TileExecutor, add_tiling_arguments
 
 def main():
     parser = argparse.ArgumentParser(
@@ -33,6 +39,7 @@ Exemples d'utilisation:
   python main.py image.jpg
   python main.py image.jpg --lang fr --confidence 0.7 --gpu
   python main.py image.jpg --benchmark
+  python main.py image.jpg --debug-dir debug_out --debug-sample 10
         """
     )
 
@@ -54,6 +61,14 @@ Exemples d'utilisation:
                        help='Méthode de détection de tranches (défaut: vertical_lines)')
     parser.add_argument('--output', type=str,
                        help='Fichier de sortie pour les résultats (JSON)')
+    parser.add_argument('--debug-dir', type=str,
+                       help='Dossier où écrire les étapes de détection (PNG + temps), sans fenêtre')
+    parser.add_argument('--debug-sample', type=int, default=1,
+                       help='Échantillonnage du debug sur disque: 1 image sur N (défaut: 1)')
+    add_resolution_arguments(parser)
+    add_catalog_arguments(parser)
+    add_parquet_arguments(parser)
+    add_tiling_arguments(parser)
 
     args = parser.parse_args()
 
@@ -92,11 +107,18 @@ Exemples d'utilisation:
         print(f"   Seuil de confiance: {args.confidence}")
         print(f"   Device: {'GPU' if use_gpu else 'CPU'}")
 
+        debug_sink = None
+        if args.debug_dir:
+            debug_sink = DiskDebugSink(args.debug_dir, sample_every=args.debug_sample)
+
         start_init = time.time()
         processor = EasyOCRProcessor(
             languages=args.lang,
             confidence_threshold=args.confidence,
-            use_gpu=use_gpu
+            use_gpu=use_gpu,
+            debug_sink=debug_sink,
+            resolution_policy=ResolutionPolicy.from_args(args),
+            tile_executor=TileExecutor.from_args(args)
         )
         init_time = time.time() - start_init
         print(f"   Temps d'initialisation: {init_time:.2f}s")
@@ -104,8 +126,13 @@ Exemples d'utilisation:
         print("🔍 Analyse de l'image en cours...")
         start_process = time.time()
         pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        results = processor.get_boxes(pil_image, preprocess=False, use_spine_detection=True, debug=args.debug, spine_method=args.spine_method)
+        # Trace par étape pour l'export Parquet (ou si SHELFREADER_TRACE=1)
+        with tracer.request('easyocr', enabled=bool(args.parquet_dir) or None) as trace:
+            results = processor.get_boxes(pil_image, preprocess=False, use_spine_detection=True, debug=args.debug, spine_method=args.spine_method)
         process_time = time.time() - start_process
+        if debug_sink:
+            debug_sink.close()
+            print(f"🐛 Étapes de détection écrites dans: {args.debug_dir}")
 
         # Afficher les résultats
         print(f"\n📋 RÉSULTATS ({len(results)} éléments trouvés)")
@@ -212,6 +239,13 @@ Exemples d'utilisation:
                 json.dump(output_data, f, indent=2, ensure_ascii=False)
             print(f"💾 Résultats sauvegardés dans: {args.output}")
 
+        # Inventaire persistant (--catalog)
+        record_scan(args, results, 'easyocr')
+
+        # Export colonnaire (--parquet-dir)
+        export_results(args, results, 'easyocr', timings={'init': init_time, 'process': process_time},
+                       trace=trace)
+
         print("\n✅ Traitement terminé avec succès!")
         return 0
 
@@ -1,31 +1,13 @@
 # DÉPENDANCES:
-#   - Utilise: Aucun (structure de données simple)
+#   - Utilise: core/spine/line.py
 #   - Importe: Aucun
-#   - Utilisé par: detection/spine_detection.py, __init__.py
+#   - Utilisé par: __init__.py
 
 """
 ShelfReader - EasyOCR Line Model
-Classe représentant une ligne détectée dans l'image.
+Lignes de tranche (Line, LineSet), définies dans le service de détection partagé (core/spine).
 """
 
-class Line(object):
-    """Classe représentant une ligne détectée (bord de tranche de livre)."""
+from core.spine.line import Line, LineSet
 
-    def __init__(self, slope, intercept, center, min_x, max_x, min_y, max_y):
-        self.m = slope  # pente
-        self.b = intercept  # ordonnée à l'origine
-        self.center = center  # centre de la ligne
-        self.min_x = min_x
-        self.max_x = max_x
-        self.min_y = min_y
-        self.max_y = max_y
-        self.vertical_threshold = 1000  # seuil pour considérer une ligne comme verticale
-
-    def x(self, y):
-        """Retourne la coordonnée x de la ligne à la position y."""
-        # Ligne verticale
-        if self.m > self.vertical_threshold:
-            return self.center[0]
-        # Ligne normale
-        else:
-            return (y - self.b) / self.m
\ No newline at end of file
+__all__ = ['Line', 'LineSet']
@@ -1,14 +1,47 @@
+# DÉPENDANCES:
+#   - Utilise: core/spine (service de détection de tranches partagé, largeur minimale et marge)
+#   - Importe: Aucun
+#   - Utilisé par: logic/orchestrator.py, __init__.py
+
 """
 ShelfReader - Tesseract Spine Detection
-Module simplifié de détection pour Tesseract (pas de détection avancée).
+Régions de tranches pour Tesseract: lignes et quadrilatères du service de
+tranches partagé (méthode Shelfie) et redressement de chaque tranche.
 """
 
+from core.spine import spine_service, spine_regions, upright_crops
+from core.spine.config import MIN_SPINE_WIDTH, SPINE_PADDING
+
+
 class TesseractSpineDetection:
-    """Détection simplifiée pour Tesseract - pas de détection de tranches sophistiquée."""
+    """Régions de tranches et redressement pour la reconnaissance ligne par ligne."""
 
     @staticmethod
-    def detect_spine_lines(image, debug=False, method="simple"):
-        """Tesseract n'a pas de détection de tranches avancée."""
-        if debug:
-            print("🔍 Tesseract: pas de détection de tranches disponible")
-        return []
\ No newline at end of file
+    def detect_spines(image, debug=False):
+        """Lignes et quadrilatères par livre (SpineResult), partagés avec les autres moteurs."""
+        return spine_service.detect(image, method="vertical_lines", debug=debug)
+
+    @staticmethod
+    def detect_spine_lines(image, debug=False, method="vertical_lines"):
+        """Lignes de tranches ('vertical_lines') ou d'étagères ('horizontal_shelves'), via le service partagé."""
+        return spine_service.detect(image, method=method, debug=debug).lines
+
+    @staticmethod
+    def spine_regions(lines, shape, min_width=MIN_SPINE_WIDTH):
+        """
+        Quadrilatères entre lignes de tranches voisines (bords de l'image inclus).
+
+        Returns:
+            list: Tableaux float32 (4, 2) [haut-gauche, haut-droit, bas-droit, bas-gauche]
+        """
+        return spine_regions(lines, shape, min_width)
+
+    @staticmethod
+    def upright_crops(image, quad, padding=SPINE_PADDING):
+        """
+        Redresse une tranche dans les deux sens de lecture.
+
+        Returns:
+            tuple: (lecture bas->haut, lecture haut->bas)
+        """
+        return upright_crops(image, quad, padding)
@@ -0,0 +1,198 @@
+# DÉPENDANCES:
+#   - Utilise: core/instrumentation.py
+#   - Importe: cv2, numpy, threading, shlex, tesserocr (optionnel), pytesseract (optionnel)
+#   - Utilisé par: logic/orchestrator.py, main.py
+
+"""
+ShelfReader - Tesseract Backends
+Accès à Tesseract: API C persistante (tesserocr) ou processus externe (pytesseract).
+
+pytesseract écrit une image temporaire, lance le binaire `tesseract`, recharge
+les traineddata et relit une sortie TSV à chaque appel. Le backend tesserocr
+garde une instance TessBaseAPI initialisée par thread, lui passe directement le
+buffer numpy et lit les boîtes et confiances des mots sans passer par le disque.
+
+Les deux backends retournent le même dictionnaire que
+pytesseract.image_to_data(..., output_type=Output.DICT).
+"""
+
+import shlex
+import threading
+
+import cv2
+import numpy as np
+
+from core.instrumentation import count
+
+BACKENDS = ('auto', 'tesserocr', 'pytesseract')
+DEFAULT_BACKEND = 'auto'
+
+
+def parse_config(config):
+    """
+    Analyse une configuration de type ligne de commande Tesseract.
+
+    Returns:
+        tuple: (psm ou None, {variable: valeur}) pour '--psm 7 -c tessedit_char_whitelist=ABC'
+    """
+    psm, variables = None, {}
+    tokens = shlex.split(config or '')
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '--psm' and i + 1 < len(tokens):
+            psm = int(tokens[i + 1])
+            i += 1
+        elif token.startswith('--psm='):
+            psm = int(token.split('=', 1)[1])
+        elif token == '-c' and i + 1 < len(tokens) and '=' in tokens[i + 1]:
+            name, value = tokens[i + 1].split('=', 1)
+            variables[name] = value
+            i += 1
+        i += 1
+    return psm, variables
+
+
+def _lang_string(languages):
+    return '+'.join(languages) if isinstance(languages, (list, tuple)) else languages
+
+
+def _empty_data():
+    return {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+
+
+class PytesseractBackend:
+    """Backend historique: un processus `tesseract` par appel."""
+
+    name = 'pytesseract'
+
+    def __init__(self, languages):
+        import pytesseract
+        from pytesseract import Output
+        self._pytesseract = pytesseract
+        self._output = Output
+        self.lang = _lang_string(languages)
+
+    def image_to_data(self, image, config=''):
+        count('tesseract.subprocess_calls')
+        return self._pytesseract.image_to_data(image, config=config, lang=self.lang,
+                                               output_type=self._output.DICT)
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend:
+    """
+    API C de Tesseract via tesserocr, une instance TessBaseAPI par thread.
+
+    TessBaseAPI n'est pas réentrante: chaque thread du pool de reconnaissance
+    initialise la sienne au premier appel (chargement des traineddata une fois
+    par thread) puis la réutilise pour toutes les images suivantes.
+
+    Les variables passées par `-c` restent actives sur l'instance: leurs
+    valeurs précédentes sont rétablies après chaque appel. Sans `--psm`, le
+    mode par défaut est celui du binaire tesseract (3, comme pytesseract).
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, languages, default_psm=3):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.lang = _lang_string(languages)
+        self.default_psm = default_psm
+        self._local = threading.local()
+        self._instances = []
+        self._lock = threading.Lock()
+
+    def _api(self):
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = self._tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+            with self._lock:
+                self._instances.append(api)
+            count('tesseract.api_instances')
+        return api
+
+    @staticmethod
+    def _set_image(api, image):
+        """Passe le buffer numpy à Tesseract (niveaux de gris ou RGB, 8 bits)."""
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+    def image_to_data(self, image, config=''):
+        tesserocr = self._tesserocr
+        psm, variables = parse_config(config)
+        api = self._api()
+        count('tesseract.api_calls')
+
+        api.SetPageSegMode(psm if psm is not None else self.default_psm)
+        previous = {}
+        for name, value in variables.items():
+            current = api.GetVariableAsString(name)
+            if current is not None and api.SetVariable(name, value):
+                previous[name] = current
+        try:
+            self._set_image(api, np.asarray(image))
+            api.Recognize()
+            data = _empty_data()
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+            level = tesserocr.RIL.WORD
+            for word in tesserocr.iterate_level(iterator, level):
+                text = word.GetUTF8Text(level)
+                box = word.BoundingBox(level)
+                if text is None or box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                data['text'].append(text)
+                data['conf'].append(word.Confidence(level))
+                data['left'].append(x1)
+                data['top'].append(y1)
+                data['width'].append(x2 - x1)
+                data['height'].append(y2 - y1)
+            return data
+        finally:
+            # Libère les résultats de reconnaissance, garde le modèle chargé
+            api.Clear()
+            for name, value in previous.items():
+                api.SetVariable(name, value)
+
+    def close(self):
+        """Libère toutes les instances TessBaseAPI (tous threads)."""
+        with self._lock:
+            for api in self._instances:
+                api.End()
+            self._instances = []
+        self._local = threading.local()
+
+
+def create_backend(name=DEFAULT_BACKEND, languages='eng'):
+    """
+    Crée le backend demandé.
+
+    Args:
+        name: 'auto' (tesserocr si installé, sinon pytesseract), 'tesserocr', 'pytesseract',
+            ou un backend déjà construit (objet exposant image_to_data et close)
+
+    Raises:
+        ImportError: Si le backend demandé (ou aucun backend en mode auto) n'est disponible
+    """
+    if not isinstance(name, str):
+        return name
+    if name not in BACKENDS:
+        raise ValueError(f"Backend Tesseract inconnu : {name} (choix : {', '.join(BACKENDS)})")
+    if name in ('auto', 'tesserocr'):
+        try:
+            return TesserocrBackend(languages)
+        except ImportError:
+            if name == 'tesserocr':
+                raise
+    return PytesseractBackend(languages)
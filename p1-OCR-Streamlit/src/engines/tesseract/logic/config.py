@@ -1,5 +1,5 @@
 # DÉPENDANCES:
-#   - Utilise: Aucun (fichier de constantes)
+#   - Utilise: Aucun
 #   - Importe: Aucun
 #   - Utilisé par: orchestrator.py, __init__.py
 
@@ -20,6 +20,22 @@ PSM_CONFIGS = [
     '--psm 6',  # Texte uniforme - le plus rapide et efficace
 ]
 
+# Reconnaissance par tranche (régions, largeur minimale et marge: core/spine/config.py)
+SPINE_PSM_CONFIG = '--psm 7'  # Une seule ligne de texte par tranche redressée
+MIN_SPINE_REGIONS = 2  # En dessous, analyse de la page entière
+SPINE_WORKERS = None  # Threads de reconnaissance (None = nombre de cœurs)
+
+# Recherche concurrente (PSM x variantes de prétraitement) avec arrêt anticipé
+SEARCH_PSM_CONFIGS = [
+    '--psm 6',   # Bloc uniforme (le plus rapide, essayé en premier)
+    '--psm 11',  # Texte épars (titres dispersés sur les tranches)
+    '--psm 3',   # Segmentation automatique complète (la plus lente)
+]
+TARGET_CONFIDENCE = 0.80  # Confiance moyenne suffisante pour arrêter la recherche (0-1)
+TARGET_COVERAGE = 0.50  # Fraction de la largeur de l'image couverte par les boîtes retenues
+SEARCH_WORKERS = None  # Combinaisons évaluées en parallèle (None = nombre de cœurs)
+SPINE_TARGET_CONFIDENCE = 0.85  # Tranche: second sens de lecture ignoré au-delà de cette confiance
+
 # Paramètres de filtrage
 MAX_RESULTS = 15
 MIN_TEXT_LENGTH = 2
\ No newline at end of file
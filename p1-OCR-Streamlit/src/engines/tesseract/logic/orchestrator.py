@@ -1,6 +1,8 @@
 # DÉPENDANCES:
-#   - Utilise: preprocessing/image_preprocessing.py, grouping/text_grouping.py, config.py
-#   - Importe: numpy, cv2 (opencv), PIL (Pillow), pytesseract
+#   - Utilise: preprocessing/image_preprocessing.py, grouping/text_grouping.py, detection/spine_detection.py (core/spine),
+#              config.py, backends.py,
+#              core/instrumentation.py, core/resolution.py, core/image_loading.py
+#   - Importe: numpy, cv2 (opencv), PIL (Pillow), os, threading, concurrent.futures
 #   - Utilisé par: __init__.py, main.py
 
 """
@@ -8,47 +10,101 @@ ShelfReader - Tesseract OCR Processor
 Processeur OCR spécialisé pour Tesseract.
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import numpy as np
 import cv2
 from PIL import Image
-import pytesseract
-from pytesseract import Output
+from core.instrumentation import span, count, tracer
+from core.resolution import ResolutionPolicy
+from core.image_loading import to_bgr
 from ..preprocessing.image_preprocessing import TesseractPreprocessing
 from ..grouping.text_grouping import TesseractTextGrouping
-from .config import PSM_CONFIGS, MAX_RESULTS, MIN_TEXT_LENGTH
+from ..detection.spine_detection import TesseractSpineDetection
+from .config import (
+    PSM_CONFIGS, MAX_RESULTS, MIN_TEXT_LENGTH,
+    SPINE_PSM_CONFIG, MIN_SPINE_REGIONS, SPINE_WORKERS, SPINE_TARGET_CONFIDENCE,
+    SEARCH_PSM_CONFIGS, TARGET_CONFIDENCE, TARGET_COVERAGE, SEARCH_WORKERS
+)
+from .backends import create_backend, DEFAULT_BACKEND
 
 
 class TesseractOCRProcessor:
     """Processeur OCR spécialisé pour Tesseract."""
 
-    def __init__(self, languages, confidence_threshold, use_gpu=False):
-        """Initialise Tesseract."""
+    def __init__(self, languages, confidence_threshold, use_gpu=False, resolution_policy=None,
+                 backend=DEFAULT_BACKEND, per_spine=True, spine_workers=SPINE_WORKERS,
+                 psm_configs=None, variant_search=False, target_confidence=TARGET_CONFIDENCE,
+                 target_coverage=TARGET_COVERAGE, search_workers=SEARCH_WORKERS):
+        """
+        Initialise Tesseract.
+
+        Args:
+            resolution_policy: ResolutionPolicy (réduction avant analyse, défaut: grand côté 2048 px)
+            backend: 'auto' (API C persistante via tesserocr si installé, sinon pytesseract),
+                'tesserocr' ou 'pytesseract'
+            per_spine: Lire chaque tranche détectée séparément (PSM 7, redressée) plutôt que la page entière
+            spine_workers: Threads de reconnaissance par tranche (None = nombre de cœurs)
+            psm_configs: Configurations PSM (défaut: PSM_CONFIGS, ou SEARCH_PSM_CONFIGS en recherche)
+            variant_search: Évaluer en parallèle plusieurs (PSM, prétraitement) avec arrêt anticipé
+            target_confidence: Confiance moyenne qui arrête la recherche (None = ignorée)
+            target_coverage: Couverture horizontale qui arrête la recherche (None = ignorée)
+            search_workers: Combinaisons évaluées en parallèle (None = nombre de cœurs)
+        """
         try:
-            import cv2
-            import numpy as np
-            from PIL import Image
-            import pytesseract
-            from pytesseract import Output
+            self.backend = create_backend(backend, languages)
         except ImportError as e:
             raise ImportError(f"Tesseract nécessite des dépendances manquantes: {e}")
 
         self.confidence_threshold = confidence_threshold
         self.languages = languages
         self.use_gpu = use_gpu  # Tesseract ne supporte pas vraiment GPU
+        self.resolution_policy = resolution_policy or ResolutionPolicy()
+        self.per_spine = per_spine
+        self.spine_workers = spine_workers
+        self.variant_search = variant_search
+        self.psm_configs = psm_configs or (SEARCH_PSM_CONFIGS if variant_search else PSM_CONFIGS)
+        self.target_confidence = target_confidence
+        self.target_coverage = target_coverage
+        self.search_workers = search_workers
+        # Pools de threads gardés d'une image à l'autre: chaque thread garde son instance
+        # TessBaseAPI (backend tesserocr), les traineddata ne sont chargés qu'une fois par thread
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+        print(f"🔍 Tesseract initialisé - Langues: {languages}, Seuil: {confidence_threshold}, "
+              f"Backend: {self.backend.name}")
+
+    def close(self):
+        """Attend les lectures en cours puis libère les pools et les instances Tesseract persistantes."""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self.backend.close()
 
-        print(f"🔍 Tesseract initialisé - Langues: {languages}, Seuil: {confidence_threshold}")
+    def _pool(self, name, workers):
+        """Pool de threads persistant du processeur (créé au premier usage)."""
+        with self._pools_lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = self._pools[name] = ThreadPoolExecutor(max_workers=workers,
+                                                              thread_name_prefix=f'tesseract-{name}')
+            return pool
 
     def _detect_with_psm(self, image, psm_config):
         """Détection avec une configuration PSM spécifique."""
         try:
-            config = f'{psm_config}'
-            lang_str = '+'.join(self.languages) if isinstance(self.languages, list) else self.languages
-            data = pytesseract.image_to_data(image, config=config, lang=lang_str, output_type=Output.DICT)
+            with span('tesseract.recognition', psm=psm_config, backend=self.backend.name):
+                data = self.backend.image_to_data(image, config=psm_config)
+            count('tesseract.calls')
 
             results = []
             n_boxes = len(data['text'])
             for i in range(n_boxes):
-                confidence = int(data['conf'][i])
+                confidence = int(float(data['conf'][i]))
                 text = data['text'][i].strip()
 
                 if confidence > self.confidence_threshold and len(text) >= MIN_TEXT_LENGTH:
@@ -62,25 +118,204 @@ class TesseractOCRProcessor:
             return []
 
     def detect_text(self, pil_image, preprocess=True):
-        """Détecte le texte avec Tesseract."""
-        image_array = np.array(pil_image)
-        bgr_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
+        """
+        Détecte le texte avec Tesseract.
+
+        Tesseract segmente et reconnaît en une seule passe: l'analyse se fait à la
+        résolution de reconnaissance si elle est configurée, sinon sur l'image de
+        détection. Les boîtes sont ramenées au repère de l'image d'origine.
+
+        Args:
+            pil_image: PIL.Image, ou tableau BGR déjà décodé (core.image_loading)
+        """
+        return self._detect(pil_image, preprocess=preprocess)[0]
+
+    def _detect(self, pil_image, preprocess=True, per_spine=False, debug=False):
+        """
+        Détection par tranche si demandée et possible, sinon sur la page entière.
+
+        Returns:
+            tuple: (résultats [(bbox, text, confidence)], vrai si un résultat = une tranche)
+        """
+        results, spine_mode = [], False
+        for result, spine_mode in self._iter_detect(pil_image, preprocess, per_spine, debug):
+            results.append(result)
+        return results, spine_mode
+
+    def _iter_detect(self, pil_image, preprocess=True, per_spine=False, debug=False):
+        """
+        Générateur de _detect: en mode tranche, chaque tranche est produite dès
+        qu'elle est lue (dans l'ordre de gauche à droite); sur la page entière,
+        les résultats sont produits une fois l'analyse terminée.
+
+        Yields:
+            tuple: ((bbox, text, confidence) dans le repère d'origine, vrai si le résultat est une tranche)
+        """
+        bgr_image = to_bgr(pil_image)
+
+        # Réduction avant analyse
+        with span('tesseract.resize'):
+            detection = self.resolution_policy.for_detection(bgr_image)
+            frame = self.resolution_policy.for_recognition(bgr_image, detection)
+        bgr_image = frame.image
 
         # Prétraitement si demandé
-        if preprocess:
-            processed_images = TesseractPreprocessing.preprocess_image(bgr_image)
-        else:
-            processed_images = [cv2.cvtColor(bgr_image, cv2.COLOR_BGR2GRAY)]
+        with span('tesseract.preprocessing'):
+            if preprocess:
+                processed_images = TesseractPreprocessing.preprocess_image(bgr_image)
+            else:
+                processed_images = [cv2.cvtColor(bgr_image, cv2.COLOR_BGR2GRAY)]
 
-        # Utiliser la meilleure configuration PSM
-        all_results = []
-        for processed_img in processed_images:
-            results = self._detect_with_psm(processed_img, PSM_CONFIGS[0])
-            all_results.extend(results)
+        if per_spine:
+            regions = self._spine_regions(detection, frame, debug=debug)
+            if regions is not None:
+                for bbox, text, confidence in self._recognize_spines(regions, processed_images[0]):
+                    yield (frame.polygon_to_original(bbox), text, confidence), True
+                return
+
+        if self.variant_search:
+            # Combinaisons (PSM, variante) en parallèle, arrêt dès que l'objectif est atteint
+            if preprocess:
+                with span('tesseract.preprocessing_variants'):
+                    variants = TesseractPreprocessing.preprocess_variants(bgr_image, processed_images[0])
+            else:
+                variants = [('gray', processed_images[0])]
+            all_results = self._search_variants(variants, bgr_image.shape[1])
+        else:
+            # Utiliser la configuration PSM principale
+            all_results = []
+            for processed_img in processed_images:
+                results = self._detect_with_psm(processed_img, self.psm_configs[0])
+                all_results.extend(results)
 
         # Trier par confiance et limiter les résultats
         all_results.sort(key=lambda x: x[2], reverse=True)
-        return all_results[:MAX_RESULTS]
+        for bbox, text, confidence in all_results[:MAX_RESULTS]:
+            yield (frame.polygon_to_original(bbox), text, confidence), False
+
+    @staticmethod
+    def _score(results, width):
+        """Confiance moyenne et fraction de la largeur couverte par les boîtes."""
+        if not results:
+            return 0.0, 0.0
+        confidence = sum(c for _, _, c in results) / len(results)
+        intervals = sorted((min(p[0] for p in bbox), max(p[0] for p in bbox)) for bbox, _, _ in results)
+        covered, end = 0.0, float('-inf')
+        for x0, x1 in intervals:
+            if x1 > end:
+                covered += x1 - max(x0, end)
+                end = x1
+        return confidence, min(1.0, covered / float(width))
+
+    def _target_reached(self, confidence, coverage):
+        """Objectifs configurés (None = ignoré) tous atteints."""
+        targets = [(self.target_confidence, confidence), (self.target_coverage, coverage)]
+        active = [(target, value) for target, value in targets if target is not None]
+        return bool(active) and all(value >= target for target, value in active)
+
+    def _search_variants(self, variants, width):
+        """
+        Évalue les combinaisons (PSM, variante de prétraitement) dans le pool de
+        recherche, dans l'ordre de priorité (première PSM sur toutes les variantes,
+        puis la suivante). Chaque résultat est noté dès qu'il arrive; dès qu'un
+        résultat atteint l'objectif, les combinaisons en attente sont annulées ou
+        abandonnées avant d'appeler Tesseract. Un appel déjà lancé ne peut pas être
+        interrompu: il se termine en arrière-plan, son résultat est ignoré, et
+        close() l'attend avant de libérer les instances Tesseract.
+
+        Returns:
+            list: Meilleur résultat [(bbox, text, confidence)] (caractères lus × confiance)
+        """
+        combos = [(name, image, psm) for psm in self.psm_configs for name, image in variants]
+        pool_size = self.search_workers or os.cpu_count() or 1
+        stop = threading.Event()
+
+        def detect(combo):
+            # Objectif atteint entre-temps: abandon sans appeler Tesseract
+            if stop.is_set():
+                return None
+            return self._detect_with_psm(combo[1], combo[2])
+
+        detect = tracer.wrap(detect)
+        best, best_score, best_combo, completed = [], -1.0, None, 0
+        with span('tesseract.variant_search', combos=len(combos), workers=min(pool_size, len(combos))) as s:
+            pool = self._pool('search', pool_size)
+            futures = {pool.submit(detect, combo): combo for combo in combos}
+            try:
+                for future in as_completed(futures):
+                    results = future.result()
+                    completed += 1
+                    name, _, psm = futures[future]
+                    score = sum(c * len(text) for _, text, c in results)
+                    if score > best_score:
+                        best, best_score, best_combo = results, score, f"{name} {psm}"
+                    if self._target_reached(*self._score(results, width)):
+                        count('tesseract.early_exits')
+                        break
+            finally:
+                # Ne pas attendre les combinaisons lentes déjà lancées, ne plus en lancer
+                stop.set()
+                for future in futures:
+                    future.cancel()
+            s.set(completed=completed, best=best_combo)
+        count('tesseract.variants_run', completed)
+        count('tesseract.variants_skipped', len(combos) - completed)
+        return best
+
+    def _spine_regions(self, detection, frame, debug=False):
+        """
+        Régions de tranches du service de tranches partagé (calculées sur l'image de
+        détection, comme pour EasyOCR, donc réutilisées d'un moteur à l'autre).
+
+        Returns:
+            list ou None: Quadrilatères dans le repère de frame, None si trop peu de tranches
+        """
+        with span('tesseract.spine_detection'):
+            regions = TesseractSpineDetection.detect_spines(detection.image, debug=debug).polygons
+            if frame is not detection:
+                ratio = frame.scale / detection.scale
+                regions = [(quad * ratio).astype(np.float32) for quad in regions]
+        if len(regions) < MIN_SPINE_REGIONS:
+            count('tesseract.spine_fallbacks')
+            return None
+        count('tesseract.spine_regions', len(regions))
+        return regions
+
+    def _recognize_spines(self, regions, gray_image):
+        """
+        Reconnaissance tranche par tranche: chaque région est redressée puis lue en
+        mode ligne unique dans le pool persistant des tranches (mêmes threads, donc
+        mêmes instances Tesseract, d'une image à l'autre). Les résultats sont
+        produits dans l'ordre des régions, chacun dès que sa lecture (et celles qui
+        le précèdent) est terminée.
+
+        Yields:
+            tuple: (quadrilatère, texte, confiance) dans le repère de frame
+        """
+        pool_size = self.spine_workers or os.cpu_count() or 1
+        recognize = tracer.wrap(lambda quad: self._recognize_spine(gray_image, quad))
+        with span('tesseract.spine_recognition', regions=len(regions), workers=min(pool_size, len(regions))):
+            for result in self._pool('spine', pool_size).map(recognize, regions):
+                if result is not None:
+                    yield result
+
+    def _recognize_spine(self, gray_image, quad):
+        """Lit une tranche dans les deux sens d'écriture et garde la lecture la plus sûre."""
+        best, best_score = None, 0.0
+        for crop in TesseractSpineDetection.upright_crops(gray_image, quad):
+            words = self._detect_with_psm(crop, SPINE_PSM_CONFIG)
+            score = sum(confidence * len(text) for _, text, confidence in words)
+            if score > best_score:
+                best, best_score = words, score
+            # Lecture sûre dans le premier sens: inutile d'essayer l'autre
+            if words and sum(c for _, _, c in words) / len(words) >= SPINE_TARGET_CONFIDENCE:
+                count('tesseract.spine_early_exits')
+                break
+        if not best:
+            return None
+        text = ' '.join(text for _, text, _ in best)
+        confidence = sum(c for _, _, c in best) / len(best)
+        return quad.tolist(), text, confidence
 
     def get_text_and_confidence(self, pil_image, preprocess=True, use_spine_detection=True, reference_titles=None, spine_method="simple"):
         """Extrait le texte et la confiance moyenne."""
@@ -96,34 +331,50 @@ class TesseractOCRProcessor:
 
     def get_boxes(self, pil_image, preprocess=True, vertical_only=False, use_spine_detection=True, debug=False, reference_titles=None, spine_method="simple"):
         """Extrait les boîtes de texte avec coordonnées."""
-        results = self.detect_text(pil_image, preprocess=preprocess)
+        return list(self.iter_books(pil_image, preprocess=preprocess, vertical_only=vertical_only,
+                                    use_spine_detection=use_spine_detection, debug=debug,
+                                    spine_method=spine_method))
 
+    def iter_books(self, pil_image, preprocess=True, vertical_only=False, use_spine_detection=True, debug=False,
+                   spine_method="simple"):
+        """
+        Générateur des boîtes par livre: en lecture par tranche, chaque livre est
+        produit dès que sa tranche est reconnue; sinon les groupes sont produits
+        après l'analyse et le regroupement de la page entière.
+        """
         boxes = []
-        for bbox, text, confidence in results:
-            # Calcul des dimensions
-            x = min([p[0] for p in bbox])
-            y = min([p[1] for p in bbox])
-            width = max([p[0] for p in bbox]) - x
-            height = max([p[1] for p in bbox]) - y
-            font_size = height
-
-            # Détection verticale
-            is_vertical = height > width * 1.5
-
-            if vertical_only and not is_vertical:
+        for (bbox, text, confidence), per_spine in self._iter_detect(
+                pil_image, preprocess=preprocess, per_spine=use_spine_detection and self.per_spine, debug=debug):
+            box = self._to_box(bbox, text, confidence)
+            if vertical_only and not box['is_vertical']:
                 continue
-
-            boxes.append({
-                "text": text,
-                "x": x, "y": y,
-                "width": width, "height": height,
-                "font_size": font_size,
-                "is_vertical": is_vertical,
-                "confidence": confidence
-            })
+            # Chaque boîte est déjà une tranche: inutile d'attendre les autres
+            if per_spine:
+                yield box
+            else:
+                boxes.append(box)
 
         # Regrouper si demandé
         if boxes and use_spine_detection:
-            boxes = TesseractTextGrouping.group_texts_by_spine_lines(boxes, None, debug=debug, method=spine_method)
+            with span('tesseract.grouping', boxes=len(boxes)):
+                boxes = TesseractTextGrouping.group_texts_by_spine_lines(boxes, None, debug=debug, method=spine_method)
+        yield from boxes
+
+    @staticmethod
+    def _to_box(bbox, text, confidence):
+        """Boîte ShelfReader depuis un résultat (bbox, texte, confiance)."""
+        # Calcul des dimensions
+        x = min([p[0] for p in bbox])
+        y = min([p[1] for p in bbox])
+        width = max([p[0] for p in bbox]) - x
+        height = max([p[1] for p in bbox]) - y
 
-        return boxes
\ No newline at end of file
+        return {
+            "text": text,
+            "x": x, "y": y,
+            "width": width, "height": height,
+            "font_size": height,
+            # Détection verticale
+            "is_vertical": height > width * 1.5,
+            "confidence": confidence
+        }
@@ -23,6 +23,12 @@ src_dir = current_dir.parent.parent  # Remonter à src/
 sys.path.insert(0, str(src_dir))
 
 from engines.tesseract import TesseractOCRProcessor
+from core.resolution import ResolutionPolicy, add_resolution_arguments
+from services.catalog_store import add_catalog_arguments, record_scan
+from services.parquet_export import add_parquet_arguments, export_results
+from core.instrumentation import tracer
+from engines.tesseract.logic.backends import BACKENDS, DEFAULT_BACKEND
+from engines.tesseract.logic.config import TARGET_CONFIDENCE, TARGET_COVERAGE
 
 def main():
     parser = argparse.ArgumentParser(
@@ -33,6 +39,7 @@ Exemples d'utilisation:
   python main.py image.jpg
   python main.py image.jpg --lang eng fra --confidence 0.6
   python main.py image.jpg --psm 8 --benchmark
+  python main.py image.jpg --psm-search --target-confidence 0.8
   python main.py image.jpg --output results.json
         """
     )
@@ -54,6 +61,19 @@ Exemples d'utilisation:
                        help='Afficher les métriques de performance')
     parser.add_argument('--output', type=str,
                        help='Fichier de sortie pour les résultats (JSON)')
+    parser.add_argument('--psm-search', action='store_true',
+                       help='Essaie en parallèle plusieurs PSM et prétraitements, arrêt dès que '
+                            'l\'objectif de confiance/couverture est atteint (ignore --psm)')
+    parser.add_argument('--target-confidence', type=float, default=TARGET_CONFIDENCE,
+                       help=f'Confiance moyenne qui arrête la recherche (défaut: {TARGET_CONFIDENCE})')
+    parser.add_argument('--target-coverage', type=float, default=TARGET_COVERAGE,
+                       help=f'Fraction de la largeur couverte qui arrête la recherche (défaut: {TARGET_COVERAGE})')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                       help='Accès à Tesseract: API C persistante (tesserocr) ou processus externe '
+                            '(pytesseract); auto = tesserocr si installé (défaut: auto)')
+    add_resolution_arguments(parser)
+    add_catalog_arguments(parser)
+    add_parquet_arguments(parser)
 
     args = parser.parse_args()
 
@@ -89,13 +109,20 @@ Exemples d'utilisation:
         print("🚀 Initialisation du moteur Tesseract...")
         print(f"   Langues: {args.lang}")
         print(f"   Seuil de confiance: {args.confidence}")
-        print(f"   PSM: {args.psm}")
+        print(f"   PSM: {'recherche multi-PSM' if args.psm_search else args.psm}")
         print(f"   Device: CPU (Tesseract est CPU-only)")
+        print(f"   Backend: {args.backend}")
 
         start_init = time.time()
         processor = TesseractOCRProcessor(
             languages=args.lang,
-            confidence_threshold=args.confidence
+            confidence_threshold=args.confidence,
+            resolution_policy=ResolutionPolicy.from_args(args),
+            backend=args.backend,
+            psm_configs=None if args.psm_search else [f'--psm {args.psm}'],
+            variant_search=args.psm_search,
+            target_confidence=args.target_confidence,
+            target_coverage=args.target_coverage
         )
         init_time = time.time() - start_init
         print(f"   Temps d'initialisation: {init_time:.2f}s")
@@ -103,7 +130,9 @@ Exemples d'utilisation:
         print("🔍 Analyse de l'image en cours...")
         start_process = time.time()
         pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        results = processor.get_boxes(pil_image)
+        # Trace par étape pour l'export Parquet (ou si SHELFREADER_TRACE=1)
+        with tracer.request('tesseract', enabled=bool(args.parquet_dir) or None) as trace:
+            results = processor.get_boxes(pil_image)
         process_time = time.time() - start_process
 
         # Afficher les résultats
@@ -206,6 +235,13 @@ Exemples d'utilisation:
                 json.dump(output_data, f, indent=2, ensure_ascii=False)
             print(f"💾 Résultats sauvegardés dans: {args.output}")
 
+        # Inventaire persistant (--catalog)
+        record_scan(args, results, 'tesseract')
+
+        # Export colonnaire (--parquet-dir)
+        export_results(args, results, 'tesseract', timings={'init': init_time, 'process': process_time},
+                       trace=trace)
+
         print("\n✅ Traitement terminé avec succès!")
         return 0
 
@@ -39,4 +39,28 @@ class TesseractPreprocessing:
         # Léger débruitage pour améliorer la qualité
         denoised = cv2.bilateralFilter(enhanced, BILATERAL_D, BILATERAL_SIGMA_COLOR, BILATERAL_SIGMA_SPACE)
 
-        return [denoised]  # Retourner une seule image optimisée
\ No newline at end of file
+        return [denoised]  # Retourner une seule image optimisée
+
+    @staticmethod
+    def preprocess_variants(image, enhanced=None):
+        """
+        Variantes de prétraitement pour la recherche concurrente, de la plus
+        probable à la moins probable.
+
+        Args:
+            image: Image numpy array (BGR)
+            enhanced: Résultat de preprocess_image déjà calculé (évite de le refaire)
+
+        Returns:
+            Liste de (nom, image en niveaux de gris)
+        """
+        if enhanced is None:
+            enhanced = TesseractPreprocessing.preprocess_image(image)[0]
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        _, otsu = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return [
+            ('clahe', enhanced),
+            ('gray', gray),
+            ('otsu', otsu),
+            ('inverted', cv2.bitwise_not(enhanced)),  # texte clair sur dos sombres
+        ]
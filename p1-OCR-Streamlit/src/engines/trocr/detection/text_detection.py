@@ -1,5 +1,5 @@
 # DÉPENDANCES:
-#   - Utilise: Aucun (détection simple)
+#   - Utilise: core/spine/regions.py (rectangles des tranches)
 #   - Importe: cv2, numpy, typing
 #   - Utilisé par: logic/orchestrator.py
 
@@ -10,33 +10,45 @@ Détection et segmentation du texte pour TrOCR.
 
 import cv2
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from core.spine.regions import bounding_rect
 
 class TrOCRTextDetector:
     """Détecteur de texte pour TrOCR."""
 
-    def __init__(self, strip_height_threshold: int = 50):
+    def __init__(self, strip_height_threshold: int = 50, min_spine_regions: int = 2):
         """
         Initialise le détecteur.
 
         Args:
             strip_height_threshold: Seuil de hauteur minimum pour considérer une bande comme contenant du texte
+            min_spine_regions: Nombre minimal de tranches pour les utiliser à la place des bandes fixes
         """
         self.strip_height_threshold = strip_height_threshold
+        self.min_spine_regions = min_spine_regions
 
-    def detect_text_regions(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    def detect_text_regions(self, image: np.ndarray,
+                            spine_polygons: Optional[List[np.ndarray]] = None) -> List[Tuple[int, int, int, int]]:
         """
         Détecte les régions de texte dans l'image.
-        Pour TrOCR, nous segmentons simplement en bandes verticales.
+        Une région par tranche détectée si possible, sinon des bandes verticales fixes.
 
         Args:
             image: Image d'entrée
+            spine_polygons: Quadrilatères par livre (core.spine), dans le repère de l'image
 
         Returns:
             Liste de boîtes englobantes (x, y, w, h)
         """
         height, width = image.shape[:2]
 
+        if spine_polygons is not None and len(spine_polygons) >= self.min_spine_regions:
+            regions = []
+            for quad in spine_polygons:
+                x, y, w, h = bounding_rect(quad)
+                regions.append((x, y, min(w, width - x), min(h, height - y)))
+            return regions
+
         # Diviser en bandes verticales
         num_strips = 14
         strip_width = width // num_strips
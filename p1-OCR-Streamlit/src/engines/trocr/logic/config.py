@@ -17,7 +17,9 @@ LENGTH_PENALTY = 1.5
 REPETITION_PENALTY = 1.2
 
 # Paramètres de segmentation
-NUM_STRIPS = 14  # Nombre de bandes verticales
+NUM_STRIPS = 14  # Nombre de bandes verticales (sans tranches détectées)
+USE_SPINE_REGIONS = True  # Une région par livre via le service de tranches partagé (core/spine)
+MIN_SPINE_REGIONS = 2  # En dessous, retour aux bandes fixes
 
 # Modèle
 MODEL_NAME = 'microsoft/trocr-base-handwritten'
\ No newline at end of file
@@ -1,5 +1,6 @@
 # DÉPENDANCES:
-#   - Utilise: config.py, preprocessing/image_preprocessing.py, detection/text_detection.py, grouping/text_grouping.py
+#   - Utilise: config.py, preprocessing/image_preprocessing.py, detection/text_detection.py, grouping/text_grouping.py,
+#              core/instrumentation.py, core/resolution.py, core/spine (tranches)
 #   - Importe: torch, numpy, transformers, typing, logging
 #   - Utilisé par: __init__.py, main.py
 
@@ -14,6 +15,9 @@ from transformers import VisionEncoderDecoderModel, TrOCRProcessor
 from typing import List, Dict, Any, Optional
 import logging
 
+from core.instrumentation import span, count
+from core.resolution import ResolutionPolicy
+from core.spine import spine_service
 from .config import *
 from ..preprocessing.image_preprocessing import TrOCRImagePreprocessor
 from ..detection.text_detection import TrOCRTextDetector
@@ -24,14 +28,19 @@ logger = logging.getLogger(__name__)
 class ShelfReaderTrOCRProcessor:
     """Processeur principal pour TrOCR."""
 
-    def __init__(self, device: str = 'auto'):
+    def __init__(self, device: str = 'auto', resolution_policy: Optional[ResolutionPolicy] = None,
+                 use_spines: bool = USE_SPINE_REGIONS):
         """
         Initialise le processeur TrOCR.
 
         Args:
             device: Device pour l'inférence ('cpu', 'cuda', 'auto')
+            resolution_policy: Réduction avant détection, résolution des zones reconnues
+            use_spines: Une région par livre (service de tranches partagé) plutôt que des bandes fixes
         """
         self.device = self._setup_device(device)
+        self.resolution_policy = resolution_policy or ResolutionPolicy()
+        self.use_spines = use_spines
 
         # Charger le modèle et le processeur
         logger.info(f"Chargement du modèle TrOCR: {MODEL_NAME}")
@@ -43,7 +52,7 @@ class ShelfReaderTrOCRProcessor:
 
         # Initialiser les composants modulaires
         self.preprocessor = TrOCRImagePreprocessor(self.processor)
-        self.detector = TrOCRTextDetector()
+        self.detector = TrOCRTextDetector(min_spine_regions=MIN_SPINE_REGIONS)
         self.grouper = TrOCRTextGrouper()
 
         logger.info("TrOCR Processor initialisé avec succès")
@@ -62,28 +71,14 @@ class ShelfReaderTrOCRProcessor:
             image: Image d'entrée (numpy array)
 
         Returns:
-            Liste des résultats de texte détecté
+            Liste des résultats de texte détecté (bbox dans le repère de l'image d'entrée)
         """
         try:
-            # Prétraitement
-            enhanced_image = self.preprocessor.enhance_image(image)
-
-            # Détection des régions de texte
-            regions = self.detector.detect_text_regions(enhanced_image)
-
-            # Traiter chaque région
-            text_results = []
-            for region in regions:
-                x, y, w, h = region
-                roi = enhanced_image[y:y+h, x:x+w]
-
-                # OCR sur la région
-                result = self._ocr_region(roi, region)
-                if result:
-                    text_results.append(result)
+            text_results = list(self.iter_results(image))
 
             # Regrouper les résultats
-            grouped_lines = self.grouper.group_text_lines(text_results)
+            with span('trocr.grouping'):
+                grouped_lines = self.grouper.group_text_lines(text_results)
 
             # Filtrer les résultats de faible confiance
             filtered_results = self.grouper.filter_low_confidence(grouped_lines, min_confidence=0.1)
@@ -94,6 +89,48 @@ class ShelfReaderTrOCRProcessor:
             logger.error(f"Erreur lors du traitement TrOCR: {e}")
             return []
 
+    def iter_results(self, image: np.ndarray):
+        """
+        Générateur des résultats par région (une par livre si les tranches sont
+        détectées), chacun produit dès que sa reconnaissance est terminée.
+
+        Args:
+            image: Image d'entrée (numpy array)
+
+        Yields:
+            Dict: {'text', 'confidence', 'bbox'} (bbox dans le repère de l'image d'entrée)
+        """
+        # Réduction avant détection
+        with span('trocr.resize'):
+            detection = self.resolution_policy.for_detection(image)
+            recognition = self.resolution_policy.for_recognition(image, detection)
+
+        # Prétraitement
+        with span('trocr.preprocessing'):
+            enhanced_image = self.preprocessor.enhance_image(detection.image)
+            if recognition is detection:
+                recognition_image = enhanced_image
+            else:
+                recognition_image = self.preprocessor.enhance_image(recognition.image)
+
+        # Détection des régions de texte
+        with span('trocr.detection'):
+            # Tranches calculées sur l'image de détection brute: résultat partagé avec les autres moteurs
+            spine_polygons = spine_service.detect(detection.image).polygons if self.use_spines else None
+            regions = self.detector.detect_text_regions(enhanced_image, spine_polygons=spine_polygons)
+
+        # Traiter chaque région
+        for region in regions:
+            x, y, w, h = recognition.rect_from(detection, region)
+            roi = recognition_image[y:y+h, x:x+w]
+
+            # OCR sur la région
+            with span('trocr.recognition', region=list(region)):
+                result = self._ocr_region(roi, detection.rect_to_original(region))
+            count('trocr.regions')
+            if result:
+                yield result
+
     def _ocr_region(self, region: np.ndarray, bbox: tuple) -> Optional[Dict[str, Any]]:
         """
         Effectue l'OCR sur une région spécifique.
@@ -23,6 +23,7 @@ src_dir = current_dir.parent.parent  # Remonter à src/
 sys.path.insert(0, str(src_dir))
 
 from engines.trocr import ShelfReaderTrOCRProcessor
+from core.resolution import ResolutionPolicy, add_resolution_arguments
 
 def main():
     parser = argparse.ArgumentParser(
@@ -49,6 +50,7 @@ Exemples d'utilisation:
                        help='Afficher les métriques de performance')
     parser.add_argument('--output', type=str,
                        help='Fichier de sortie pour les résultats (JSON)')
+    add_resolution_arguments(parser)
 
     args = parser.parse_args()
 
@@ -99,7 +101,7 @@ Exemples d'utilisation:
         print(f"   Device: {device}")
 
         start_init = time.time()
-        processor = ShelfReaderTrOCRProcessor(device=device)
+        processor = ShelfReaderTrOCRProcessor(device=device, resolution_policy=ResolutionPolicy.from_args(args))
         init_time = time.time() - start_init
         print(f"   Temps d'initialisation: {init_time:.2f}s")
         # Afficher les infos du modèle
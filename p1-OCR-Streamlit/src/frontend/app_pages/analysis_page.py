@@ -10,10 +10,13 @@ import tempfile
 import os
 from PIL import Image
 
-from components.results_display import display_results
+from components.results_display import display_results, display_stage_waterfall, display_stream
 from components.visualization import display_visualization, display_book_details
 from utils.ocr_processing import ocr_processor
 from utils.openlibrary_enrichment import openlibrary_enricher
+from core.instrumentation import tracer, span
+from core.image_loading import load_image
+from core.resolution import ResolutionPolicy
 
 
 def show():
@@ -149,11 +152,28 @@ def show():
                     help="Comment Tesseract analyse la structure de la page"
                 )[0]
 
+                tesseract_psm_search = st.checkbox(
+                    "Recherche multi-PSM",
+                    value=False,
+                    help="Essaie en parallèle plusieurs PSM et prétraitements ; s'arrête dès qu'une "
+                         "combinaison atteint la confiance et la couverture visées (ignore le PSM ci-dessus)"
+                )
+
+                tesseract_backend = st.selectbox(
+                    "Backend",
+                    options=["auto", "tesserocr", "pytesseract"],
+                    index=0,
+                    help="tesserocr garde Tesseract chargé en mémoire (pas de processus ni de fichier "
+                         "temporaire par appel) ; auto = tesserocr si installé, sinon pytesseract"
+                )
+
                 advanced_params = {
                     'confidence': tesseract_confidence,
                     'use_gpu': tesseract_use_gpu,
                     'lang': tesseract_lang,
-                    'psm': int(tesseract_psm)
+                    'psm': int(tesseract_psm),
+                    'psm_search': tesseract_psm_search,
+                    'backend': tesseract_backend
                 }
                 st.session_state.tesseract_params = advanced_params
 
@@ -205,6 +225,36 @@ def show():
                 }
                 st.session_state.trocr_params = advanced_params
 
+            # Résolution: commune aux trois moteurs (coordonnées toujours dans l'image d'origine)
+            st.markdown("### 📐 Résolution")
+            max_detect_edge = st.selectbox(
+                "Grand côté max (détection)",
+                options=[1024, 1536, 2048, 3072, 4096, 0],
+                index=2,
+                format_func=lambda v: "Pleine résolution" if v == 0 else f"{v} px",
+                help="L'image est réduite avant la détection : latence et mémoire prévisibles quelle que soit la taille de la photo. "
+                     "Un panorama est limité sur son petit côté (moitié de cette valeur) puis découpé en tuiles"
+            )
+            max_recognition_edge = st.selectbox(
+                "Grand côté max (reconnaissance)",
+                options=[None, 3072, 4096, 0],
+                index=0,
+                format_func=lambda v: "Identique à la détection" if v is None else ("Pleine résolution" if v == 0 else f"{v} px"),
+                help="Relit uniquement les zones détectées à plus haute résolution (petits textes)"
+            )
+            tile_size = st.selectbox(
+                "Découpage en tuiles (EasyOCR)",
+                options=[4096, 2048, 8192, 0],
+                index=0,
+                format_func=lambda v: "Jamais" if v == 0 else f"Au-delà de {v} px",
+                help="Les panoramas très larges sont traités par tuiles chevauchantes en parallèle : mémoire bornée par la taille d'une tuile"
+            )
+            advanced_params.update({
+                'max_detect_edge': max_detect_edge,
+                'max_recognition_edge': max_recognition_edge,
+                'tile_size': tile_size
+            })
+
             debug_mode = st.checkbox(
                 "Mode debug",
                 value=False,
@@ -218,6 +268,36 @@ def show():
                 help="Recherche les métadonnées des livres sur Open Library (nécessite connexion internet)"
             )
 
+            use_cache = st.checkbox(
+                "Cache des résultats",
+                value=True,
+                help="Une image déjà analysée avec les mêmes paramètres est restituée sans relancer l'OCR "
+                     "(cache borné : les entrées les plus anciennes sont supprimées)"
+            )
+            near_duplicate_distance = st.slider(
+                "Tolérance quasi-doublons",
+                min_value=0, max_value=12, value=0,
+                disabled=not use_cache,
+                help="Distance de Hamming maximale entre empreintes perceptuelles (0 = fichier identique uniquement). "
+                     "Réutilise les résultats d'une photo quasi identique de la même étagère"
+            )
+            advanced_params.update({
+                'use_cache': use_cache,
+                'near_duplicate_distance': near_duplicate_distance
+            })
+
+            profile_mode = st.checkbox(
+                "Profilage par étape",
+                value=False,
+                help="Mesure le temps de chaque étape (prétraitement, détection, reconnaissance, enrichissement)"
+            )
+
+            stream_mode = st.checkbox(
+                "Affichage progressif",
+                value=False,
+                help="Affiche chaque livre (et son enrichissement) dès qu'il est reconnu, sans attendre toute l'étagère"
+            )
+
         st.markdown("---")
 
         # Bouton de traitement
@@ -288,28 +368,61 @@ def show():
                     
                     executed_command = " ".join(executed_cmd_parts)
                     
-                    # Traitement OCR avec paramètres avancés
-                    results, processing_time = ocr_processor.process_image(
-                        temp_path,
-                        engine_name=ocr_engine,
-                        confidence=advanced_params.get('confidence', 0.3),
-                        use_gpu=advanced_params.get('use_gpu', True),
-                        debug=debug_mode,
-                        advanced_params=advanced_params
-                    )
+                    # Une seule trace couvre l'OCR et l'enrichissement
+                    with tracer.request(ocr_engine, enabled=profile_mode, engine=ocr_engine) as trace:
+                        # Décodage unique, partagé par l'OCR et la visualisation
+                        with span('load_image'):
+                            loaded_image = load_image(
+                                temp_path,
+                                max_edge=ResolutionPolicy.from_params(advanced_params).decode_edge()
+                            )
+
+                        if stream_mode:
+                            # Livres affichés au fur et à mesure, enrichis un par un
+                            results, processing_time, enriched_books = display_stream(
+                                ocr_processor.process_image_stream(
+                                    loaded_image,
+                                    engine_name=ocr_engine,
+                                    confidence=advanced_params.get('confidence', 0.3),
+                                    use_gpu=advanced_params.get('use_gpu', True),
+                                    debug=debug_mode,
+                                    advanced_params=advanced_params,
+                                    enrich=openlibrary_enricher.enrich_books if enrich_with_ol else None
+                                )
+                            )
+                        else:
+                            # Traitement OCR avec paramètres avancés
+                            results, processing_time = ocr_processor.process_image(
+                                loaded_image,
+                                engine_name=ocr_engine,
+                                confidence=advanced_params.get('confidence', 0.3),
+                                use_gpu=advanced_params.get('use_gpu', True),
+                                debug=debug_mode,
+                                advanced_params=advanced_params
+                            )
+                            enriched_books = None
+
+                        # Enrichissement optionnel (réutilisé depuis le cache si disponible)
+                        cache_info = results.get('cache', {}) if results else {}
+                        if results and enrich_with_ol and results.get('books') and enriched_books is None:
+                            enriched_books = cache_info.get('enriched_books')
+                            if enriched_books is None:
+                                with st.spinner("🔍 Enrichissement avec Open Library..."):
+                                    enriched_books = openlibrary_enricher.enrich_books(results['books'])
+                                ocr_processor.store_enrichment(results, enriched_books)
+
+                    if results and trace is not None:
+                        results['trace'] = trace.to_dict()
 
                     if results:
-                        # Enrichissement optionnel
-                        enriched_books = None
-                        if enrich_with_ol and results.get('books'):
-                            with st.spinner("🔍 Enrichissement avec Open Library..."):
-                                enriched_books = openlibrary_enricher.enrich_books(results['books'])
-
                         # Message de succès
                         success_msg = "✅ Analyse terminée !"
                         if enrich_with_ol:
                             success_msg += " + Enrichissement OL"
                         st.success(success_msg)
+                        if cache_info.get('hit'):
+                            match = "identique" if cache_info['match'] == 'exact' else f"quasi identique (distance {cache_info['distance']})"
+                            st.info(f"♻️ Résultats restitués depuis le cache : image {match}")
 
                         st.markdown("---")
 
@@ -319,12 +432,15 @@ def show():
                                       advanced_params=advanced_params,
                                       executed_command=executed_command)
 
+                        # Cascade des étapes (si profilage activé)
+                        display_stage_waterfall(results.get('trace'))
+
                         # Section visualisation et détails
                         st.markdown("---")
 
                         # Visualisation des zones détectées
                         books = enriched_books if enriched_books else results.get('books', [])
-                        display_visualization(temp_path, books)
+                        display_visualization(loaded_image, books)
 
                         # Détails par livre
                         if books:
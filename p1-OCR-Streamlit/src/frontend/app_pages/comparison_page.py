@@ -13,6 +13,8 @@ from components.results_display import display_comparison_results, display_compa
 from components.visualization import display_comparison_visualizations
 from utils.ocr_processing import ocr_processor
 from utils.openlibrary_enrichment import openlibrary_enricher
+from core.image_loading import load_image
+from core.resolution import ResolutionPolicy
 
 
 def show():
@@ -334,6 +336,11 @@ def show():
                     # car ocr_processor ne gère pas plusieurs configurations du même moteur
                     processor_advanced_params[engine] = config_params
 
+                # Décodage unique partagé par toutes les configurations et la visualisation
+                decode_edges = [ResolutionPolicy.from_params(advanced_params.get(config['name'])).decode_edge()
+                                for config in engine_configs]
+                loaded_image = load_image(temp_path, max_edge=None if None in decode_edges else max(decode_edges))
+
                 # Traitement de chaque configuration individuellement
                 with st.spinner("🔍 Comparaison en cours..."):
                     config_results = {}
@@ -345,7 +352,7 @@ def show():
                         config_confidence = config_adv_params.pop('confidence', 0.3)
                         config_use_gpu = config_adv_params.pop('use_gpu', True)
                         result, processing_time = ocr_processor.process_image(
-                            temp_path,
+                            loaded_image,
                             engine,
                             confidence=config_confidence,
                             use_gpu=config_use_gpu,
@@ -380,7 +387,7 @@ def show():
                 config_names = [config['name'] for config in engine_configs]
 
                 # Affichage des visualisations côte à côte
-                display_comparison_visualizations(config_results, config_names, temp_path)
+                display_comparison_visualizations(config_results, config_names, loaded_image)
 
                 # Affichage des résultats détaillés
                 # On passe les livres enrichis à l'affichage
@@ -9,7 +9,7 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import html
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 def display_results(results: Dict, processing_time: float,
@@ -406,4 +406,104 @@ def display_comparison_charts(results_dict: Dict[str, Dict],
     st.markdown("### Heatmap Livres détectés")
     import numpy as np
     heatmap_data = np.array(nb_books).reshape(1, -1)
-    st.dataframe(heatmap_data)
\ No newline at end of file
+    st.dataframe(heatmap_data)
+
+def display_stage_waterfall(trace: Optional[Dict], title: str = "⏱️ Profilage par étape") -> None:
+    """
+    Affiche la cascade des étapes d'une requête (prétraitement, détection,
+    reconnaissance, regroupement, enrichissement...).
+
+    Args:
+        trace (Optional[Dict]): Trace exportée par core.instrumentation (Trace.to_dict())
+        title (str): Titre de la section
+    """
+    if not trace or not trace.get('spans'):
+        return
+
+    import altair as alt
+
+    st.markdown(f"### {title}")
+
+    # Profondeur de chaque span pour indenter la cascade
+    parents = {s['id']: s['parent'] for s in trace['spans']}
+
+    def depth(span_id):
+        level = 0
+        while parents.get(span_id) is not None:
+            span_id = parents[span_id]
+            level += 1
+        return level
+
+    df = pd.DataFrame([
+        {
+            'Étape': f"{'  ' * depth(s['id'])}{s['name']} #{s['id']}",
+            'Début (ms)': s['start'] * 1000,
+            'Fin (ms)': (s['start'] + s['duration']) * 1000,
+            'Durée (ms)': round(s['duration'] * 1000, 1),
+            'Catégorie': s['name'].split('.')[0]
+        }
+        for s in trace['spans']
+    ])
+
+    chart = alt.Chart(df).mark_bar().encode(
+        x=alt.X('Début (ms):Q', title='Temps (ms)'),
+        x2='Fin (ms):Q',
+        y=alt.Y('Étape:N', sort=None, title=None),
+        color=alt.Color('Catégorie:N', legend=None),
+        tooltip=['Étape', 'Durée (ms)']
+    ).properties(height=max(120, 22 * len(df)))
+    st.altair_chart(chart, use_container_width=True)
+
+    # Totaux par étape et compteurs
+    totals = pd.DataFrame(df.assign(Étape=[s['name'] for s in trace['spans']])
+                          .groupby('Étape')['Durée (ms)'].agg(['sum', 'count'])
+                          .sort_values('sum', ascending=False)
+                          .rename(columns={'sum': 'Total (ms)', 'count': 'Appels'}))
+    col_totals, col_counters = st.columns([2, 1])
+    with col_totals:
+        st.dataframe(totals, use_container_width=True)
+    with col_counters:
+        counters = trace.get('counters') or {}
+        for name, value in sorted(counters.items()):
+            st.metric(name, f"{value:g}")
+
+
+def display_stream(events: Iterable[Dict]) -> Tuple[Optional[Dict], float, Optional[List[Dict]]]:
+    """
+    Affiche les livres au fur et à mesure de leur reconnaissance.
+
+    Args:
+        events: Événements de OCRProcessor.process_image_stream
+
+    Returns:
+        Tuple: (résultats, temps de traitement, livres enrichis ou None),
+            (None, 0.0, None) en cas d'échec
+    """
+    status = st.empty()
+    container = st.empty()
+    rows = []
+
+    for event in events:
+        if event['type'] == 'book':
+            book = event['book']
+            row = {
+                'Livre': event['index'] + 1,
+                'Texte OCR': book.get('text', ''),
+                'Confiance': f"{book.get('confidence', 0):.1%}"
+            }
+            if book.get('enriched'):
+                row['Titre Open Library'] = book.get('openlibrary_title')
+                row['Auteur'] = book.get('openlibrary_author')
+            rows.append(row)
+            status.caption(f"📚 {len(rows)} livre(s) reconnu(s) en {event['elapsed']:.1f} s...")
+            container.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        elif event['type'] == 'done':
+            # L'affichage complet (display_results) remplace l'aperçu
+            status.empty()
+            container.empty()
+            return event['results'], event['processing_time'], event.get('enriched_books')
+        elif event['type'] == 'error':
+            status.empty()
+            st.error(f"Erreur : {event['error']}")
+
+    return None, 0.0, None
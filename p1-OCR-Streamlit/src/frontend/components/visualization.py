@@ -8,11 +8,14 @@ de livres détectées sur les images, avec bounding boxes colorées.
 import streamlit as st
 import cv2
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from PIL import Image
 
+from core.image_loading import LoadedImage, load_image
+from services.cover_cache import get_cover_cache
 
-def visualize_detected_zones(image_path: str, books: List[Dict]) -> Optional[np.ndarray]:
+
+def visualize_detected_zones(image_path, books: List[Dict]) -> Optional[np.ndarray]:
     """
     Crée une visualisation des zones de livres détectées sur l'image.
 
@@ -20,8 +23,9 @@ def visualize_detected_zones(image_path: str, books: List[Dict]) -> Optional[np.
     détecté et ajoute des numéros pour identifier facilement les zones.
 
     Args:
-        image_path (str): Chemin vers l'image originale
-        books (List[Dict]): Liste des livres détectés avec coordonnées
+        image_path (str | LoadedImage): Chemin vers l'image originale, ou image déjà
+            décodée pour l'OCR (réutilisée sans relire le fichier)
+        books (List[Dict]): Liste des livres détectés avec coordonnées (repère d'origine)
 
     Returns:
         Optional[np.ndarray]: Image avec visualisations (RGB) ou None si erreur
@@ -31,14 +35,14 @@ def visualize_detected_zones(image_path: str, books: List[Dict]) -> Optional[np.
         Le numéro de chaque livre est affiché dans le rectangle supérieur-gauche.
     """
     try:
-        # Charger l'image avec OpenCV
-        image = cv2.imread(image_path)
-        if image is None:
-            st.error(f"Impossible de charger l'image : {image_path}")
-            return None
+        # Réutiliser le buffer décodé pour l'OCR (orientation EXIF déjà appliquée)
+        loaded = image_path if isinstance(image_path, LoadedImage) else load_image(image_path)
+
+        # Convertir BGR vers RGB pour Streamlit (copie: le buffer partagé reste intact)
+        image_rgb = loaded.rgb()
 
-        # Convertir BGR vers RGB pour Streamlit
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # Coordonnées d'origine -> buffer décodé (éventuellement réduit)
+        books = loaded.boxes_from_original(books)
 
         # Palette de couleurs pour différencier les livres
         colors = [
@@ -88,13 +92,13 @@ def visualize_detected_zones(image_path: str, books: List[Dict]) -> Optional[np.
         return None
 
 
-def display_visualization(image_path: str, books: List[Dict],
+def display_visualization(image_path, books: List[Dict],
                          title: str = "Zones détectées") -> None:
     """
     Affiche la visualisation des zones détectées dans Streamlit.
 
     Args:
-        image_path (str): Chemin vers l'image originale
+        image_path (str | LoadedImage): Chemin vers l'image originale ou image décodée
         books (List[Dict]): Liste des livres détectés
         title (str): Titre de la section de visualisation
     """
@@ -123,17 +127,21 @@ def display_visualization(image_path: str, books: List[Dict],
 
 def display_comparison_visualizations(results_dict: Dict[str, Dict],
                                     selected_engines: List[str],
-                                    image_path: str) -> None:
+                                    image_path) -> None:
     """
     Affiche les visualisations côte à côte pour la comparaison des moteurs.
 
     Args:
         results_dict (Dict[str, Dict]): Résultats par moteur OCR
         selected_engines (List[str]): Liste des moteurs comparés
-        image_path (str): Chemin vers l'image originale
+        image_path (str | LoadedImage): Chemin vers l'image originale ou image décodée
     """
     st.markdown("## Visualisation des bounding boxes par moteur")
 
+    # Décoder une seule fois pour tous les moteurs
+    if not isinstance(image_path, LoadedImage):
+        image_path = load_image(image_path)
+
     # Créer les colonnes pour l'affichage côte à côte
     img_cols = st.columns(len(selected_engines))
 
@@ -151,6 +159,24 @@ def display_comparison_visualizations(results_dict: Dict[str, Dict],
                 st.warning(f"{engine}: Aucun livre détecté")
 
 
+def _cover_image(cover_url: str) -> Union[bytes, str]:
+    """
+    Vignette locale de la couverture si elle est en cache (contenu du fichier),
+    sinon l'URL (téléchargement lancé en arrière-plan pour le rendu suivant).
+    """
+    try:
+        cache = get_cover_cache()
+        path = cache.path(cover_url)
+        if path is None:
+            cache.prefetch([cover_url])
+            return cover_url
+        # Lu tout de suite: la vignette peut être évincée avant le rendu
+        with open(path, 'rb') as f:
+            return f.read()
+    except Exception:
+        return cover_url
+
+
 def display_book_details(enriched_books: List[Dict], image_path: str) -> None:
     """
     Affiche les détails détaillés de chaque livre détecté.
@@ -178,7 +204,7 @@ def display_book_details(enriched_books: List[Dict], image_path: str) -> None:
                 # Afficher la couverture si disponible
                 cover_url = book.get('openlibrary_cover_url')
                 if cover_url:
-                    st.image(cover_url, width=100, caption="Couverture")
+                    st.image(_cover_image(cover_url), width=100, caption="Couverture")
                 else:
                     st.write("🖼️ *Pas de couverture disponible*")
 
@@ -5,10 +5,10 @@ Ce module contient la logique métier pour le traitement OCR adaptatif multi-éc
 Il gère la sélection et l'utilisation des différents moteurs OCR (EasyOCR, Tesseract, TrOCR).
 """
 
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from PIL import Image
 import numpy as np
 
 
@@ -30,6 +30,13 @@ if SRC_PATH not in sys.path:
 from engines.easyocr.logic.orchestrator import EasyOCRProcessor
 from engines.tesseract.logic.orchestrator import TesseractOCRProcessor
 from engines.trocr.logic.orchestrator import ShelfReaderTrOCRProcessor
+from core.instrumentation import tracer, span
+from core.resolution import ResolutionPolicy
+from core.tiling import TileExecutor
+from core.image_loading import LoadedImage, load_image
+from core.result_cache import (
+    ResultCache, DEFAULT_CACHE_DIR, content_hash, dhash, params_fingerprint, scale_boxes
+)
 
 
 class OCRProcessor:
@@ -40,22 +47,34 @@ class OCRProcessor:
     une interface unifiée pour le traitement d'images de livres sur étagères.
 
     Attributs:
-        engines (dict): Dictionnaire des moteurs OCR disponibles
+        engines (dict): Dictionnaire des moteurs OCR disponibles (processeur courant par moteur)
     """
 
-    def __init__(self):
-        """Initialise les moteurs OCR disponibles."""
+    def __init__(self, result_cache: Optional[ResultCache] = None):
+        """
+        Initialise les moteurs OCR disponibles.
+
+        Args:
+            result_cache (ResultCache): Cache des résultats (sinon créé à la demande)
+        """
         self.engines = {
             'EasyOCR': None,  # Sera initialisé à la demande
             'Tesseract': None,
             'TrOCR': None
         }
+        self._engine_keys = {}  # moteur -> paramètres du processeur courant
+        self._engines_lock = threading.Lock()
+        self.result_cache = result_cache
 
     def get_processor(self, engine_name: str, confidence: float = 0.3, use_gpu: bool = True, 
                       advanced_params: Dict = None) -> Any:
         """
         Récupère ou crée un processeur OCR pour le moteur spécifié.
 
+        Le processeur est réutilisé tant que le moteur et ses paramètres sont
+        inchangés (modèles, pools de threads et handles Tesseract conservés);
+        quand ils changent, l'ancien processeur est fermé avant d'être remplacé.
+
         Args:
             engine_name (str): Nom du moteur ('EasyOCR', 'Tesseract', 'TrOCR')
             confidence (float): Seuil de confiance pour le filtrage (0.0-1.0)
@@ -71,8 +90,25 @@ class OCRProcessor:
         if engine_name not in self.engines:
             raise ValueError(f"Moteur OCR inconnu : {engine_name}")
 
-        # Toujours créer une nouvelle instance pour s'assurer que les paramètres sont à jour
+        # Nouvelle instance seulement si les paramètres ont changé
         # (notamment le seuil de confiance qui peut changer dynamiquement)
+        key = (params_fingerprint(engine_name, confidence, advanced_params), use_gpu)
+        with self._engines_lock:
+            previous = self.engines[engine_name]
+            if previous is not None and self._engine_keys.get(engine_name) == key:
+                return previous
+            processor = self._create_processor(engine_name, confidence, use_gpu, advanced_params)
+            self.engines[engine_name] = processor
+            self._engine_keys[engine_name] = key
+        if previous is not None and hasattr(previous, 'close'):
+            previous.close()
+        return processor
+
+    def _create_processor(self, engine_name, confidence, use_gpu, advanced_params):
+        """Instancie le processeur du moteur avec ses paramètres."""
+        # Résolution de détection / reconnaissance (max_detect_edge, max_recognition_edge)
+        resolution_policy = ResolutionPolicy.from_params(advanced_params)
+
         if engine_name == 'EasyOCR':
             # Utiliser les paramètres avancés si disponibles
             if advanced_params:
@@ -84,7 +120,9 @@ class OCRProcessor:
                 conf_threshold = confidence
                 gpu = use_gpu
             
-            processor = EasyOCRProcessor(languages, conf_threshold, gpu)
+            processor = EasyOCRProcessor(languages, conf_threshold, gpu,
+                                         resolution_policy=resolution_policy,
+                                         tile_executor=TileExecutor.from_params(advanced_params))
             
         elif engine_name == 'Tesseract':
             # Utiliser les paramètres avancés si disponibles
@@ -96,7 +134,12 @@ class OCRProcessor:
                 conf_threshold = confidence
             
             # Tesseract utilise des confiances en pourcentage (0-100), convertir le seuil
-            processor = TesseractOCRProcessor(lang, conf_threshold * 100, False)  # Convertir en pourcentage
+            processor = TesseractOCRProcessor(lang, conf_threshold * 100, False,  # Convertir en pourcentage
+                                              resolution_policy=resolution_policy,
+                                              backend=advanced_params.get('backend', 'auto') if advanced_params else 'auto',
+                                              psm_configs=[f"--psm {advanced_params['psm']}"]
+                                              if advanced_params and advanced_params.get('psm') else None,
+                                              variant_search=bool(advanced_params and advanced_params.get('psm_search')))
             
         elif engine_name == 'TrOCR':
             # Utiliser les paramètres avancés si disponibles
@@ -105,15 +148,13 @@ class OCRProcessor:
             else:
                 device = 'cuda' if use_gpu else 'cpu'
             
-            processor = ShelfReaderTrOCRProcessor(device)
+            processor = ShelfReaderTrOCRProcessor(device, resolution_policy=resolution_policy)
         else:
             raise ValueError(f"Moteur OCR non supporté : {engine_name}")
 
-        # Stocker la nouvelle instance
-        self.engines[engine_name] = processor
         return processor
 
-    def process_image(self, image_path: str, engine_name: str = 'EasyOCR',
+    def process_image(self, image_path, engine_name: str = 'EasyOCR',
                      confidence: float = 0.3, use_gpu: bool = True,
                      debug: bool = False, advanced_params: Dict = None) -> Tuple[Optional[Dict], float]:
         """
@@ -124,7 +165,8 @@ class OCRProcessor:
         avec préprocessing intelligent et méthodes de détection de dos de livres.
 
         Args:
-            image_path (str): Chemin vers l'image à traiter
+            image_path (str | LoadedImage): Chemin vers l'image à traiter, ou image
+                déjà décodée par core.image_loading.load_image (partagée avec la visualisation)
             engine_name (str): Moteur OCR à utiliser ('EasyOCR', 'Tesseract', 'TrOCR')
             confidence (float): Seuil de confiance minimum (0.0-1.0)
             use_gpu (bool): Utilisation du GPU pour accélérer le traitement
@@ -134,89 +176,45 @@ class OCRProcessor:
         Returns:
             Tuple[Optional[Dict], float]: (résultats, temps de traitement)
                 - results: dict avec 'books', 'text', 'confidence' ou None si erreur
+                  (coordonnées dans le repère de l'image d'origine orientée)
                 - processing_time: temps en secondes
 
         Note:
             Pour EasyOCR, utilise la détection spécialisée de dos de livres
             avec la méthode "shelfie" pour optimiser la reconnaissance sur étagères.
         """
+        # Profilage par étape : advanced_params['trace'] ou SHELFREADER_TRACE=1
+        trace_enabled = advanced_params.get('trace') if advanced_params else None
+
         try:
-            start_time = time.time()
+            with tracer.request(engine_name, enabled=trace_enabled, engine=engine_name) as trace:
+                start_time = time.time()
+                results, loaded, store = self._cached_or_loaded(image_path, engine_name, confidence,
+                                                                advanced_params, start_time, 'batch')
 
-            # Charger l'image
-            pil_image = Image.open(image_path)
+                if results is None:
+                    boxes, text, avg_confidence = self._run_engine(
+                        loaded.bgr, engine_name, confidence, use_gpu, debug, advanced_params
+                    )
 
-            # Récupérer le processeur approprié avec paramètres avancés
-            processor = self.get_processor(engine_name, confidence, use_gpu, advanced_params)
+                    # Coordonnées ramenées à l'image d'origine si le décodage était réduit
+                    boxes = loaded.boxes_to_original(boxes)
 
-            # Traitement spécifique selon le moteur
-            if engine_name == 'EasyOCR':
-                # Récupérer les paramètres avancés pour EasyOCR
-                spine_method = "vertical_lines"  # défaut
-                if advanced_params and 'spine_method' in advanced_params:
-                    spine_method = advanced_params['spine_method']
-                
-                # EasyOCR avec détection spécialisée de dos de livres
-                boxes = processor.get_boxes(
-                    pil_image,
-                    preprocess=False,  # Préprocessing déjà fait dans le moteur
-                    use_spine_detection=True,  # Détection intelligente des dos
-                    debug=debug,
-                    reference_titles=None,
-                    spine_method=spine_method
-                )
-                text, avg_confidence = processor.get_text_and_confidence(
-                    pil_image,
-                    preprocess=False,
-                    use_spine_detection=True,
-                    reference_titles=None,
-                    spine_method=spine_method
-                )
-
-            elif engine_name == 'Tesseract':
-                # Traitement standard pour Tesseract
-                boxes = processor.get_boxes(pil_image)
-                text, avg_confidence = processor.get_text_and_confidence(pil_image)
-                
-            elif engine_name == 'TrOCR':
-                # TrOCR: process_image returns list of dicts with text/confidence/bbox
-                image_np = np.array(pil_image)
-                trocr_results = processor.process_image(image_np)
-
-                # Convert TrOCR format to standard format expected by visualization
-                # and apply confidence filtering
-                boxes = []
-                filtered_results = []
-                for result in trocr_results:
-                    result_confidence = result.get('confidence', 0.0)
-                    if result_confidence >= confidence:  # Apply confidence threshold
-                        if 'bbox' in result and len(result['bbox']) >= 4:
-                            x, y, w, h = result['bbox']
-                            boxes.append({
-                                'x': x,
-                                'y': y,
-                                'width': w,
-                                'height': h,
-                                'text': result.get('text', ''),
-                                'confidence': result_confidence
-                            })
-                        filtered_results.append(result)
-
-                text = '\n'.join([r.get('text','') for r in filtered_results]) if filtered_results else ''
-                avg_confidence = (sum([r.get('confidence',0) for r in filtered_results])/len(filtered_results)) if filtered_results else 0.0
+                    processing_time = time.time() - start_time
 
-            else:
-                raise ValueError(f"Moteur OCR non supporté : {engine_name}")
+                    results = {
+                        'books': boxes,
+                        'text': text,
+                        'confidence': avg_confidence,
+                        'processing_time': processing_time,
+                        'engine': engine_name
+                    }
+                    store(results)
 
-            processing_time = time.time() - start_time
+                processing_time = results['processing_time']
 
-            results = {
-                'books': boxes,
-                'text': text,
-                'confidence': avg_confidence,
-                'processing_time': processing_time,
-                'engine': engine_name
-            }
+            if trace is not None:
+                results['trace'] = trace.to_dict()
 
             return results, processing_time
 
@@ -224,7 +222,281 @@ class OCRProcessor:
             print(f"Erreur lors du traitement OCR avec {engine_name}: {str(e)}")
             return None, 0.0
 
-    def compare_engines(self, image_path: str, engines: List[str],
+    def _cached_or_loaded(self, image_path, engine_name, confidence, advanced_params, start_time, mode):
+        """
+        Recherche en cache puis décodage, communs à process_image et process_image_stream.
+
+        Args:
+            mode: 'batch' (process_image) ou 'stream' (process_image_stream): entrées
+                de cache distinctes, les deux chemins ne produisant pas les mêmes livres
+
+        Returns:
+            Tuple: (résultats en cache ou None, LoadedImage ou None si résultat exact en cache,
+                fonction store(results) qui enregistre de nouveaux résultats dans le cache)
+        """
+        # Cache des résultats (rescans) : recherche exacte avant tout décodage
+        cache = self.get_result_cache(advanced_params)
+        if cache is not None:
+            with span('cache.hash'):
+                sha256 = self._content_hash(image_path)
+                cache_params = params_fingerprint(engine_name, confidence, advanced_params, mode)
+            hit = cache.lookup_exact(sha256, cache_params)
+            if hit:
+                return self._results_from_cache(hit, None, start_time), None, None
+
+        # Décodage unique (réduction JPEG si la politique de résolution le permet)
+        with span('load_image'):
+            if isinstance(image_path, LoadedImage):
+                loaded = image_path
+            else:
+                loaded = load_image(image_path, max_edge=ResolutionPolicy.from_params(advanced_params).decode_edge())
+        if cache is None:
+            return None, loaded, lambda results: None
+
+        # Quasi-doublon : même étagère photographiée à nouveau
+        with span('cache.dhash'):
+            image_hash = dhash(loaded.bgr)
+        hit = cache.lookup_near(image_hash, cache_params, advanced_params.get('near_duplicate_distance'))
+        if hit:
+            return self._results_from_cache(hit, loaded.original_size, start_time), loaded, None
+
+        def store(results):
+            key = cache.store(sha256, image_hash, cache_params, results, loaded.original_size)
+            results['cache'] = {'key': key, 'hit': False}
+
+        return None, loaded, store
+
+    def _run_engine(self, image, engine_name, confidence, use_gpu, debug, advanced_params):
+        """
+        Exécute le moteur OCR sur l'image décodée (BGR).
+
+        Returns:
+            Tuple[List[Dict], str, float]: (boîtes, texte, confiance moyenne)
+        """
+        # Récupérer le processeur approprié avec paramètres avancés
+        with span('engine_init'):
+            processor = self.get_processor(engine_name, confidence, use_gpu, advanced_params)
+
+        # Traitement spécifique selon le moteur
+        if engine_name == 'EasyOCR':
+            # Récupérer les paramètres avancés pour EasyOCR
+            spine_method = "vertical_lines"  # défaut
+            if advanced_params and 'spine_method' in advanced_params:
+                spine_method = advanced_params['spine_method']
+        
+            # EasyOCR avec détection spécialisée de dos de livres
+            boxes = processor.get_boxes(
+                image,
+                preprocess=False,  # Préprocessing déjà fait dans le moteur
+                use_spine_detection=True,  # Détection intelligente des dos
+                debug=debug,
+                reference_titles=None,
+                spine_method=spine_method
+            )
+            text, avg_confidence = processor.get_text_and_confidence(
+                image,
+                preprocess=False,
+                use_spine_detection=True,
+                reference_titles=None,
+                spine_method=spine_method
+            )
+
+        elif engine_name == 'Tesseract':
+            # Traitement standard pour Tesseract
+            boxes = processor.get_boxes(image)
+            text, avg_confidence = processor.get_text_and_confidence(image)
+        
+        elif engine_name == 'TrOCR':
+            # TrOCR: process_image returns list of dicts with text/confidence/bbox
+            trocr_results = processor.process_image(image)
+
+            # Convert TrOCR format to standard format expected by visualization
+            # and apply confidence filtering
+            boxes = []
+            filtered_results = []
+            for result in trocr_results:
+                if result.get('confidence', 0.0) >= confidence:  # Apply confidence threshold
+                    box = self._trocr_box(result)
+                    if box is not None:
+                        boxes.append(box)
+                    filtered_results.append(result)
+
+            text = '\n'.join([r.get('text','') for r in filtered_results]) if filtered_results else ''
+            avg_confidence = (sum([r.get('confidence',0) for r in filtered_results])/len(filtered_results)) if filtered_results else 0.0
+
+        else:
+            raise ValueError(f"Moteur OCR non supporté : {engine_name}")
+
+        return boxes, text, avg_confidence
+
+    @staticmethod
+    def _trocr_box(result: Dict) -> Optional[Dict]:
+        """Boîte au format de visualisation pour un résultat TrOCR (None sans bbox)."""
+        if 'bbox' not in result or len(result['bbox']) < 4:
+            return None
+        x, y, w, h = result['bbox'][:4]
+        return {
+            'x': x,
+            'y': y,
+            'width': w,
+            'height': h,
+            'text': result.get('text', ''),
+            'confidence': result.get('confidence', 0.0)
+        }
+
+    def process_image_stream(self, image_path, engine_name: str = 'EasyOCR',
+                             confidence: float = 0.3, use_gpu: bool = True,
+                             debug: bool = False, advanced_params: Dict = None,
+                             enrich: Optional[Callable[[List[Dict]], List[Dict]]] = None) -> Iterator[Dict]:
+        """
+        Traite une image et produit chaque livre dès qu'il est reconnu.
+
+        Même traitement que process_image (cache, décodage, moteur), mais les
+        livres sont remis un par un pendant l'analyse: l'interface peut afficher
+        le premier livre (et son enrichissement) sans attendre toute l'étagère.
+
+        Args:
+            image_path (str | LoadedImage): Image à traiter
+            engine_name, confidence, use_gpu, debug, advanced_params: Voir process_image
+            enrich (Callable): Enrichissement optionnel appliqué à chaque livre dès sa
+                reconnaissance (ex. OpenLibraryEnricher.enrich_books, appelé avec [livre])
+
+        Yields:
+            Dict: Événements
+                - {'type': 'book', 'index', 'book', 'elapsed'}: un livre (enrichi si enrich)
+                - {'type': 'done', 'results', 'processing_time', 'enriched_books'}: fin,
+                  results au même format que process_image (enriched_books None sans enrich)
+                - {'type': 'error', 'error'}: échec du traitement
+        """
+        trace_enabled = advanced_params.get('trace') if advanced_params else None
+
+        try:
+            with tracer.request(engine_name, enabled=trace_enabled, engine=engine_name, stream=True) as trace:
+                start_time = time.time()
+                results, loaded, store = self._cached_or_loaded(image_path, engine_name, confidence,
+                                                                advanced_params, start_time, 'stream')
+
+                enriched_books = [] if enrich is not None else None
+                if results is not None:
+                    # Résultats en cache: tous les livres sont disponibles immédiatement
+                    cached_enrichment = results['cache'].get('enriched_books')
+                    books = cached_enrichment or results.get('books', [])
+                    for index, book in enumerate(books):
+                        if enrich is not None and not cached_enrichment:
+                            with span('enrichment'):
+                                book = enrich([book])[0]
+                        if enriched_books is not None:
+                            enriched_books.append(book)
+                        yield {'type': 'book', 'index': index, 'book': book, 'elapsed': time.time() - start_time}
+                else:
+                    boxes = []
+                    for index, box in enumerate(self._iter_engine(
+                            loaded.bgr, engine_name, confidence, use_gpu, debug, advanced_params)):
+                        box = loaded.boxes_to_original([box])[0]
+                        boxes.append(box)
+                        book = box
+                        if enrich is not None:
+                            with span('enrichment'):
+                                book = enrich([box])[0]
+                            enriched_books.append(book)
+                        yield {'type': 'book', 'index': index, 'book': book, 'elapsed': time.time() - start_time}
+
+                    confidences = [b.get('confidence', 0.0) for b in boxes]
+                    separator = '\n' if engine_name == 'TrOCR' else ' | '
+                    results = {
+                        'books': boxes,
+                        'text': separator.join(b.get('text', '') for b in boxes),
+                        'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+                        'processing_time': time.time() - start_time,
+                        'engine': engine_name
+                    }
+                    store(results)
+
+                if enriched_books is not None:
+                    self.store_enrichment(results, enriched_books)
+                processing_time = results['processing_time']
+
+            if trace is not None:
+                results['trace'] = trace.to_dict()
+
+            yield {'type': 'done', 'results': results, 'processing_time': processing_time,
+                   'enriched_books': enriched_books}
+
+        except Exception as e:
+            print(f"Erreur lors du traitement OCR avec {engine_name}: {str(e)}")
+            yield {'type': 'error', 'error': str(e)}
+
+    def _iter_engine(self, image, engine_name, confidence, use_gpu, debug, advanced_params):
+        """
+        Générateur des boîtes par livre du moteur OCR sur l'image décodée (BGR).
+
+        Yields:
+            Dict: Boîte d'un livre (repère de l'image décodée)
+        """
+        with span('engine_init'):
+            processor = self.get_processor(engine_name, confidence, use_gpu, advanced_params)
+
+        if engine_name == 'EasyOCR':
+            spine_method = (advanced_params or {}).get('spine_method', "vertical_lines")
+            yield from processor.iter_books(image, preprocess=False, spine_method=spine_method, debug=debug)
+
+        elif engine_name == 'Tesseract':
+            yield from processor.iter_books(image)
+
+        elif engine_name == 'TrOCR':
+            for result in processor.iter_results(image):
+                if result.get('confidence', 0.0) >= confidence:
+                    box = self._trocr_box(result)
+                    if box is not None:
+                        yield box
+
+        else:
+            raise ValueError(f"Moteur OCR non supporté : {engine_name}")
+
+    def get_result_cache(self, advanced_params: Dict = None) -> Optional[ResultCache]:
+        """Cache des résultats, créé au premier usage si advanced_params['use_cache'] est vrai."""
+        if not advanced_params or not advanced_params.get('use_cache'):
+            return None
+        if self.result_cache is None:
+            self.result_cache = ResultCache(advanced_params.get('cache_dir', DEFAULT_CACHE_DIR))
+        return self.result_cache
+
+    @staticmethod
+    def _content_hash(image_path) -> str:
+        """SHA-256 du fichier source (ou des pixels si l'image n'a pas de fichier)."""
+        if isinstance(image_path, LoadedImage):
+            if isinstance(image_path.source, str):
+                return content_hash(image_path.source)
+            return content_hash(memoryview(np.ascontiguousarray(image_path.bgr)))
+        return content_hash(image_path)
+
+    @staticmethod
+    def _results_from_cache(hit, original_size, start_time) -> Dict:
+        """Résultats d'une entrée du cache, remis à l'échelle si le quasi-doublon a une autre taille."""
+        results = dict(hit.entry['results'])
+        enriched_books = hit.entry.get('enriched_books')
+        cached_size = hit.entry.get('original_size')
+        if original_size and cached_size and tuple(cached_size) != tuple(original_size):
+            sx = original_size[0] / float(cached_size[0])
+            sy = original_size[1] / float(cached_size[1])
+            results['books'] = scale_boxes(results.get('books', []), sx, sy)
+            if enriched_books:
+                enriched_books = scale_boxes(enriched_books, sx, sy)
+        results['processing_time'] = time.time() - start_time
+        results['cache'] = {
+            'key': hit.key, 'hit': True, 'match': hit.match,
+            'distance': hit.distance, 'enriched_books': enriched_books
+        }
+        return results
+
+    def store_enrichment(self, results: Dict, enriched_books: List[Dict]) -> None:
+        """Enregistre l'enrichissement Open Library avec les résultats OCR en cache."""
+        cache_info = results.get('cache') if results else None
+        if not cache_info or self.result_cache is None or cache_info.get('enriched_books'):
+            return
+        self.result_cache.store_enrichment(cache_info['key'], enriched_books)
+
+    def compare_engines(self, image_path, engines: List[str],
                        confidence: float = 0.3, use_gpu: bool = True,
                        debug: bool = False, advanced_params: Dict = None) -> Dict[str, Dict]:
         """
@@ -234,7 +506,7 @@ class OCRProcessor:
         et choisir le plus adapté selon le cas d'usage.
 
         Args:
-            image_path (str): Chemin vers l'image à analyser
+            image_path (str | LoadedImage): Chemin vers l'image à analyser (décodée une seule fois)
             engines (List[str]): Liste des moteurs à comparer
             confidence (float): Seuil de confiance pour tous les moteurs
             use_gpu (bool): Utilisation du GPU pour tous les moteurs
@@ -247,6 +519,12 @@ class OCRProcessor:
         """
         results = {}
 
+        # Décodage unique partagé par tous les moteurs (à la plus grande résolution requise)
+        if not isinstance(image_path, LoadedImage):
+            edges = [ResolutionPolicy.from_params(advanced_params.get(e) if advanced_params else None).decode_edge()
+                     for e in engines]
+            image_path = load_image(image_path, max_edge=None if None in edges else max(edges))
+
         for engine_name in engines:
             print(f"Traitement avec {engine_name}...")
             # Utiliser les paramètres avancés spécifiques au moteur si disponibles
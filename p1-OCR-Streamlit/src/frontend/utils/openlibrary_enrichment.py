@@ -3,7 +3,10 @@ Utilitaires d'enrichissement Open Library - ShelfReader P1
 
 Ce module gère l'enrichissement des résultats OCR avec des métadonnées
 provenant de l'API Open Library, permettant d'obtenir titres, auteurs,
-dates de publication et couvertures de livres.
+dates de publication et couvertures de livres. Le niveau d'enrichissement
+choisit ce qui est récupéré tout de suite: la description de l'œuvre est
+sinon chargée au premier accès, et les couvertures des livres enrichis sont
+préchargées en vignettes locales (services/cover_cache.py) à l'étape 'cover'.
 """
 
 from typing import Dict, List, Optional, Any
@@ -12,7 +15,10 @@ import os
 # Ajouter le répertoire parent (src) au path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from services.openlibrary_client import OpenLibraryClient
+from services.async_openlibrary_client import create_openlibrary_client
+from services.openlibrary_client import LazyDict, WITH_COVER, enrichment_steps
+from services.cover_cache import get_cover_cache
+from core.instrumentation import span
 
 
 class OpenLibraryEnricher:
@@ -24,17 +30,25 @@ class OpenLibraryEnricher:
     la qualité et la précision des résultats.
 
     Attributs:
-        client (OpenLibraryClient): Client pour les appels API
+        client: Client pour les appels API (SyncOpenLibraryClient sur le transport
+            partagé si httpx est installé, sinon OpenLibraryClient)
+        level: Niveau d'enrichissement (voir services/openlibrary_client.py)
     """
 
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, level: str = WITH_COVER):
         """
         Initialise l'enrichisseur avec un client Open Library.
 
         Args:
             timeout (int): Timeout en secondes pour les appels API
+            level (str): 'search' (une requête par livre, description au premier
+                accès), '+details' (description tout de suite), '+cover'
+                (vignettes des couvertures téléchargées en arrière-plan dans
+                le cache partagé de services/cover_cache.py)
         """
-        self.client = OpenLibraryClient(timeout=timeout)
+        self.client = create_openlibrary_client(timeout=timeout)
+        self.level = level
+        self.steps = enrichment_steps(level)
 
     def enrich_books(self, books: List[Dict]) -> List[Dict]:
         """
@@ -61,30 +75,36 @@ class OpenLibraryEnricher:
 
         Note:
             Les livres non enrichis (pas de correspondance trouvée) gardent
-            leur structure originale avec enriched=False.
+            leur structure originale avec enriched=False. Avec le client
+            asynchrone, les requêtes de tous les livres partent en parallèle.
+            Sans l'étape 'details', openlibrary_description n'est demandée
+            qu'au premier accès. Avec l'étape 'cover', les couvertures sont
+            ensuite téléchargées en arrière-plan, sans attendre leur fin.
         """
         enriched_books = []
+        texts = [book.get('text', '').strip() for book in books]
+        infos = self._book_infos(texts)
 
-        for book in books:
-            text = book.get('text', '').strip()
-
+        for book, text, enriched_info in zip(books, texts, infos):
             if text:
-                # Tentative d'enrichissement via Open Library
-                enriched_info = self.client.get_book_info_for_ocr_result(text)
-
                 if enriched_info:
+                    # Description non encore chargée: reportée sans requête /works
+                    lazy = isinstance(enriched_info, LazyDict) and not enriched_info.is_loaded('description')
                     # Fusion des données OCR avec les données Open Library
-                    enriched_book = book.copy()
+                    enriched_book = LazyDict(book)
                     enriched_book.update({
                         'openlibrary_title': enriched_info.get('title'),
                         'openlibrary_author': enriched_info.get('author'),
                         'openlibrary_year': enriched_info.get('first_publish_year'),
                         'openlibrary_cover_url': enriched_info.get('cover_url'),
                         'openlibrary_url': enriched_info.get('open_library_url'),
-                        'openlibrary_description': enriched_info.get('description'),
+                        'openlibrary_description': None if lazy else enriched_info.get('description'),
                         'openlibrary_subjects': enriched_info.get('subjects', []),
                         'enriched': True
                     })
+                    if lazy:
+                        enriched_book.defer('openlibrary_description',
+                                            lambda info=enriched_info: info.get('description'))
                     enriched_books.append(enriched_book)
                 else:
                     # Livre OCR sans enrichissement
@@ -97,8 +117,32 @@ class OpenLibraryEnricher:
                 book_copy['enriched'] = False
                 enriched_books.append(book_copy)
 
+        if 'cover' in self.steps:
+            self._prefetch_covers(enriched_books)
         return enriched_books
 
+    @staticmethod
+    def _prefetch_covers(books: List[Dict]) -> None:
+        """Lance le téléchargement des couvertures (un cache inutilisable n'empêche pas l'enrichissement)."""
+        try:
+            get_cover_cache().prefetch_books(books)
+        except Exception as e:
+            print(f"⚠️ Préchargement des couvertures impossible : {e}")
+
+    def _book_infos(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Informations Open Library de chaque texte (None si vide ou sans correspondance)."""
+        queries = [text for text in texts if text]
+        if hasattr(self.client, 'get_book_info_many'):
+            with span('enrichment.books', books=len(queries)):
+                found = iter(self.client.get_book_info_many(queries, level=self.level))
+        else:
+            found = []
+            for text in queries:
+                with span('enrichment.book'):
+                    found.append(self.client.get_book_info_for_ocr_result(text, level=self.level))
+            found = iter(found)
+        return [next(found) if text else None for text in texts]
+
     def get_enrichment_stats(self, books: List[Dict]) -> Dict[str, int]:
         """
         Calcule les statistiques d'enrichissement.
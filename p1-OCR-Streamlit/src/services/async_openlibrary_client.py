@@ -0,0 +1,349 @@
+# DÉPENDANCES:
+#   - Utilise: services/openlibrary_client.py, core/instrumentation.py
+#   - Importe: asyncio, concurrent.futures, contextvars, random, threading, time, httpx (à l'initialisation)
+#   - Utilisé par: frontend/utils/openlibrary_enrichment.py, p4-Mobile-Real-time/realtime_engine/pipeline.py
+
+"""
+ShelfReader - Async Open Library Client
+Client Open Library asynchrone sur une connexion partagée (httpx).
+
+Un seul pool de connexions keep-alive (HTTP/2 optionnel, avec le paquet h2)
+sert toutes les requêtes: recherches et détails d'une étagère entière partent
+en parallèle au lieu d'une requête suivie d'un time.sleep(0.1). Le débit reste
+limité (max_rate requêtes par seconde), les réponses 429/5xx et les erreurs
+réseau sont relancées avec un délai exponentiel à gigue (Retry-After respecté).
+Au niveau d'enrichissement par défaut ('search'), un livre coûte une seule
+recherche réduite aux champs utilisés; la description n'est demandée qu'au
+premier accès.
+
+Les appelants synchrones (interface Streamlit, scripts, pipeline temps réel)
+passent par SyncOpenLibraryClient: les coroutines tournent sur la boucle d'un
+OpenLibraryTransport (thread dédié), partagé par tout le processus via
+shared_client().
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import random
+import threading
+import time
+
+from core.instrumentation import span, count
+from services.openlibrary_client import (OpenLibraryClient, BASE_URL, DEFAULT_LEVEL, SEARCH_FIELDS,
+                                         build_book_info, build_cover_url, clean_ocr_text, enrichment_steps)
+
+# Paramètres par défaut
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # Secondes, doublé à chaque tentative
+DEFAULT_MAX_BACKOFF = 8.0
+DEFAULT_MAX_RATE = 10.0  # Requêtes par seconde (None = pas de limite)
+DEFAULT_CONCURRENCY = 8  # Livres enrichis en parallèle
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+USER_AGENT = "ShelfReader/1.0"
+
+
+def backoff_delay(attempt, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF, retry_after=None):
+    """
+    Délai avant la tentative suivante: Retry-After s'il est fourni, sinon
+    gigue complète sur un délai exponentiel (uniforme entre 0 et backoff * 2^attempt).
+    """
+    if retry_after is not None:
+        return min(max_backoff, retry_after)
+    return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AsyncOpenLibraryClient:
+    """
+    Client Open Library asynchrone (mêmes méthodes et mêmes réponses que OpenLibraryClient).
+
+    Args:
+        timeout: Timeout par requête (secondes)
+        max_connections: Taille du pool de connexions
+        max_keepalive: Connexions gardées ouvertes entre deux requêtes
+        http2: Active HTTP/2 si le paquet h2 est installé
+        retries: Nouvelles tentatives sur 429/5xx et erreurs réseau
+        backoff, max_backoff: Délai exponentiel entre tentatives (secondes)
+        max_rate: Requêtes par seconde au plus (None = pas de limite)
+        base_url: Serveur Open Library (ou serveur de test)
+
+    Raises:
+        ImportError: Si httpx n'est pas installé
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive=DEFAULT_MAX_KEEPALIVE, http2=False, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF, max_rate=DEFAULT_MAX_RATE,
+                 base_url=BASE_URL):
+        import httpx
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️ HTTP/2 demandé mais le paquet h2 n'est pas installé : HTTP/1.1 utilisé")
+                http2 = False
+        self._httpx = httpx
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_rate = max_rate
+        self.client = httpx.AsyncClient(
+            base_url=base_url, http2=http2, follow_redirects=True, headers={'User-Agent': USER_AGENT},
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive))
+        self._next_slot = 0.0
+        self._slot_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _throttle(self):
+        """Espace les départs de requêtes de 1/max_rate secondes (sans bloquer les autres tâches)."""
+        if not self.max_rate:
+            return
+        async with self._slot_lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + 1.0 / self.max_rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def get_json(self, path, params=None, name='openlibrary.request'):
+        """
+        GET avec nouvelles tentatives.
+
+        Returns:
+            Réponse JSON, ou None (erreur HTTP définitive, tentatives épuisées)
+        """
+        error = None
+        for attempt in range(self.retries + 1):
+            await self._throttle()
+            retry_after = None
+            try:
+                with span(name):
+                    response = await self.client.get(path, params=params)
+                count('openlibrary.http_requests')
+            except self._httpx.TransportError as e:
+                error = e
+            else:
+                if response.status_code in RETRY_STATUSES:
+                    error = f"HTTP {response.status_code}"
+                    retry_after = _retry_after(response)
+                elif response.is_error:
+                    count('openlibrary.http_errors')
+                    print(f"Erreur Open Library ({path}): HTTP {response.status_code}")
+                    return None
+                else:
+                    return response.json()
+            if attempt < self.retries:
+                count('openlibrary.retries')
+                await asyncio.sleep(backoff_delay(attempt, self.backoff, self.max_backoff, retry_after))
+        count('openlibrary.http_errors')
+        print(f"Erreur Open Library ({path}) après {self.retries + 1} tentative(s): {error}")
+        return None
+
+    async def search_books(self, query, limit=5, fields=None):
+        """
+        Cherche des livres sur Open Library.
+
+        Args:
+            query: Requête de recherche
+            limit: Nombre maximum de résultats
+            fields: Champs demandés (liste), pour réduire la réponse
+        """
+        query = (query or '').strip()
+        if not query:
+            return None
+        params = {'q': query, 'limit': limit}
+        if fields:
+            params['fields'] = ','.join(fields)
+        return await self.get_json('/search.json', params, name='openlibrary.search')
+
+    async def get_book_details(self, work_key):
+        """Récupère les détails d'une œuvre (/works/...)."""
+        if not work_key or not work_key.startswith('/works/'):
+            return None
+        return await self.get_json(f"{work_key}.json", name='openlibrary.details')
+
+    get_book_cover_url = staticmethod(build_cover_url)
+
+    async def search_book_by_title_and_author(self, title, author=None, limit=5):
+        """Recherche avancée avec titre et auteur."""
+        if not title.strip():
+            return None
+        query = f'title:"{title.strip()}"'
+        if author:
+            query += f' author:"{author.strip()}"'
+        return await self.search_books(query, limit)
+
+    async def get_book_info_for_ocr_result(self, ocr_text, level=DEFAULT_LEVEL, load_details=None):
+        """
+        Enrichit un résultat OCR (voir OpenLibraryClient.get_book_info_for_ocr_result).
+
+        Args:
+            level: Niveau d'enrichissement ('search', 'search+details', ...)
+            load_details: Sans l'étape 'details', fonction synchrone work_key -> détails
+                appelée au premier accès à la description (hors de la boucle asyncio);
+                sans elle, description None
+        """
+        steps = enrichment_steps(level)
+        clean_text = clean_ocr_text(ocr_text)
+        if not clean_text:
+            return None
+        results = await self.search_books(clean_text, limit=1, fields=SEARCH_FIELDS)
+        if not results or not results.get('docs'):
+            return None
+        book = results['docs'][0]
+        details = None
+        if book.get('key') and 'details' in steps:
+            details = await self.get_book_details(book['key'])
+        return build_book_info(ocr_text, book, details, load_details)
+
+    async def get_book_info_many(self, ocr_texts, concurrency=DEFAULT_CONCURRENCY, level=DEFAULT_LEVEL,
+                                 load_details=None):
+        """
+        Enrichit plusieurs résultats OCR en parallèle.
+
+        Returns:
+            List: une entrée par texte, dans l'ordre (None si pas de correspondance)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(text):
+            async with semaphore:
+                return await self.get_book_info_for_ocr_result(text, level, load_details)
+
+        return list(await asyncio.gather(*(one(text) for text in ocr_texts)))
+
+
+class OpenLibraryTransport:
+    """
+    Boucle asyncio dédiée (thread démon) portant un AsyncOpenLibraryClient.
+
+    Les appels depuis d'autres threads attendent leur résultat (run), avec le
+    contexte de l'appelant: les spans Open Library restent rattachés à la
+    requête instrumentée en cours.
+
+    Args:
+        **client_options: Arguments de AsyncOpenLibraryClient
+    """
+
+    def __init__(self, **client_options):
+        import httpx  # noqa: F401 (ImportError avant de démarrer le thread)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='openlibrary-transport', daemon=True)
+        self._thread.start()
+        self.client = self.run(self._create(client_options))
+
+    @staticmethod
+    async def _create(options):
+        return AsyncOpenLibraryClient(**options)
+
+    def run(self, coroutine, timeout=None):
+        """Exécute une coroutine sur la boucle du transport et retourne son résultat."""
+        context = contextvars.copy_context()
+        future = concurrent.futures.Future()
+
+        def done(task):
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def start():
+            self._loop.create_task(coroutine, context=context).add_done_callback(done)
+
+        self._loop.call_soon_threadsafe(start)
+        return future.result(timeout)
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        self.run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class SyncOpenLibraryClient:
+    """
+    Façade synchrone d'un OpenLibraryTransport, interchangeable avec OpenLibraryClient.
+
+    Args:
+        transport: Transport utilisé (défaut: transport partagé du processus)
+    """
+
+    def __init__(self, transport=None):
+        self.transport = transport or get_transport()
+
+    @property
+    def base_url(self):
+        return self.transport.client.base_url
+
+    def search_books(self, query, limit=5, fields=None):
+        return self.transport.run(self.transport.client.search_books(query, limit, fields))
+
+    def get_book_details(self, work_key):
+        return self.transport.run(self.transport.client.get_book_details(work_key))
+
+    get_book_cover_url = staticmethod(build_cover_url)
+
+    def search_book_by_title_and_author(self, title, author=None, limit=5):
+        return self.transport.run(self.transport.client.search_book_by_title_and_author(title, author, limit))
+
+    # Description paresseuse: chargée via le transport au premier accès
+    def get_book_info_for_ocr_result(self, ocr_text, level=DEFAULT_LEVEL):
+        return self.transport.run(
+            self.transport.client.get_book_info_for_ocr_result(ocr_text, level, self.get_book_details))
+
+    def get_book_info_many(self, ocr_texts, concurrency=DEFAULT_CONCURRENCY, level=DEFAULT_LEVEL):
+        return self.transport.run(
+            self.transport.client.get_book_info_many(ocr_texts, concurrency, level, self.get_book_details))
+
+
+# Transport partagé par tout le processus (créé au premier usage)
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport(**client_options):
+    """Transport partagé; les options ne sont prises en compte qu'à sa création."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = OpenLibraryTransport(**client_options)
+        return _transport
+
+
+def shared_client(**client_options):
+    """Client synchrone sur le transport partagé."""
+    return SyncOpenLibraryClient(get_transport(**client_options))
+
+
+def create_openlibrary_client(timeout=DEFAULT_TIMEOUT):
+    """Client synchrone partagé si httpx est installé, sinon OpenLibraryClient (requests)."""
+    try:
+        return shared_client(timeout=timeout)
+    except ImportError:
+        return OpenLibraryClient(timeout=timeout)
@@ -0,0 +1,390 @@
+# DÉPENDANCES:
+#   - Utilise: core/instrumentation.py
+#   - Importe: sqlite3, bisect, json, os, re, threading, time, unicodedata
+#   - Utilisé par: engines/easyocr/main.py, engines/tesseract/main.py
+
+"""
+ShelfReader - Catalog Store
+Inventaire persistant (SQLite) des livres vus par étagère et par scan.
+
+Chaque scan d'une étagère est enregistré en une seule transaction: le scan,
+ses observations (texte, confiance, position, boîte) et la fusion dans
+l'inventaire de l'étagère (un livre déjà connu est mis à jour, un nouveau est
+ajouté, un livre absent du scan n'est plus marqué présent). Les différences
+entre deux scans (ajouts, retraits, déplacements) sont calculées à partir des
+observations indexées par scan.
+
+Schéma:
+    shelves     une ligne par étagère (nom unique)
+    scans       une ligne par scan d'étagère
+    books       inventaire: un livre par (étagère, clé, exemplaire)
+    scan_books  observations: un livre vu dans un scan, à une position
+    enrichment  métadonnées Open Library par livre
+"""
+
+import bisect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from core.instrumentation import span, count
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shelves (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    shelf_id INTEGER NOT NULL REFERENCES shelves(id) ON DELETE CASCADE,
+    created REAL NOT NULL,
+    image_path TEXT,
+    engine TEXT,
+    params TEXT,
+    book_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    shelf_id INTEGER NOT NULL REFERENCES shelves(id) ON DELETE CASCADE,
+    book_key TEXT NOT NULL,
+    copy INTEGER NOT NULL DEFAULT 1,
+    title TEXT,
+    normalized_title TEXT,
+    author TEXT,
+    isbn TEXT,
+    first_scan_id INTEGER REFERENCES scans(id),
+    last_scan_id INTEGER REFERENCES scans(id),
+    position INTEGER,
+    present INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (shelf_id, book_key, copy)
+);
+CREATE TABLE IF NOT EXISTS scan_books (
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    book_id INTEGER NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT,
+    confidence REAL,
+    x REAL, y REAL, width REAL, height REAL,
+    PRIMARY KEY (scan_id, book_id)
+);
+CREATE TABLE IF NOT EXISTS enrichment (
+    book_id INTEGER PRIMARY KEY REFERENCES books(id) ON DELETE CASCADE,
+    title TEXT,
+    author TEXT,
+    year INTEGER,
+    isbn TEXT,
+    cover_url TEXT,
+    url TEXT,
+    subjects TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_books_normalized_title ON books(normalized_title);
+CREATE INDEX IF NOT EXISTS idx_books_isbn ON books(isbn);
+CREATE INDEX IF NOT EXISTS idx_books_shelf ON books(shelf_id, present, position);
+CREATE INDEX IF NOT EXISTS idx_scans_shelf ON scans(shelf_id, id);
+CREATE INDEX IF NOT EXISTS idx_scan_books_book ON scan_books(book_id);
+"""
+
+
+def normalize_title(text):
+    """Titre normalisé pour la recherche et le rapprochement: minuscules, sans accents ni ponctuation."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', text).split())
+
+
+def normalize_isbn(isbn):
+    """ISBN sans tirets ni espaces (None si vide)."""
+    if isinstance(isbn, (list, tuple)):
+        isbn = isbn[0] if isbn else None
+    isbn = re.sub(r'[^0-9Xx]', '', str(isbn or '')).upper()
+    return isbn or None
+
+
+def book_fields(book):
+    """
+    Champs d'inventaire d'un livre OCR (enrichi ou non).
+
+    Returns:
+        dict: title, normalized_title, author, isbn, book_key (ISBN si connu,
+            sinon titre normalisé)
+    """
+    title = book.get('openlibrary_title') or book.get('title') or book.get('text') or ''
+    isbn = normalize_isbn(book.get('isbn') or book.get('openlibrary_isbn'))
+    normalized = normalize_title(title)
+    return {
+        'title': title.strip(),
+        'normalized_title': normalized,
+        'author': book.get('openlibrary_author') or book.get('author'),
+        'isbn': isbn,
+        'book_key': f"isbn:{isbn}" if isbn else f"title:{normalized}"
+    }
+
+
+def _moved(old_positions):
+    """
+    Livres déplacés: ceux hors de la plus longue sous-suite croissante des
+    anciennes positions (dans l'ordre du nouveau scan). Un ajout ou un retrait
+    décale les suivants sans les compter comme déplacés.
+
+    Args:
+        old_positions: [(book_id, ancienne position)] dans l'ordre du nouveau scan
+
+    Returns:
+        set: book_id déplacés
+    """
+    tails, tails_index, previous = [], [], [-1] * len(old_positions)
+    for i, (_, position) in enumerate(old_positions):
+        k = bisect.bisect_left(tails, position)
+        if k == len(tails):
+            tails.append(position)
+            tails_index.append(i)
+        else:
+            tails[k] = position
+            tails_index[k] = i
+        previous[i] = tails_index[k - 1] if k else -1
+    kept = set()
+    i = tails_index[-1] if tails_index else -1
+    while i >= 0:
+        kept.add(old_positions[i][0])
+        i = previous[i]
+    return {book_id for book_id, _ in old_positions if book_id not in kept}
+
+
+class CatalogStore:
+    """
+    Catalogue SQLite des étagères, scans et livres.
+
+    Args:
+        path: Fichier de la base (':memory:' pour une base temporaire)
+
+    La connexion est partagée entre threads et protégée par un verrou; chaque
+    écriture est une transaction.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA foreign_keys = ON")
+        if path != ':memory:':
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = NORMAL")
+        with self._db:
+            self._db.executescript(SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _shelf_id(self, shelf, create=False):
+        row = self._db.execute("SELECT id FROM shelves WHERE name = ?", (shelf,)).fetchone()
+        if row is not None:
+            return row['id']
+        if not create:
+            raise KeyError(f"Étagère inconnue : {shelf}")
+        return self._db.execute("INSERT INTO shelves (name, created) VALUES (?, ?)",
+                                (shelf, time.time())).lastrowid
+
+    def add_scan(self, shelf, books, image_path=None, engine=None, params=None, created=None):
+        """
+        Enregistre un scan d'étagère et le fusionne dans l'inventaire (une transaction).
+
+        Args:
+            shelf: Nom de l'étagère (créée au premier scan)
+            books: Livres dans l'ordre de l'étagère (boîtes OCR, enrichies ou non)
+            image_path, engine, params: Informations sur le scan
+            created: Horodatage (défaut: maintenant)
+
+        Returns:
+            int: Identifiant du scan
+        """
+        created = time.time() if created is None else created
+        with self._lock, span('catalog.add_scan', books=len(books)), self._db:
+            shelf_id = self._shelf_id(shelf, create=True)
+            scan_id = self._db.execute(
+                "INSERT INTO scans (shelf_id, created, image_path, engine, params, book_count) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (shelf_id, created, image_path, engine,
+                 json.dumps(params, sort_keys=True, default=str) if params else None, len(books))
+            ).lastrowid
+
+            # Plusieurs exemplaires d'un même livre: numérotés dans l'ordre du scan
+            copies = {}
+            rows = []
+            for position, book in enumerate(books):
+                fields = book_fields(book)
+                copies[fields['book_key']] = copies.get(fields['book_key'], 0) + 1
+                rows.append((fields, copies[fields['book_key']], position, book))
+
+            self._db.executemany(
+                "INSERT INTO books (shelf_id, book_key, copy, title, normalized_title, author, isbn, "
+                "first_scan_id, last_scan_id, position, present) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT (shelf_id, book_key, copy) DO UPDATE SET "
+                "title = excluded.title, normalized_title = excluded.normalized_title, "
+                "author = COALESCE(excluded.author, books.author), isbn = COALESCE(excluded.isbn, books.isbn), "
+                "last_scan_id = excluded.last_scan_id, position = excluded.position, present = 1",
+                [(shelf_id, f['book_key'], copy, f['title'], f['normalized_title'], f['author'], f['isbn'],
+                  scan_id, scan_id, position) for f, copy, position, _ in rows]
+            )
+            ids = {(r['book_key'], r['copy']): r['id'] for r in self._db.execute(
+                "SELECT id, book_key, copy FROM books WHERE shelf_id = ? AND last_scan_id = ?",
+                (shelf_id, scan_id))}
+
+            self._db.executemany(
+                "INSERT INTO scan_books (scan_id, book_id, position, text, confidence, x, y, width, height) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(scan_id, ids[(f['book_key'], copy)], position, book.get('text'), book.get('confidence'),
+                  book.get('x'), book.get('y'), book.get('width'), book.get('height'))
+                 for f, copy, position, book in rows]
+            )
+            self._db.executemany(
+                "INSERT INTO enrichment (book_id, title, author, year, isbn, cover_url, url, subjects, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (book_id) DO UPDATE SET title = excluded.title, author = excluded.author, "
+                "year = excluded.year, isbn = excluded.isbn, cover_url = excluded.cover_url, "
+                "url = excluded.url, subjects = excluded.subjects, updated = excluded.updated",
+                [(ids[(f['book_key'], copy)], book.get('openlibrary_title'), book.get('openlibrary_author'),
+                  book.get('openlibrary_year'), f['isbn'], book.get('openlibrary_cover_url'),
+                  book.get('openlibrary_url'), json.dumps(book.get('openlibrary_subjects') or []), created)
+                 for f, copy, _, book in rows if book.get('enriched')]
+            )
+
+            # Livres de l'inventaire absents de ce scan
+            self._db.execute("UPDATE books SET present = 0 WHERE shelf_id = ? AND last_scan_id != ? AND present = 1",
+                             (shelf_id, scan_id))
+        count('catalog.books_written', len(books))
+        return scan_id
+
+    def scans(self, shelf):
+        """Scans d'une étagère, du plus ancien au plus récent."""
+        with self._lock:
+            shelf_id = self._shelf_id(shelf)
+            return [dict(row) for row in self._db.execute(
+                "SELECT id, created, image_path, engine, book_count FROM scans WHERE shelf_id = ? ORDER BY id",
+                (shelf_id,))]
+
+    def inventory(self, shelf, include_absent=False):
+        """Livres de l'étagère (présents au dernier scan par défaut), dans l'ordre de l'étagère."""
+        query = (
+            "SELECT b.id, b.title, b.author, b.isbn, b.position, b.present, b.first_scan_id, b.last_scan_id, "
+            "e.year, e.cover_url, e.url FROM books b LEFT JOIN enrichment e ON e.book_id = b.id "
+            "WHERE b.shelf_id = ?" + ("" if include_absent else " AND b.present = 1") +
+            " ORDER BY b.present DESC, b.position"
+        )
+        with self._lock:
+            return [dict(row) for row in self._db.execute(query, (self._shelf_id(shelf),))]
+
+    def find(self, title=None, isbn=None, shelf=None):
+        """
+        Recherche de livres par titre (préfixe du titre normalisé) ou par ISBN.
+
+        Returns:
+            List[Dict]: Livres trouvés avec le nom de leur étagère
+        """
+        clauses, args = [], []
+        if title:
+            # Préfixe sur une colonne indexée: parcours d'index, pas de la table
+            prefix = normalize_title(title)
+            clauses.append("b.normalized_title >= ? AND b.normalized_title < ?")
+            args += [prefix, prefix + '\uffff']
+        if isbn:
+            clauses.append("b.isbn = ?")
+            args.append(normalize_isbn(isbn))
+        if shelf:
+            clauses.append("s.name = ?")
+            args.append(shelf)
+        query = ("SELECT b.id, s.name AS shelf, b.title, b.author, b.isbn, b.position, b.present "
+                 "FROM books b JOIN shelves s ON s.id = b.shelf_id")
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return [dict(row) for row in self._db.execute(query + " ORDER BY s.name, b.position", args)]
+
+    def diff(self, shelf, from_scan=None, to_scan=None):
+        """
+        Différences entre deux scans d'une même étagère (défaut: les deux derniers).
+
+        Returns:
+            Dict: {'from_scan', 'to_scan', 'added', 'removed', 'moved'}; chaque livre
+                est un dict (id, title, position, old_position)
+        """
+        with self._lock:
+            shelf_id = self._shelf_id(shelf)
+            if to_scan is None or from_scan is None:
+                recent = [row['id'] for row in self._db.execute(
+                    "SELECT id FROM scans WHERE shelf_id = ? AND (? IS NULL OR id <= ?) ORDER BY id DESC LIMIT 2",
+                    (shelf_id, to_scan, to_scan))]
+                to_scan = recent[0] if to_scan is None and recent else to_scan
+                if from_scan is None:
+                    from_scan = recent[1] if len(recent) > 1 else None
+
+            # Jointure externe complète des observations des deux scans (ordre du nouveau scan)
+            rows = self._db.execute(
+                "SELECT b.id, b.title, new.position AS position, old.position AS old_position "
+                "FROM scan_books new JOIN books b ON b.id = new.book_id "
+                "LEFT JOIN scan_books old ON old.book_id = new.book_id AND old.scan_id = ? "
+                "WHERE new.scan_id = ? "
+                "UNION ALL "
+                "SELECT b.id, b.title, NULL, old.position "
+                "FROM scan_books old JOIN books b ON b.id = old.book_id "
+                "WHERE old.scan_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM scan_books new WHERE new.scan_id = ? AND new.book_id = old.book_id) "
+                "ORDER BY 3, 4",
+                (from_scan, to_scan, from_scan, to_scan)
+            ).fetchall()
+
+        books = [dict(row) for row in rows]
+        common = [(book['id'], book['old_position']) for book in books
+                  if book['position'] is not None and book['old_position'] is not None]
+        moved = _moved(common)
+        return {
+            'from_scan': from_scan,
+            'to_scan': to_scan,
+            'added': [b for b in books if b['old_position'] is None],
+            'removed': [b for b in books if b['position'] is None],
+            'moved': [b for b in books if b['id'] in moved]
+        }
+
+
+def add_catalog_arguments(parser):
+    """Ajoute --catalog / --shelf à un parser argparse."""
+    parser.add_argument('--catalog', type=str,
+                        help='Base SQLite de l\'inventaire: le scan y est enregistré et comparé au précédent')
+    parser.add_argument('--shelf', type=str,
+                        help='Nom de l\'étagère dans le catalogue (défaut: nom du fichier image)')
+
+
+def record_scan(args, books, engine, params=None):
+    """
+    Enregistre les résultats d'un script dans le catalogue (--catalog) et
+    affiche les différences avec le scan précédent de la même étagère.
+    """
+    if not getattr(args, 'catalog', None):
+        return None
+    shelf = args.shelf or os.path.splitext(os.path.basename(args.image_path))[0]
+    with CatalogStore(args.catalog) as store:
+        scan_id = store.add_scan(shelf, books, image_path=os.path.abspath(args.image_path),
+                                 engine=engine, params=params)
+        diff = store.diff(shelf)
+    print(f"🗂️ Scan {scan_id} enregistré dans {args.catalog} (étagère: {shelf})")
+    if diff['from_scan'] is not None:
+        for label, key in (("Ajoutés", 'added'), ("Retirés", 'removed'), ("Déplacés", 'moved')):
+            titles = ', '.join(book['title'] for book in diff[key]) or '-'
+            print(f"   {label}: {titles}")
+    return scan_id
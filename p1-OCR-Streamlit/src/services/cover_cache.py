@@ -0,0 +1,332 @@
+# DÉPENDANCES:
+#   - Utilise: core/result_cache.py (content_hash), core/instrumentation.py
+#   - Importe: concurrent.futures, io, os, sqlite3, threading, time, PIL, requests
+#   - Utilisé par: frontend/utils/openlibrary_enrichment.py, frontend/components/visualization.py
+
+"""
+ShelfReader - Cover Cache
+Cache disque des couvertures Open Library, en vignettes.
+
+Après l'enrichissement, les couvertures des livres trouvés sont téléchargées
+en parallèle (pool de threads, session HTTP keep-alive), réduites en vignettes
+JPEG et stockées sous leur empreinte SHA-256: deux URL d'une même image
+partagent un seul fichier. L'interface affiche le fichier local au lieu de
+faire télécharger la couverture pleine taille par le navigateur à chaque rendu.
+La taille totale est bornée: les vignettes les moins récemment affichées sont
+supprimées en premier (LRU), sauf celles affichées depuis moins de
+EVICTION_GRACE secondes (leur chemin vient d'être remis à l'interface). Une couverture absente (404) est mémorisée et
+n'est redemandée qu'après MISSING_TTL.
+
+Disposition sur disque:
+    <cache_dir>/index.db              URL -> empreinte, taille et dernier accès (SQLite)
+    <cache_dir>/thumbs/ab/<sha>.jpg   vignettes
+"""
+
+import concurrent.futures
+import io
+import os
+import sqlite3
+import threading
+import time
+
+from core.instrumentation import span, count
+from core.result_cache import content_hash
+
+# Paramètres par défaut
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SHELFREADER_COVER_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'shelfreader', 'covers')
+)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_THUMB_SIZE = (200, 300)  # Boîte englobante (largeur, hauteur), 2x la largeur affichée
+DEFAULT_QUALITY = 85
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 10
+MISSING_TTL = 24 * 3600  # Secondes avant de redemander une couverture absente
+EVICTION_GRACE = 60  # Secondes pendant lesquelles une vignette affichée n'est pas supprimée
+USER_AGENT = "ShelfReader/1.0"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS covers (
+    url TEXT PRIMARY KEY,
+    digest TEXT,
+    fetched REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS covers_digest ON covers(digest);
+CREATE TABLE IF NOT EXISTS thumbs (
+    digest TEXT PRIMARY KEY,
+    bytes INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS thumbs_last_access ON thumbs(last_access);
+"""
+
+
+def make_thumbnail(data, size=DEFAULT_THUMB_SIZE, quality=DEFAULT_QUALITY):
+    """
+    Vignette JPEG d'une image encodée.
+
+    Returns:
+        bytes, ou None si l'image est illisible ou n'est qu'un pixel (image par défaut d'Open Library)
+    """
+    from PIL import Image
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        # Décodage JPEG directement à une résolution réduite
+        image.draft('RGB', size)
+        image.load()
+    except (OSError, ValueError):
+        return None
+    if image.width <= 1 or image.height <= 1:
+        return None
+    image.thumbnail(size)
+    out = io.BytesIO()
+    image.convert('RGB').save(out, format='JPEG', quality=quality, optimize=True)
+    return out.getvalue()
+
+
+class CoverCache:
+    """
+    Vignettes de couvertures sur disque, préchargées en parallèle.
+
+    Args:
+        cache_dir: Dossier du cache
+        max_bytes: Taille totale maximale des vignettes (éviction LRU au-delà)
+        thumb_size: Boîte englobante des vignettes (largeur, hauteur)
+        quality: Qualité JPEG des vignettes
+        workers: Téléchargements simultanés
+        timeout: Timeout par téléchargement (secondes)
+        session: Session requests (défaut: session keep-alive dimensionnée pour workers)
+        eviction_grace: Secondes après un accès pendant lesquelles une vignette est gardée,
+            même au-delà de max_bytes
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, thumb_size=DEFAULT_THUMB_SIZE,
+                 quality=DEFAULT_QUALITY, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, session=None,
+                 eviction_grace=EVICTION_GRACE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.thumb_size = tuple(thumb_size)
+        self.quality = quality
+        self.timeout = timeout
+        self.eviction_grace = eviction_grace
+        os.makedirs(os.path.join(cache_dir, 'thumbs'), exist_ok=True)
+
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        with self._db:
+            self._db.executescript(SCHEMA)
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                               thread_name_prefix='cover-cache')
+        self._pending = {}  # URL -> Future des téléchargements en cours
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _thumb_path(self, digest):
+        return os.path.join(self.cache_dir, 'thumbs', digest[:2], f"{digest}.jpg")
+
+    def _lookup(self, url):
+        """(empreinte, date du téléchargement) d'une URL connue, sinon None."""
+        return self._db.execute("SELECT digest, fetched FROM covers WHERE url = ?", (url,)).fetchone()
+
+    def path(self, url):
+        """
+        Vignette locale d'une couverture (et mise à jour de son dernier accès).
+
+        Returns:
+            str: Chemin du fichier, ou None si la couverture n'est pas (ou plus) en cache
+        """
+        if not url:
+            return None
+        with self._lock:
+            row = self._lookup(url)
+            if row is None or row[0] is None:
+                count('covers.misses')
+                return None
+            digest = row[0]
+            path = self._thumb_path(digest)
+            if not os.path.exists(path):
+                # Fichier supprimé hors du cache: entrée oubliée
+                with self._db:
+                    self._forget(digest)
+                count('covers.misses')
+                return None
+            with self._db:
+                self._db.execute("UPDATE thumbs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        count('covers.hits')
+        return path
+
+    def _is_known(self, url):
+        """Vignette en cache, ou absence récente (pas besoin de télécharger)."""
+        row = self._lookup(url)
+        if row is None:
+            return False
+        digest, fetched = row
+        if digest is None:
+            return time.time() - fetched < MISSING_TTL
+        return os.path.exists(self._thumb_path(digest))
+
+    def fetch(self, url):
+        """
+        Vignette locale d'une couverture, téléchargée si besoin.
+
+        Returns:
+            str: Chemin du fichier, ou None (pas d'URL, pas de couverture, erreur réseau)
+        """
+        future = self.prefetch([url]).get(url)
+        if future is not None:
+            return future.result()
+        return self.path(url)
+
+    def _download(self, url):
+        import requests
+
+        try:
+            with span('covers.fetch'):
+                # default=false: 404 au lieu d'une image vide d'un pixel si la couverture n'existe pas
+                response = self.session.get(url, params={'default': 'false'}, timeout=self.timeout)
+            count('covers.http_requests')
+        except requests.RequestException as e:
+            print(f"Erreur couverture ({url}): {e}")
+            return
+        if response.status_code == 404:
+            self._store(url, None)
+            return
+        if not response.ok:
+            # Erreur temporaire: rien n'est mémorisé, nouvel essai au prochain préchargement
+            print(f"Erreur couverture ({url}): HTTP {response.status_code}")
+            return
+
+        with span('covers.thumbnail'):
+            thumbnail = make_thumbnail(response.content, self.thumb_size, self.quality)
+        self._store(url, thumbnail)
+
+    def _store(self, url, thumbnail):
+        """Enregistre la vignette d'une URL (None = pas de couverture) puis applique la limite de taille."""
+        digest = None
+        if thumbnail is not None:
+            digest = content_hash(thumbnail)
+            path = self._thumb_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(thumbnail)
+                os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO covers (url, digest, fetched) VALUES (?, ?, ?)",
+                             (url, digest, now))
+            if digest is not None:
+                self._db.execute(
+                    "INSERT INTO thumbs (digest, bytes, last_access) VALUES (?, ?, ?) "
+                    "ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access",
+                    (digest, len(thumbnail), now))
+                self._evict(keep=digest)
+
+    def _forget(self, digest):
+        self._db.execute("DELETE FROM covers WHERE digest = ?", (digest,))
+        self._db.execute("DELETE FROM thumbs WHERE digest = ?", (digest,))
+
+    def _evict(self, keep=None):
+        """
+        Supprime les vignettes les moins récemment utilisées jusqu'à repasser sous max_bytes.
+
+        Les vignettes affichées depuis moins de eviction_grace secondes sont gardées:
+        path() vient peut-être de remettre leur chemin à l'interface.
+        """
+        total = self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM thumbs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        recent = time.time() - self.eviction_grace
+        rows = self._db.execute("SELECT digest, bytes, last_access FROM thumbs ORDER BY last_access").fetchall()
+        for digest, size, last_access in rows:
+            if total <= self.max_bytes or last_access > recent:
+                break
+            if digest == keep:
+                continue
+            self._forget(digest)
+            try:
+                os.remove(self._thumb_path(digest))
+            except FileNotFoundError:
+                pass
+            total -= size
+            count('covers.evictions')
+
+    def prefetch(self, urls):
+        """
+        Télécharge en arrière-plan les couvertures absentes du cache.
+
+        Args:
+            urls: URL de couvertures (doublons et valeurs vides ignorés)
+
+        Returns:
+            Dict[str, Future]: Téléchargements lancés ou déjà en cours (résultat: chemin ou None)
+        """
+        futures = {}
+        with self._lock:
+            for url in dict.fromkeys(url for url in urls if url):
+                future = self._pending.get(url)
+                if future is None:
+                    if self._is_known(url):
+                        continue
+                    future = self._executor.submit(self._prefetch_one, url)
+                    self._pending[url] = future
+                futures[url] = future
+        return futures
+
+    def _prefetch_one(self, url):
+        try:
+            self._download(url)
+            return self.path(url)
+        finally:
+            with self._lock:
+                self._pending.pop(url, None)
+
+    def prefetch_books(self, books):
+        """Précharge les couvertures de livres enrichis (champ openlibrary_cover_url)."""
+        return self.prefetch(book.get('openlibrary_cover_url') for book in books if book.get('enriched'))
+
+    def stats(self):
+        """Nombre d'URL connues, de vignettes et taille totale (octets)."""
+        with self._lock:
+            urls = self._db.execute("SELECT COUNT(*) FROM covers WHERE digest IS NOT NULL").fetchone()[0]
+            thumbs, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM thumbs").fetchone()
+        return {'urls': urls, 'thumbnails': thumbs, 'bytes': total, 'max_bytes': self.max_bytes}
+
+
+# Cache partagé par tout le processus (créé au premier usage)
+_cover_cache = None
+_cover_cache_lock = threading.Lock()
+
+
+def get_cover_cache(**options):
+    """Cache de couvertures partagé; les options ne sont prises en compte qu'à sa création."""
+    global _cover_cache
+    with _cover_cache_lock:
+        if _cover_cache is None:
+            _cover_cache = CoverCache(**options)
+        return _cover_cache
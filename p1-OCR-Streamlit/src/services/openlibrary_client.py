@@ -4,18 +4,166 @@
 import requests
 import time
 import re
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Any
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.instrumentation import span, count
+
+BASE_URL = "https://openlibrary.org"
+COVERS_URL = "https://covers.openlibrary.org"
+
+# Niveaux d'enrichissement: la recherche, plus des étapes combinables avec '+'
+#   search          une requête; description chargée au premier accès
+#   search+details  description demandée tout de suite (/works/<clé>.json)
+#   search+cover    vignette de la couverture préchargée (services/cover_cache.py)
+SEARCH_ONLY = 'search'
+WITH_DETAILS = 'search+details'
+WITH_COVER = 'search+cover'
+FULL = 'search+details+cover'
+ENRICHMENT_STEPS = ('search', 'details', 'cover')
+DEFAULT_LEVEL = SEARCH_ONLY
+# Champs de /search.json lus par build_book_info (paramètre fields=, réponse plus légère)
+SEARCH_FIELDS = ('key', 'title', 'author_name', 'first_publish_year', 'isbn', 'subject', 'language')
+
+
+def create_session(pool_size=10, retries=3, backoff=0.5):
+    """
+    Session requests partagée: connexions gardées ouvertes (keep-alive) et nouvelles
+    tentatives avec délai exponentiel à gigue sur 429/5xx (Retry-After respecté).
+
+    Utilisée aussi par les clients api_client.py de P2, P3 et P4.
+    backoff_jitter demande urllib3 >= 2.
+    """
+    retry = Retry(total=retries, backoff_factor=backoff, backoff_jitter=backoff,
+                  status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',),
+                  respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def enrichment_steps(level=DEFAULT_LEVEL):
+    """
+    Étapes d'un niveau d'enrichissement ('search', 'search+details', 'details+cover', ...).
+
+    Returns:
+        frozenset: Étapes, 'search' toujours comprise
+
+    Raises:
+        ValueError: Étape inconnue
+    """
+    steps = {step.strip() for step in (level or SEARCH_ONLY).split('+') if step.strip()}
+    unknown = steps.difference(ENRICHMENT_STEPS)
+    if unknown:
+        raise ValueError(f"Étape d'enrichissement inconnue : {', '.join(sorted(unknown))} "
+                         f"(attendu : {', '.join(ENRICHMENT_STEPS)})")
+    return frozenset(steps | {'search'})
+
+
+def build_cover_url(isbn, size='M', covers_url=COVERS_URL):
+    """URL de la couverture d'un ISBN (10 ou 13 chiffres, tirets et espaces ignorés), ou None."""
+    if isbn and isinstance(isbn, str):
+        isbn_clean = re.sub(r'[-\s]', '', isbn)
+        if len(isbn_clean) in [10, 13] and isbn_clean.isdigit():
+            return f"{covers_url}/b/isbn/{isbn_clean}-{size}.jpg"
+    return None
+
+
+def clean_ocr_text(ocr_text):
+    """Texte OCR prêt pour la recherche (ponctuation retirée, espaces normalisés), ou None si trop court."""
+    if not ocr_text or len(ocr_text.strip()) < 3:
+        return None
+    clean_text = re.sub(r'[^\w\s]', ' ', ocr_text).strip()
+    return re.sub(r'\s+', ' ', clean_text)
+
+
+class LazyDict(dict):
+    """
+    Dictionnaire dont certaines valeurs ne sont calculées qu'au premier accès
+    (info[clé], info.get(clé)), puis conservées.
+
+    Une valeur différée n'est pas encore dans le dictionnaire: copy(), items()
+    et json.dumps ne déclenchent aucun chargement et ne la contiennent pas.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._deferred = {}
+
+    def defer(self, key, loader):
+        """Valeur de key calculée par loader() au premier accès."""
+        self.pop(key, None)
+        self._deferred[key] = loader
+
+    def is_loaded(self, key):
+        return key not in self._deferred
+
+    def __missing__(self, key):
+        loader = self._deferred.pop(key, None)
+        if loader is None:
+            raise KeyError(key)
+        value = self[key] = loader()
+        return value
+
+    def __contains__(self, key):
+        return super().__contains__(key) or key in self._deferred
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def _description(details):
+    return details.get('description') if details else None
+
+
+def build_book_info(ocr_text, book, details=None, load_details=None):
+    """
+    Réponse enrichie à partir du premier résultat de recherche et des détails de l'œuvre.
+
+    Args:
+        details: Détails de l'œuvre déjà récupérés
+        load_details: Sans details, fonction work_key -> détails appelée au
+            premier accès à 'description' (champ paresseux)
+
+    Returns:
+        LazyDict
+    """
+    work_key = book.get('key')
+    isbn = book.get('isbn', [None])[0] if book.get('isbn') else None
+    info = LazyDict({
+        'ocr_text': ocr_text,
+        'title': book.get('title', 'Titre inconnu'),
+        'author': book.get('author_name', ['Auteur inconnu'])[0] if book.get('author_name') else 'Auteur inconnu',
+        'first_publish_year': book.get('first_publish_year'),
+        'isbn': isbn,
+        'cover_url': build_cover_url(isbn) if isbn else None,
+        'open_library_url': f"{BASE_URL}{work_key}" if work_key else None,
+        'description': _description(details),
+        'subjects': book.get('subject', []),
+        'language': book.get('language', ['unknown'])[0] if book.get('language') else 'unknown'
+    })
+    if details is None and load_details is not None and work_key:
+        info.defer('description', lambda: _description(load_details(work_key)))
+    return info
+
 
 class OpenLibraryClient:
     """Client pour interagir avec l'API Open Library"""
 
-    def __init__(self, timeout=10):
-        self.base_url = "https://openlibrary.org"
+    def __init__(self, timeout=10, session=None):
+        self.base_url = BASE_URL
         self.timeout = timeout
-        self.session = requests.Session()  # Utiliser une session pour de meilleures performances
+        self.session = session or create_session()
 
-    def search_books(self, query, limit=5):
-        """Cherche des livres par titre sur Open Library"""
+    def search_books(self, query, limit=5, fields=None):
+        """Cherche des livres par titre sur Open Library (fields: champs demandés, réponse plus légère)"""
 
         # Nettoyer et encoder la requête
         query = query.strip()
@@ -26,13 +174,18 @@ class OpenLibraryClient:
         query_encoded = requests.utils.quote(query)
 
         url = f"{self.base_url}/search.json?q={query_encoded}&limit={limit}"
+        if fields:
+            url += f"&fields={requests.utils.quote(','.join(fields))}"
 
         try:
-            response = self.session.get(url, timeout=self.timeout)
+            with span('openlibrary.search'):
+                response = self.session.get(url, timeout=self.timeout)
+            count('openlibrary.http_requests')
             response.raise_for_status()  # Lève une exception pour les codes d'erreur HTTP
             time.sleep(0.1)  # Rate limiting
             return response.json()
         except requests.RequestException as e:
+            count('openlibrary.http_errors')
             print(f"Erreur lors de la recherche: {e}")
             return None
 
@@ -44,11 +197,14 @@ class OpenLibraryClient:
         url = f"{self.base_url}{work_key}.json"
 
         try:
-            response = self.session.get(url, timeout=self.timeout)
+            with span('openlibrary.details'):
+                response = self.session.get(url, timeout=self.timeout)
+            count('openlibrary.http_requests')
             response.raise_for_status()
             time.sleep(0.1)
             return response.json()
         except requests.RequestException as e:
+            count('openlibrary.http_errors')
             print(f"Erreur lors de la récupération des détails: {e}")
             return None
 
@@ -63,12 +219,7 @@ class OpenLibraryClient:
             str: URL de la couverture si ISBN existe
             None: Si pas d'ISBN
         """
-        if isbn and isinstance(isbn, str):
-            # Nettoyer l'ISBN (enlever les tirets et espaces)
-            isbn_clean = re.sub(r'[-\s]', '', isbn)
-            if len(isbn_clean) in [10, 13] and isbn_clean.isdigit():
-                return f"https://covers.openlibrary.org/b/isbn/{isbn_clean}-{size}.jpg"
-        return None
+        return build_cover_url(isbn, size)
 
     def search_book_by_title_and_author(self, title: str, author: Optional[str] = None, limit: int = 5) -> Optional[Dict[str, Any]]:
         """Recherche avancée avec titre et auteur
@@ -90,48 +241,37 @@ class OpenLibraryClient:
 
         return self.search_books(query, limit)
 
-    def get_book_info_for_ocr_result(self, ocr_text: str) -> Optional[Dict[str, Any]]:
+    def get_book_info_for_ocr_result(self, ocr_text: str, level: str = DEFAULT_LEVEL) -> Optional[Dict[str, Any]]:
         """Enrichit un résultat OCR avec des informations de Open Library
 
         Args:
             ocr_text: Texte extrait par OCR
+            level: Niveau d'enrichissement; sans l'étape 'details', la
+                description n'est demandée qu'au premier accès
 
         Returns:
-            Dictionnaire avec informations enrichies ou None
+            Dictionnaire (LazyDict) avec informations enrichies ou None
         """
-        if not ocr_text or len(ocr_text.strip()) < 3:
-            return None
+        steps = enrichment_steps(level)
 
         # Nettoyer le texte OCR (enlever la ponctuation excessive, normaliser)
-        clean_text = re.sub(r'[^\w\s]', ' ', ocr_text).strip()
-        clean_text = re.sub(r'\s+', ' ', clean_text)
+        clean_text = clean_ocr_text(ocr_text)
+        if not clean_text:
+            return None
 
-        # Recherche sur Open Library
-        results = self.search_books(clean_text, limit=1)
+        # Recherche sur Open Library (seulement les champs utilisés)
+        results = self.search_books(clean_text, limit=1, fields=SEARCH_FIELDS)
 
         if results and results.get('docs'):
             book = results['docs'][0]
 
-            # Récupérer plus de détails si possible
+            # Détails tout de suite si demandés, sinon au premier accès à la description
             work_key = book.get('key')
             details = None
-            if work_key:
+            if work_key and 'details' in steps:
                 details = self.get_book_details(work_key)
 
             # Construire la réponse enrichie
-            enriched_info = {
-                'ocr_text': ocr_text,
-                'title': book.get('title', 'Titre inconnu'),
-                'author': book.get('author_name', ['Auteur inconnu'])[0] if book.get('author_name') else 'Auteur inconnu',
-                'first_publish_year': book.get('first_publish_year'),
-                'isbn': book.get('isbn', [None])[0] if book.get('isbn') else None,
-                'cover_url': self.get_book_cover_url(book.get('isbn', [None])[0]) if book.get('isbn') else None,
-                'open_library_url': f"https://openlibrary.org{work_key}" if work_key else None,
-                'description': details.get('description') if details else None,
-                'subjects': book.get('subject', []),
-                'language': book.get('language', ['unknown'])[0] if book.get('language') else 'unknown'
-            }
-
-            return enriched_info
+            return build_book_info(ocr_text, book, details, load_details=self.get_book_details)
 
         return None
\ No newline at end of file
@@ -0,0 +1,252 @@
+# DÉPENDANCES:
+#   - Utilise: core/instrumentation.py
+#   - Importe: os, time, uuid, datetime, collections, pyarrow (à l'initialisation)
+#   - Utilisé par: engines/easyocr/main.py, engines/tesseract/main.py
+
+"""
+ShelfReader - Parquet Export
+Export colonnaire des résultats par boîte (une ligne par tranche/zone de texte).
+
+Les lignes sont accumulées dans un tampon borné (colonnes Python), converties
+en RecordBatch Arrow quand le tampon est plein, puis écrites dans des fichiers
+Parquet partitionnés à la Hive:
+
+    <dossier>/engine=<moteur>/date=<AAAA-MM-JJ>/part-<run>-<n>.parquet
+
+Un writer reste ouvert par partition jusqu'à max_rows_per_file lignes: un
+traitement par lots de millions de tranches ne garde en mémoire que le tampon
+courant, jamais l'ensemble des résultats.
+"""
+
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from core.instrumentation import span, count
+
+# Paramètres par défaut
+DEFAULT_BATCH_ROWS = 8192  # Lignes gardées en mémoire avant écriture d'un RecordBatch
+DEFAULT_MAX_ROWS_PER_FILE = 1_000_000
+DEFAULT_COMPRESSION = 'zstd'
+PARTITIONS = ('engine', 'date')
+
+# Colonnes: (nom, type Arrow)
+COLUMNS = (
+    ('engine', 'string'),
+    ('date', 'string'),
+    ('image_id', 'string'),
+    ('image_path', 'string'),
+    ('box_index', 'int32'),
+    ('spine_index', 'int32'),
+    ('x', 'float32'),
+    ('y', 'float32'),
+    ('width', 'float32'),
+    ('height', 'float32'),
+    ('text', 'string'),
+    ('confidence', 'float32'),
+    ('is_vertical', 'bool'),
+    ('enriched', 'bool'),
+    ('openlibrary_title', 'string'),
+    ('openlibrary_author', 'string'),
+    ('openlibrary_year', 'int32'),
+    ('openlibrary_isbn', 'string'),
+    ('openlibrary_url', 'string'),
+    ('timings', 'timings'),
+    ('processed_at', 'timestamp'),
+)
+
+
+def stage_timings(trace):
+    """
+    Durées cumulées par étape d'une trace (Trace.to_dict()).
+
+    Returns:
+        Dict[str, float]: secondes par nom de span
+    """
+    totals = defaultdict(float)
+    for s in (trace or {}).get('spans', []):
+        totals[s['name']] += s['duration']
+    return dict(totals)
+
+
+def _year(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _isbn(value):
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    return str(value) if value else None
+
+
+class ParquetExporter:
+    """
+    Écriture en flux des résultats OCR par boîte dans des fichiers Parquet partitionnés.
+
+    Args:
+        root_dir: Dossier racine du jeu de données
+        batch_rows: Taille du tampon (lignes, toutes partitions confondues)
+        max_rows_per_file: Lignes par fichier avant d'en commencer un nouveau
+        compression: Codec Parquet ('zstd', 'snappy', ...)
+
+    Raises:
+        ImportError: Si pyarrow n'est pas installé
+    """
+
+    def __init__(self, root_dir, batch_rows=DEFAULT_BATCH_ROWS,
+                 max_rows_per_file=DEFAULT_MAX_ROWS_PER_FILE, compression=DEFAULT_COMPRESSION):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._pq = pq
+        self.root_dir = root_dir
+        self.batch_rows = batch_rows
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        self.schema = pa.schema([(name, self._arrow_type(kind)) for name, kind in COLUMNS])
+        self.run_id = uuid.uuid4().hex[:12]
+        self.rows_written = 0
+        self.files = []
+        self._buffers = {}  # partition -> {colonne: [valeurs]}
+        self._buffered = 0
+        self._writers = {}  # partition -> [ParquetWriter, lignes écrites, numéro de fichier]
+
+    def _arrow_type(self, kind):
+        pa = self._pa
+        if kind == 'timings':
+            return pa.map_(pa.string(), pa.float64())
+        if kind == 'timestamp':
+            return pa.timestamp('ms', tz='UTC')
+        return pa.bool_() if kind == 'bool' else getattr(pa, kind)()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_image(self, engine, image_id, boxes, timings=None, image_path=None, processed_at=None):
+        """
+        Ajoute les boîtes d'une image.
+
+        Args:
+            engine: Nom du moteur
+            image_id: Identifiant de l'image (ex. empreinte ou nom de fichier)
+            boxes: Boîtes ShelfReader (enrichies ou non), dans l'ordre de l'étagère
+            timings: Durées par étape pour l'image (voir stage_timings)
+            image_path: Chemin de l'image source
+            processed_at: Horodatage (défaut: maintenant)
+        """
+        processed_at = datetime.fromtimestamp(time.time() if processed_at is None else processed_at,
+                                              tz=timezone.utc)
+        partition = (str(engine), processed_at.strftime('%Y-%m-%d'))
+        buffer = self._buffers.get(partition)
+        if buffer is None:
+            buffer = self._buffers[partition] = {name: [] for name, _ in COLUMNS}
+        timings = list((timings or {}).items())
+
+        for index, box in enumerate(boxes):
+            row = {
+                'engine': partition[0],
+                'date': partition[1],
+                'image_id': str(image_id),
+                'image_path': image_path,
+                'box_index': index,
+                'spine_index': box.get('spine_index', index),
+                'x': box.get('x'),
+                'y': box.get('y'),
+                'width': box.get('width'),
+                'height': box.get('height'),
+                'text': box.get('text'),
+                'confidence': box.get('confidence'),
+                'is_vertical': box.get('is_vertical'),
+                'enriched': bool(box.get('enriched', False)),
+                'openlibrary_title': box.get('openlibrary_title'),
+                'openlibrary_author': box.get('openlibrary_author'),
+                'openlibrary_year': _year(box.get('openlibrary_year')),
+                'openlibrary_isbn': _isbn(box.get('openlibrary_isbn') or box.get('isbn')),
+                'openlibrary_url': box.get('openlibrary_url'),
+                'timings': timings,
+                'processed_at': processed_at,
+            }
+            for name, values in buffer.items():
+                values.append(row[name])
+            self._buffered += 1
+            if self._buffered >= self.batch_rows:
+                self.flush()
+
+    def flush(self):
+        """Écrit le tampon (un RecordBatch par partition) et le vide."""
+        if not self._buffered:
+            return
+        with span('parquet.flush', rows=self._buffered):
+            for partition, buffer in self._buffers.items():
+                if buffer['engine']:
+                    batch = self._pa.RecordBatch.from_pydict(buffer, schema=self.schema)
+                    self._write(partition, batch)
+                # Listes vidées sur place: add_image garde une référence au tampon
+                for values in buffer.values():
+                    values.clear()
+        count('parquet.rows', self._buffered)
+        self._buffered = 0
+
+    def _write(self, partition, batch):
+        state = self._writers.get(partition)
+        if state is not None and state[1] >= self.max_rows_per_file:
+            state[0].close()
+            state = [None, 0, state[2] + 1]
+        if state is None or state[0] is None:
+            number = state[2] if state else 0
+            directory = os.path.join(self.root_dir, *(f"{key}={value}" for key, value in zip(PARTITIONS, partition)))
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self.run_id}-{number:05d}.parquet")
+            # Colonnes de partition dans le chemin, pas dans le fichier
+            writer = self._pq.ParquetWriter(path, self._file_schema, compression=self.compression)
+            self.files.append(path)
+            state = self._writers[partition] = [writer, 0, number]
+        state[0].write_batch(batch.drop_columns(list(PARTITIONS)))
+        state[1] += batch.num_rows
+        self.rows_written += batch.num_rows
+
+    @property
+    def _file_schema(self):
+        return self._pa.schema([field for field in self.schema if field.name not in PARTITIONS])
+
+    def close(self):
+        """Écrit le reste du tampon et ferme les fichiers."""
+        self.flush()
+        for writer, _, _ in self._writers.values():
+            if writer is not None:
+                writer.close()
+        self._writers = {}
+
+
+def add_parquet_arguments(parser):
+    """Ajoute --parquet-dir à un parser argparse."""
+    parser.add_argument('--parquet-dir', type=str,
+                        help='Dossier du jeu de données Parquet (une ligne par boîte, partitionné par moteur et date)')
+
+
+def export_results(args, boxes, engine, timings=None, trace=None):
+    """
+    Ajoute les boîtes d'un script au jeu de données Parquet (--parquet-dir).
+
+    Args:
+        timings: Durées mesurées par le script (ex. init, process)
+        trace: Trace du traitement (tracer.request), ajoutée aux durées par étape
+    """
+    if not getattr(args, 'parquet_dir', None):
+        return None
+    timings = dict(timings or {})
+    if trace is not None:
+        timings.update(stage_timings(trace.to_dict()))
+    with ParquetExporter(args.parquet_dir) as exporter:
+        exporter.add_image(engine, os.path.basename(args.image_path), boxes, timings=timings,
+                           image_path=os.path.abspath(args.image_path))
+    print(f"📦 {exporter.rows_written} ligne(s) exportée(s) dans {args.parquet_dir}")
+    return exporter.files
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Fixtures partagées des tests
+Serveurs HTTP locaux à la place des services Open Library.
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def http_stub():
+    """
+    Démarre des serveurs HTTP locaux, arrêtés à la fin du test.
+
+    Usage:
+        server = http_stub(Handler, failures=0)
+
+    Le serveur expose lock, requests (chemins reçus, à remplir par le handler),
+    url (http://127.0.0.1:<port>) et les attributs passés en mots-clés.
+    """
+    servers = []
+
+    def start(handler, **attributes):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.lock = threading.Lock()
+        server.requests = []
+        server.url = f"http://127.0.0.1:{server.server_address[1]}"
+        for name, value in attributes.items():
+            setattr(server, name, value)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test du client Open Library asynchrone
+Serveur HTTP local à la place d'openlibrary.org: nouvelles tentatives sur 503,
+pool de connexions partagé, façade synchrone et niveaux d'enrichissement.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip('httpx')
+
+from services.async_openlibrary_client import (AsyncOpenLibraryClient, OpenLibraryTransport,
+                                               SyncOpenLibraryClient)
+from services.openlibrary_client import OpenLibraryClient, SEARCH_FIELDS, WITH_DETAILS, enrichment_steps
+
+
+class _OpenLibraryStub(BaseHTTPRequestHandler):
+    """Réponses minimales de /search.json et /works/<id>.json; premières requêtes en 503 si demandé."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.ports.add(self.client_address[1])
+            failing = server.failures > 0
+            server.failures -= 1
+        url = urlparse(self.path)
+        if failing:
+            self._send(503, {'error': 'busy'}, {'Retry-After': '0'})
+        elif url.path == '/search.json':
+            q = parse_qs(url.query)['q'][0]
+            self._send(200, {'docs': [{'key': f"/works/{q.replace(' ', '_')}", 'title': q.title(),
+                                       'author_name': ['Auteur'], 'isbn': ['9780441172719']}]})
+        elif url.path.startswith('/works/'):
+            self._send(200, {'description': f"Description de {url.path[7:-5]}"})
+        else:
+            self._send(404, {})
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(http_stub):
+    return http_stub(_OpenLibraryStub, ports=set(), failures=0)
+
+
+def _options(stub):
+    return {'base_url': stub.url, 'backoff': 0.01, 'max_rate': None}
+
+
+def test_nouvelles_tentatives_et_pool_partage(stub):
+    """Un 503 est relancé; 12 livres enrichis en parallèle sur au plus max_connections connexions."""
+    stub.failures = 1
+    texts = [f"livre {i}" for i in range(12)]
+
+    async def run():
+        async with AsyncOpenLibraryClient(max_connections=4, **_options(stub)) as client:
+            return await client.get_book_info_many(texts, concurrency=8, level=WITH_DETAILS)
+
+    infos = asyncio.run(run())
+
+    assert [info['title'] for info in infos] == [text.title() for text in texts]
+    assert infos[3]['description'] == "Description de livre_3"
+    assert infos[0]['cover_url'].endswith('/b/isbn/9780441172719-M.jpg')
+    # 12 recherches + 12 détails + la requête en échec relancée
+    assert len(stub.requests) == 25
+    assert len(stub.ports) <= 4
+
+
+def test_facade_synchrone(stub):
+    """SyncOpenLibraryClient: mêmes réponses qu'OpenLibraryClient, erreurs définitives -> None."""
+    transport = OpenLibraryTransport(**_options(stub))
+    try:
+        client = SyncOpenLibraryClient(transport)
+        results = client.search_books("Dune", limit=1, fields=['key', 'title'])
+        assert results['docs'][0]['title'] == "Dune"
+        assert 'fields=key%2Ctitle' in stub.requests[-1]
+        assert client.get_book_details('/works/inconnu') is not None
+        assert client.get_book_details('pas-une-oeuvre') is None
+        assert client.transport.run(client.transport.client.get_json('/absent')) is None
+    finally:
+        transport.close()
+
+
+def _works_requests(stub):
+    return [path for path in stub.requests if path.startswith('/works/')]
+
+
+def test_niveau_recherche_description_paresseuse(stub):
+    """Niveau 'search': une recherche réduite aux champs utilisés, /works au premier accès seulement."""
+    transport = OpenLibraryTransport(**_options(stub))
+    try:
+        client = SyncOpenLibraryClient(transport)
+        infos = client.get_book_info_many([f"livre {i}" for i in range(4)])
+        assert len(stub.requests) == 4
+        assert all(f"fields={'%2C'.join(SEARCH_FIELDS)}" in path for path in stub.requests)
+
+        # Ni copie, ni sérialisation, ni test d'appartenance ne chargent la description
+        assert 'description' in infos[0] and not infos[0].is_loaded('description')
+        assert 'description' not in json.loads(json.dumps(infos[0]))
+        assert 'description' not in infos[0].copy()
+        assert copy.deepcopy(infos[0])['title'] == "Livre 0"
+        assert _works_requests(stub) == []
+
+        assert infos[1]['description'] == "Description de livre_1"
+        assert infos[1].get('description') == "Description de livre_1"
+        assert _works_requests(stub) == ['/works/livre_1.json']
+    finally:
+        transport.close()
+
+
+def test_niveaux_client_requests(stub):
+    """OpenLibraryClient (requests): mêmes niveaux; étapes inconnues refusées."""
+    client = OpenLibraryClient()
+    client.base_url = _options(stub)['base_url']
+
+    info = client.get_book_info_for_ocr_result("Dune")
+    assert info['title'] == "Dune" and len(stub.requests) == 1
+    assert info['description'] == "Description de Dune"
+    assert len(stub.requests) == 2
+
+    info = client.get_book_info_for_ocr_result("Dune", level='search+details')
+    assert info.is_loaded('description') and len(stub.requests) == 4
+
+    assert enrichment_steps('details+cover') == {'search', 'details', 'cover'}
+    with pytest.raises(ValueError):
+        enrichment_steps('search+resume')
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests de la suite de benchmarks
+Vérifie le générateur d'étagères synthétiques, la détection de régressions
+et la mesure des moteurs hors cache de tranches.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Ajouter le répertoire benchmarks au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from synthetic_shelf import generate_shelf, spine_boundaries
+from metrics import title_recall, grouping_accuracy, compare_runs
+from run_benchmarks import _uncached
+
+
+def test_generation_deterministe():
+    """Même graine = même image et même vérité terrain."""
+    image_a, truth_a = generate_shelf(num_spines=6, seed=3, width=600, row_height=300, rows=2)
+    image_b, truth_b = generate_shelf(num_spines=6, seed=3, width=600, row_height=300, rows=2)
+
+    assert np.array_equal(image_a, image_b)
+    assert truth_a == truth_b
+    assert len(truth_a['spines']) == 12
+    assert len(spine_boundaries(truth_a)) == 10
+
+
+def test_precision_titres_et_regroupement():
+    """Un dos coupé en deux boîtes compte comme mal regroupé."""
+    _, truth = generate_shelf(num_spines=3, seed=1, width=600, row_height=300)
+    boxes = []
+    for spine in truth['spines'][:2]:
+        x0, x1 = spine['x_range']
+        boxes.append({'x': x0 + 5, 'y': 150, 'width': x1 - x0 - 10, 'height': 100, 'text': spine['title']})
+    # Troisième dos coupé en deux fragments
+    x0, x1 = truth['spines'][2]['x_range']
+    boxes.append({'x': x0 + 5, 'y': 120, 'width': x1 - x0 - 10, 'height': 40, 'text': 'xx'})
+    boxes.append({'x': x0 + 5, 'y': 200, 'width': x1 - x0 - 10, 'height': 40, 'text': 'yy'})
+
+    titles = [s['title'] for s in truth['spines']]
+    assert title_recall(boxes, titles) == 2 / 3
+    assert grouping_accuracy(boxes, truth['spines']) == 2 / 3
+
+
+def test_compare_signale_les_regressions():
+    """Latence +20% et précision -0.1 sont signalées, le bruit non."""
+    def run(p50, recall):
+        return {'cases': {'EasyOCR': {
+            'status': 'ok', 'latency_ms': {'p50': p50, 'p95': 100.0},
+            'throughput_ips': 2.0, 'peak_rss_mb': 500.0,
+            'accuracy': {'title_recall': recall}
+        }}}
+
+    rows = compare_runs(run(100.0, 0.8), run(120.0, 0.7))
+    flagged = {r['metric'] for r in rows if r['regression']}
+    assert flagged == {'latency_ms.p50', 'accuracy.title_recall'}
+
+    rows = compare_runs(run(100.0, 0.8), run(105.0, 0.79))
+    assert not any(r['regression'] for r in rows)
+
+
+def test_moteurs_mesures_hors_cache_de_tranches():
+    """Chauffe puis répétitions sur la même image: la détection de tranches est recalculée à chaque appel."""
+    from core.spine import spine_service
+
+    image, _ = generate_shelf(num_spines=4, seed=2, width=400, row_height=300)
+    runner = _uncached(lambda shelf: spine_service.detect(shelf).cached)
+    assert [runner(image) for _ in range(3)] == [False, False, False]
+    # Sans contournement, le cache du processus aurait servi l'appel suivant
+    assert spine_service.detect(image).cached
+    spine_service.clear()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test du catalogue SQLite des étagères
+Vérifie la fusion des scans dans l'inventaire, les différences entre scans
+(ajouts, retraits, déplacements) et les recherches indexées.
+"""
+
+import os
+import sys
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.catalog_store import CatalogStore, normalize_title
+
+
+def _books(*titles):
+    return [{'text': title, 'confidence': 0.9, 'x': 50 * i, 'y': 0, 'width': 40, 'height': 300}
+            for i, title in enumerate(titles)]
+
+
+def test_fusion_et_differences_entre_scans(tmp_path):
+    """Un livre inséré ne déplace pas les suivants; seul le livre changé de place est déplacé."""
+    store = CatalogStore(str(tmp_path / 'catalog.db'))
+    store.add_scan('salon', _books('Moby Dick', 'Dune', 'Les Misérables', 'Ulysses'))
+    store.add_scan('salon', _books('Neuromancer', 'Moby Dick', 'Les Misérables', 'Ulysses', 'Dune'))
+
+    diff = store.diff('salon')
+    assert [b['title'] for b in diff['added']] == ['Neuromancer']
+    assert diff['removed'] == []
+    assert [b['title'] for b in diff['moved']] == ['Dune']
+
+    store.add_scan('salon', _books('Neuromancer', 'Moby Dick', 'Ulysses', 'Dune'))
+    assert [b['title'] for b in store.diff('salon')['removed']] == ['Les Misérables']
+    assert [b['title'] for b in store.inventory('salon')] == ['Neuromancer', 'Moby Dick', 'Ulysses', 'Dune']
+    assert len(store.inventory('salon', include_absent=True)) == 5
+
+    # Comparaison avec le premier scan, base rouverte
+    store.close()
+    store = CatalogStore(str(tmp_path / 'catalog.db'))
+    first, _, last = [scan['id'] for scan in store.scans('salon')]
+    diff = store.diff('salon', from_scan=first, to_scan=last)
+    assert [b['title'] for b in diff['removed']] == ['Les Misérables']
+
+
+def test_exemplaires_isbn_et_recherche():
+    """Deux exemplaires restent distincts; recherche par préfixe de titre et par ISBN."""
+    store = CatalogStore(':memory:')
+    books = _books('Dune', 'Dune', 'Le Petit Prince')
+    books[2].update({'enriched': True, 'openlibrary_title': 'Le Petit Prince',
+                     'openlibrary_author': 'Antoine de Saint-Exupéry', 'isbn': '978-2-07-061275-8'})
+    store.add_scan('chambre', books)
+
+    assert len(store.find(title='dune')) == 2
+    assert [b['author'] for b in store.find(title='le petit')] == ['Antoine de Saint-Exupéry']
+    assert store.find(isbn='9782070612758')[0]['title'] == 'Le Petit Prince'
+    assert normalize_title("  L'Étranger!  ") == 'l etranger'
+
+    plan = ' '.join(row[-1] for row in store._db.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM books WHERE normalized_title >= ? AND normalized_title < ?", ('a', 'b')))
+    assert 'idx_books_normalized_title' in plan
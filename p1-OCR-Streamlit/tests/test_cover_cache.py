@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test du cache de couvertures
+Serveur HTTP local à la place de covers.openlibrary.org: préchargement en
+parallèle, noms de fichiers par empreinte, couvertures absentes et éviction LRU
+(sauf vignettes affichées récemment).
+"""
+
+import concurrent.futures
+import io
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+Image = pytest.importorskip('PIL.Image')
+
+from core.result_cache import content_hash
+from services.cover_cache import CoverCache, make_thumbnail
+
+
+def _cover(seed, size=(400, 600)):
+    """Couverture JPEG pleine taille (bruit: vignettes de tailles comparables)."""
+    pixels = np.random.default_rng(seed).integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, format='JPEG', quality=90)
+    return out.getvalue()
+
+
+class _CoversStub(BaseHTTPRequestHandler):
+    """/b/isbn/<n>-M.jpg: couverture n (n >= 100: même image que n - 100); 'absent' -> 404."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        name = url.path.rsplit('/', 1)[-1].split('-')[0]
+        if not name.isdigit():
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        payload = self.server.covers[int(name) % 100]
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(http_stub):
+    return http_stub(_CoversStub, covers=[_cover(i) for i in range(6)])
+
+
+def _url(stub, name):
+    return f"{stub.url}/b/isbn/{name}-M.jpg"
+
+
+def test_prechargement_et_empreintes(stub, tmp_path):
+    """Vignettes réduites nommées par leur SHA-256; doublons d'image partagés; 404 mémorisé."""
+    books = [{'enriched': True, 'openlibrary_cover_url': _url(stub, n)} for n in (0, 1, 2, 3, 100)]
+    books += [{'enriched': True, 'openlibrary_cover_url': _url(stub, 'absent')},
+              {'enriched': False, 'openlibrary_cover_url': _url(stub, 4)}]
+
+    with CoverCache(str(tmp_path), workers=4, thumb_size=(100, 150)) as cache:
+        futures = cache.prefetch_books(books)
+        assert len(futures) == 6  # livre non enrichi ignoré
+        concurrent.futures.wait(futures.values())
+
+        paths = [cache.path(book['openlibrary_cover_url']) for book in books[:5]]
+        assert all(paths)
+        for path in paths:
+            assert os.path.basename(path) == f"{content_hash(path)}.jpg"
+            with Image.open(path) as thumb:
+                assert thumb.width <= 100 and thumb.height <= 150
+        # Même image sous deux URL: un seul fichier
+        assert paths[0] == paths[4]
+        assert cache.stats()['thumbnails'] == 4
+        assert cache.path(_url(stub, 'absent')) is None
+        assert all('default=false' in request for request in stub.requests)
+
+        # Tout est connu: aucune nouvelle requête
+        sent = len(stub.requests)
+        assert cache.prefetch_books(books) == {}
+        assert cache.fetch(_url(stub, 1)) == paths[1]
+        assert len(stub.requests) == sent
+
+    # L'index survit à la réouverture
+    with CoverCache(str(tmp_path)) as cache:
+        assert cache.path(_url(stub, 2)) == paths[2]
+
+
+def test_eviction_lru(stub, tmp_path):
+    """Au-delà de max_bytes, la vignette la moins récemment affichée est supprimée."""
+    sizes = [len(make_thumbnail(cover, (100, 150))) for cover in stub.covers[:3]]
+    with CoverCache(str(tmp_path), max_bytes=sizes[0] + sizes[1] + max(sizes) // 2,
+                    thumb_size=(100, 150), eviction_grace=0) as cache:
+        first = cache.fetch(_url(stub, 0))
+        second = cache.fetch(_url(stub, 1))
+        # Affichage de la première: la seconde devient la moins récente
+        assert cache.path(_url(stub, 0)) == first
+        third = cache.fetch(_url(stub, 2))
+
+        assert cache.path(_url(stub, 1)) is None
+        assert not os.path.exists(second)
+        assert os.path.exists(first) and os.path.exists(third)
+        assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_vignettes_affichees_recemment_gardees(stub, tmp_path):
+    """Un chemin remis par path() reste valide pendant eviction_grace, même au-delà de max_bytes."""
+    with CoverCache(str(tmp_path), max_bytes=1, thumb_size=(100, 150)) as cache:
+        first = cache.fetch(_url(stub, 0))
+        second = cache.fetch(_url(stub, 1))
+        assert os.path.exists(first) and os.path.exists(second)
+        assert cache.stats()['bytes'] > cache.max_bytes
+
+        # Délai écoulé: les anciennes vignettes sont supprimées au prochain ajout
+        cache.eviction_grace = -1
+        third = cache.fetch(_url(stub, 2))
+        assert not os.path.exists(first) and not os.path.exists(second)
+        assert os.path.exists(third) and cache.stats()['thumbnails'] == 1
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests du debug sink headless de la détection de tranches.
+Vérifie l'échantillonnage, l'écriture asynchrone des PNG et les temps par étape.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.debug_sink import DebugSink, DiskDebugSink, InteractiveDebugSink, MemoryDebugSink, to_displayable
+
+
+def test_sampling_one_in_n():
+    """Seule une image sur N ouvre une session."""
+    sink = MemoryDebugSink(sample_every=3)
+    sessions = [sink.start(f"img{i}") for i in range(7)]
+    sink.close()
+
+    assert [s is not None for s in sessions] == [True, False, False, True, False, False, True]
+
+
+def test_disk_sink_writes_png_and_timings(tmp_path):
+    """Les étapes sont écrites en PNG numérotés avec un fichier de temps."""
+    sink = DiskDebugSink(str(tmp_path))
+    session = sink.start("shelf")
+    session.stage("sobel", np.random.rand(20, 30))
+    session.stage("binarized", np.zeros((20, 30), dtype=np.uint8))
+    session.close()
+    sink.close()
+
+    files = sorted(os.listdir(tmp_path / "shelf"))
+    assert files == ["00_sobel.png", "01_binarized.png", "timings.json"]
+
+    with open(tmp_path / "shelf" / "timings.json", encoding="utf-8") as f:
+        timings = json.load(f)
+    assert [s["name"] for s in timings["stages"]] == ["sobel", "binarized"]
+
+
+def test_to_displayable_normalizes_floats():
+    """Les images float sont ramenées sur 0-255."""
+    img = to_displayable(np.array([[0.0, 0.5], [1.0, 2.0]]))
+    assert img.dtype == np.uint8
+    assert img.min() == 0 and img.max() == 255
+
+
+def test_memory_sink_sessions_and_capacity():
+    """Les sessions se lisent par copie; au-delà de capacity, les plus anciennes sont oubliées."""
+    sink = MemoryDebugSink(capacity=2)
+    for name in ("a", "b", "c"):
+        session = sink.start(name)
+        session.stage("sobel", np.zeros((4, 4), dtype=np.uint8))
+        session.close()
+    sink.flush()
+
+    assert sink.session("a") is None
+    copy = sink.session("c")
+    assert list(copy["images"]) == ["00_sobel"] and copy["timings"]["image_id"] == "c"
+    copy["images"].clear()
+    assert sink.session("c")["images"]
+    sink.close()
+
+
+def test_sink_interface_and_lazy_thread():
+    """DebugSink est abstraite; aucun thread d'encodage tant qu'aucune image n'est soumise."""
+    with pytest.raises(TypeError):
+        DebugSink()
+    sink = InteractiveDebugSink()
+    sink.write_image("interactive", 0, "sobel", b"")
+    sink.close()
+    assert sink._executor is None
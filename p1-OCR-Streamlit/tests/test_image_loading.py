@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test du chargement d'image
+Vérifie la réduction JPEG au décodage, l'orientation EXIF et le partage du buffer.
+"""
+
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.image_loading import load_image, to_bgr
+from core.resolution import ResolutionPolicy
+
+
+def _write_jpeg(path, width, height, orientation=1):
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:, : width // 2] = (255, 0, 0)  # moitié gauche rouge (RGB)
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    Image.fromarray(image).save(path, exif=exif, quality=95)
+
+
+def test_orientation_exif_et_bgr_contigu(tmp_path):
+    """Orientation 6 (rotation 90°) appliquée une fois, sortie BGR contiguë."""
+    path = str(tmp_path / 'photo.jpg')
+    _write_jpeg(path, 400, 200, orientation=6)
+
+    loaded = load_image(path)
+    assert loaded.bgr.shape == (400, 200, 3)
+    assert loaded.original_size == (200, 400)
+    assert loaded.bgr.flags['C_CONTIGUOUS']
+    # Après rotation, le rouge est en haut; en BGR le canal 2 porte le rouge
+    assert loaded.bgr[10, 100, 2] > 200 and loaded.bgr[390, 100, 2] < 50
+
+
+def test_reduction_dct_et_remappage(tmp_path):
+    """Un JPEG 4000 px décodé pour une détection à 1000 px est réduit dès le décodage."""
+    path = str(tmp_path / 'grand.jpg')
+    _write_jpeg(path, 4000, 2000)
+
+    policy = ResolutionPolicy(max_detect_edge=1000)
+    loaded = load_image(path, max_edge=policy.decode_edge())
+    assert loaded.bgr.shape[1] == 1000 and loaded.scale == 0.25
+
+    boxes = [{'x': 100, 'y': 50, 'width': 10, 'height': 20, 'text': 'A'}]
+    original = loaded.boxes_to_original(boxes)
+    assert original[0]['x'] == 400 and original[0]['height'] == 80
+    assert loaded.boxes_from_original(original)[0]['x'] == 100
+
+    # Pleine résolution exigée par la politique: pas de réduction
+    assert ResolutionPolicy(max_detect_edge=1000, max_recognition_edge=0).decode_edge() is None
+
+
+def test_to_bgr_depuis_pil():
+    """Les moteurs acceptent PIL ou numpy BGR indifféremment."""
+    rgb = np.zeros((10, 10, 3), dtype=np.uint8)
+    rgb[..., 0] = 255
+    bgr = to_bgr(Image.fromarray(rgb))
+    assert bgr[0, 0].tolist() == [0, 0, 255]
+    assert to_bgr(bgr) is bgr
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test de l'instrumentation par étape
+Vérifie l'imbrication des spans, les compteurs et les exports.
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.instrumentation import Tracer, NULL_SPAN
+
+
+def test_spans_imbriques_et_compteurs():
+    """Les spans sont rattachés à leur parent et les compteurs cumulés."""
+    tracer = Tracer(enabled=True)
+    with tracer.request('EasyOCR') as trace:
+        with tracer.span('easyocr.detection') as s:
+            with tracer.span('spine.sobel'):
+                pass
+            s.set(boxes=3)
+        tracer.count('openlibrary.http_requests')
+        tracer.count('openlibrary.http_requests', 2)
+
+    spans = {s['name']: s for s in trace.to_dict()['spans']}
+    assert spans['EasyOCR']['parent'] is None
+    assert spans['easyocr.detection']['parent'] == spans['EasyOCR']['id']
+    assert spans['spine.sobel']['parent'] == spans['easyocr.detection']['id']
+    assert spans['easyocr.detection']['attrs']['boxes'] == 3
+    assert trace.counters['openlibrary.http_requests'] == 3
+
+
+def test_desactive_sans_effet():
+    """Hors requête ou tracer désactivé : aucun enregistrement."""
+    tracer = Tracer(enabled=False)
+    assert tracer.span('spine.sobel') is NULL_SPAN
+    with tracer.request('EasyOCR') as trace:
+        assert trace is None
+        assert tracer.span('spine.sobel') is NULL_SPAN
+        tracer.count('tesseract.calls')
+    assert tracer.prometheus_text().count('tesseract') == 0
+
+
+def test_propagation_threads_et_exports():
+    """wrap() propage la trace vers un pool de threads ; exports Chrome/Prometheus."""
+    tracer = Tracer(enabled=True)
+
+    def work(i):
+        with tracer.span('tesseract.recognition', psm=i):
+            return threading.get_ident()
+
+    with tracer.request('Tesseract') as trace:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(tracer.wrap(work), range(4)))
+
+    recognition = [s for s in trace.spans if s.name == 'tesseract.recognition']
+    assert len(recognition) == 4
+    root = next(s for s in trace.spans if s.name == 'Tesseract')
+    assert all(s.parent_id == root.span_id for s in recognition)
+
+    chrome = trace.to_chrome_trace()
+    assert sum(1 for e in chrome['traceEvents'] if e['ph'] == 'X') == 5
+
+    text = tracer.prometheus_text()
+    assert 'shelfreader_stage_seconds_count{stage="tesseract.recognition"} 4' in text
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test du modèle de lignes
+Vérifie Line (drapeau vertical explicite) et l'évaluation vectorisée de LineSet
+utilisée par le regroupement et le dessin des tranches.
+"""
+
+import copy
+import os
+import sys
+
+import numpy as np
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.spine.line import Line, LineSet
+
+
+def test_line_verticale_et_copie():
+    """Une ligne verticale est repérée par son centre, y compris à la pente limite; la copie la conserve."""
+    vertical = Line(1000, 0, (120.0, 50.0), 119, 121, 0, 100)
+    assert vertical.vertical and vertical.x(80) == 120.0
+    assert not hasattr(vertical, '__dict__')
+    moved = copy.copy(vertical)
+    moved.center = (130.0, 50.0)
+    assert moved.vertical and moved.x(0) == 130.0 and vertical.x(0) == 120.0
+
+
+def test_line_set_x_at_colonnes_et_plus_proche():
+    """x_at évalue toutes les lignes à la fois, comme Line.x ligne par ligne."""
+    lines = [Line(1000, 0, (300.0, 50.0), 299, 301, 0, 100),
+             Line(2.0, -100.0, (100.0, 100.0), 50, 150, 0, 200),
+             Line(0, 40.0, (200.0, 40.0), 0, 400, 40, 40)]
+    line_set = LineSet.from_lines(lines)
+    ys = np.array([0.0, 100.0, 200.0])
+    xs = line_set.x_at(ys)
+    assert xs.shape == (3, 3)
+    for i, line in enumerate(lines[:2]):
+        assert np.allclose(xs[i], [line.x(y) for y in ys])
+    assert np.isnan(xs[2]).all()  # rangée horizontale: pas d'abscisse
+
+    # Colonnes: la ligne inclinée est évaluée à la hauteur de chaque point
+    assert line_set.columns([60.0, 140.0, 350.0], [0.0, 200.0, 10.0]).tolist() == [1, 0, 2]
+    index, distance = line_set.nearest([290.0, 105.0], [10.0, 100.0])
+    assert index.tolist() == [0, 1] and np.allclose(distance, [10.0, 5.0])
+    assert [line.center[0] for line in line_set.sorted('x')] == [100.0, 200.0, 300.0]
+    assert line_set.rows([10.0, 45.0, 150.0]).tolist() == [0, 1, 3]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test de l'OCRProcessor
+Réutilisation des processeurs de moteur entre les images, fermeture de
+l'ancien processeur quand les paramètres changent, et entrées de cache
+distinctes pour les modes par lot et progressif (processeur factice).
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Le module importe les trois moteurs (TrOCR: torch et transformers)
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+
+from frontend.utils import ocr_processing  # noqa: E402
+from frontend.utils.ocr_processing import OCRProcessor  # noqa: E402
+
+
+class _Processor:
+    """TesseractOCRProcessor factice: garde ses arguments et compte les fermetures."""
+
+    instances = []
+
+    def __init__(self, lang, conf, debug, **options):
+        self.lang, self.conf, self.options = lang, conf, options
+        self.closed = 0
+        _Processor.instances.append(self)
+
+    def close(self):
+        self.closed += 1
+
+    def get_boxes(self, image):
+        return [{'x': 0, 'y': 0, 'width': 10, 'height': 40, 'text': 'GROUPE', 'confidence': 0.9}]
+
+    def get_text_and_confidence(self, image):
+        return 'GROUPE', 0.9
+
+    def iter_books(self, image):
+        yield {'x': 0, 'y': 0, 'width': 10, 'height': 20, 'text': 'PAR', 'confidence': 0.9}
+        yield {'x': 0, 'y': 20, 'width': 10, 'height': 20, 'text': 'TRANCHE', 'confidence': 0.9}
+
+
+def test_processeur_reutilise_puis_ferme(monkeypatch):
+    """Mêmes paramètres: même processeur; paramètres modifiés: nouveau processeur, l'ancien est fermé."""
+    monkeypatch.setattr(ocr_processing, 'TesseractOCRProcessor', _Processor)
+    _Processor.instances = []
+    processor = OCRProcessor()
+    params = {'lang': 'eng', 'psm': 7}
+
+    first = processor.get_processor('Tesseract', 0.3, False, params)
+    assert processor.get_processor('Tesseract', 0.3, False, dict(params)) is first
+    # Paramètres sans effet sur le moteur (trace, cache): pas de reconstruction
+    assert processor.get_processor('Tesseract', 0.3, False, dict(params, trace=True)) is first
+    assert len(_Processor.instances) == 1 and first.closed == 0
+
+    second = processor.get_processor('Tesseract', 0.5, False, params)
+    assert second is not first and second.conf == 50.0
+    assert first.closed == 1 and second.closed == 0
+    assert processor.engines['Tesseract'] is second
+
+    third = processor.get_processor('Tesseract', 0.5, False, dict(params, psm=6))
+    assert second.closed == 1 and third.options['psm_configs'] == ['--psm 6']
+
+    with pytest.raises(ValueError):
+        processor.get_processor('Inconnu')
+
+
+def test_modes_par_lot_et_progressif_separes_dans_le_cache(monkeypatch, tmp_path):
+    """Même image et mêmes paramètres: le mode progressif ne reprend pas le résultat du mode par lot."""
+    monkeypatch.setattr(ocr_processing, 'TesseractOCRProcessor', _Processor)
+    path = str(tmp_path / 'etagere.png')
+    cv2.imwrite(path, np.zeros((40, 60, 3), dtype=np.uint8))
+    params = {'use_cache': True, 'cache_dir': str(tmp_path / 'cache')}
+    processor = OCRProcessor()
+
+    batch, _ = processor.process_image(path, 'Tesseract', 0.3, False, advanced_params=params)
+    done = list(processor.process_image_stream(path, 'Tesseract', 0.3, False, advanced_params=params))[-1]
+    assert [b['text'] for b in batch['books']] == ['GROUPE'] and not batch['cache']['hit']
+    assert [b['text'] for b in done['results']['books']] == ['PAR', 'TRANCHE']
+    assert not done['results']['cache']['hit']
+
+    # Chaque mode retrouve ensuite son propre résultat
+    again, _ = processor.process_image(path, 'Tesseract', 0.3, False, advanced_params=params)
+    done = list(processor.process_image_stream(path, 'Tesseract', 0.3, False, advanced_params=params))[-1]
+    assert again['cache']['hit'] and [b['text'] for b in again['books']] == ['GROUPE']
+    assert done['results']['cache']['hit'] and [b['text'] for b in done['results']['books']] == ['PAR', 'TRANCHE']
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test de l'export Parquet des résultats
+Vérifie le tampon borné, le partitionnement moteur/date et la relecture du jeu de données.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.instrumentation import span, tracer
+from services.parquet_export import ParquetExporter, export_results, stage_timings
+
+
+def _boxes(n):
+    return [{'text': f"Livre {i}", 'confidence': 0.8, 'x': 40 * i, 'y': 0, 'width': 35, 'height': 400,
+             'is_vertical': True} for i in range(n)]
+
+
+def test_ecriture_par_lots_et_partitions(tmp_path):
+    """Le tampon ne dépasse jamais batch_rows; fichiers découpés et partitionnés; relecture complète."""
+    ds = pytest.importorskip('pyarrow.dataset')
+    root = str(tmp_path / 'dataset')
+    with ParquetExporter(root, batch_rows=16, max_rows_per_file=32) as exporter:
+        for i in range(10):
+            exporter.add_image('easyocr', f"img{i}", _boxes(7), timings={'easyocr.recognize': 0.5},
+                               processed_at=1_760_000_000)
+            assert exporter._buffered < 16
+        exporter.add_image('tesseract', 'img0', [dict(_boxes(1)[0], enriched=True, openlibrary_title='Dune',
+                                                      openlibrary_year='1965')], processed_at=1_760_000_000)
+
+    assert exporter.rows_written == 71
+    assert len([f for f in exporter.files if 'engine=easyocr' in f]) == 3
+    table = ds.dataset(root, format='parquet', partitioning='hive').to_table()
+    assert table.num_rows == 71
+    assert set(table.column('engine').to_pylist()) == {'easyocr', 'tesseract'}
+    assert set(table.column('date').to_pylist()) == {'2025-10-09'}
+    row = table.filter(ds.field('engine') == 'tesseract').to_pylist()[0]
+    assert row['openlibrary_title'] == 'Dune' and row['openlibrary_year'] == 1965 and row['enriched']
+    assert dict(table.column('timings').to_pylist()[0]) == {'easyocr.recognize': 0.5}
+
+
+def test_durees_par_etape():
+    trace = {'spans': [{'name': 'a', 'duration': 0.25}, {'name': 'b', 'duration': 1.0},
+                       {'name': 'a', 'duration': 0.5}]}
+    assert stage_timings(trace) == {'a': 0.75, 'b': 1.0}
+
+
+def test_export_cli_avec_trace(tmp_path):
+    """export_results (--parquet-dir): durées du script et durées par étape de la trace."""
+    ds = pytest.importorskip('pyarrow.dataset')
+    args = types.SimpleNamespace(parquet_dir=str(tmp_path / 'dataset'), image_path=str(tmp_path / 'etagere.jpg'))
+    with tracer.request('tesseract', enabled=True) as trace:
+        with span('tesseract.recognition'):
+            pass
+
+    assert export_results(args, _boxes(2), 'tesseract', timings={'init': 1.5}, trace=trace)
+    timings = dict(ds.dataset(args.parquet_dir, format='parquet', partitioning='hive').to_table()
+                   .column('timings').to_pylist()[0])
+    assert timings['init'] == 1.5
+    assert {'tesseract', 'tesseract.recognition'} <= set(timings)
+    assert export_results(types.SimpleNamespace(parquet_dir=None), _boxes(1), 'tesseract') is None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test de la politique de résolution
+Vérifie la réduction avant détection et le remappage des coordonnées.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.resolution import PANORAMA_ASPECT, ResolutionPolicy, scale_easyocr_lists
+from engines.easyocr.models.line import Line
+
+
+def test_reduction_et_remappage():
+    """Une photo 6000x4000 est ramenée à 2048 px et les boîtes reviennent à l'original."""
+    image = np.zeros((4000, 6000, 3), dtype=np.uint8)
+    policy = ResolutionPolicy(max_detect_edge=2048)
+
+    detection = policy.for_detection(image)
+    assert max(detection.image.shape[:2]) == 2048
+    assert policy.for_recognition(image, detection) is detection
+
+    polygon = detection.polygon_to_original([[1024, 512], [1100, 512], [1100, 600], [1024, 600]])
+    assert np.allclose(polygon[0], [3000, 1500], atol=2)
+
+    box = detection.box_to_original({'x': 1024, 'y': 512, 'width': 10, 'height': 20, 'text': 'A'})
+    assert abs(box['x'] - 3000) < 2 and abs(box['height'] - 58.6) < 0.5 and box['text'] == 'A'
+
+
+def test_petite_image_non_copiee():
+    """Sous le seuil, l'image est utilisée telle quelle."""
+    image = np.zeros((800, 1200, 3), dtype=np.uint8)
+    detection = ResolutionPolicy().for_detection(image)
+    assert detection.image is image and not detection.is_scaled
+
+
+def test_panorama_limite_sur_le_petit_cote():
+    """Un panorama garde sa hauteur utile: le grand côté dépasse max_detect_edge, laissé aux tuiles."""
+    image = np.zeros((1500, 12000, 3), dtype=np.uint8)
+    detection = ResolutionPolicy(max_detect_edge=2048).for_detection(image)
+    assert detection.image.shape[0] == 2048 / PANORAMA_ASPECT and detection.image.shape[1] == 8192
+
+    # Au rapport limite, les deux règles donnent la même réduction
+    limit = np.zeros((1000, int(1000 * PANORAMA_ASPECT), 3), dtype=np.uint8)
+    assert max(ResolutionPolicy(max_detect_edge=1000).for_detection(limit).image.shape[:2]) == 1000
+
+
+def test_lignes_et_reconnaissance_separee():
+    """Les lignes gardent leur pente; la reconnaissance peut être plus résolue."""
+    image = np.zeros((4000, 6000, 3), dtype=np.uint8)
+    policy = ResolutionPolicy(max_detect_edge=1500, max_recognition_edge=3000)
+    detection = policy.for_detection(image)
+    recognition = policy.for_recognition(image, detection)
+    assert recognition is not detection and recognition.scale == 2 * detection.scale
+
+    # Ligne y = 2x + 10 dans l'image réduite
+    line = Line(2.0, 10.0, (100.0, 210.0), 50, 150, 110, 310)
+    original = detection.line_to_original(line)
+    assert original.m == 2.0
+    assert abs(original.x(original.center[1]) - original.center[0]) < 1e-6
+    assert original.center[0] == 400.0 and line.center[0] == 100.0
+
+    horizontal, free = scale_easyocr_lists([[10, 20, 30, 40]], [[[0, 0], [4, 0], [4, 4], [0, 4]]], 2.0)
+    assert horizontal == [[20, 40, 60, 80]] and free[0][2] == [8, 8]
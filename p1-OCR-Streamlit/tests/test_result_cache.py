@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test du cache des résultats
+Vérifie l'index BK-tree, la recherche exacte et quasi-doublon, la persistance disque,
+l'éviction (nombre d'entrées et âge) et la version dans l'empreinte des paramètres.
+"""
+
+import os
+import random
+import sys
+
+import cv2
+import numpy as np
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import result_cache
+from core.result_cache import BKTree, ResultCache, content_hash, dhash, hamming, params_fingerprint
+
+
+def _shelf(seed):
+    rng = np.random.default_rng(seed)
+    image = np.zeros((400, 600, 3), dtype=np.uint8)
+    x = 0
+    while x < 600:
+        width = int(rng.integers(20, 60))
+        image[:, x:x + width] = rng.integers(0, 255, 3)
+        x += width
+    return image
+
+
+def test_bktree_equivaut_recherche_exhaustive():
+    """Le BK-tree retourne exactement les empreintes à distance <= d."""
+    rng = random.Random(0)
+    hashes = [rng.getrandbits(64) for _ in range(500)]
+    tree = BKTree()
+    for i, h in enumerate(hashes):
+        tree.add(h, i)
+    query = hashes[42] ^ 0b1011  # 3 bits modifiés
+    expected = sorted(i for i, h in enumerate(hashes) if hamming(query, h) <= 6)
+    assert sorted(i for _, i in tree.search(query, 6)) == expected
+    assert tree.search(query, 6)[0] == (3, 42)
+
+
+def test_recherche_exacte_et_quasi_doublon(tmp_path):
+    """Même fichier: recherche exacte; photo recompressée: quasi-doublon; autre étagère: absent."""
+    image = _shelf(1)
+    _, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 60])
+    recompressed = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+    assert hamming(dhash(image), dhash(recompressed)) <= 4
+    assert hamming(dhash(image), dhash(_shelf(2))) > 12
+
+    cache = ResultCache(str(tmp_path), near_duplicate_distance=6)
+    params = params_fingerprint('EasyOCR', 0.3, {'spine_method': 'vertical_lines', 'trace': True})
+    sha = content_hash(b'fichier-1')
+    results = {'books': [{'x': np.float32(10), 'y': 5, 'width': 20, 'height': 100, 'text': 'EMMA'}],
+               'text': 'EMMA', 'confidence': 0.9, 'trace': {'spans': []}}
+    key = cache.store(sha, dhash(image), params, results, original_size=(600, 400))
+
+    hit = cache.lookup_exact(sha, params)
+    assert hit.match == 'exact' and hit.entry['results']['books'][0]['x'] == 10.0
+    assert 'trace' not in hit.entry['results']
+    assert cache.lookup_exact(sha, params_fingerprint('Tesseract', 0.3)) is None
+
+    near = cache.lookup_near(dhash(recompressed), params)
+    assert near.match == 'near' and near.key == key
+    assert cache.lookup_near(dhash(_shelf(2)), params) is None
+
+
+def test_persistance_et_enrichissement(tmp_path):
+    """L'index est rechargé depuis le disque et l'enrichissement est conservé."""
+    params = params_fingerprint('EasyOCR', 0.3)
+    cache = ResultCache(str(tmp_path))
+    key = cache.store('abc', dhash(_shelf(3)), params, {'books': [], 'text': ''})
+    assert cache.store_enrichment(key, [{'text': 'EMMA', 'ol_title': 'Emma'}])
+
+    reloaded = ResultCache(str(tmp_path))
+    assert len(reloaded) == 1
+    hit = reloaded.lookup_exact('abc', params)
+    assert hit.entry['enriched_books'][0]['ol_title'] == 'Emma'
+    assert reloaded.lookup_near(dhash(_shelf(3)), params) is None  # quasi-doublons désactivés par défaut
+
+
+def test_eviction_des_plus_anciennes(tmp_path, monkeypatch):
+    """Au-delà de max_entries, les plus anciennes entrées sont supprimées du disque et de l'index."""
+    clock = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: clock[0])
+    params = params_fingerprint('EasyOCR', 0.3)
+    cache = ResultCache(str(tmp_path), near_duplicate_distance=6, max_entries=10)
+    for i in range(11):
+        clock[0] += 1
+        cache.store(f"sha-{i}", dhash(_shelf(i)), params, {'books': [], 'text': str(i)})
+
+    # 11 > 10: la plus ancienne et EVICTION_SLACK (1 entrée) supprimées
+    assert len(cache) == 9
+    assert cache.lookup_exact('sha-0', params) is None and cache.lookup_exact('sha-1', params) is None
+    assert cache.lookup_near(dhash(_shelf(0)), params) is None
+    assert cache.lookup_exact('sha-10', params).entry['results']['text'] == '10'
+    assert not os.path.exists(cache._entry_path(cache.make_key('sha-0', params)))
+
+    reloaded = ResultCache(str(tmp_path), max_entries=10)
+    assert len(reloaded) == 9
+    with open(tmp_path / 'index.jsonl', encoding='utf-8') as f:
+        assert len(f.readlines()) == 9
+
+
+def test_expiration_et_version(tmp_path, monkeypatch):
+    """Une entrée plus vieille que max_age n'est plus restituée; le mode et CACHE_VERSION changent l'empreinte."""
+    clock = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: clock[0])
+    params = params_fingerprint('EasyOCR', 0.3)
+    cache = ResultCache(str(tmp_path), max_age=60)
+    cache.store('abc', dhash(_shelf(1)), params, {'books': [], 'text': ''})
+    assert cache.lookup_exact('abc', params) is not None
+
+    clock[0] += 61
+    assert cache.lookup_exact('abc', params) is None
+    assert len(ResultCache(str(tmp_path), max_age=60)) == 0
+
+    assert params_fingerprint('EasyOCR', 0.3, mode='stream') != params
+    monkeypatch.setattr(result_cache, 'CACHE_VERSION', result_cache.CACHE_VERSION + 1)
+    assert params_fingerprint('EasyOCR', 0.3) != params
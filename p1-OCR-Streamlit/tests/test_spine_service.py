@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test du service de détection de tranches partagé
+Vérifie le résultat (lignes, polygones, durées) et le cache par image:
+une même image n'est analysée qu'une fois, même par des appels simultanés.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.synthetic_shelf import generate_shelf
+from core.spine import SpineService, SpineDetector
+
+
+def test_resultat_lignes_polygones_durees():
+    """Un polygone par espace entre lignes voisines, durées par étape."""
+    image, _ = generate_shelf(num_spines=12, seed=1, width=1600, row_height=700)
+    result = SpineService().detect(image)
+
+    assert len(result.lines) >= 5
+    assert not result.cached
+    assert 0 < len(result.polygons) <= len(result.lines) + 1
+    assert all(quad.shape == (4, 2) for quad in result.polygons)
+    assert set(result.timings) == {'fingerprint', 'detection', 'regions'}
+
+
+def test_cache_par_image():
+    """Deuxième appel servi par le cache; une autre image ou méthode est recalculée."""
+    service = SpineService(cache_size=2)
+    image, _ = generate_shelf(num_spines=12, seed=1, width=1600, row_height=700)
+    other, _ = generate_shelf(num_spines=12, seed=2, width=1600, row_height=700)
+
+    first = service.detect(image)
+    second = service.detect(image.copy())
+    assert second.cached
+    assert [l.center for l in second.lines] == [l.center for l in first.lines]
+    # Chaque appelant reçoit sa propre liste
+    second.lines.sort(key=lambda line: -line.center[0])
+    assert service.detect(image).lines[0].center == first.lines[0].center
+
+    assert not service.detect(other).cached
+    assert not service.detect(image, method='horizontal_shelves').cached
+    assert len(service) == 2
+    with pytest.raises(ValueError):
+        service.detect(image, method='inconnue')
+
+
+def test_appels_simultanes_un_seul_calcul(monkeypatch):
+    """Plusieurs moteurs demandant la même image en parallèle partagent un seul calcul."""
+    calls = []
+    detect = SpineDetector.detect_spine_lines
+
+    def counting(image, **kwargs):
+        calls.append(image.shape)
+        return detect(image, **kwargs)
+
+    monkeypatch.setattr(SpineDetector, 'detect_spine_lines', staticmethod(counting))
+    image, _ = generate_shelf(num_spines=12, seed=1, width=1600, row_height=700)
+    service = SpineService()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: service.detect(image), range(4)))
+
+    assert len(calls) == 1
+    assert sum(not result.cached for result in results) == 1
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test des backends Tesseract
+Vérifie l'analyse des configurations, les réglages passés à l'API C (API
+factice) et, si tesserocr est installé, la lecture directe depuis un buffer
+numpy avec une instance persistante par thread.
+"""
+
+import os
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from engines.tesseract.logic.backends import create_backend, parse_config
+
+
+def test_analyse_configuration():
+    """Les options pytesseract sont traduites pour l'API C."""
+    assert parse_config('--psm 6') == (6, {})
+    assert parse_config('--psm=7 -c tessedit_char_whitelist=ABC') == (7, {'tessedit_char_whitelist': 'ABC'})
+    assert parse_config('') == (None, {})
+    with pytest.raises(ValueError):
+        create_backend('inconnu')
+
+
+class _FakeApi:
+    """TessBaseAPI factice: mode de segmentation et variables de l'instance."""
+
+    def __init__(self, lang):
+        self.psm = []
+        self.variables = {'tessedit_char_whitelist': ''}
+        self.seen = []
+
+    def SetPageSegMode(self, psm):
+        self.psm.append(psm)
+
+    def GetVariableAsString(self, name):
+        return self.variables.get(name)
+
+    def SetVariable(self, name, value):
+        if name not in self.variables:
+            return False
+        self.variables[name] = value
+        return True
+
+    def SetImageBytes(self, *args):
+        pass
+
+    def Recognize(self):
+        self.seen.append(dict(self.variables))
+
+    def GetIterator(self):
+        return None
+
+    def Clear(self):
+        pass
+
+    def End(self):
+        pass
+
+
+def test_tesserocr_variables_retablies_et_psm_par_defaut(monkeypatch):
+    """Les variables `-c` ne valent que pour l'appel; sans --psm, mode 3 comme pytesseract."""
+    monkeypatch.setitem(sys.modules, 'tesserocr', types.SimpleNamespace(PyTessBaseAPI=_FakeApi))
+    backend = create_backend('tesserocr', ['eng'])
+    image = np.zeros((10, 10), dtype=np.uint8)
+
+    backend.image_to_data(image, '--psm 7 -c tessedit_char_whitelist=ABC -c inconnue=1')
+    backend.image_to_data(image)
+    api = backend._instances[0]
+    assert api.seen == [{'tessedit_char_whitelist': 'ABC'}, {'tessedit_char_whitelist': ''}]
+    assert api.psm == [7, 3]
+    backend.close()
+
+
+def test_tesserocr_buffer_et_instances_par_thread():
+    """Lecture d'un mot depuis un tableau numpy; une instance TessBaseAPI par thread."""
+    pytest.importorskip('tesserocr')
+    image = np.full((80, 320), 255, dtype=np.uint8)
+    cv2.putText(image, 'SHELF', (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 4)
+
+    backend = create_backend('tesserocr', ['eng'])
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            outputs = list(pool.map(lambda _: backend.image_to_data(image, '--psm 7'), range(6)))
+        assert all('SHELF' in ' '.join(data['text']) for data in outputs)
+        assert 1 <= len(backend._instances) <= 2
+    finally:
+        backend.close()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test de la reconnaissance Tesseract par tranche
+Vérifie le découpage en régions entre lignes de tranches et le redressement des dos.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from engines.easyocr.models.line import Line
+from engines.tesseract.detection.spine_detection import TesseractSpineDetection
+
+
+def _vertical(x, height):
+    return Line(1000, 0, (x, height / 2), x, x, 0, height - 1)
+
+
+def test_regions_entre_lignes_voisines():
+    """Trois lignes dans une image de 400 px: quatre tranches, bords de l'image inclus."""
+    lines = [_vertical(x, 300) for x in (250, 100, 330)]
+    regions = TesseractSpineDetection.spine_regions(lines, (300, 400))
+    lefts = [float(quad[0][0]) for quad in regions]
+    rights = [float(quad[1][0]) for quad in regions]
+    assert lefts == [0.0, 100.0, 250.0, 330.0]
+    assert rights == [100.0, 250.0, 330.0, 399.0]
+    # Une tranche plus étroite que MIN_SPINE_WIDTH est ignorée
+    assert len(TesseractSpineDetection.spine_regions([_vertical(100, 300), _vertical(104, 300)], (300, 400))) == 2
+
+
+def test_redressement_deux_sens():
+    """Un dos haut et étroit donne deux lectures horizontales (bas->haut et haut->bas)."""
+    image = np.zeros((300, 400), dtype=np.uint8)
+    image[:, 100:150] = 200
+    image[20:40, 100:150] = 50  # marque en haut du dos
+    quad = np.array([[100, 0], [149, 0], [149, 299], [100, 299]], dtype=np.float32)
+    bottom_to_top, top_to_bottom = TesseractSpineDetection.upright_crops(image, quad, padding=0)
+    assert bottom_to_top.shape == top_to_bottom.shape == (49, 299)
+    # Lecture bas->haut: le haut du dos se retrouve à droite
+    assert bottom_to_top[:, -35:-25].mean() < 100 and bottom_to_top[:, :10].mean() > 150
+    assert top_to_bottom[:, 25:35].mean() < 100
+
+
+def test_methode_de_detection_transmise(monkeypatch):
+    """detect_spine_lines transmet la méthode demandée au service de tranches partagé."""
+    from engines.tesseract.detection import spine_detection
+
+    methods = []
+
+    class _Result:
+        lines = ['ligne']
+
+    def detect(image, method, debug=False):
+        methods.append(method)
+        return _Result()
+
+    monkeypatch.setattr(spine_detection.spine_service, 'detect', detect)
+    image = np.zeros((10, 10), dtype=np.uint8)
+    assert TesseractSpineDetection.detect_spine_lines(image, method='horizontal_shelves') == ['ligne']
+    TesseractSpineDetection.detect_spine_lines(image)
+    assert methods == ['horizontal_shelves', 'vertical_lines']
+
+
+def test_tesseract_par_tranche_etagere_synthetique():
+    """Sur une étagère synthétique, chaque boîte correspond à une tranche."""
+    pytest.importorskip('tesserocr')
+    from benchmarks.synthetic_shelf import generate_shelf
+    from engines.tesseract.logic.orchestrator import TesseractOCRProcessor
+
+    image, _ = generate_shelf(num_spines=6, seed=1, width=900, row_height=600, max_slant=0)
+    processor = TesseractOCRProcessor('eng', 30, backend='tesserocr', spine_workers=2)
+    try:
+        boxes = processor.get_boxes(image)
+    finally:
+        processor.close()
+    assert all(box['is_vertical'] for box in boxes)
+
+
+class _TimedBackend:
+    """Backend de test: PSM plus ou moins sûres, éventuellement lentes ou bloquées jusqu'à un événement."""
+
+    name = 'timed'
+
+    def __init__(self, delays, confidences, gates=None):
+        self.delays = delays
+        self.confidences = confidences
+        self.gates = gates or {}
+        self.calls = []
+        self.completed = []
+
+    def image_to_data(self, image, config=''):
+        import time
+        self.calls.append(config)
+        if config in self.gates:
+            self.gates[config].wait(10)
+        time.sleep(self.delays.get(config, 0.0))
+        width = image.shape[1]
+        self.completed.append(config)
+        return {'text': ['MOBY', 'DICK'], 'conf': [self.confidences[config]] * 2,
+                'left': [0, width // 2], 'top': [0, 0], 'width': [width // 2, width // 2], 'height': [20, 20]}
+
+    def close(self):
+        pass
+
+
+def test_recherche_multi_psm_arret_anticipe():
+    """Les combinaisons en cours ne sont pas attendues, celles en attente ne sont pas lancées."""
+    import threading
+    from engines.tesseract.logic.orchestrator import TesseractOCRProcessor
+
+    image = np.full((200, 400, 3), 255, dtype=np.uint8)
+    confidences = {'--psm 6': 40, '--psm 11': 92, '--psm 3': 95}
+
+    # --psm 3 bloquée: le résultat est rendu sans elle; close() attend sa fin
+    release = threading.Event()
+    backend = _TimedBackend(delays={}, confidences=confidences, gates={'--psm 3': release})
+    processor = TesseractOCRProcessor('eng', 30, backend=backend, per_spine=False,
+                                      variant_search=True, search_workers=12)
+    try:
+        results = processor.detect_text(image)
+        assert '--psm 3' not in backend.completed
+        assert [text for _, text, _ in results] == ['MOBY', 'DICK']
+        assert min(confidence for _, _, confidence in results) == 0.92
+    finally:
+        release.set()
+        processor.close()
+    assert backend.completed.count('--psm 3') == backend.calls.count('--psm 3')
+
+    # Un seul thread: les combinaisons en attente derrière la première --psm 11 ne sont pas lancées
+    backend = _TimedBackend(delays={}, confidences=confidences)
+    processor = TesseractOCRProcessor('eng', 30, backend=backend, per_spine=False,
+                                      variant_search=True, search_workers=1)
+    try:
+        processor.detect_text(image)
+    finally:
+        processor.close()
+    assert backend.calls[:5] == ['--psm 6'] * 4 + ['--psm 11']
+    assert len(backend.calls) <= 6 and '--psm 3' not in backend.calls
+
+    # Objectif inatteignable: toutes les combinaisons sont évaluées, la meilleure gagne
+    backend = _TimedBackend(delays={}, confidences={'--psm 6': 40, '--psm 11': 60, '--psm 3': 70})
+    processor = TesseractOCRProcessor('eng', 30, backend=backend, per_spine=False, variant_search=True,
+                                      target_confidence=0.99)
+    results = processor.detect_text(image)
+    assert len(backend.calls) == 12 and results[0][2] == 0.70
+
+
+def test_livres_produits_au_fur_et_a_mesure():
+    """iter_books produit chaque livre avant de lire la tranche suivante; mêmes boîtes que get_boxes."""
+    import threading
+    from benchmarks.synthetic_shelf import generate_shelf
+    from engines.tesseract.logic.config import SPINE_PSM_CONFIG
+    from engines.tesseract.logic.orchestrator import TesseractOCRProcessor
+
+    class _GatedBackend(_TimedBackend):
+        """Une lecture par livre reçu: la tranche suivante attend que le livre précédent soit produit."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.permits = threading.Semaphore(1)
+            self.blocked = 0
+
+        def image_to_data(self, image, config=''):
+            if not self.permits.acquire(timeout=5):
+                self.blocked += 1
+            return super().image_to_data(image, config)
+
+    image, _ = generate_shelf(num_spines=8, seed=1, width=1200, row_height=600, max_slant=0)
+    # Confiance 95: une seule lecture (SPINE_PSM_CONFIG) par tranche
+    backend = _GatedBackend(delays={}, confidences={SPINE_PSM_CONFIG: 95})
+    processor = TesseractOCRProcessor('eng', 30, backend=backend, spine_workers=1)
+    books = []
+    try:
+        for book in processor.iter_books(image):
+            books.append(book)
+            backend.permits.release()
+    finally:
+        processor.close()
+
+    assert len(books) >= 3
+    assert all(book['text'] == 'MOBY DICK' for book in books)
+    assert backend.calls == [SPINE_PSM_CONFIG] * len(books)
+    assert backend.blocked == 0
+
+    processor = TesseractOCRProcessor('eng', 30, backend=_TimedBackend({}, {SPINE_PSM_CONFIG: 95}),
+                                      spine_workers=1)
+    try:
+        assert [(b['x'], b['y'], b['text']) for b in processor.get_boxes(image)] == \
+               [(b['x'], b['y'], b['text']) for b in books]
+    finally:
+        processor.close()
+
+
+def test_pool_des_tranches_persistant():
+    """Les mêmes threads (donc les mêmes instances Tesseract) lisent les tranches de toutes les images."""
+    import threading
+    from benchmarks.synthetic_shelf import generate_shelf
+    from engines.tesseract.logic.config import SPINE_PSM_CONFIG
+    from engines.tesseract.logic.orchestrator import TesseractOCRProcessor
+
+    class _ThreadBackend(_TimedBackend):
+        def image_to_data(self, image, config=''):
+            self.threads.add(threading.current_thread())
+            return super().image_to_data(image, config)
+
+    backend = _ThreadBackend(delays={}, confidences={SPINE_PSM_CONFIG: 95})
+    backend.threads = set()
+    processor = TesseractOCRProcessor('eng', 30, backend=backend, spine_workers=2)
+    try:
+        for seed in range(3):
+            image, _ = generate_shelf(num_spines=6, seed=seed, width=900, row_height=600, max_slant=0)
+            assert processor.get_boxes(image)
+        assert len(backend.calls) >= 9
+        assert len(backend.threads) <= 2
+    finally:
+        processor.close()
+    assert processor._pools == {}
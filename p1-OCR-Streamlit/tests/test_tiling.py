@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test du découpage en tuiles
+Vérifie le plan de découpage, la fusion des boîtes et lignes aux jointures
+la détection de tranches par tuiles et le chemin EasyOCR par défaut sur un
+panorama synthétique.
+"""
+
+import os
+import sys
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from core.tiling import DEFAULT_TILE_SIZE, TileExecutor, plan_tiles, merge_text_results, merge_lines
+from engines.easyocr.models.line import Line
+
+
+def test_plan_tuiles_panorama():
+    """Un panorama 10000x1500 donne une rangée de tuiles pleine hauteur qui couvre l'image."""
+    tiles = plan_tiles((1500, 10000), tile_size=4096, overlap=256)
+    assert len(tiles) == 3
+    assert all(t.y == 0 and t.height == 1500 for t in tiles)
+    assert tiles[0].x == 0 and tiles[-1].x + tiles[-1].width == 10000
+    for left, right in zip(tiles, tiles[1:]):
+        assert left.x + left.width - right.x >= 256
+    assert tiles[0].seams == {'right'} and tiles[1].seams == {'left', 'right'}
+    assert len(plan_tiles((1500, 3000), tile_size=4096)) == 1
+
+
+def test_fusion_boites_et_lignes_aux_jointures():
+    """Une boîte vue entière et tronquée garde la version entière; une tranche coupée est recollée."""
+    full = ([[4000, 100], [4060, 100], [4060, 500], [4000, 500]], 'DRACULA', 0.8, False)
+    cut = ([[4000, 100], [4040, 100], [4040, 500], [4000, 500]], 'DRACU', 0.9, True)
+    other = ([[100, 100], [160, 100], [160, 500], [100, 500]], 'EMMA', 0.7, False)
+    merged = merge_text_results([other, cut, full])
+    assert [text for _, text, _ in merged] == ['EMMA', 'DRACULA']
+
+    top = Line(1000, 0, (500, 300), 499, 501, 0, 600)
+    bottom = Line(1000, 0, (502, 900), 501, 503, 590, 1200)
+    apart = Line(1000, 0, (900, 600), 899, 901, 0, 1200)
+    lines = merge_lines([top, bottom, apart], overlap=256)
+    assert len(lines) == 2
+    assert lines[0].min_y == 0 and lines[0].max_y == 1200
+
+
+def test_detection_tranches_par_tuiles():
+    """Détection par tuiles: lignes dans le repère du panorama, résultat identique en parallèle."""
+    from benchmarks.synthetic_shelf import generate_shelf
+    from engines.easyocr.detection.spine_detection import EasyOCRSpineDetection
+
+    image, _ = generate_shelf(num_spines=30, seed=3, width=6000, row_height=900)
+    sequential = EasyOCRSpineDetection.detect_spine_lines(
+        image, tile_executor=TileExecutor(tile_size=2048, overlap=256, max_workers=1))
+    parallel = EasyOCRSpineDetection.detect_spine_lines(
+        image, tile_executor=TileExecutor(tile_size=2048, overlap=256, max_workers=4))
+
+    assert [l.center for l in sequential] == [l.center for l in parallel]
+    assert all(0 <= l.min_x and l.max_x <= image.shape[1] for l in sequential)
+    xs = [l.center[0] for l in sequential]
+    assert xs == sorted(xs)
+
+
+class _Reader:
+    """Reader EasyOCR factice: un mot au centre de chaque image lue."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def readtext(self, image, **kwargs):
+        self.shapes.append(image.shape[:2])
+        height, width = image.shape[:2]
+        x, y = width / 2, height / 2
+        return [([[x - 50, y - 20], [x + 50, y - 20], [x + 50, y + 20], [x - 50, y + 20]], 'TITRE', 0.9)]
+
+
+def test_easyocr_panorama_par_tuiles():
+    """Politique de résolution et tuiles par défaut: un panorama est lu tuile par tuile, boîtes dans l'original."""
+    from core.instrumentation import tracer
+    from core.resolution import ResolutionPolicy
+    from engines.easyocr.logic.orchestrator import EasyOCRProcessor
+
+    processor = EasyOCRProcessor.__new__(EasyOCRProcessor)
+    processor.confidence_threshold, processor.debug_sink = 0.3, None
+    processor.resolution_policy, processor.tile_executor = ResolutionPolicy(), TileExecutor()
+    processor.reader = _Reader()
+
+    with tracer.request('EasyOCR', enabled=True) as trace:
+        results = processor.detect_text(np.zeros((1500, 12000, 3), dtype=np.uint8), preprocess=False)
+
+    assert 'easyocr.tiling' in {s['name'] for s in trace.to_dict()['spans']}
+    assert len(processor.reader.shapes) > 1
+    assert all(max(shape) <= DEFAULT_TILE_SIZE for shape in processor.reader.shapes)
+    assert len(results) == len(processor.reader.shapes)
+    assert all(0 <= x <= 12000 and abs(y - 750) <= 30 for bbox, _, _ in results for x, y in bbox)
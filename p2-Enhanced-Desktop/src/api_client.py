@@ -1,30 +1,43 @@
 #Rôle : Chercher les infos du livre sur Open Library Technologies : requests, JSON 
 #Concepts : REST API, parsing de réponses
 
+import os
+import sys
+
 import requests
-import time 
+
+# Session partagée avec P1 (keep-alive, nouvelles tentatives à gigue sur 429/5xx)
+P1_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'p1-OCR-Streamlit', 'src'))
+if P1_SRC not in sys.path:
+    sys.path.append(P1_SRC)
+from services.openlibrary_client import create_session
+
 
 class OpenLibraryClient:
     """Client pour interagir avec l'API Open Library"""
 
     # TODO 1
-    def __init__(self, timeout=10):
+    def __init__(self, timeout=10, session=None):
         self.base_url = "https://openlibrary.org"
         self.timeout = timeout
+        self.session = session or create_session()
 
     # TODO 2
-    def search_books(self, query, limit=5):
-        """Cherche des livres par titre sur Open Library"""
+    def search_books(self, query, limit=5, fields=None):
+        """Cherche des livres par titre sur Open Library (fields : champs demandés, réponse plus légère)"""
         
         # 1. Construire l'URL avec f-string
-        url = f"{self.base_url}/search.json?q={query}&limit={limit}"
+        url = f"{self.base_url}/search.json"
+        params = {'q': query, 'limit': limit}
+        if fields:
+            params['fields'] = ','.join(fields)
         
-        # 2. Faire la requête avec gestion d'erreurs
+        # 2. Faire la requête avec gestion d'erreurs (les 429 sont relancés par la session)
         try:
-            response = requests.get(url, timeout=self.timeout)
-            time.sleep(0.1)  # Rate limiting (max 10 req/sec)
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
             return response.json()  # Convertir JSON en dict Python
-        except requests.RequestException:  # Capturer toutes les erreurs réseau
+        except (requests.RequestException, ValueError):  # Erreurs réseau et JSON invalide
             return None  # Retourner None si erreur
 
     # TODO 3
@@ -33,10 +46,10 @@ class OpenLibraryClient:
         url = f"{self.base_url}{work_key}.json"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            time.sleep(0.1)
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
             return response.json()
-        except requests.RequestException:
+        except (requests.RequestException, ValueError):
             return None
 
     # TODO 4
@@ -5,15 +5,104 @@ P2-Enhanced-Desktop component
 """
 
 import os
+import sys
 import cv2
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Iterable, Iterator, List, Tuple, Optional
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Batched / tiled inference defaults
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_TILE_OVERLAP = 0.2
+DEFAULT_NMS_IOU = 0.5
+
+
+# Fallback (no YOLO weights) defaults
+FALLBACK_MAX_EDGE = 640  # Longest edge analysed by the contour fallback
+FALLBACK_NMS_IOU = 0.3
+FALLBACK_MIN_SPINE_WIDTH = 6  # Pixels, at the reduced resolution
+FALLBACK_SPINE_EDGE = 1280  # Longest edge analysed by the spine line detector
+
+# P1 engines (Shelfie spine detector), imported on first use
+P1_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'p1-OCR-Streamlit', 'src'))
+
+
+def _use_p1():
+    """Make the P1 packages (core, engines) importable."""
+    if P1_SRC not in sys.path:
+        sys.path.append(P1_SRC)
+
+
+def _spine_line_set(image: np.ndarray):
+    """Vertical spine lines of an image (P1 Shelfie detector) as a LineSet, or None if unavailable."""
+    _use_p1()
+    try:
+        from core.spine import LineSet, spine_service
+    except ImportError as e:
+        logger.debug(f"Spine detector unavailable: {e}")
+        return None
+    return LineSet.from_lines(spine_service.detect(image, method='vertical_lines').lines)
+
+
+def tile_windows(width: int, height: int, tile_size: int, overlap: float = DEFAULT_TILE_OVERLAP) -> List[Tuple[int, int, int, int]]:
+    """
+    Overlapping tiles covering an image, planned by P1 core.tiling.
+
+    Args:
+        overlap: Fraction of tile_size shared by neighbouring tiles
+
+    Returns:
+        List of (x0, y0, x1, y1) windows; the last tile of each row/column is
+        aligned on the image border so every tile has the full size when possible
+    """
+    _use_p1()
+    from core.tiling import plan_tiles
+
+    return [(tile.x, tile.y, tile.x + tile.width, tile.y + tile.height)
+            for tile in plan_tiles((height, width), tile_size, int(tile_size * overlap))]
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = DEFAULT_NMS_IOU) -> np.ndarray:
+    """
+    Greedy non-maximum suppression.
+
+    Args:
+        boxes: (n, 4) array of x1, y1, x2, y2
+        scores: (n,) confidences
+
+    Returns:
+        Indices of the kept boxes, by decreasing score
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        # IoU of the best box against all remaining boxes at once
+        w = np.maximum(0, np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]))
+        h = np.maximum(0, np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]))
+        inter = w * h
+        iou = inter / np.maximum(areas[best] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.intp)
+
+
+def to_detections(xyxy: np.ndarray, conf: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
+    """Convert (n, 4) x1, y1, x2, y2 boxes and (n,) scores to (x, y, w, h, conf) tuples sorted by x."""
+    xywh = np.column_stack([xyxy[:, 0], xyxy[:, 1], xyxy[:, 2] - xyxy[:, 0], xyxy[:, 3] - xyxy[:, 1]]).astype(int)
+    order = np.argsort(xywh[:, 0], kind='stable')
+    return [(x, y, w, h, c) for (x, y, w, h), c in zip(xywh[order].tolist(), conf[order].astype(float).tolist())]
+
+
 class BookDetector:
     """
     YOLOv8-based book detector for precise spine detection.
@@ -22,21 +111,48 @@ class BookDetector:
     using YOLOv8 object detection model.
     """
 
-    def __init__(self, model_path: str = "yolov8n.pt", conf_threshold: float = 0.5):
+    def __init__(self, model_path: str = "yolov8n.pt", conf_threshold: float = 0.5, backend: str = "auto"):
         """
         Initialize the book detector.
 
         Args:
-            model_path: Path to YOLOv8 model weights
+            model_path: Path to YOLOv8 model weights (.pt) or exported ONNX model (.onnx)
             conf_threshold: Confidence threshold for detections (0.0-1.0)
+            backend: "ultralytics" (PyTorch), "onnx" (ONNX Runtime CPU, see onnx_runtime.py)
+                or "auto" (ONNX if model_path is, or has next to it, an .onnx file)
         """
         self.model_path = model_path
         self.conf_threshold = conf_threshold
+        self.backend = backend
         self.model = None
+        self.runtime = None
         self._load_model()
 
+    def _onnx_path(self) -> Optional[str]:
+        """ONNX model to use for the requested backend, if any."""
+        if self.model_path.endswith('.onnx'):
+            return self.model_path
+        candidate = os.path.splitext(self.model_path)[0] + '.onnx'
+        if self.backend == 'onnx' or (self.backend == 'auto' and os.path.exists(candidate)):
+            return candidate
+        return None
+
     def _load_model(self):
-        """Load YOLOv8 model with error handling for PyTorch 2.6+"""
+        """Load the ONNX Runtime model if available, else YOLOv8 with error handling for PyTorch 2.6+"""
+        onnx_path = self._onnx_path()
+        if onnx_path and self.backend != 'ultralytics':
+            try:
+                from onnx_runtime import OnnxDetectorRuntime, export_onnx
+                if not os.path.exists(onnx_path):
+                    export_onnx(self.model_path, onnx_path)
+                self.runtime = OnnxDetectorRuntime(onnx_path, conf_threshold=self.conf_threshold)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️  Could not load ONNX model: {e}")
+                if self.backend == 'onnx' or self.model_path.endswith('.onnx'):
+                    logger.info("🔄 Falling back to alternative detection method")
+                    return
+
         try:
             # Import YOLOv8
             from ultralytics import YOLO
@@ -62,86 +178,219 @@ class BookDetector:
         Returns:
             List of tuples (x, y, w, h, confidence) for detected books
         """
-        if self.model is None:
-            logger.warning("No YOLO model available, using fallback detection")
-            return self._fallback_detection(image)
+        return self.detect_books_batch([image])[0]
 
-        try:
-            # Run YOLOv8 inference
-            results = self.model(image, conf=self.conf_threshold, verbose=False)
+    def detect_books_batch(self, images: List[np.ndarray], batch_size: int = DEFAULT_BATCH_SIZE,
+                           tile_size: Optional[int] = None, tile_overlap: float = DEFAULT_TILE_OVERLAP,
+                           iou_threshold: float = DEFAULT_NMS_IOU) -> List[List[Tuple[int, int, int, int, float]]]:
+        """
+        Detect books in several images with batched YOLOv8 forward passes.
 
-            # Extract bounding boxes
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Get box coordinates (x1, y1, x2, y2)
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        conf = box.conf[0].cpu().numpy()
+        Images (or their tiles) are sent to the model `batch_size` at a time, and
+        each result's `boxes.xyxy` / `boxes.conf` tensors are copied to NumPy once
+        instead of once per box.
 
-                        # Convert to (x, y, w, h) format
-                        x, y = int(x1), int(y1)
-                        w, h = int(x2 - x1), int(y2 - y1)
+        Args:
+            images: Input images as numpy arrays (BGR format)
+            batch_size: Images (or tiles) per forward pass
+            tile_size: If set, images wider or taller than this are split into
+                overlapping square tiles of this size; boxes from all tiles are merged
+                with a cross-tile NMS. Useful for wide shelf panoramas.
+            tile_overlap: Fraction of tile_size shared by neighbouring tiles
+            iou_threshold: IoU above which overlapping tile detections are merged
 
-                        detections.append((x, y, w, h, float(conf)))
+        Returns:
+            One list of (x, y, w, h, confidence) tuples per image, sorted left to right
+        """
+        if not images:
+            return []
+        if self.model is None and self.runtime is None:
+            logger.warning("No YOLO model available, using fallback detection")
+            return [self._fallback_detection(image) for image in images]
+
+        # One job per image, or per tile for large images: (image index, crop, x offset, y offset)
+        jobs = []
+        for index, image in enumerate(images):
+            height, width = image.shape[:2]
+            if tile_size and max(width, height) > tile_size:
+                for x0, y0, x1, y1 in tile_windows(width, height, tile_size, tile_overlap):
+                    jobs.append((index, image[y0:y1, x0:x1], x0, y0))
+            else:
+                jobs.append((index, image, 0, 0))
 
-            # Sort by x-coordinate (left to right)
-            detections.sort(key=lambda x: x[0])
+        try:
+            boxes = [[] for _ in images]
+            scores = [[] for _ in images]
+            for start in range(0, len(jobs), batch_size):
+                chunk = jobs[start:start + batch_size]
+                for (index, _, x0, y0), (xyxy, conf) in zip(chunk, self._predict([crop for _, crop, _, _ in chunk])):
+                    if not len(xyxy):
+                        continue
+                    boxes[index].append(xyxy + np.array([x0, y0, x0, y0], dtype=np.float32))
+                    scores[index].append(conf)
 
-            logger.info(f"📚 Detected {len(detections)} books with YOLOv8")
+            detections = []
+            for index in range(len(images)):
+                if not boxes[index]:
+                    detections.append([])
+                    continue
+                xyxy = np.concatenate(boxes[index])
+                conf = np.concatenate(scores[index])
+                if len(boxes[index]) > 1:
+                    # Same book seen by several overlapping tiles
+                    keep = non_max_suppression(xyxy, conf, iou_threshold)
+                    xyxy, conf = xyxy[keep], conf[keep]
+                detections.append(to_detections(xyxy, conf))
+
+            logger.info(f"📚 Detected {sum(len(d) for d in detections)} books in {len(images)} image(s) "
+                        f"with YOLOv8{' ONNX' if self.runtime is not None else ''} "
+                        f"({len(jobs)} input(s), batch size {batch_size})")
             return detections
 
         except Exception as e:
             logger.error(f"❌ YOLOv8 detection failed: {e}")
-            return self._fallback_detection(image)
+            return [self._fallback_detection(image) for image in images]
+
+    def _predict(self, crops: List[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """One forward pass over crops: (xyxy, conf) NumPy arrays per crop."""
+        if self.runtime is not None:
+            return self.runtime.predict_batch(crops)
+        outputs = []
+        for result in self.model(crops, conf=self.conf_threshold, verbose=False):
+            if result.boxes is None or len(result.boxes) == 0:
+                outputs.append((np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32)))
+                continue
+            # A single device-to-host copy per result
+            outputs.append((result.boxes.xyxy.cpu().numpy().astype(np.float32),
+                            result.boxes.conf.cpu().numpy().astype(np.float32)))
+        return outputs
+
+    def detect_folder(self, image_paths: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                      **kwargs) -> Iterator[Tuple[str, List[Tuple[int, int, int, int, float]]]]:
+        """
+        Detect books in a sequence of image files, `batch_size` images per forward pass.
+
+        Only one batch of decoded images is held in memory at a time.
+
+        Yields:
+            (image path, detections) for every readable image, in input order
+        """
+        paths = []
+        images = []
+        for path in image_paths:
+            image = cv2.imread(path)
+            if image is None:
+                logger.warning(f"⚠️  Could not read image: {path}")
+                continue
+            paths.append(path)
+            images.append(image)
+            if len(images) == batch_size:
+                yield from zip(paths, self.detect_books_batch(images, batch_size=batch_size, **kwargs))
+                paths, images = [], []
+        if images:
+            yield from zip(paths, self.detect_books_batch(images, batch_size=batch_size, **kwargs))
 
     def _fallback_detection(self, image: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
         """
         Fallback detection method when YOLOv8 is not available.
 
-        Uses simple image processing to detect potential book regions.
+        Works on a copy reduced to FALLBACK_MAX_EDGE pixels: Canny edges and
+        external contours, then bounding boxes, aspect/size filters and scores
+        computed over all contours at once, non-maximum suppression of the
+        overlapping candidates, and each candidate split along the vertical
+        lines found by the Shelfie spine detector (P1).
+        Candidates are at least 0.3x as wide as they are tall, wider than most
+        single spines, so every one of them may hold several books.
         This is a basic implementation - not as accurate as YOLOv8.
         """
         logger.info("🔄 Using fallback book detection method")
+        height, width = image.shape[:2]
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # Reduced resolution: contour extraction cost scales with pixel count
+        scale = min(1.0, FALLBACK_MAX_EDGE / float(max(height, width)))
+        small = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                           interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+        small_h, small_w = small.shape[:2]
 
-        # Apply Gaussian blur to reduce noise
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-        # Edge detection
         edges = cv2.Canny(blurred, 50, 150)
-
-        # Find contours
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            logger.info("📚 Fallback detection found 0 potential books")
+            return []
+
+        # Bounding rectangles of all contours as one (n, 4) array
+        rects = np.array([cv2.boundingRect(contour) for contour in contours], dtype=np.float32)
+        x, y, w, h = rects.T
+
+        # Books are typically vertical rectangles
+        keep = (w > h * 0.3) & (h > small_h * 0.1) & (w < small_w * 0.3)
+        aspect_ratio = h / np.maximum(w, 1.0)
+        size_ratio = (w * h) / float(small_w * small_h)
+        confidence = np.minimum(0.8, aspect_ratio * 0.5 + size_ratio * 2)
+        keep &= confidence > 0.3  # Minimum confidence threshold
+        if not keep.any():
+            logger.info("📚 Fallback detection found 0 potential books")
+            return []
+
+        xyxy = np.column_stack([x, y, x + w, y + h])[keep]
+        confidence = confidence[keep]
+        selected = non_max_suppression(xyxy, confidence, FALLBACK_NMS_IOU)
+        xyxy, confidence = xyxy[selected], confidence[selected]
+
+        xyxy, confidence = self._split_regions(image, scale, xyxy, confidence)
+
+        # Back to the input resolution
+        detections = to_detections(xyxy / scale, confidence)
 
-        detections = []
-        height, width = image.shape[:2]
-
-        for contour in contours:
-            # Get bounding rectangle
-            x, y, w, h = cv2.boundingRect(contour)
-
-            # Filter contours that might be books
-            # Books are typically vertical rectangles
-            if w > h * 0.3 and h > height * 0.1 and w < width * 0.3:
-                # Calculate confidence based on rectangle properties
-                aspect_ratio = h / w
-                size_ratio = (w * h) / (width * height)
+        logger.info(f"📚 Fallback detection found {len(detections)} potential books")
+        return detections
 
-                # Simple confidence score
-                confidence = min(0.8, aspect_ratio * 0.5 + size_ratio * 2)
+    @staticmethod
+    def _split_regions(image: np.ndarray, scale: float, xyxy: np.ndarray, confidence: np.ndarray):
+        """
+        Split candidate regions along the vertical spine lines that cross them.
 
-                if confidence > 0.3:  # Minimum confidence threshold
-                    detections.append((x, y, w, h, confidence))
+        Regions crossed by no line (single spine) are kept whole.
 
-        # Sort by x-coordinate
-        detections.sort(key=lambda x: x[0])
+        Args:
+            image: Full resolution image
+            scale: Resolution of the regions relative to image
+            xyxy, confidence: Candidate regions (at image resolution x scale)
 
-        logger.info(f"📚 Fallback detection found {len(detections)} potential books")
-        return detections
+        Returns:
+            (xyxy, confidence) with each region replaced by its spines
+        """
+        if not len(xyxy):
+            return xyxy, confidence
+        # The line detector needs more pixels than the contour pass
+        height, width = image.shape[:2]
+        spine_scale = min(1.0, FALLBACK_SPINE_EDGE / float(max(height, width)))
+        if spine_scale < 1.0:
+            image = cv2.resize(image, (max(1, round(width * spine_scale)), max(1, round(height * spine_scale))),
+                               interpolation=cv2.INTER_AREA)
+        spine_lines = _spine_line_set(image)
+        if spine_lines is None or not len(spine_lines):
+            return xyxy, confidence
+
+        # x of every spine line at the vertical centre of every region: (lines, regions)
+        centers = (xyxy[:, 1] + xyxy[:, 3]) / 2.0
+        ratio = scale / spine_scale
+        line_x = spine_lines.x_at(centers / ratio) * ratio
+
+        boxes, scores = [], []
+        for index, (x0, y0, x1, y1) in enumerate(xyxy):
+            cuts = line_x[:, index]
+            cuts = np.sort(cuts[(cuts > x0 + FALLBACK_MIN_SPINE_WIDTH) & (cuts < x1 - FALLBACK_MIN_SPINE_WIDTH)])
+            edges = np.concatenate([[x0], cuts, [x1]])
+            # Drop slivers left by nearly duplicate lines
+            spans = np.column_stack([edges[:-1], edges[1:]])
+            spans = spans[(spans[:, 1] - spans[:, 0]) >= FALLBACK_MIN_SPINE_WIDTH]
+            boxes.append(np.column_stack([spans[:, 0], np.full(len(spans), y0),
+                                          spans[:, 1], np.full(len(spans), y1)]).astype(np.float32))
+            scores.append(np.full(len(spans), confidence[index], dtype=np.float32))
+        return np.concatenate(boxes), np.concatenate(scores)
 
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Detection → OCR crop pipeline
+P2-Enhanced-Desktop component
+
+Feeds BookDetector spine boxes straight into a crop recognizer (EasyOCR
+recognizer, TrOCR batches or Tesseract line mode) instead of letting an OCR
+engine re-detect text on the whole image.
+
+    sources ──► [detection thread] ──queue──► [recognition workers] ──queue──► results
+
+Stages are connected by bounded queues: detection of image N+1 runs while
+image N is being recognized, and when recognition falls behind the detection
+thread blocks on the full queue, so memory stays flat on long runs.
+Recognition runs in threads (GPU models shared in-process) or, with
+use_processes=True, in a process pool where each process builds its own
+recognizer (CPU-bound Tesseract).
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pipeline defaults
+DEFAULT_QUEUE_SIZE = 4  # Images waiting between two stages
+DEFAULT_RECOGNITION_BATCH = 16  # Crops per recognizer call
+CROP_PADDING = 4
+SPINE_ASPECT = 1.5  # Crops taller than SPINE_ASPECT x width are rotated to horizontal text
+
+_DONE = object()
+
+
+# ---------------------------------------------------------------------------
+# Crops
+# ---------------------------------------------------------------------------
+
+def extract_crops(image: np.ndarray, detections: List[Tuple], padding: int = CROP_PADDING,
+                  rotate_spines: bool = True) -> List[np.ndarray]:
+    """
+    Cut one crop per detection (x, y, w, h, conf).
+
+    Vertical spines are rotated 90° counter-clockwise so that top-to-bottom
+    titles become left-to-right lines, which line recognizers expect.
+    """
+    height, width = image.shape[:2]
+    crops = []
+    for x, y, w, h, _ in detections:
+        x0, y0 = max(0, int(x) - padding), max(0, int(y) - padding)
+        x1, y1 = min(width, int(x + w) + padding), min(height, int(y + h) + padding)
+        crop = image[y0:y1, x0:x1]
+        if rotate_spines and crop.shape[0] > SPINE_ASPECT * crop.shape[1]:
+            crop = cv2.rotate(crop, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        crops.append(np.ascontiguousarray(crop))
+    return crops
+
+
+# ---------------------------------------------------------------------------
+# Recognizers: recognize(crops) -> [(text, confidence)]
+# ---------------------------------------------------------------------------
+
+class EasyOCRRecognizer:
+    """EasyOCR recognition stage only (no text detection): each crop is read as a whole."""
+
+    def __init__(self, languages=('en',), gpu: bool = True):
+        import easyocr
+        self.reader = easyocr.Reader(list(languages), gpu=gpu)
+
+    def recognize(self, crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        results = []
+        for crop in crops:
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+            height, width = gray.shape[:2]
+            lines = self.reader.recognize(gray, horizontal_list=[[0, width, 0, height]], free_list=[], detail=1)
+            lines = [line for line in lines if line[1].strip()]
+            text = ' '.join(line[1] for line in lines)
+            confidence = float(np.mean([line[2] for line in lines])) if lines else 0.0
+            results.append((text, confidence))
+        return results
+
+
+class TrOCRRecognizer:
+    """TrOCR on batches of crops: one encoder/decoder pass per batch."""
+
+    def __init__(self, model_name: str = "microsoft/trocr-base-printed", device: Optional[str] = None,
+                 max_new_tokens: int = 48):
+        import torch
+        from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+        self.torch = torch
+        self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        self.processor = TrOCRProcessor.from_pretrained(model_name)
+        self.model = VisionEncoderDecoderModel.from_pretrained(model_name).to(self.device).eval()
+        self.max_new_tokens = max_new_tokens
+
+    def recognize(self, crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        if not crops:
+            return []
+        images = [cv2.cvtColor(crop, cv2.COLOR_BGR2RGB) if crop.ndim == 3 else cv2.cvtColor(crop, cv2.COLOR_GRAY2RGB)
+                  for crop in crops]
+        pixel_values = self.processor(images=images, return_tensors="pt").pixel_values.to(self.device)
+        with self.torch.no_grad():
+            outputs = self.model.generate(pixel_values, max_new_tokens=self.max_new_tokens,
+                                          output_scores=True, return_dict_in_generate=True)
+            # Per-token log-probabilities -> mean probability per crop
+            scores = self.model.compute_transition_scores(outputs.sequences, outputs.scores, normalize_logits=True)
+            confidences = scores.exp().mean(dim=1).cpu().numpy()
+        texts = self.processor.batch_decode(outputs.sequences, skip_special_tokens=True)
+        return [(text.strip(), float(conf)) for text, conf in zip(texts, confidences)]
+
+
+class TesseractRecognizer:
+    """Tesseract in single-line mode (--psm 7) on each crop."""
+
+    def __init__(self, lang: str = 'eng', psm: int = 7):
+        import pytesseract
+        from pytesseract import Output
+        self.pytesseract = pytesseract
+        self.output = Output
+        self.lang = lang
+        self.config = f'--psm {psm}'
+
+    def recognize(self, crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        results = []
+        for crop in crops:
+            data = self.pytesseract.image_to_data(crop, lang=self.lang, config=self.config,
+                                                  output_type=self.output.DICT)
+            words = [(text, float(conf)) for text, conf in zip(data['text'], data['conf'])
+                     if text.strip() and float(conf) >= 0]
+            text = ' '.join(word for word, _ in words)
+            confidence = float(np.mean([conf for _, conf in words])) / 100.0 if words else 0.0
+            results.append((text, confidence))
+        return results
+
+
+RECOGNIZERS = {
+    'easyocr': EasyOCRRecognizer,
+    'trocr': TrOCRRecognizer,
+    'tesseract': TesseractRecognizer,
+}
+
+
+def create_recognizer(engine: str, **options):
+    """Build a crop recognizer by engine name ('easyocr', 'trocr', 'tesseract')."""
+    if engine not in RECOGNIZERS:
+        raise ValueError(f"Unknown OCR engine: {engine} (choose from {', '.join(RECOGNIZERS)})")
+    return RECOGNIZERS[engine](**options)
+
+
+# Recognizer of the current worker process (process pool mode)
+_process_recognizer = None
+
+
+def _init_process(engine: str, options: Dict):
+    global _process_recognizer
+    _process_recognizer = create_recognizer(engine, **options)
+
+
+def _recognize_in_process(crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+    return _process_recognizer.recognize(crops)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+class CropPipeline:
+    """
+    Bounded-queue pipeline: BookDetector boxes → crops → recognizer.
+
+    Args:
+        detector: BookDetector (or any object with detect_books(image))
+        engine: Recognizer name ('easyocr', 'trocr', 'tesseract'), or a recognizer
+            instance exposing recognize(crops) (thread mode only)
+        engine_options: Keyword arguments for the recognizer
+        recognition_workers: Recognition threads (or processes with use_processes)
+        use_processes: Run recognition in a process pool, one recognizer per process
+        queue_size: Maximum images waiting between two stages
+        batch_size: Crops per recognizer call
+        rotate_spines: Rotate vertical spine crops to horizontal text
+    """
+
+    def __init__(self, detector, engine='easyocr', engine_options: Optional[Dict] = None,
+                 recognition_workers: int = 1, use_processes: bool = False,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, batch_size: int = DEFAULT_RECOGNITION_BATCH,
+                 rotate_spines: bool = True):
+        self.detector = detector
+        self.engine = engine
+        self.engine_options = engine_options or {}
+        self.recognition_workers = max(1, recognition_workers)
+        self.use_processes = use_processes
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.rotate_spines = rotate_spines
+        self._recognizer = None
+        self._stats_lock = threading.Lock()
+        self.stats = {}
+
+        if use_processes and not isinstance(engine, str):
+            raise ValueError("use_processes requires an engine name (each process builds its own recognizer)")
+
+    def _thread_recognizer(self):
+        if self._recognizer is None:
+            self._recognizer = (create_recognizer(self.engine, **self.engine_options)
+                                if isinstance(self.engine, str) else self.engine)
+        return self._recognizer
+
+    @staticmethod
+    def _load(source) -> Tuple[str, Optional[np.ndarray]]:
+        if isinstance(source, np.ndarray):
+            return None, source
+        return str(source), cv2.imread(str(source))
+
+    @staticmethod
+    def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+        """Blocking put that gives up when the pipeline is stopped (backpressure point)."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _detect_stage(self, sources, detected: queue.Queue, results: queue.Queue, stop: threading.Event):
+        try:
+            for index, source in enumerate(sources):
+                if stop.is_set():
+                    return
+                started = time.perf_counter()
+                path, image = self._load(source)
+                if image is None:
+                    logger.warning(f"⚠️  Could not read image: {path}")
+                    self._put(results, (index, {'source': path, 'books': [], 'error': 'unreadable image'}), stop)
+                    continue
+                detections = self.detector.detect_books(image)
+                crops = extract_crops(image, detections, rotate_spines=self.rotate_spines)
+                self._add_time('detection', time.perf_counter() - started)
+                # The full image is not forwarded: only boxes and crops stay in memory
+                if not self._put(detected, (index, path, detections, crops), stop):
+                    return
+        except Exception as e:
+            self._put(results, (None, e), stop)
+        finally:
+            for _ in range(self.recognition_workers):
+                self._put(detected, _DONE, stop)
+
+    def _recognize_stage(self, detected: queue.Queue, results: queue.Queue, stop: threading.Event, pool):
+        try:
+            while not stop.is_set():
+                try:
+                    item = detected.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    break
+                index, path, detections, crops = item
+                started = time.perf_counter()
+                readings = []
+                for start in range(0, len(crops), self.batch_size):
+                    batch = crops[start:start + self.batch_size]
+                    if pool is not None:
+                        readings.extend(pool.submit(_recognize_in_process, batch).result())
+                    else:
+                        readings.extend(self._thread_recognizer().recognize(batch))
+                self._add_time('recognition', time.perf_counter() - started)
+
+                books = [{
+                    'x': x, 'y': y, 'width': w, 'height': h,
+                    'detection_confidence': float(det_conf),
+                    'text': text, 'confidence': conf
+                } for (x, y, w, h, det_conf), (text, conf) in zip(detections, readings)]
+                if not self._put(results, (index, {'source': path, 'books': books}), stop):
+                    return
+        except Exception as e:
+            self._put(results, (None, e), stop)
+        finally:
+            self._put(results, (None, _DONE), stop)
+
+    def _add_time(self, stage: str, seconds: float):
+        with self._stats_lock:
+            self.stats[stage] = self.stats.get(stage, 0.0) + seconds
+
+    def run(self, sources: Iterable) -> Iterator[Dict]:
+        """
+        Process images (paths or BGR arrays) and yield one result per image, in input order.
+
+        Yields:
+            Dict: {'source': path or None, 'books': [{x, y, width, height,
+                detection_confidence, text, confidence}]}
+        """
+        stop = threading.Event()
+        detected = queue.Queue(maxsize=self.queue_size)
+        results = queue.Queue(maxsize=self.queue_size)
+        self.stats = {'detection': 0.0, 'recognition': 0.0, 'images': 0}
+
+        pool = None
+        if self.use_processes:
+            pool = ProcessPoolExecutor(max_workers=self.recognition_workers, initializer=_init_process,
+                                       initargs=(self.engine, self.engine_options))
+        else:
+            self._thread_recognizer()  # Model loaded once before the workers start
+
+        threads = [threading.Thread(target=self._detect_stage, args=(iter(sources), detected, results, stop),
+                                    name='crop-pipeline-detect', daemon=True)]
+        threads += [threading.Thread(target=self._recognize_stage, args=(detected, results, stop, pool),
+                                     name=f'crop-pipeline-recognize-{i}', daemon=True)
+                    for i in range(self.recognition_workers)]
+        for thread in threads:
+            thread.start()
+
+        # Results arrive in completion order; a small reorder buffer restores input order
+        # (bounded by the number of images in flight)
+        pending = {}
+        next_index = 0
+        running = self.recognition_workers
+        try:
+            while running:
+                index, item = results.get()
+                if item is _DONE:
+                    running -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                pending[index] = item
+                while next_index in pending:
+                    self.stats['images'] += 1
+                    yield pending.pop(next_index)
+                    next_index += 1
+            for index in sorted(pending):
+                self.stats['images'] += 1
+                yield pending[index]
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=5)
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+
+def run_folder(folder: str, engine: str = 'easyocr', batch_size: int = DEFAULT_RECOGNITION_BATCH, **options):
+    """Run the pipeline on every image of a folder and print the books found."""
+    from book_detector import BookDetector
+
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                   if name.lower().endswith(('.jpg', '.jpeg', '.png')))
+    pipeline = CropPipeline(BookDetector(), engine=engine, batch_size=batch_size, **options)
+    started = time.perf_counter()
+    for result in pipeline.run(paths):
+        print(f"📚 {result['source']}: {len(result['books'])} book(s)")
+        for book in result['books']:
+            print(f"   {book['text']!r} ({book['confidence']:.2f})")
+    print(f"⏱️  {len(paths)} image(s) in {time.perf_counter() - started:.1f}s "
+          f"(detection {pipeline.stats['detection']:.1f}s, recognition {pipeline.stats['recognition']:.1f}s)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="BookDetector → OCR crop pipeline on a folder of shelf photos")
+    parser.add_argument('folder')
+    parser.add_argument('--engine', choices=sorted(RECOGNIZERS), default='easyocr')
+    parser.add_argument('--workers', type=int, default=1, help="Recognition workers")
+    parser.add_argument('--processes', action='store_true', help="Recognition in worker processes")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_RECOGNITION_BATCH)
+    args = parser.parse_args()
+    run_folder(args.folder, engine=args.engine, batch_size=args.batch_size, recognition_workers=args.workers,
+               use_processes=args.processes, queue_size=args.queue_size)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime CPU backend for BookDetector
+P2-Enhanced-Desktop component
+
+Loading yolov8n.pt goes through ultralytics and PyTorch (several seconds on
+CPU-only nodes). This module exports the weights once to ONNX with a static
+input shape, then runs them with ONNX Runtime: letterbox preprocessing, box
+decoding and per-class NMS (as in ultralytics) are plain NumPy, and a warmup
+inference at load time moves the graph optimisation and memory allocation cost
+out of the first real call. predict() is thread-safe: each thread reuses its
+own input buffer.
+
+Usage:
+    python src/onnx_runtime.py export yolov8n.pt          # -> yolov8n.onnx
+    python src/onnx_runtime.py bench yolov8n.onnx shelf.jpg
+"""
+
+import os
+import threading
+import time
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from book_detector import non_max_suppression, DEFAULT_NMS_IOU
+
+logger = logging.getLogger(__name__)
+
+# Export / runtime defaults
+DEFAULT_INPUT_SIZE = 640
+DEFAULT_OPSET = 12
+LETTERBOX_COLOR = 114
+MAX_CANDIDATES = 3000  # Boxes kept (by score) before NMS
+
+
+def export_onnx(model_path: str = "yolov8n.pt", output_path: Optional[str] = None,
+                input_size: int = DEFAULT_INPUT_SIZE, opset: int = DEFAULT_OPSET) -> str:
+    """
+    Export YOLOv8 weights to ONNX with a static 1x3xSxS input (requires ultralytics).
+
+    Returns:
+        Path of the .onnx file
+    """
+    from ultralytics import YOLO
+
+    exported = YOLO(model_path).export(format='onnx', imgsz=input_size, dynamic=False,
+                                       simplify=True, opset=opset, batch=1)
+    if output_path and os.path.abspath(output_path) != os.path.abspath(exported):
+        os.replace(exported, output_path)
+        exported = output_path
+    logger.info(f"✅ Exported {model_path} to {exported} ({input_size}x{input_size})")
+    return str(exported)
+
+
+def letterbox(image: np.ndarray, size: int = DEFAULT_INPUT_SIZE,
+              color: int = LETTERBOX_COLOR) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize keeping the aspect ratio and pad to a size x size square.
+
+    Returns:
+        (padded image, scale ratio, (pad_x, pad_y))
+    """
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR) if ratio != 1.0 else image
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    padded = np.full((size, size, 3), color, dtype=np.uint8)
+    padded[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+    return padded, ratio, (pad_x, pad_y)
+
+
+class OnnxDetectorRuntime:
+    """
+    YOLOv8 ONNX model on ONNX Runtime (CPU).
+
+    Boxes of different classes never suppress each other (per-class NMS,
+    ultralytics' default), so results match the PyTorch backend.
+
+    Args:
+        onnx_path: Exported model (static input shape)
+        conf_threshold: Minimum class score
+        iou_threshold: NMS IoU threshold
+        classes: Class ids to keep (None = all, like the ultralytics path)
+        num_threads: Intra-op threads (None = ONNX Runtime default)
+        warmup: Run one inference on a blank image at load
+    """
+
+    def __init__(self, onnx_path: str, conf_threshold: float = 0.5, iou_threshold: float = DEFAULT_NMS_IOU,
+                 classes: Optional[Sequence[int]] = None, num_threads: Optional[int] = None, warmup: bool = True):
+        import onnxruntime as ort
+
+        started = time.perf_counter()
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_size = model_input.shape[2] if isinstance(model_input.shape[2], int) else DEFAULT_INPUT_SIZE
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+        self.classes = None if classes is None else np.asarray(classes)
+        # Input buffer reused across calls, one per thread (session.run may be called concurrently)
+        self._buffers = threading.local()
+
+        if warmup:
+            self.predict(np.zeros((self.input_size, self.input_size, 3), dtype=np.uint8))
+        logger.info(f"✅ ONNX model loaded from {onnx_path} in {time.perf_counter() - started:.2f}s "
+                    f"({self.input_size}x{self.input_size}{', warmed up' if warmup else ''})")
+
+    def _input_buffer(self) -> np.ndarray:
+        blob = getattr(self._buffers, 'blob', None)
+        if blob is None:
+            blob = self._buffers.blob = np.empty((1, 3, self.input_size, self.input_size), dtype=np.float32)
+        return blob
+
+    def _preprocess(self, image: np.ndarray):
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        padded, ratio, pad = letterbox(image, self.input_size)
+        # BGR HWC uint8 -> RGB CHW float32 in [0, 1], written into this thread's buffer
+        blob = self._input_buffer()
+        np.multiply(padded[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=blob[0], casting='unsafe')
+        return blob, ratio, pad
+
+    def predict(self, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Detect objects in a BGR image.
+
+        Returns:
+            (xyxy (n, 4) float32 in image coordinates, scores (n,) float32)
+        """
+        blob, ratio, (pad_x, pad_y) = self._preprocess(image)
+        output = self.session.run(None, {self.input_name: blob})[0]
+
+        # YOLOv8 head: (1, 4 + classes, anchors) -> (anchors, 4 + classes)
+        predictions = output[0].T
+        class_scores = predictions[:, 4:]
+        if self.classes is not None:
+            class_scores = class_scores[:, self.classes]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(class_scores)), class_ids]
+        candidates = np.flatnonzero(scores >= self.conf_threshold)
+        if candidates.size > MAX_CANDIDATES:
+            candidates = candidates[np.argsort(-scores[candidates])[:MAX_CANDIDATES]]
+        if candidates.size == 0:
+            return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        cx, cy, w, h = predictions[candidates, :4].T
+        xyxy = np.column_stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+        scores = scores[candidates]
+        # Per-class NMS in one pass: each class is shifted to its own region so boxes
+        # of different classes never overlap
+        offsets = class_ids[candidates, np.newaxis] * (np.abs(xyxy).max() * 2 + 1)
+        keep = non_max_suppression(xyxy + offsets, scores, self.iou_threshold)
+        xyxy, scores = xyxy[keep], scores[keep]
+
+        # Undo the letterbox
+        xyxy -= np.array([pad_x, pad_y, pad_x, pad_y], dtype=xyxy.dtype)
+        xyxy /= ratio
+        height, width = image.shape[:2]
+        xyxy[:, [0, 2]] = np.clip(xyxy[:, [0, 2]], 0, width)
+        xyxy[:, [1, 3]] = np.clip(xyxy[:, [1, 3]], 0, height)
+        return xyxy.astype(np.float32), scores.astype(np.float32)
+
+    def predict_batch(self, images: List[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Static batch of one: images are run one after the other."""
+        return [self.predict(image) for image in images]
+
+
+def _bench(onnx_path: str, image_path: str, runs: int = 20):
+    started = time.perf_counter()
+    runtime = OnnxDetectorRuntime(onnx_path)
+    image = cv2.imread(image_path)
+    xyxy, _ = runtime.predict(image)
+    print(f"⏱️  Load + first inference: {time.perf_counter() - started:.2f}s ({len(xyxy)} detections)")
+    started = time.perf_counter()
+    for _ in range(runs):
+        runtime.predict(image)
+    print(f"⏱️  Steady state: {(time.perf_counter() - started) / runs * 1000:.1f} ms/image")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="YOLOv8 ONNX export and CPU runtime")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help="Export .pt weights to ONNX")
+    export_parser.add_argument('model', nargs='?', default='yolov8n.pt')
+    export_parser.add_argument('--output')
+    export_parser.add_argument('--imgsz', type=int, default=DEFAULT_INPUT_SIZE)
+    bench_parser = commands.add_parser('bench', help="Load time and latency of an ONNX model")
+    bench_parser.add_argument('model')
+    bench_parser.add_argument('image')
+    bench_parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export_onnx(args.model, args.output, args.imgsz)
+    else:
+        _bench(args.model, args.image, args.runs)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test du BookDetector
+Inférence par lots et par tuiles avec un modèle factice (aucun poids YOLO):
+découpage, décalage des boîtes dans le repère de l'image et NMS entre tuiles.
+Détection de secours (contours) et découpage des régions le long des tranches.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import book_detector
+from book_detector import BookDetector, tile_windows
+
+# Livres (x0, x1) d'une étagère 1000 x 200; ceux à 330 et 620 sont dans le recouvrement de deux tuiles
+BOOKS = [(50, 100), (330, 390), (450, 500), (620, 700), (850, 900)]
+
+
+def _shelf(width=1000, height=200):
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    for x0, x1 in BOOKS:
+        image[20:180, x0:x1] = 255
+    return image
+
+
+class _FakeDetector(BookDetector):
+    """_predict factice: une boîte par colonne claire de chaque crop, dans le repère du crop."""
+
+    def __init__(self):
+        self.conf_threshold = 0.5
+        self.model, self.runtime = 'factice', None
+        self.batches = []
+
+    def _predict(self, crops):
+        self.batches.append([crop.shape[:2] for crop in crops])
+        outputs = []
+        for crop in crops:
+            rows = np.flatnonzero(crop[:, :, 0].max(axis=1))
+            columns = np.concatenate([[0], (crop[:, :, 0].max(axis=0) > 0).astype(np.int8), [0]])
+            starts = np.flatnonzero(np.diff(columns) == 1)
+            ends = np.flatnonzero(np.diff(columns) == -1)
+            xyxy = np.float32([[x0, rows[0], x1, rows[-1] + 1] for x0, x1 in zip(starts, ends)]).reshape(-1, 4)
+            # Score plus élevé au centre du crop: les doublons entre tuiles ont des scores différents
+            conf = (0.9 - np.abs((xyxy[:, 0] + xyxy[:, 2]) / 2 - crop.shape[1] / 2) / crop.shape[1] * 0.5)
+            outputs.append((xyxy, conf.astype(np.float32)))
+        return outputs
+
+
+def test_tile_windows():
+    """Tuiles alignées sur le bord; seuls les axes plus longs que tile_size sont découpés."""
+    assert tile_windows(1000, 200, 400, 0.2) == [(0, 0, 400, 200), (320, 0, 720, 200), (600, 0, 1000, 200)]
+    assert tile_windows(300, 200, 400) == [(0, 0, 300, 200)]
+    windows = tile_windows(500, 500, 300, 0.1)
+    assert len(windows) == 4 and windows[-1] == (200, 200, 500, 500)
+
+
+def test_lots_tuiles_et_nms():
+    """Boîtes ramenées dans le repère de l'image, doublons des recouvrements fusionnés, lots de batch_size."""
+    detector = _FakeDetector()
+    small = _shelf(300)
+    shelf, single = detector.detect_books_batch([_shelf(), small], batch_size=2, tile_size=400)
+
+    # 3 tuiles + 1 image entière, par lots de 2
+    assert [len(batch) for batch in detector.batches] == [2, 2]
+    assert detector.batches[0] == [(200, 400), (200, 400)]
+    assert [(x, y, w, h) for x, y, w, h, _ in shelf] == [(x0, 20, x1 - x0, 160) for x0, x1 in BOOKS]
+    assert all(0.5 < conf <= 0.9 for *_, conf in shelf)
+    assert [(x, w) for x, _, w, _, _ in single] == [(50, 50)]
+
+
+def test_sans_tuiles():
+    """Sans tile_size, une entrée par image et aucune NMS."""
+    detector = _FakeDetector()
+    detections = detector.detect_books_batch([_shelf()] * 3, batch_size=2)
+    assert [len(batch) for batch in detector.batches] == [2, 1]
+    assert all(len(image) == len(BOOKS) for image in detections)
+    assert detector.detect_books_batch([]) == []
+
+
+def _fallback_shelf():
+    """Trois livres côte à côte (une seule région de contour) sur fond clair, 1600 x 1200."""
+    image = np.full((1200, 1600, 3), 200, dtype=np.uint8)
+    for i, color in enumerate([(40, 40, 160), (40, 140, 40), (160, 60, 20)]):
+        image[100:1100, 200 + 100 * i:300 + 100 * i] = color
+    return image
+
+
+def _lines(xs):
+    """LineSet de lignes verticales aux abscisses xs (détecteur de tranches P1)."""
+    pytest.importorskip('scipy')
+    book_detector._use_p1()
+    from core.spine import LineSet
+    return LineSet([1e6] * len(xs), [0.0] * len(xs), xs, [150.0] * len(xs), xs, xs,
+                   [0.0] * len(xs), [300.0] * len(xs), [True] * len(xs))
+
+
+def test_decoupage_des_regions(monkeypatch):
+    """Coupes aux lignes qui traversent la région; tranches trop étroites supprimées; région non traversée gardée."""
+    monkeypatch.setattr(book_detector, '_spine_line_set', lambda image: _lines([50.0, 140.0, 143.0, 200.0]))
+    xyxy = np.float32([[100, 10, 260, 290], [300, 10, 340, 290]])
+    boxes, scores = BookDetector._split_regions(np.zeros((300, 400, 3), np.uint8), 1.0, xyxy, np.float32([0.7, 0.6]))
+    assert boxes.tolist() == [[100, 10, 140, 290], [143, 10, 200, 290], [200, 10, 260, 290], [300, 10, 340, 290]]
+    assert np.allclose(scores, [0.7, 0.7, 0.7, 0.6])
+
+    # Lignes détectées à une autre résolution que les régions: coupes remises à l'échelle
+    monkeypatch.setattr(book_detector, '_spine_line_set', lambda image: _lines([100.0]))
+    boxes, _ = BookDetector._split_regions(np.zeros((2560, 400, 3), np.uint8), 0.25, np.float32([[20, 0, 80, 600]]),
+                                           np.float32([0.7]))
+    assert boxes.tolist() == [[20, 0, 50, 600], [50, 0, 80, 600]]
+
+
+def test_detection_de_secours_sans_lignes(monkeypatch):
+    """Sans détecteur de tranches, la rangée de livres reste une seule région, à la résolution d'entrée."""
+    monkeypatch.setattr(book_detector, '_spine_line_set', lambda image: None)
+    detector = BookDetector.__new__(BookDetector)
+    detector.model, detector.runtime = None, None
+
+    detections = detector.detect_books(_fallback_shelf())
+    assert len(detections) == 1
+    x, y, w, h, conf = detections[0]
+    assert abs(x - 200) <= 5 and abs(y - 100) <= 5 and abs(w - 300) <= 10 and abs(h - 1000) <= 10
+    assert conf == pytest.approx(0.8)
+    assert detector.detect_books(np.full((600, 800, 3), 200, dtype=np.uint8)) == []
+
+
+def test_detection_de_secours_tranches_p1():
+    """Détecteur de tranches P1 réel: la rangée est découpée en plusieurs livres contigus dans ses bornes."""
+    pytest.importorskip('scipy')
+    detector = BookDetector.__new__(BookDetector)
+    detector.model, detector.runtime = None, None
+
+    detections = detector.detect_books(_fallback_shelf())
+    assert len(detections) > 1
+    xs = [(x, x + w) for x, _, w, _, _ in detections]
+    assert all(abs(right - left) <= 1 for (_, right), (left, _) in zip(xs, xs[1:]))
+    assert xs[0][0] >= 190 and xs[-1][1] <= 510
+    assert len({(y, h, conf) for _, y, _, h, conf in detections}) == 1
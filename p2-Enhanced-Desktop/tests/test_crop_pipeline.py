@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test du CropPipeline
+Détecteur et reconnaisseur factices (aucun modèle): ordre des résultats,
+image illisible, propagation des erreurs, arrêt des threads et files bornées.
+"""
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import crop_pipeline
+from crop_pipeline import CropPipeline
+
+
+def _image(index):
+    """Image dont tous les pixels valent index: le reconnaisseur retrouve l'image d'origine depuis le crop."""
+    return np.full((80, 40, 3), index, dtype=np.uint8)
+
+
+class _Detector:
+    """Une tranche par image; compte les images détectées."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def detect_books(self, image):
+        with self.lock:
+            self.calls += 1
+        return [(10, 10, 20, 60, 0.9)]
+
+
+class _Recognizer:
+    """Lit l'index de l'image dans le crop; délais, erreur et verrou configurables par index."""
+
+    def __init__(self, delays=None, fail_on=None, gate=None):
+        self.delays = delays or {}
+        self.fail_on = fail_on
+        self.gate = gate
+        self.lock = threading.Lock()
+        self.completed = []
+
+    def recognize(self, crops):
+        readings = []
+        for crop in crops:
+            index = int(crop[0, 0, 0])
+            if self.gate is not None:
+                self.gate.wait()
+            time.sleep(self.delays.get(index, 0.0))
+            if index == self.fail_on:
+                raise RuntimeError(f"échec sur l'image {index}")
+            with self.lock:
+                self.completed.append(index)
+            readings.append((str(index), 0.8))
+        return readings
+
+
+def _pipeline_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith('crop-pipeline') and thread.is_alive()]
+
+
+def test_ordre_d_entree_conserve():
+    """Les workers finissent dans le désordre, les résultats sortent dans l'ordre des sources."""
+    recognizer = _Recognizer(delays={0: 0.3})
+    pipeline = CropPipeline(_Detector(), engine=recognizer, recognition_workers=2)
+
+    results = list(pipeline.run([_image(i) for i in range(4)]))
+    assert recognizer.completed[0] != 0
+    assert [result['books'][0]['text'] for result in results] == ['0', '1', '2', '3']
+    assert results[0]['books'][0]['detection_confidence'] == 0.9
+    assert pipeline.stats['images'] == 4
+
+
+def test_image_illisible(tmp_path):
+    """Chemin illisible: résultat vide avec une erreur, à sa place dans l'ordre; les autres images continuent."""
+    missing = str(tmp_path / 'absente.jpg')
+    pipeline = CropPipeline(_Detector(), engine=_Recognizer())
+
+    results = list(pipeline.run([_image(0), missing, _image(2)]))
+    assert results[1] == {'source': missing, 'books': [], 'error': 'unreadable image'}
+    assert [result['books'][0]['text'] for result in (results[0], results[2])] == ['0', '2']
+
+
+def test_erreur_du_reconnaisseur_propagee():
+    """Une exception du reconnaisseur remonte à l'appelant et les threads s'arrêtent."""
+    pipeline = CropPipeline(_Detector(), engine=_Recognizer(fail_on=1))
+
+    with pytest.raises(RuntimeError, match="l'image 1"):
+        list(pipeline.run([_image(i) for i in range(4)]))
+    assert _pipeline_threads() == []
+
+
+def test_fermeture_anticipee_arrete_les_threads():
+    """Générateur fermé après le premier résultat: sources infinies abandonnées, threads arrêtés."""
+    pipeline = CropPipeline(_Detector(), engine=_Recognizer(), recognition_workers=2)
+    sources = (_image(i % 256) for i in itertools.count())
+
+    results = pipeline.run(sources)
+    assert next(results)['books'][0]['text'] == '0'
+    results.close()
+    assert _pipeline_threads() == []
+
+
+def test_files_bornees(monkeypatch):
+    """Reconnaissance bloquée: la détection s'arrête sur la file pleine, jamais plus de queue_size éléments en file."""
+    sizes = []
+
+    class _Queue(queue.Queue):
+        def put(self, item, block=True, timeout=None):
+            super().put(item, block, timeout)
+            sizes.append(self.qsize())
+
+    monkeypatch.setattr(crop_pipeline, 'queue',
+                        types.SimpleNamespace(Queue=_Queue, Full=queue.Full, Empty=queue.Empty))
+    gate = threading.Event()
+    detector = _Detector()
+    pipeline = CropPipeline(detector, engine=_Recognizer(gate=gate), queue_size=2)
+
+    results = []
+    consumer = threading.Thread(target=lambda: results.extend(pipeline.run([_image(i) for i in range(20)])))
+    consumer.start()
+    time.sleep(0.5)
+    # Une image chez le worker, queue_size en file, une bloquée dans put côté détection
+    assert detector.calls <= pipeline.queue_size + 2
+    gate.set()
+    consumer.join(timeout=10)
+
+    assert [result['books'][0]['text'] for result in results] == [str(i) for i in range(20)]
+    assert sizes and max(sizes) <= pipeline.queue_size
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test du backend ONNX Runtime
+Letterbox, décodage de la sortie YOLOv8, NMS par classe et appels concurrents
+avec une session factice: onnxruntime n'est pas nécessaire.
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from onnx_runtime import LETTERBOX_COLOR, OnnxDetectorRuntime, letterbox
+
+
+class _Session:
+    """Session factice: renvoie toujours la même sortie (1, 4 + classes, ancres)."""
+
+    def __init__(self, anchors):
+        # anchors: lignes (cx, cy, w, h, score classe 0, score classe 1) dans le repère letterbox
+        self.output = np.float32(anchors).T[np.newaxis]
+        self.inputs = []
+
+    def run(self, names, feed):
+        self.inputs.append(next(iter(feed.values())).copy())
+        return [self.output]
+
+
+def _runtime(anchors, size=640, conf_threshold=0.5, classes=None):
+    runtime = OnnxDetectorRuntime.__new__(OnnxDetectorRuntime)
+    runtime.session, runtime.input_name, runtime.input_size = _Session(anchors), 'images', size
+    runtime.conf_threshold, runtime.iou_threshold = conf_threshold, 0.5
+    runtime.classes = None if classes is None else np.asarray(classes)
+    runtime._buffers = threading.local()
+    return runtime
+
+
+def _anchor(box, ratio, pad, scores):
+    """Boîte (x0, y0, x1, y1) de l'image -> ancre (cx, cy, w, h, scores...) du repère letterbox."""
+    x0, y0, x1, y1 = np.float32(box) * ratio + np.float32([pad[0], pad[1], pad[0], pad[1]])
+    return [(x0 + x1) / 2, (y0 + y1) / 2, x1 - x0, y1 - y0, *scores]
+
+
+def test_letterbox():
+    """Image large réduite à la largeur et centrée verticalement, bandes de LETTERBOX_COLOR."""
+    image = np.full((200, 400, 3), 10, dtype=np.uint8)
+    padded, ratio, (pad_x, pad_y) = letterbox(image, 640)
+    assert padded.shape == (640, 640, 3)
+    assert ratio == 1.6 and (pad_x, pad_y) == (0, 160)
+    assert (padded[:160] == LETTERBOX_COLOR).all() and (padded[480:] == LETTERBOX_COLOR).all()
+    assert (padded[160:480] == 10).all()
+
+
+def test_boites_ramenees_dans_l_image():
+    """Letterbox puis inversion dans predict: les boîtes retrouvent les coordonnées de l'image."""
+    image = np.zeros((200, 400, 3), dtype=np.uint8)
+    image[:, :, 0] = 255  # Bleu (BGR)
+    boxes = [(100, 50, 200, 150), (300, 0, 400, 200)]
+    runtime = _runtime([_anchor(box, 1.6, (0, 160), (0.9, 0.0)) for box in boxes])
+
+    xyxy, scores = runtime.predict(image)
+    assert np.allclose(xyxy, boxes, atol=1e-3)
+    assert np.allclose(scores, [0.9, 0.9])
+    # Entrée du modèle: RGB, CHW, [0, 1]
+    blob = runtime.session.inputs[0][0]
+    assert blob[2, 320, 320] == 1.0 and blob[0, 320, 320] == 0.0
+    assert np.isclose(blob[0, 0, 0], LETTERBOX_COLOR / 255.0)
+
+    # Boîte débordant sur les bandes: bornée à l'image
+    runtime = _runtime([_anchor((-20, -10, 50, 210), 1.6, (0, 160), (0.9, 0.0))])
+    assert np.allclose(runtime.predict(image)[0], [[0, 0, 50, 200]], atol=1e-3)
+
+
+def test_decodage_et_nms():
+    """Seuil de confiance, meilleure classe, doublons de même classe supprimés par NMS, filtre de classes."""
+    image = np.zeros((640, 640, 3), dtype=np.uint8)
+    anchors = [
+        _anchor((10, 10, 110, 310), 1.0, (0, 0), (0.8, 0.1)),
+        _anchor((12, 12, 112, 312), 1.0, (0, 0), (0.6, 0.0)),  # Doublon de la première
+        _anchor((200, 10, 300, 310), 1.0, (0, 0), (0.1, 0.7)),  # Classe 1
+        _anchor((14, 14, 114, 314), 1.0, (0, 0), (0.0, 0.65)),  # Classe 1 sur la première: gardée (NMS par classe)
+        _anchor((400, 10, 500, 310), 1.0, (0, 0), (0.3, 0.2)),  # Sous le seuil
+    ]
+    xyxy, scores = _runtime(anchors).predict(image)
+    assert np.allclose(xyxy, [(10, 10, 110, 310), (200, 10, 300, 310), (14, 14, 114, 314)], atol=1e-3)
+    assert np.allclose(scores, [0.8, 0.7, 0.65])
+
+    xyxy, scores = _runtime(anchors, classes=[1]).predict(image)
+    assert np.allclose(xyxy, [(200, 10, 300, 310), (14, 14, 114, 314)], atol=1e-3)
+
+    xyxy, scores = _runtime(anchors, conf_threshold=0.95).predict(image)
+    assert xyxy.shape == (0, 4) and scores.shape == (0,)
+
+
+class _ConcurrentSession(_Session):
+    """Deux appels simultanés: l'entrée n'est lue qu'une fois les deux prétraitements terminés."""
+
+    def __init__(self, anchors):
+        super().__init__(anchors)
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def run(self, names, feed):
+        self.barrier.wait()
+        return super().run(names, feed)
+
+
+def test_appels_concurrents():
+    """Chaque thread garde son propre tampon d'entrée: aucun appel ne lit l'image d'un autre."""
+    runtime = _runtime([])
+    runtime.session = _ConcurrentSession([_anchor((10, 10, 110, 310), 1.0, (0, 0), (0.9, 0.0))])
+    images = [np.full((640, 640, 3), value, dtype=np.uint8) for value in (0, 255)]
+
+    threads = [threading.Thread(target=runtime.predict, args=(image,)) for image in images]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert sorted(float(blob[0, 0, 0, 0]) for blob in runtime.session.inputs) == [0.0, 1.0]
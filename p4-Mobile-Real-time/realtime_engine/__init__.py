@@ -0,0 +1,13 @@
+"""
+ShelfReader - Moteur temps réel (Phase 4.1)
+Pipeline asynchrone capture / détection / reconnaissance / enrichissement.
+"""
+
+from .performance import StageMetrics, PipelineMetrics, LatencyBudgetScheduler
+from .tracking import SpineTracker, Track
+from .change_detection import FrameChange, FrameChangeDetector
+from .pipeline import Frame, FrameResult, FrameSource, RealtimePipeline
+
+__all__ = ['StageMetrics', 'PipelineMetrics', 'LatencyBudgetScheduler',
+           'SpineTracker', 'Track', 'FrameChange', 'FrameChangeDetector',
+           'Frame', 'FrameResult', 'FrameSource', 'RealtimePipeline']
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Frame change detection
+P4-Mobile-Real-time component
+
+Cheap per-frame test run before any detection or OCR: the frame is reduced
+to a small blurred grayscale image, compared block by block with the
+reference (the last processed content), and the blocks whose mean absolute
+difference exceeds a threshold are merged into changed regions in
+full-frame coordinates. Only changed blocks are copied into the reference,
+so slow drift keeps accumulating until it is large enough to report, while
+sensor noise below the threshold never triggers work. A static camera costs
+one resize and one subtraction per frame.
+"""
+
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+# Defaults
+DEFAULT_WIDTH = 160         # Width of the compared image (pixels)
+DEFAULT_BLOCK = 8           # Block size on the compared image
+DEFAULT_THRESHOLD = 12.0    # Mean absolute difference (gray levels) of a changed block
+DEFAULT_MARGIN = 1          # Blocks added around each changed region
+
+
+@dataclass
+class FrameChange:
+    """
+    Changes of a frame against the reference.
+
+    Attributes:
+        regions: (k, 4) float32 changed regions (x0, y0, x1, y1) in frame pixels
+        fraction: Fraction of the blocks that changed
+        first: No reference yet (the whole frame is reported as changed)
+    """
+    regions: np.ndarray
+    fraction: float
+    first: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return len(self.regions) > 0
+
+    def span(self, axis: int = 0) -> tuple:
+        """Extent of all regions along x (axis=0) or y (axis=1)."""
+        return (float(self.regions[:, axis].min()), float(self.regions[:, axis + 2].max()))
+
+
+class FrameChangeDetector:
+    """
+    Block-wise frame differencing against the last processed content.
+
+    Args:
+        width: Width of the downsampled comparison image
+        block: Block size in downsampled pixels
+        threshold: Mean absolute difference (gray levels) above which a block changed
+        margin: Blocks added around each changed region
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH, block: int = DEFAULT_BLOCK,
+                 threshold: float = DEFAULT_THRESHOLD, margin: int = DEFAULT_MARGIN):
+        self.width = width
+        self.block = block
+        self.threshold = threshold
+        self.margin = margin
+        self._reference = None
+        self._shape = None
+        self._block_size = (float(block), float(block))
+
+    def reset(self):
+        self._reference = None
+        self._shape = None
+
+    def _small(self, image: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        height, width = gray.shape
+        scale = min(1.0, self.width / width)
+        size = (max(self.block, int(width * scale)), max(self.block, int(height * scale)))
+        small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        # Frame pixels per block
+        self._block_size = (width / size[0] * self.block, height / size[1] * self.block)
+        # Whole blocks only; blur absorbs sub-pixel shake and sensor noise
+        rows, cols = small.shape[0] // self.block, small.shape[1] // self.block
+        small = cv2.GaussianBlur(small[:rows * self.block, :cols * self.block], (3, 3), 0)
+        return small.astype(np.int16)
+
+    def update(self, image: np.ndarray) -> FrameChange:
+        """
+        Compare a frame with the reference and fold its changed blocks into it.
+
+        Returns:
+            FrameChange (the first frame, or a frame of a new size, is entirely changed)
+        """
+        height, width = image.shape[:2]
+        small = self._small(image)
+        if self._reference is None or self._shape != (height, width):
+            self._reference, self._shape = small, (height, width)
+            return FrameChange(np.float32([[0, 0, width, height]]), 1.0, first=True)
+
+        rows, cols = small.shape[0] // self.block, small.shape[1] // self.block
+        difference = np.abs(small - self._reference)
+        blocks = difference.reshape(rows, self.block, cols, self.block).mean(axis=(1, 3)) > self.threshold
+        if not blocks.any():
+            return FrameChange(np.empty((0, 4), dtype=np.float32), 0.0)
+
+        # Reference follows the content that will be processed
+        mask = np.repeat(np.repeat(blocks, self.block, axis=0), self.block, axis=1)
+        self._reference[mask] = small[mask]
+
+        grown = blocks.astype(np.uint8)
+        if self.margin:
+            size = 2 * self.margin + 1
+            grown = cv2.dilate(grown, np.ones((size, size), np.uint8))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(grown, connectivity=8)
+        # Block grid -> frame pixels; regions touching the last block reach the frame border
+        scale_x, scale_y = self._block_size
+        x, y, w, h = (stats[1:count, i].astype(np.float32) for i in range(4))
+        regions = np.column_stack([x * scale_x, y * scale_y,
+                                   np.where(x + w >= cols, width, (x + w) * scale_x),
+                                   np.where(y + h >= rows, height, (y + h) * scale_y)])
+        regions[:, [0, 2]] = np.clip(regions[:, [0, 2]], 0, width)
+        regions[:, [1, 3]] = np.clip(regions[:, [1, 3]], 0, height)
+        return FrameChange(regions.astype(np.float32), float(blocks.mean()))
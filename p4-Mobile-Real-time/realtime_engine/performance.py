@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Real-time performance: per-stage metrics and latency-budget scheduling
+P4-Mobile-Real-time component
+
+StageMetrics keeps a sliding window of completion times and latencies for one
+pipeline stage (FPS, p50/p95 latency, dropped/skipped counts).
+LatencyBudgetScheduler decides, frame by frame, whether a captured frame is
+processed at all and whether it is a key frame that goes through the
+expensive recognition stage.
+"""
+
+import math
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+# Scheduling defaults (README target: 5-10 FPS)
+DEFAULT_TARGET_FPS = 8.0
+DEFAULT_MAX_LATENCY = 0.25      # Frames older than this (s) when a stage picks them up are dropped
+DEFAULT_KEY_INTERVAL = 5        # Minimum frames between two key frames
+DEFAULT_MAX_KEY_INTERVAL = 60   # Upper bound when recognition is slow
+METRICS_WINDOW = 120            # Samples kept per stage
+
+
+class StageMetrics:
+    """
+    Sliding-window metrics of one pipeline stage.
+
+    Args:
+        name: Stage name
+        window: Number of samples kept for FPS and latency percentiles
+    """
+
+    def __init__(self, name: str, window: int = METRICS_WINDOW):
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.skipped = 0
+        self._latencies = deque(maxlen=window)
+        self._completed = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, now: Optional[float] = None):
+        """Record one processed item and its latency (seconds)."""
+        with self._lock:
+            self.processed += 1
+            self._latencies.append(latency)
+            self._completed.append(time.perf_counter() if now is None else now)
+
+    def drop(self, count: int = 1):
+        """Items discarded because they were stale or overwritten by a newer frame."""
+        with self._lock:
+            self.dropped += count
+
+    def skip(self, count: int = 1):
+        """Items deliberately not processed by this stage (rate limit, non-key frame)."""
+        with self._lock:
+            self.skipped += count
+
+    @property
+    def fps(self) -> float:
+        """Completions per second over the window."""
+        with self._lock:
+            if len(self._completed) < 2:
+                return 0.0
+            elapsed = self._completed[-1] - self._completed[0]
+            return (len(self._completed) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def latency(self, percentile: float = 50) -> float:
+        """Latency percentile over the window (seconds, 0 when empty)."""
+        with self._lock:
+            if not self._latencies:
+                return 0.0
+            return float(np.percentile(np.fromiter(self._latencies, dtype=np.float64), percentile))
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'skipped': self.skipped,
+            'fps': round(self.fps, 2),
+            'p50_ms': round(self.latency(50) * 1000, 1),
+            'p95_ms': round(self.latency(95) * 1000, 1),
+        }
+
+
+class PipelineMetrics:
+    """Metrics of every stage, created on first use."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self.stages: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> StageMetrics:
+        with self._lock:
+            metrics = self.stages.get(name)
+            if metrics is None:
+                metrics = self.stages[name] = StageMetrics(name, self.window)
+            return metrics
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {name: metrics.snapshot() for name, metrics in self.stages.items()}
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<12}{'fps':>8}{'p50 ms':>10}{'p95 ms':>10}{'done':>8}{'drop':>8}{'skip':>8}"]
+        for name, s in self.report().items():
+            lines.append(f"{name:<12}{s['fps']:>8.2f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                         f"{s['processed']:>8}{s['dropped']:>8}{s['skipped']:>8}")
+        return '\n'.join(lines)
+
+
+class LatencyBudgetScheduler:
+    """
+    Frame admission and key-frame selection under a latency budget.
+
+    A frame is skipped when it arrives less than 1/target_fps (source time)
+    after the last admitted frame, and dropped when it has waited longer than
+    max_latency (wall time) before processing started. Key frames are spaced
+    by at least key_interval frames, and further apart when recognition is
+    slower than the frame interval, so that recognition never queues up.
+
+    Args:
+        target_fps: Processed frames per second
+        max_latency: Maximum age of a frame when processing starts (s)
+        key_interval: Minimum number of admitted frames between key frames
+        max_key_interval: Key frame forced after this many admitted frames
+        metrics: PipelineMetrics read for the measured recognition latency
+    """
+
+    def __init__(self, target_fps: float = DEFAULT_TARGET_FPS, max_latency: float = DEFAULT_MAX_LATENCY,
+                 key_interval: int = DEFAULT_KEY_INTERVAL, max_key_interval: int = DEFAULT_MAX_KEY_INTERVAL,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.frame_interval = 1.0 / target_fps if target_fps else 0.0
+        self.max_latency = max_latency
+        self.key_interval = max(1, key_interval)
+        self.max_key_interval = max(self.key_interval, max_key_interval)
+        self.metrics = metrics or PipelineMetrics()
+        self._last_admitted: Optional[float] = None
+        self._since_key = self.max_key_interval
+
+    def admit(self, timestamp: float, captured_at: Optional[float] = None, now: Optional[float] = None) -> bool:
+        """
+        Decide whether a frame is processed.
+
+        Args:
+            timestamp: Source time of the frame (s)
+            captured_at: Wall-clock capture time (perf_counter); None disables the staleness check
+            now: Current wall-clock time (defaults to perf_counter)
+        """
+        if captured_at is not None and self.max_latency:
+            now = time.perf_counter() if now is None else now
+            if now - captured_at > self.max_latency:
+                self.metrics.stage('schedule').drop()
+                return False
+        if self._last_admitted is not None and timestamp - self._last_admitted < self.frame_interval:
+            self.metrics.stage('schedule').skip()
+            return False
+        self._last_admitted = timestamp
+        return True
+
+    @property
+    def current_key_interval(self) -> int:
+        """Key-frame spacing for the measured recognition latency."""
+        recognition = self.metrics.stage('recognize').latency(50)
+        if not recognition or not self.frame_interval:
+            return self.key_interval
+        needed = math.ceil(recognition / self.frame_interval)
+        return min(self.max_key_interval, max(self.key_interval, needed))
+
+    def is_key_frame(self, recognizer_busy: bool = False, pending: bool = True) -> bool:
+        """
+        Decide whether the admitted frame goes through recognition.
+
+        Args:
+            recognizer_busy: Recognition of a previous key frame is still running
+            pending: The frame has something to recognize; when False the frame
+                only counts towards the key-frame spacing
+        """
+        self._since_key += 1
+        if not pending or self._since_key < self.current_key_interval:
+            return False
+        if recognizer_busy and self._since_key < self.max_key_interval:
+            return False
+        self._since_key = 0
+        return True
+
+    def reset(self):
+        self._last_admitted = None
+        # The first admitted frame is always a key frame
+        self._since_key = self.max_key_interval
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Real-time frame pipeline
+P4-Mobile-Real-time component
+
+Processes a video stream (video file, camera, or a still shelf photo replayed
+as a camera stand-in) as four asynchronous stages connected by queues:
+
+    capture -> detect (spine boxes, every admitted frame)
+            -> recognize (OCR of the spine crops, key frames only)
+            -> enrich (Open Library lookups, once per recognized title)
+
+Stages hand frames over through single-slot queues where a newer frame
+replaces the one waiting (the overwritten frame is counted as dropped), so a
+slow stage never builds a backlog. The LatencyBudgetScheduler skips frames
+above the target FPS, drops frames that waited too long, and spaces key
+frames according to the measured recognition latency. Every processed frame
+is yielded with the boxes detected on it and the books in view, which is what
+an AR overlay displays. Books are SpineTracker tracks: their text and
+enrichment are cached across frames, and a key frame only sends the crops of
+new, low-confidence or changed tracks to OCR. Before detection, a
+FrameChangeDetector compares the frame with the last processed content: an
+unchanged frame reuses the previous boxes without running the detector,
+and a partly changed frame is only re-detected in the vertical band covering
+the changes.
+
+Usage:
+    python -m realtime_engine.pipeline shelf.mp4 --fps 8
+    python -m realtime_engine.pipeline shelf.jpg --camera-frames 300
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .performance import (LatencyBudgetScheduler, PipelineMetrics, DEFAULT_TARGET_FPS, DEFAULT_MAX_LATENCY,
+                          DEFAULT_KEY_INTERVAL, DEFAULT_MAX_KEY_INTERVAL)
+from .tracking import SpineTracker, Track
+from .change_detection import FrameChangeDetector, FrameChange
+
+logger = logging.getLogger(__name__)
+
+# P1 spine detector (core.spine), shared with the desktop fallback detector
+P1_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'p1-OCR-Streamlit', 'src'))
+
+DETECT_MAX_EDGE = 1280          # Spine detection runs on frames downscaled to this longest edge
+MIN_SPINE_WIDTH = 8             # Boxes narrower than this (pixels, full frame) are ignored
+MIN_ENRICH_LENGTH = 3           # Shorter recognized texts are not looked up
+DEFAULT_CAMERA_FPS = 30.0
+DEFAULT_ENRICH_WORKERS = 4
+FULL_DETECT_FRACTION = 0.5      # Above this fraction of changed blocks, the whole frame is re-detected
+
+_STOP = object()
+
+
+@dataclass
+class Frame:
+    """A captured frame: index, source time (s), wall-clock capture time (perf_counter)."""
+    index: int
+    timestamp: float
+    captured_at: float
+    image: np.ndarray
+
+
+@dataclass
+class FrameResult:
+    """
+    Output of the pipeline for one processed frame.
+
+    Attributes:
+        index, timestamp: Frame identity in the source
+        boxes: (n, 4) float32 spine boxes (x0, y0, x1, y1) detected on this frame
+        key_frame: Crops of this frame were sent to recognition
+        books: Recognized books in view, [{'track_id', 'text', 'confidence', 'box',
+            'recognized_frame', 'enrichment'}], box being the tracked position on this frame
+        books_frame: Index of the latest frame that went through recognition
+        captured_at: Wall-clock capture time (perf_counter)
+        latency: Capture to output (s)
+    """
+    index: int
+    timestamp: float
+    captured_at: float
+    boxes: np.ndarray
+    key_frame: bool
+    books: List[Dict[str, Any]] = field(default_factory=list)
+    books_frame: Optional[int] = None
+    latency: float = 0.0
+
+
+class FrameSource:
+    """
+    Frames from a video file, a camera index, or a still image replayed as a camera.
+
+    Args:
+        source: Video path, camera index (int or digit string), image path or BGR array
+        fps: Frame rate of a replayed image (video files and cameras report their own)
+        frames: Number of frames of a replayed image
+        jitter: Maximum random shift (pixels) of a replayed image, to mimic a hand-held camera
+        realtime: Pace frames at the source rate (as a camera would); False reads as fast as
+            the pipeline consumes them (offline processing, no frame is dropped)
+    """
+
+    def __init__(self, source: Union[str, int, np.ndarray], fps: float = DEFAULT_CAMERA_FPS,
+                 frames: int = 300, jitter: int = 2, realtime: bool = True):
+        self.source = source
+        self.fps = fps
+        self.frames = frames
+        self.jitter = jitter
+        self.realtime = realtime
+
+    def _is_camera(self) -> bool:
+        return isinstance(self.source, int) or (isinstance(self.source, str) and self.source.isdigit())
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """Yields (index, source time in seconds, BGR frame)."""
+        if isinstance(self.source, np.ndarray):
+            yield from self._replay(self.source)
+            return
+        if not self._is_camera():
+            image = cv2.imread(self.source) if os.path.splitext(self.source)[1].lower() in \
+                ('.jpg', '.jpeg', '.png', '.bmp', '.webp') else None
+            if image is not None:
+                yield from self._replay(image)
+                return
+
+        capture = cv2.VideoCapture(int(self.source) if self._is_camera() else self.source)
+        if not capture.isOpened():
+            raise IOError(f"Cannot open video source: {self.source}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or self.fps
+        try:
+            index = 0
+            while True:
+                ok, image = capture.read()
+                if not ok:
+                    break
+                position = capture.get(cv2.CAP_PROP_POS_MSEC)
+                yield index, (position / 1000.0 if position > 0 else index / fps), image
+                index += 1
+        finally:
+            capture.release()
+
+    def _replay(self, image: np.ndarray):
+        rng = np.random.default_rng(0)
+        height, width = image.shape[:2]
+        for index in range(self.frames):
+            if self.jitter:
+                dx, dy = rng.integers(-self.jitter, self.jitter + 1, size=2)
+                shift = np.float32([[1, 0, dx], [0, 1, dy]])
+                frame = cv2.warpAffine(image, shift, (width, height), borderMode=cv2.BORDER_REPLICATE)
+            else:
+                frame = image.copy()
+            yield index, index / self.fps, frame
+
+
+class SpineBoxDetector:
+    """
+    Book boxes from the P1 spine detector (vertical separation lines), on a downscaled frame.
+
+    Args:
+        max_edge: Longest edge of the analysed frame
+        min_width: Minimum box width in full-frame pixels
+    """
+
+    def __init__(self, max_edge: int = DETECT_MAX_EDGE, min_width: int = MIN_SPINE_WIDTH):
+        if P1_SRC not in sys.path:
+            sys.path.append(P1_SRC)
+        from core.spine import SpineService
+
+        self.max_edge = max_edge
+        self.min_width = min_width
+        # Every video frame is new: no result cache, no fingerprint hashing
+        self.service = SpineService(cache_size=0)
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        scale = min(1.0, self.max_edge / max(height, width))
+        small = cv2.resize(image, (int(width * scale), int(height * scale)),
+                           interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+        polygons = self.service.detect(small, method='vertical_lines').polygons
+        if not polygons:
+            return np.empty((0, 4), dtype=np.float32)
+        corners = np.stack(polygons).astype(np.float32) / scale
+        boxes = np.column_stack([corners[:, :, 0].min(axis=1), corners[:, :, 1].min(axis=1),
+                                 corners[:, :, 0].max(axis=1), corners[:, :, 1].max(axis=1)])
+        boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, width)
+        boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, height)
+        return boxes[(boxes[:, 2] - boxes[:, 0]) >= self.min_width]
+
+
+class BookOCRRecognizer:
+    """
+    Spine crop recognition with BookOCR (EasyOCR), one crop at a time.
+
+    Args:
+        languages: EasyOCR languages
+        confidence_threshold: Minimum confidence of a text fragment
+        rotate_spines: Rotate tall crops 90° so vertical titles read horizontally
+    """
+
+    def __init__(self, languages=('en', 'fr'), confidence_threshold: float = 0.3, rotate_spines: bool = True):
+        from PIL import Image
+        from src.ocr_processor import BookOCR
+
+        self._to_pil = Image.fromarray
+        self.ocr = BookOCR(list(languages), confidence_threshold)
+        self.rotate_spines = rotate_spines
+
+    def __call__(self, crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        results = []
+        for crop in crops:
+            if self.rotate_spines and crop.shape[0] > crop.shape[1]:
+                crop = cv2.rotate(crop, cv2.ROTATE_90_CLOCKWISE)
+            results.append(self.ocr.extract_text_from_pil(self._to_pil(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))))
+        return results
+
+
+def _openlibrary_client():
+    """P1 shared Open Library transport (pooled async client) if httpx is installed, else the local client."""
+    if P1_SRC not in sys.path:
+        sys.path.append(P1_SRC)
+    try:
+        from services.async_openlibrary_client import shared_client
+        return shared_client()
+    except ImportError:
+        from src.api_client import OpenLibraryClient
+        return OpenLibraryClient()
+
+
+class OpenLibraryEnricher:
+    """Best Open Library match of a recognized text ({'title', 'author', 'year', 'key'} or None)."""
+
+    # Only the fields read below are requested (one small search, no /works request)
+    FIELDS = ('key', 'title', 'author_name', 'first_publish_year')
+
+    def __init__(self, client=None):
+        self.client = client or _openlibrary_client()
+
+    def __call__(self, text: str) -> Optional[Dict[str, Any]]:
+        response = self.client.search_books(text, limit=1, fields=self.FIELDS)
+        docs = (response or {}).get('docs') or []
+        if not docs:
+            return None
+        doc = docs[0]
+        return {
+            'title': doc.get('title'),
+            'author': ', '.join(doc.get('author_name') or []) or None,
+            'year': doc.get('first_publish_year'),
+            'key': doc.get('key'),
+        }
+
+
+def crop_boxes(image: np.ndarray, boxes: np.ndarray) -> List[np.ndarray]:
+    """Crops of the (x0, y0, x1, y1) boxes (views into the frame, at least one pixel each)."""
+    rounded = np.rint(boxes).astype(int)
+    return [image[y0:max(y1, y0 + 1), x0:max(x1, x0 + 1)] for x0, y0, x1, y1 in rounded]
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+class RealtimePipeline:
+    """
+    Asynchronous capture / detection / recognition / enrichment pipeline.
+
+    Args:
+        detector: frame -> (n, 4) boxes; default SpineBoxDetector
+        recognizer: list of crops -> [(text, confidence)]; default BookOCRRecognizer
+        enricher: text -> dict or None; default OpenLibraryEnricher; False disables enrichment
+        scheduler: LatencyBudgetScheduler (created from the arguments below if None)
+        tracker: SpineTracker holding the per-book recognition cache (default settings if None)
+        change_detector: FrameChangeDetector gating detection (default settings if None, False disables)
+        target_fps, max_latency, key_interval, max_key_interval: Scheduler settings
+        enrich_workers: Concurrent enrichment lookups
+    """
+
+    def __init__(self, detector: Optional[Callable] = None, recognizer: Optional[Callable] = None,
+                 enricher: Union[Callable, bool, None] = None, scheduler: Optional[LatencyBudgetScheduler] = None,
+                 tracker: Optional[SpineTracker] = None,
+                 change_detector: Union[FrameChangeDetector, bool, None] = None,
+                 target_fps: float = DEFAULT_TARGET_FPS, max_latency: float = DEFAULT_MAX_LATENCY,
+                 key_interval: int = DEFAULT_KEY_INTERVAL, max_key_interval: int = DEFAULT_MAX_KEY_INTERVAL,
+                 enrich_workers: int = DEFAULT_ENRICH_WORKERS):
+        self.detector = detector or SpineBoxDetector()
+        self.recognizer = recognizer or BookOCRRecognizer()
+        self.enricher = (enricher or OpenLibraryEnricher()) if enricher is not False else None
+        self.metrics = scheduler.metrics if scheduler is not None else PipelineMetrics()
+        self.scheduler = scheduler or LatencyBudgetScheduler(target_fps, max_latency, key_interval,
+                                                             max_key_interval, self.metrics)
+        self.tracker = tracker or SpineTracker()
+        self.change_detector = (change_detector or FrameChangeDetector()) if change_detector is not False else None
+        self.enrich_workers = enrich_workers
+        self.enrichments: Dict[str, Optional[Dict[str, Any]]] = {}  # normalized text -> match
+        self._books_frame: Optional[int] = None
+
+    # Queues ---------------------------------------------------------------
+
+    def _put_latest(self, queue: asyncio.Queue, item, stage: str):
+        """Put into a single-slot queue, replacing (and counting as dropped) a waiting frame."""
+        replaced = None
+        if queue.full():
+            replaced = queue.get_nowait()
+            self.metrics.stage(stage).drop()
+        queue.put_nowait(item)
+        return replaced
+
+    # Stages ---------------------------------------------------------------
+
+    async def _capture(self, source: FrameSource, out: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        frames = iter(source)
+        started = None
+        stats = self.metrics.stage('capture')
+        try:
+            while True:
+                read_at = time.perf_counter()
+                item = await loop.run_in_executor(self._io, next, frames, None)
+                if item is None:
+                    break
+                index, timestamp, image = item
+                now = time.perf_counter()
+                stats.record(now - read_at, now)
+                if source.realtime:
+                    # Camera pacing: a frame is available at its source time, not earlier
+                    started = now - timestamp if started is None else started
+                    delay = started + timestamp - now
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        now = time.perf_counter()
+                frame = Frame(index, timestamp, now, image)
+                if source.realtime:
+                    self._put_latest(out, frame, 'capture')
+                else:
+                    await out.put(frame)
+        finally:
+            await out.put(_STOP)
+
+    async def _detect(self, inbox: asyncio.Queue, recognition: asyncio.Queue, results: asyncio.Queue,
+                      realtime: bool):
+        loop = asyncio.get_running_loop()
+        stats = self.metrics.stage('detect')
+        try:
+            while True:
+                frame = await inbox.get()
+                if frame is _STOP:
+                    break
+                if not self.scheduler.admit(frame.timestamp, frame.captured_at if realtime else None):
+                    continue
+                change = self.change_detector.update(frame.image) if self.change_detector is not None else None
+                if change is not None and not change.changed and self._boxes is not None:
+                    # Nothing moved: same boxes, no model run
+                    stats.skip()
+                    boxes = self._boxes
+                else:
+                    started = time.perf_counter()
+                    boxes = await loop.run_in_executor(self._detect_pool, self._detect_frame, frame.image, change)
+                    stats.record(time.perf_counter() - started)
+                    self._boxes = boxes
+                # The tracker sees every frame, reused boxes included: tracks get
+                # confirmed and low-confidence retries come due on a static scene
+                visible = self.tracker.update(boxes, frame.image, frame.index)
+
+                pending = self.tracker.pending(visible)
+                busy = self._recognizing or not recognition.empty()
+                key_frame = self.scheduler.is_key_frame(recognizer_busy=busy, pending=bool(pending))
+                if key_frame:
+                    self.tracker.mark_pending(pending)
+                    crop_at = np.array([track.box for track in pending], dtype=np.float32)
+                    replaced = self._put_latest(recognition, (frame, pending, crop_at), 'recognize')
+                    if replaced is not None:
+                        self.tracker.cancel(replaced[1])
+                await results.put(self._result(frame, boxes, key_frame, visible))
+        finally:
+            # Always end the downstream stages and the output, so run() returns
+            # (and raises the exception of this task) instead of waiting forever
+            await recognition.put(_STOP)
+            await results.put(_STOP)
+
+    async def _recognize(self, inbox: asyncio.Queue, enrichment: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        stats = self.metrics.stage('recognize')
+        while True:
+            item = await inbox.get()
+            if item is _STOP:
+                break
+            frame, tracks, boxes = item
+            self._recognizing = True
+            started = time.perf_counter()
+            try:
+                texts = await loop.run_in_executor(self._recognize_pool, self.recognizer,
+                                                   crop_boxes(frame.image, boxes))
+            except Exception as e:
+                logger.warning(f"⚠️ Recognition failed on frame {frame.index}: {e}")
+                self.tracker.cancel(tracks)
+                continue
+            finally:
+                self._recognizing = False
+            stats.record(time.perf_counter() - started)
+
+            self._books_frame = frame.index
+            for track, (text, confidence), box in zip(tracks, texts, boxes):
+                self.tracker.set_recognition(track, text, confidence, frame.image, box, frame.index)
+                key = _normalize(track.text or '')
+                if self.enricher is not None and len(key) >= MIN_ENRICH_LENGTH and key not in self.enrichments:
+                    self.enrichments[key] = None  # Looked up once, even while pending
+                    enrichment.put_nowait(key)
+        for _ in range(self.enrich_workers):
+            await enrichment.put(_STOP)
+
+    async def _enrich(self, inbox: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        stats = self.metrics.stage('enrich')
+        while True:
+            key = await inbox.get()
+            if key is _STOP:
+                break
+            started = time.perf_counter()
+            try:
+                self.enrichments[key] = await loop.run_in_executor(self._io, self.enricher, key)
+            except Exception as e:
+                logger.warning(f"⚠️ Enrichment failed for '{key}': {e}")
+                continue
+            stats.record(time.perf_counter() - started)
+
+    def _detect_frame(self, image: np.ndarray, change: Optional[FrameChange]) -> np.ndarray:
+        """Run the detector on the whole frame, or on the band of columns that changed."""
+        previous = self._boxes
+        if change is None or change.first or previous is None or change.fraction > FULL_DETECT_FRACTION:
+            return np.asarray(self.detector(image), dtype=np.float32).reshape(-1, 4)
+
+        # Widen the band to the spines it cuts, so they are re-detected whole
+        x0, x1 = change.span(0)
+        cut = (previous[:, 2] > x0) & (previous[:, 0] < x1)
+        if cut.any():
+            x0, x1 = min(x0, float(previous[cut, 0].min())), max(x1, float(previous[cut, 2].max()))
+        x0, x1 = int(np.floor(x0)), int(np.ceil(x1))
+        band = np.asarray(self.detector(image[:, x0:x1]), dtype=np.float32).reshape(-1, 4)
+        band[:, [0, 2]] += x0
+        boxes = np.concatenate([previous[~cut], band])
+        return boxes[np.argsort(boxes[:, 0], kind='stable')]
+
+    def _book(self, track: Track) -> Dict[str, Any]:
+        return dict(track.to_dict(), enrichment=self.enrichments.get(_normalize(track.text)))
+
+    def _result(self, frame: Frame, boxes: np.ndarray, key_frame: bool, visible: List[Track]) -> FrameResult:
+        books = [self._book(track) for track in self.tracker.books(visible)]
+        return FrameResult(frame.index, frame.timestamp, frame.captured_at, boxes, key_frame, books,
+                           self._books_frame)
+
+    # Public API -----------------------------------------------------------
+
+    async def run(self, source: Union[FrameSource, str, int, np.ndarray]) -> AsyncIterator[FrameResult]:
+        """
+        Process a stream, yielding one FrameResult per processed (admitted) frame.
+
+        Recognition and enrichment finish in the background: a book appears in
+        the results of the frames that follow its recognition.
+        """
+        source = source if isinstance(source, FrameSource) else FrameSource(source)
+        self.scheduler.reset()
+        self.tracker.reset()
+        if self.change_detector is not None:
+            self.change_detector.reset()
+        self._boxes: Optional[np.ndarray] = None
+        self._recognizing = False
+        self._io = ThreadPoolExecutor(max_workers=1 + self.enrich_workers, thread_name_prefix='rt-io')
+        self._detect_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rt-detect')
+        self._recognize_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rt-recognize')
+
+        frames = asyncio.Queue(maxsize=1 if source.realtime else 2)
+        recognition = asyncio.Queue(maxsize=1)
+        enrichment = asyncio.Queue()
+        results = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._capture(source, frames)),
+            asyncio.create_task(self._detect(frames, recognition, results, source.realtime)),
+            asyncio.create_task(self._recognize(recognition, enrichment)),
+        ]
+        if self.enricher is not None:
+            tasks += [asyncio.create_task(self._enrich(enrichment)) for _ in range(self.enrich_workers)]
+
+        for name in ('capture', 'detect', 'recognize', 'enrich'):
+            self.metrics.stage(name)
+        output = self.metrics.stage('output')
+        try:
+            while True:
+                result = await results.get()
+                if result is _STOP:
+                    break
+                now = time.perf_counter()
+                result.latency = now - result.captured_at
+                output.record(result.latency, now)
+                yield result
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for pool in (self._detect_pool, self._recognize_pool, self._io):
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def books(self) -> List[Dict[str, Any]]:
+        """Recognized books of the live tracks, with their enrichment."""
+        return [self._book(track) for track in self.tracker.books()]
+
+    def process(self, source: Union[FrameSource, str, int, np.ndarray],
+                on_result: Optional[Callable[[FrameResult], None]] = None) -> PipelineMetrics:
+        """Synchronous wrapper: run the pipeline to the end of the source and return the metrics."""
+        async def consume():
+            async for result in self.run(source):
+                if on_result is not None:
+                    on_result(result)
+
+        asyncio.run(consume())
+        return self.metrics
+
+
+def main():
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Real-time shelf pipeline on a video, camera or replayed image")
+    parser.add_argument('source', help="Video file, camera index, or shelf image replayed as a camera")
+    parser.add_argument('--fps', type=float, default=DEFAULT_TARGET_FPS, help="Target processed FPS")
+    parser.add_argument('--max-latency', type=float, default=DEFAULT_MAX_LATENCY)
+    parser.add_argument('--key-interval', type=int, default=DEFAULT_KEY_INTERVAL)
+    parser.add_argument('--camera-fps', type=float, default=DEFAULT_CAMERA_FPS, help="Rate of a replayed image")
+    parser.add_argument('--camera-frames', type=int, default=300, help="Frames of a replayed image")
+    parser.add_argument('--offline', action='store_true', help="Read as fast as processed (no pacing, no drops)")
+    parser.add_argument('--no-enrich', action='store_true', help="Skip Open Library lookups")
+    parser.add_argument('--no-change-detection', action='store_true',
+                        help="Run detection on every admitted frame, even when nothing changed")
+    args = parser.parse_args()
+
+    pipeline = RealtimePipeline(enricher=False if args.no_enrich else None,
+                                change_detector=False if args.no_change_detection else None, target_fps=args.fps,
+                                max_latency=args.max_latency, key_interval=args.key_interval)
+    source = FrameSource(args.source, fps=args.camera_fps, frames=args.camera_frames, realtime=not args.offline)
+
+    def show(result: FrameResult):
+        if result.key_frame:
+            print(f"🔑 Frame {result.index}: {len(result.boxes)} spines, {len(result.books)} books in view, "
+                  f"{result.latency * 1000:.0f} ms")
+
+    metrics = pipeline.process(source, show)
+    print(metrics.format_report())
+    print(f"🔎 {pipeline.tracker.created} tracks, {pipeline.tracker.recognitions} spine crops recognized")
+    for book in pipeline.books():
+        match = book['enrichment'] or {}
+        print(f"📚 {book['text']} ({book['confidence']:.2f}) -> {match.get('title', '—')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Temporal spine tracking
+P4-Mobile-Real-time component
+
+Associates the spine boxes of consecutive frames so that each physical book
+keeps one track while it stays in view. The horizontal position of a spine
+(the centre between its two separation lines) follows a constant-velocity
+Kalman filter; predicted boxes are matched to the new detections by IoU with
+an optimal assignment. Each track caches its recognized text and a small
+appearance signature of the crop it was read from, so OCR runs again only
+when a track is new, its text confidence is low, or its crop no longer looks
+the same: recognition work scales with new books, not with frame count.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+logger = logging.getLogger(__name__)
+
+# Association / lifecycle defaults
+DEFAULT_IOU_THRESHOLD = 0.3
+DEFAULT_MIN_HITS = 2            # Detections before a track is recognized (filters one-frame noise)
+DEFAULT_MAX_MISSES = 15         # Frames a track survives without a matching detection
+DEFAULT_MIN_CONFIDENCE = 0.5    # Texts below this are read again
+DEFAULT_MAX_ATTEMPTS = 3        # OCR attempts on a low-confidence track
+DEFAULT_RETRY_INTERVAL = 10     # Frames between two attempts on a low-confidence track
+DEFAULT_CHANGE_THRESHOLD = 0.4  # Appearance distance (1 - correlation) triggering a new reading
+SIGNATURE_SIZE = (16, 48)       # (width, height) of the appearance thumbnail
+
+# Kalman filter on (x, vx) of the spine centre, time step = one frame
+PROCESS_NOISE = 4.0
+MEASUREMENT_NOISE = 9.0
+_F = np.array([[1.0, 1.0], [0.0, 1.0]])
+_Q = PROCESS_NOISE * np.array([[0.25, 0.5], [0.5, 1.0]])
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU of every (x0, y0, x1, y1) box of a against every box of b: (len(a), len(b))."""
+    if not len(a) or not len(b):
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    x0 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y0 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x1 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y1 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter, dtype=np.float64), where=union > 0)
+
+
+def appearance_signature(image: np.ndarray, box: np.ndarray) -> Optional[np.ndarray]:
+    """Zero-mean, unit-norm grayscale thumbnail of a box (None for an empty crop)."""
+    x0, y0, x1, y1 = np.rint(box).astype(int)
+    crop = image[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)]
+    if crop.size == 0:
+        return None
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    thumb = cv2.resize(crop, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+    thumb -= thumb.mean()
+    norm = np.linalg.norm(thumb)
+    return thumb / norm if norm > 0 else thumb
+
+
+def appearance_distance(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> float:
+    """1 - normalized correlation of two signatures (0 = identical, 2 = inverted)."""
+    if a is None or b is None:
+        return 0.0
+    # A flat crop has an all-zero signature: no correlation to measure
+    flat_a, flat_b = not a.any(), not b.any()
+    if flat_a or flat_b:
+        return 0.0 if flat_a and flat_b else 1.0
+    return float(1.0 - np.dot(a, b))
+
+
+class Track:
+    """
+    One book followed across frames.
+
+    Attributes:
+        track_id: Stable identifier
+        box: Current (x0, y0, x1, y1) box (float32)
+        text, confidence: Cached recognition (None until recognized)
+        signature: Appearance of the crop the text was read from
+        hits, misses: Matched detections / consecutive frames without one
+        attempts: OCR runs on this track
+        recognized_frame: Frame index of the last OCR run
+    """
+
+    __slots__ = ('track_id', 'box', 'state', 'covariance', 'text', 'confidence', 'signature',
+                 'hits', 'misses', 'attempts', 'recognized_frame', 'pending')
+
+    def __init__(self, track_id: int, box: np.ndarray):
+        self.track_id = track_id
+        self.box = np.asarray(box, dtype=np.float32)
+        self.state = np.array([(box[0] + box[2]) / 2.0, 0.0])
+        self.covariance = np.diag([MEASUREMENT_NOISE, 100.0])
+        self.text: Optional[str] = None
+        self.confidence: Optional[float] = None
+        self.signature: Optional[np.ndarray] = None
+        self.hits = 1
+        self.misses = 0
+        self.attempts = 0
+        self.recognized_frame: Optional[int] = None
+        self.pending = False  # Sent to recognition, result not back yet
+
+    def predict(self):
+        self.state = _F @ self.state
+        self.covariance = _F @ self.covariance @ _F.T + _Q
+        shift = self.state[0] - (self.box[0] + self.box[2]) / 2.0
+        self.box = self.box + np.float32([shift, 0, shift, 0])
+
+    def correct(self, box: np.ndarray):
+        # Measurement: spine centre x
+        innovation = (box[0] + box[2]) / 2.0 - self.state[0]
+        gain = self.covariance[:, 0] / (self.covariance[0, 0] + MEASUREMENT_NOISE)
+        self.state = self.state + gain * innovation
+        self.covariance = self.covariance - np.outer(gain, self.covariance[0])
+        # Width and vertical extent follow the detection; position follows the filter
+        half = (box[2] - box[0]) / 2.0
+        self.box = np.float32([self.state[0] - half, box[1], self.state[0] + half, box[3]])
+        self.hits += 1
+        self.misses = 0
+
+    def to_dict(self) -> Dict:
+        return {'track_id': self.track_id, 'box': self.box.tolist(), 'text': self.text,
+                'confidence': self.confidence, 'recognized_frame': self.recognized_frame}
+
+
+class SpineTracker:
+    """
+    IoU / Kalman tracker of spine boxes with a per-track recognition cache.
+
+    Args:
+        iou_threshold: Minimum IoU between a predicted track box and a detection
+        min_hits: Detections before a track is sent to recognition
+        max_misses: Frames a track is kept without detection
+        min_confidence: Texts below this confidence are read again (up to max_attempts)
+        max_attempts: OCR attempts on a low-confidence track
+        retry_interval: Frames between two attempts on a low-confidence track
+        change_threshold: Appearance distance that invalidates a cached text
+    """
+
+    def __init__(self, iou_threshold: float = DEFAULT_IOU_THRESHOLD, min_hits: int = DEFAULT_MIN_HITS,
+                 max_misses: int = DEFAULT_MAX_MISSES, min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, retry_interval: int = DEFAULT_RETRY_INTERVAL,
+                 change_threshold: float = DEFAULT_CHANGE_THRESHOLD):
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_misses = max_misses
+        self.min_confidence = min_confidence
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.change_threshold = change_threshold
+        self.tracks: List[Track] = []
+        self.frame_index = -1
+        self.created = 0
+        self.recognitions = 0
+        self._appearance: Dict[int, np.ndarray] = {}  # track_id -> current signature
+
+    def reset(self):
+        self.tracks = []
+        self.frame_index = -1
+        self.created = 0
+        self.recognitions = 0
+        self._appearance = {}
+
+    def update(self, boxes: np.ndarray, image: Optional[np.ndarray] = None,
+               frame_index: Optional[int] = None) -> List[Track]:
+        """
+        Match the detections of a new frame to the tracks.
+
+        Args:
+            boxes: (n, 4) detections (x0, y0, x1, y1)
+            image: Frame, used for the appearance signatures of tracks with a cached text
+            frame_index: Index of the frame (defaults to one more than the previous update)
+
+        Returns:
+            Tracks matched on this frame (new ones included), left to right
+        """
+        self.frame_index = self.frame_index + 1 if frame_index is None else frame_index
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        for track in self.tracks:
+            track.predict()
+
+        predicted = np.array([track.box for track in self.tracks], dtype=np.float32).reshape(-1, 4)
+        overlap = iou_matrix(predicted, boxes)
+        matched_tracks, matched_boxes = set(), set()
+        if overlap.size:
+            rows, cols = linear_sum_assignment(-overlap)
+            for row, col in zip(rows, cols):
+                if overlap[row, col] >= self.iou_threshold:
+                    self.tracks[row].correct(boxes[col])
+                    matched_tracks.add(row)
+                    matched_boxes.add(col)
+
+        visible = [track for index, track in enumerate(self.tracks) if index in matched_tracks]
+        for index, track in enumerate(self.tracks):
+            if index not in matched_tracks:
+                track.misses += 1
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+        for col in range(len(boxes)):
+            if col not in matched_boxes:
+                self.created += 1
+                track = Track(self.created, boxes[col])
+                self.tracks.append(track)
+                visible.append(track)
+
+        self._appearance = {}
+        if image is not None:
+            for track in visible:
+                if track.signature is not None:
+                    self._appearance[track.track_id] = appearance_signature(image, track.box)
+        return sorted(visible, key=lambda track: track.box[0])
+
+    def needs_recognition(self, track: Track) -> bool:
+        """New confirmed track, low-confidence text due for a retry, or changed appearance."""
+        if track.pending or track.misses or track.hits < self.min_hits:
+            return False
+        if track.text is None:
+            return track.attempts == 0 or self._retry_due(track)
+        if (track.confidence or 0.0) < self.min_confidence:
+            return self._retry_due(track)
+        current = self._appearance.get(track.track_id)
+        return appearance_distance(track.signature, current) > self.change_threshold
+
+    def _retry_due(self, track: Track) -> bool:
+        return (track.attempts < self.max_attempts and
+                self.frame_index - (track.recognized_frame or 0) >= self.retry_interval)
+
+    def pending(self, tracks: Optional[List[Track]] = None) -> List[Track]:
+        """Tracks (among the visible ones, default all) whose text must be (re)read."""
+        return [track for track in (self.tracks if tracks is None else tracks) if self.needs_recognition(track)]
+
+    def mark_pending(self, tracks: List[Track]):
+        for track in tracks:
+            track.pending = True
+
+    def set_recognition(self, track: Track, text: str, confidence: float, image: np.ndarray,
+                        box: np.ndarray, frame_index: int):
+        """
+        Cache the OCR result of a track.
+
+        A low-confidence reading does not replace a better cached one; the
+        signature is taken from the crop that was actually read.
+        """
+        track.pending = False
+        track.attempts += 1
+        track.recognized_frame = frame_index
+        self.recognitions += 1
+        changed = appearance_distance(track.signature, self._appearance.get(track.track_id)) > self.change_threshold
+        if text and (track.text is None or changed or confidence >= (track.confidence or 0.0)):
+            track.text, track.confidence = text, float(confidence)
+        track.signature = appearance_signature(image, box)
+
+    def cancel(self, tracks: List[Track]):
+        """Recognition failed or was dropped: the tracks become eligible again."""
+        for track in tracks:
+            track.pending = False
+
+    def books(self, tracks: Optional[List[Track]] = None) -> List[Track]:
+        """Tracks with a cached text (visible ones, or all live tracks), left to right."""
+        tracks = self.tracks if tracks is None else tracks
+        return sorted((track for track in tracks if track.text), key=lambda track: track.box[0])
@@ -14,6 +14,9 @@ class BookOCR:
         self.reader = easyocr.Reader(languages, gpu=True)
         # Stocker le seuil de confiance
         self.confidence_threshold = confidence_threshold
+        # Mode temps réel : zones modifiées depuis la frame précédente (créé au premier usage) et textes déjà lus
+        self.change_detector = None
+        self.live_results = []  # [((x0, y0, x1, y1), texte, confiance), ...]
         
       
     # Prétraitement d'image (niveaux de gris, égalisation)
@@ -67,6 +70,50 @@ class BookOCR:
 
         # Retourner le texte combiné et la confiance moyenne
         return (full_text, avg_confidence)
+
+    # Mode temps réel : même résultat que extract_text_from_pil, mais l'OCR ne tourne
+    # que sur les zones de l'image qui ont changé depuis la frame précédente
+    def extract_text_live(self, pil_image, preprocess=True):
+        if self.change_detector is None:
+            from realtime_engine.change_detection import FrameChangeDetector
+            self.change_detector = FrameChangeDetector()
+        image_array = np.array(pil_image)
+        bgr_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
+
+        # Aucune zone modifiée : résultat précédent, sans appel à EasyOCR
+        change = self.change_detector.update(bgr_image)
+        if change.changed:
+            # Oublier les textes dont le centre tombe dans une zone modifiée
+            kept = []
+            for box, text, confidence in self.live_results:
+                cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+                inside = ((change.regions[:, 0] <= cx) & (cx <= change.regions[:, 2]) &
+                          (change.regions[:, 1] <= cy) & (cy <= change.regions[:, 3]))
+                if not inside.any():
+                    kept.append((box, text, confidence))
+
+            # OCR de chaque zone modifiée, coordonnées ramenées dans l'image entière
+            image = self.preprocess_image(bgr_image) if preprocess else bgr_image
+            for x0, y0, x1, y1 in change.regions.astype(int):
+                for points, text, confidence in self.reader.readtext(image[y0:y1, x0:x1]):
+                    if confidence >= self.confidence_threshold:
+                        xs = [p[0] + x0 for p in points]
+                        ys = [p[1] + y0 for p in points]
+                        kept.append(((min(xs), min(ys), max(xs), max(ys)), text, confidence))
+            self.live_results = kept
+
+        # Ordre de lecture : de haut en bas, puis de gauche à droite
+        results = sorted(self.live_results, key=lambda r: (r[0][1], r[0][0]))
+        full_text = ' '.join(r[1] for r in results)
+        avg_confidence = sum(r[2] for r in results) / len(results) if results else 0.0
+        return (full_text, avg_confidence)
+
+    # Repartir de zéro (nouvelle scène, changement de caméra)
+    def reset_live(self):
+        if self.change_detector is not None:
+            self.change_detector.reset()
+        self.live_results = []
+
     # TODO 3 : Créer une méthode pour filtrer et extraire uniquement les titres de livres à partir du texte OCR (ex : lignes longues, capitalisées, etc.). Retourner une liste de titres.
     # def extract_book_titles(self, pil_image):
     #     pass
@@ -74,37 +121,3 @@ class BookOCR:
     # Format : [{"text": ..., "x": ..., "y": ..., "width": ..., "height": ...}, ...]
     # def get_bounding_boxes(self, pil_image):
     #     pass
-
-# 🧠 Mémoire du Projet ShelfReader
-
-**Dernière mise à jour** : 2025-10-03
-
-## 📊 État d'avancement
-
-### Structure du projet
-- `src/api_client.py` : Client Open Library (Phase 1) — Terminé
-- `src/ocr_processor.py` : OCR EasyOCR (Phase 2) — En cours
-- `src/app.py` : Interface Streamlit (Phase 3) — À faire
-- `tests/` : Tests unitaires (Phase 4) — À faire
-
-### TODOs principales
-1. Installer Tesseract et EasyOCR ✔️
-2. Implémenter extract_text_from_pil ✔️
-3. Ajouter extract_book_titles ⏳
-4. Ajouter get_bounding_boxes ⏳
-5. Tester BookOCR sur une image ⏳
-
-### Documentation simplifiée
-- Tous les fichiers `.md` sont à jour et résumés :
-    - Phase 1 : API Client — Terminé
-    - Phase 2 : OCR — Méthode d’extraction de texte OK, reste titres et bounding boxes
-    - Phase 3 : Interface — À faire
-    - Phase 4 : Tests — À faire
-
-### Conseils pour agents/futurs modèles
-- Suivre la todo list du projet (voir ci-dessus)
-- Se référer aux fichiers `.md` pour la structure et les exemples
-- Mettre à jour ce fichier à chaque modification importante
-
-### Prochaine étape
-- Implémenter la méthode `extract_book_titles` dans `BookOCR`
\ No newline at end of file
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test de la détection de changements entre frames
+Frame fixe, changement local (bornes de la zone), bruit sous le seuil, et
+OCR limité aux zones modifiées (BookOCR.extract_text_live, lecteur factice).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ajouter la racine de P4 au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from realtime_engine.change_detection import FrameChangeDetector
+
+
+def _frame(seed=0, size=(480, 640)):
+    """Image texturée (gros blocs aléatoires, stables après le flou du détecteur)."""
+    blocks = np.random.default_rng(seed).integers(0, 256, (size[0] // 16, size[1] // 16), dtype=np.uint8)
+    return np.repeat(np.repeat(blocks, 16, axis=0), 16, axis=1)
+
+
+def test_frame_fixe():
+    """Première frame entièrement modifiée, puis plus aucun changement."""
+    detector = FrameChangeDetector()
+    frame = _frame()
+    first = detector.update(frame)
+    assert first.first and first.fraction == 1.0
+    assert first.regions.tolist() == [[0, 0, 640, 480]]
+
+    for _ in range(3):
+        change = detector.update(frame.copy())
+        assert not change.changed and change.fraction == 0.0
+
+    # Nouvelle taille: tout est à nouveau modifié
+    assert detector.update(_frame(size=(240, 320))).first
+
+
+def test_changement_local():
+    """Une zone modifiée est couverte par une seule région proche de ses bornes."""
+    detector = FrameChangeDetector()
+    frame = _frame()
+    detector.update(frame)
+
+    moved = frame.copy()
+    moved[160:320, 400:480] = 255 - moved[160:320, 400:480]
+    change = detector.update(moved)
+    assert change.changed and not change.first
+    assert len(change.regions) == 1
+    x0, y0, x1, y1 = change.regions[0]
+    # Marge d'un bloc (4 px réduits = 32 px de l'image) autour de la zone
+    assert 400 - 64 <= x0 <= 400 and 480 <= x1 <= 480 + 64
+    assert 160 - 64 <= y0 <= 160 and 320 <= y1 <= 320 + 64
+    assert change.span(0) == (x0, x1)
+    assert 0 < change.fraction < 0.2
+
+    # La référence a suivi: la même frame ne change plus rien
+    assert not detector.update(moved).changed
+
+
+def test_bruit_sous_le_seuil():
+    """Bruit capteur (±6 niveaux) ignoré; un changement franc reste détecté."""
+    detector = FrameChangeDetector(threshold=12)
+    frame = _frame()
+    detector.update(frame)
+
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        noise = rng.integers(-6, 7, frame.shape)
+        assert not detector.update(np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8)).changed
+
+    brighter = np.clip(frame.astype(int) + 40, 0, 255).astype(np.uint8)
+    assert detector.update(brighter).changed
+
+
+class _FakeReader:
+    """readtext factice: un texte par appel, avec la taille de la zone lue."""
+
+    def __init__(self):
+        self.calls = []
+
+    def readtext(self, image):
+        self.calls.append(image.shape[:2])
+        height, width = image.shape[:2]
+        return [([[0, 0], [width, 0], [width, height], [0, height]], f"zone {width}x{height}", 0.9)]
+
+
+def test_extract_text_live_zones_modifiees():
+    """OCR de l'image entière, puis rien sur une frame fixe, puis seulement la zone modifiée."""
+    pytest.importorskip('easyocr')
+    from PIL import Image
+    from src.ocr_processor import BookOCR
+
+    ocr = BookOCR.__new__(BookOCR)
+    ocr.reader, ocr.confidence_threshold = _FakeReader(), 0.5
+    ocr.change_detector, ocr.live_results = None, []
+
+    frame = np.stack([_frame()] * 3, axis=-1)
+    assert ocr.extract_text_live(Image.fromarray(frame)) == ("zone 640x480", 0.9)
+    assert ocr.extract_text_live(Image.fromarray(frame)) == ("zone 640x480", 0.9)
+    assert len(ocr.reader.calls) == 1
+
+    # La zone modifiée contient le centre de l'ancien texte: il est remplacé
+    frame[200:280, 280:360] = 255 - frame[200:280, 280:360]
+    text, _ = ocr.extract_text_live(Image.fromarray(frame))
+    assert len(ocr.reader.calls) == 2
+    assert ocr.reader.calls[-1][0] < 480 and ocr.reader.calls[-1][1] < 640
+    assert text.startswith("zone ") and text != "zone 640x480"
+
+    ocr.reset_live()
+    assert ocr.live_results == []
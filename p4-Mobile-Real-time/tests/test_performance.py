@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test des métriques par étape et de l'ordonnanceur à budget de latence
+Horloges passées explicitement: aucun test ne dépend du temps réel.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Ajouter la racine de P4 au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from realtime_engine.performance import LatencyBudgetScheduler, PipelineMetrics, StageMetrics
+
+
+def test_stage_metrics_fps_et_percentiles():
+    """FPS sur la fenêtre glissante, percentiles de latence, compteurs."""
+    stats = StageMetrics('detect', window=5)
+    assert stats.fps == 0.0 and stats.latency(50) == 0.0
+
+    for i in range(10):
+        stats.record(latency=0.01 * (i + 1), now=i * 0.1)
+    stats.drop()
+    stats.skip(3)
+
+    # Fenêtre: les 5 derniers échantillons (latences 60 à 100 ms, toutes les 100 ms)
+    assert stats.fps == pytest.approx(10.0)
+    assert stats.latency(50) == pytest.approx(0.08)
+    assert stats.latency(100) == pytest.approx(0.10)
+    snapshot = stats.snapshot()
+    assert (snapshot['processed'], snapshot['dropped'], snapshot['skipped']) == (10, 1, 3)
+    assert snapshot['p50_ms'] == pytest.approx(80.0)
+
+
+def test_admission_limite_de_debit_et_frames_perimees():
+    """Frames plus rapprochées que 1/target_fps ignorées, frames trop anciennes abandonnées."""
+    scheduler = LatencyBudgetScheduler(target_fps=10, max_latency=0.2)
+    admitted = [t for t in (0.0, 0.05, 0.1, 0.12, 0.2, 0.31) if scheduler.admit(t)]
+    assert admitted == [0.0, 0.1, 0.2, 0.31]
+    assert scheduler.metrics.stage('schedule').skipped == 2
+
+    assert not scheduler.admit(1.0, captured_at=5.0, now=5.3)
+    assert scheduler.metrics.stage('schedule').dropped == 1
+    assert scheduler.admit(1.0, captured_at=5.0, now=5.1)
+
+
+def test_frames_cles_espacees_selon_la_reconnaissance():
+    """Première frame clé, puis key_interval; intervalle élargi quand la reconnaissance est lente."""
+    metrics = PipelineMetrics()
+    scheduler = LatencyBudgetScheduler(target_fps=10, key_interval=3, max_key_interval=20, metrics=metrics)
+    keys = [i for i in range(10) if scheduler.is_key_frame()]
+    assert keys == [0, 3, 6, 9]
+
+    # Reconnaissance à 1 s pour une frame toutes les 100 ms: une frame clé toutes les 10 frames
+    metrics.stage('recognize').record(1.0)
+    assert scheduler.current_key_interval == 10
+    metrics.stage('recognize').record(5.0)
+    metrics.stage('recognize').record(5.0)
+    assert scheduler.current_key_interval == 20
+
+
+def test_frames_cles_reconnaissance_occupee_et_rien_a_lire():
+    """Reconnaissance occupée: frame clé reportée jusqu'à max_key_interval; sans livre à lire: aucune."""
+    scheduler = LatencyBudgetScheduler(target_fps=10, key_interval=2, max_key_interval=5)
+    assert scheduler.is_key_frame()
+    decisions = [scheduler.is_key_frame(recognizer_busy=True) for _ in range(5)]
+    assert decisions == [False, False, False, False, True]
+
+    scheduler.reset()
+    assert not any(scheduler.is_key_frame(pending=False) for _ in range(10))
+    assert scheduler.is_key_frame()